@@ -4,6 +4,7 @@ import pathlib
 import re
 import uuid
 import warnings
+from contextlib import contextmanager
 import ipyvue
 from astropy import units as u
 from astropy.nddata import NDData, NDDataArray
@@ -30,6 +31,7 @@ from glue_astronomy.translators.regions import roi_subset_state_to_region
 from glue_jupyter.app import JupyterApplication
 from glue_jupyter.common.toolbar_vuetify import read_icon
 from glue_jupyter.state_traitlets_helpers import GlueState
+from glue_jupyter.utils import get_ioloop
 from ipypopout import PopoutButton
 from ipyvuetify import VuetifyTemplate, theme as vuetify_theme
 from ipywidgets import widget_serialization
@@ -45,7 +47,8 @@ from jdaviz.core.events import (LoadDataMessage, NewViewerMessage, AddDataMessag
                                 SubsetRenameMessage, AddDataToViewerMessage,
                                 RemoveDataFromViewerMessage, ViewerAddedMessage,
                                 ViewerRemovedMessage, ViewerRenamedMessage, ChangeRefDataMessage,
-                                IconsUpdatedMessage, LayersFinalizedMessage)
+                                IconsUpdatedMessage, LayersFinalizedMessage,
+                                GlobalDisplayUnitChanged)
 from jdaviz.core.loaders.resolvers.file.file import PresetFileResolver
 from jdaviz.core.loaders.resolvers.object.object import PresetObjectResolver
 from jdaviz.core.loaders.resolvers.url.url import PresetURLResolver
@@ -300,8 +303,13 @@ class ApplicationState(State):
     settings = DictCallbackProperty({
         'data': {
             'auto_populate': False,
-            'parser': None
+            'parser': None,
+            # Keep FITS data memory-mapped and only read the selected extensions
+            # (extensions are identified by header rather than content hashes).
+            'lazy_load': False
         },
+        # Profile the wall time and peak memory of plugin methods (see plg.profiling_results())
+        'profiling': False,
         'visible': {
             'menu_bar': True,
             'toolbar': True,
@@ -422,6 +430,9 @@ class PrivateApplication(VuetifyTemplate, HubListener):
     golden_layout_state = Dict(default_value=None, allow_none=True).tag(sync=True)
     force_open_about = Bool(False).tag(sync=True)
 
+    # seconds over which subset edits are coalesced before recomputing live plugin results
+    _live_plugin_results_delay = 0.1
+
     def __init__(self, configuration=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._jdaviz_helper = None
@@ -461,6 +472,18 @@ class PrivateApplication(VuetifyTemplate, HubListener):
         self.hub.subscribe(self, PluginPlotAddedMessage,
                            handler=self._on_plugin_plot_added)
 
+        # Live-updating plugin results (see _update_live_plugin_results): labels of the
+        # results waiting to be recomputed, in order, and the plugin instance reused to
+        # recompute each result
+        self._live_plugin_results_pending = {}
+        self._live_plugin_instances = {}
+        self._live_plugin_results_held = 0
+        self._live_plugin_results_scheduled = False
+        self._live_plugin_results_flushing = False
+        self.hub.subscribe(self, GlobalDisplayUnitChanged,
+                           handler=lambda msg: self._update_live_plugin_results(
+                               trigger_unit=msg.axis))
+
         # Convenient reference of all existing subset names
         self._reserved_labels = set([])
 
@@ -475,6 +498,10 @@ class PrivateApplication(VuetifyTemplate, HubListener):
         self._align_by = 'pixels'
         if self.config == "imviz":
             self._wcs_fast_approximation = None
+        # tangent-plane fits of the image WCSs, reused when relinking by WCS
+        # (see link_image_data)
+        from jdaviz.configs.imviz.wcs_utils import TangentPlaneCache
+        self._wcs_tangent_plane_cache = TangentPlaneCache()
 
         # Subscribe to messages indicating that a new viewer needs to be
         #  created. When received, information is passed to the application
@@ -546,47 +573,160 @@ class PrivateApplication(VuetifyTemplate, HubListener):
         key = f"{msg.plugin._plugin_name}: {msg.table._table_name}"
         self._plugin_tables.setdefault(key, msg.table.user_api)
 
-    def _iter_live_plugin_results(self, trigger_data_lbl=None, trigger_subset=None):
-        trigger_subset_lbl = trigger_subset.label if trigger_subset is not None else None
+    @staticmethod
+    def _live_plugin_result_dependencies(plugin_inputs):
+        """
+        The data, subsets and display units that a live-updating plugin result depends on.
+
+        Parameters
+        ----------
+        plugin_inputs : dict
+            The plugin options stored in the metadata of the result.
+
+        Returns
+        -------
+        dependencies : dict
+            Sets of the labels of the data (``'data'``) and subsets (``'subset'``)
+            referenced by the plugin options, and of the display unit axes (``'units'``)
+            the result depends on.
+        """
+        subscriptions = plugin_inputs.get('_subscriptions', {})
+        dependencies = {'units': set(subscriptions.get('units', []))}
+        for kind in ('data', 'subset'):
+            labels = set()
+            for attr in subscriptions.get(kind, []):
+                value = plugin_inputs.get(attr)
+                if isinstance(value, (list, tuple)):
+                    labels.update(value)
+                elif value is not None:
+                    labels.add(value)
+            dependencies[kind] = labels
+        return dependencies
+
+    def _iter_live_plugin_results(self, trigger_data_lbl=None, trigger_subset=None,
+                                  trigger_unit=None):
         for data in self.data_collection:
             plugin_inputs = data.meta.get('_update_live_plugin_results', None)
             if plugin_inputs is None:
                 continue
-            data_subs = plugin_inputs.get('_subscriptions', {}).get('data', [])
-            subset_subs = plugin_inputs.get('_subscriptions', {}).get('subset', [])
-            if (trigger_data_lbl is not None and
-                    not np.any([plugin_inputs.get(attr) == trigger_data_lbl
-                                for attr in data_subs])):
+            dependencies = self._live_plugin_result_dependencies(plugin_inputs)
+            if trigger_data_lbl is not None and trigger_data_lbl not in dependencies['data']:
                 # trigger data does not match subscribed data entries
                 continue
-            if trigger_subset_lbl is not None:
-                if not np.any([plugin_inputs.get(attr) == trigger_subset_lbl
-                               for attr in subset_subs]):
+            if trigger_subset is not None:
+                if trigger_subset.label not in dependencies['subset']:
                     # trigger subset does not match subscribed subsets
                     continue
-                if not np.any([plugin_inputs.get(attr) == trigger_subset.data.label
-                               for attr in data_subs]):
+                if trigger_subset.data.label not in dependencies['data']:
                     # trigger parent data of subset does not match subscribed data entries
                     continue
+            if trigger_unit is not None and trigger_unit not in dependencies['units']:
+                # result does not depend on the display units along this axis
+                continue
             yield (data, plugin_inputs)
 
-    def _update_live_plugin_results(self, trigger_data_lbl=None, trigger_subset=None):
-        for data, plugin_inputs in self._iter_live_plugin_results(trigger_data_lbl, trigger_subset):
-            # update and overwrite data
-            # make a new instance of the plugin to avoid changing any UI settings
+    def _update_live_plugin_results(self, trigger_data_lbl=None, trigger_subset=None,
+                                    trigger_unit=None):
+        """
+        Recompute the live-updating plugin results that depend on the trigger.
+
+        Recomputations triggered by subset edits are coalesced: when running in a
+        kernel, they are deferred (by ``_live_plugin_results_delay`` seconds) so that
+        each result is only recomputed once for a rapid sequence of edits.  Otherwise
+        (and for other triggers), the results are recomputed immediately, unless within
+        ``_delay_live_plugin_results``.
+        """
+        for data, _ in self._iter_live_plugin_results(trigger_data_lbl, trigger_subset,
+                                                      trigger_unit):
+            self._live_plugin_results_pending[data.label] = None
+        if not len(self._live_plugin_results_pending):
+            return
+
+        ioloop = None
+        if trigger_subset is not None:
+            try:
+                ioloop = get_ioloop()
+            except RuntimeError:  # no running event loop
+                ioloop = None
+        if ioloop is None:
+            self._flush_live_plugin_results()
+        elif not self._live_plugin_results_scheduled:
+            self._live_plugin_results_scheduled = True
+            ioloop.call_later(self._live_plugin_results_delay,
+                              self._flush_live_plugin_results)
+
+    @contextmanager
+    def _delay_live_plugin_results(self):
+        """
+        Defer recomputing live-updating plugin results until the end of the context, so
+        that each result affected by any number of changes within it is recomputed once.
+        """
+        self._live_plugin_results_held += 1
+        try:
+            yield
+        finally:
+            self._live_plugin_results_held -= 1
+            self._flush_live_plugin_results()
+
+    def _flush_live_plugin_results(self):
+        """Recompute the live-updating plugin results that are waiting to be updated."""
+        self._live_plugin_results_scheduled = False
+        if self._live_plugin_results_held or self._live_plugin_results_flushing:
+            # results pending now are recomputed when the outer call finishes
+            return
+
+        # forget the plugin instances of results that no longer exist
+        for label in list(self._live_plugin_instances):
+            if label not in self.data_collection.labels:
+                del self._live_plugin_instances[label]
+
+        self._live_plugin_results_flushing = True
+        try:
+            # recomputing a result can make others (that depend on it) pending
+            while len(self._live_plugin_results_pending):
+                label = next(iter(self._live_plugin_results_pending))
+                del self._live_plugin_results_pending[label]
+                if label not in self.data_collection.labels:
+                    continue
+                data = self.data_collection[label]
+                plugin_inputs = data.meta.get('_update_live_plugin_results', None)
+                if plugin_inputs is None:
+                    continue
+                self._recompute_live_plugin_result(data, plugin_inputs)
+        finally:
+            self._live_plugin_results_flushing = False
+
+    def _recompute_live_plugin_result(self, data, plugin_inputs):
+        from jdaviz.core.template_mixin import WithCache
+
+        # reuse the plugin instance (separate from the one in the tray, to avoid changing
+        # any UI settings) from the last time this result was recomputed
+        plg = self._live_plugin_instances.get(data.label)
+        if plg is None or plg._plugin_name != data.meta.get('plugin'):
             plg = self._jdaviz_helper.plugins.get(data.meta.get('plugin'))._obj.new()
             if not plg.supports_auto_update:
                 raise NotImplementedError(f"{data.meta.get('plugin')} does not support live-updates")  # noqa
-            plg.user_api.from_dict(plugin_inputs)
-            # keep auto-updating, even if the option is hidden from the user API
-            # (can remove this line if auto_update is exposed to the user API in the future)
-            plg.add_results.auto_update_result = True
-            try:
-                plg()
-            except Exception as e:
-                self.hub.broadcast(SnackbarMessage(
-                    f"Auto-update for {plugin_inputs['add_results']['label']} failed: {e}",
-                    sender=self, color="error"))
+            self._live_plugin_instances[data.label] = plg
+        else:
+            # the trigger may have been handled here before the plugin saw it
+            plg._clear_cache()
+            for component in vars(plg).values():
+                if isinstance(component, WithCache):
+                    component._clear_cache()
+        plg.user_api.from_dict(plugin_inputs)
+        # overwrite this result, even if its label was the default label when it was created
+        # (which may have changed when restoring the other inputs)
+        plg.add_results.auto = False
+        plg.add_results.label = data.label
+        # keep auto-updating, even if the option is hidden from the user API
+        # (can remove this line if auto_update is exposed to the user API in the future)
+        plg.add_results.auto_update_result = True
+        try:
+            plg()
+        except Exception as e:
+            self.hub.broadcast(SnackbarMessage(
+                f"Auto-update for {plugin_inputs['add_results']['label']} failed: {e}",
+                sender=self, color="error"))
 
     def _remove_live_plugin_results(self, trigger_data_lbl=None, trigger_subset=None):
         for data, plugin_inputs in self._iter_live_plugin_results(trigger_data_lbl, trigger_subset):
@@ -694,7 +834,7 @@ class PrivateApplication(VuetifyTemplate, HubListener):
         # We have these options:
         #   debug, info, warning, error
         # Therefore:
-        # * debug is not used, it is more for the future if we also have a logger.
+        # * debug is only logged on request (e.g., the results of plugin profiling)
         # * info lets everything through
         # * success, secondary, and primary are treated as info (not sure what they are used for)
         # * None is also treated as info (when color is not set)
@@ -2050,6 +2190,8 @@ class PrivateApplication(VuetifyTemplate, HubListener):
 
             # Update live plugin results if metadata exists
             self._update_live_plugin_results_metadata(data, old_label, new_label, 'data')
+            if old_label in self._live_plugin_instances:
+                self._live_plugin_instances[new_label] = self._live_plugin_instances.pop(old_label)
 
             # Update metadata in OTHER data that subscribe to the renamed data
             for d in self.data_collection:
@@ -3197,6 +3339,7 @@ class PrivateApplication(VuetifyTemplate, HubListener):
                 self.state.data_items.remove(data_item)
 
         self._clear_object_cache(msg.data.label)
+        self._wcs_tangent_plane_cache.discard(msg.data.label)
 
         self._update_existing_data_in_dc(msg, data_added=False)
 
@@ -1,4 +1,5 @@
 import numpy as np
+from collections import OrderedDict
 from contextlib import contextmanager
 import multiprocessing as mp
 import sys
@@ -12,7 +13,6 @@ try:
 except ImportError:
     pass
 
-from jdaviz.configs.default.plugins.model_fitting.fitting_backend import generate_spaxel_list
 from jdaviz.utils import parallelize_calculation
 
 #  smallest fraction of the max audio amplitude that can be represented by a 16-bit signed integer
@@ -65,9 +65,18 @@ def sonify_spectrum(spec, duration, overlap=0.05, system='mono', srate=44100, fm
 
 
 class CubeListenerData:
+    """
+    Audio buffers for every spaxel of a cube, stored in a single contiguous ``int16``
+    array of shape ``(n_i, n_j, siglen)``, where ``i`` and ``j`` index the two spatial
+    axes of the cube in order.
+
+    If ``lazy`` is `True`, buffers are instead only synthesized when first requested
+    (i.e., for the pixels visited by the cursor) and the ``cache_size`` most recently
+    used buffers are kept.
+    """
     def __init__(self, cube, wlens, samplerate=44100, duration=1, overlap=0.05, buffsize=1024,
                  bdepth=16, wl_unit=None, audfrqmin=50, audfrqmax=1500, eln=False, vol=None,
-                 spectral_axis_index=2, n_cpu=None):
+                 spectral_axis_index=2, n_cpu=None, lazy=False, cache_size=4096):
         self.siglen = int(samplerate*(duration-overlap))
         self.cube = cube
         self.dur = duration
@@ -84,6 +93,7 @@ class CubeListenerData:
         spatial_inds = [0, 1, 2]
         spatial_inds.remove(self.spectral_axis_index)
         self.spatial_inds = spatial_inds
+        self.spatial_shape = tuple(self.cube.shape[i] for i in spatial_inds)
 
         if vol is None:
             self.atten_level = 1
@@ -92,6 +102,7 @@ class CubeListenerData:
 
         self.wl_unit = wl_unit
         self.wlens = wlens
+        self.lo2hi = self.wlens.argsort()[::-1]
 
         # control fades
         fade = np.linspace(0, 1, buffsize+1)
@@ -109,15 +120,21 @@ class CubeListenerData:
         self.cursig = np.zeros(self.siglen, dtype='int16')
         self.newsig = np.zeros(self.siglen, dtype='int16')
 
+        # per-spaxel volume scaling, see set_spaxel_scale
+        self.scale = None
+
+        self.lazy = lazy
+        self.cache_size = cache_size
+        self._sig_cache = OrderedDict()
+        if lazy:
+            self.sigcube = None
+            return
+
         # ensure sigcube isn't too big before we initialise it
-        slices = [slice(None),]*3
-        slices[spectral_axis_index] = 0
-        if self.cube[*slices].size * self.siglen * 2 * pow(1024, -3) > 2:
+        if np.prod(self.spatial_shape) * self.siglen * 2 * pow(1024, -3) > 2:
             raise Exception("Cube projected to be > 2Gb!")
 
-        sigcube_shape = list(self.cube.shape)
-        sigcube_shape[spectral_axis_index] = self.siglen
-        self.sigcube = np.zeros(sigcube_shape, dtype='int16')
+        self.sigcube = np.zeros(self.spatial_shape + (self.siglen,), dtype='int16')
 
     def set_wl_bounds(self, w1, w2):
         """
@@ -131,42 +148,89 @@ class CubeListenerData:
         Iterate through the cube, convert each spectrum to a signal, and store
         in class attributes
         """
-        lo2hi = self.wlens.argsort()[::-1]
-
-        spaxels = generate_spaxel_list(self.cube, self.spectral_axis_index)
-
-        # Callback to collect results from workers into the cubes
-        def collect_result(results):
-            for i in range(len(results['x'])):
-                x = results['x'][i]
-                y = results['y'][i]
-                sig = results['sig'][i]
-
-                # Store fitted values
-                if self.spectral_axis_index in [2, -1]:
-                    self.sigcube[x, y, :] = sig
-                elif self.spectral_axis_index == 0:
-                    self.sigcube[:, y, x] = sig
-
-        # Workers for the parallelization pool.
-        workers = (SonifySpaxelWorker(self.cube, spx, lo2hi, self.dur, self.srate,
-                                      self.audfrqmin, self.audfrqmax, self.eln, self.maxval,
-                                      spectral_axis_index=self.spectral_axis_index)
-                   for spx in np.array_split(spaxels, self.n_cpu))
-
-        parallelize_calculation(workers, collect_result, n_cpu=self.n_cpu)
-
-        if self.spectral_axis_index == 2:
-            self.cursig[:] = self.sigcube[0, 0, :]
-        elif self.spectral_axis_index == 0:
-            self.cursig[:] = self.sigcube[:, 0, 0]
+        if not self.lazy:
+            spaxels = np.argwhere(np.ones(self.spatial_shape, dtype=bool))
+
+            # Callback to collect results from workers into the signal array
+            def collect_result(results):
+                for i, j, sig in zip(results['i'], results['j'], results['sig']):
+                    self.sigcube[i, j] = sig
+
+            # Workers for the parallelization pool.
+            workers = (SonifySpaxelWorker(self.cube, spx, self.lo2hi, self.dur, self.srate,
+                                          self.audfrqmin, self.audfrqmax, self.eln, self.maxval,
+                                          spectral_axis_index=self.spectral_axis_index)
+                       for spx in np.array_split(spaxels, max(self.n_cpu, 1)))
+
+            parallelize_calculation(workers, collect_result, n_cpu=self.n_cpu)
+
+            # all buffers are synthesized, the (scaled) input cube is no longer needed
+            self.cube = None
+
+        self.cursig[:] = self.spaxel_signal(0, 0)
         self.newsig[:] = self.cursig[:]
 
+    def set_spaxel_scale(self, scale):
+        """
+        Scale the volume of each spaxel (for example by the white-light image).
+
+        Parameters
+        ----------
+        scale : array-like
+            Scale factors, with the spatial shape of the cube.
+        """
+        self.scale = np.asarray(scale).reshape(self.spatial_shape)
+        if self.lazy:
+            self._sig_cache.clear()
+        else:
+            self.sigcube = (self.sigcube * self.scale[..., np.newaxis]).astype('int16')
+
+    def spaxel_signal(self, i, j):
+        """
+        Audio buffer for the spaxel at spatial indices ``(i, j)``.
+        """
+        if not self.lazy:
+            return self.sigcube[i, j]
+
+        if (i, j) in self._sig_cache:
+            self._sig_cache.move_to_end((i, j))
+            return self._sig_cache[(i, j)]
+
+        sig = SonifySpaxelWorker(self.cube, [(i, j)], self.lo2hi, self.dur, self.srate,
+                                 self.audfrqmin, self.audfrqmax, self.eln, self.maxval,
+                                 spectral_axis_index=self.spectral_axis_index)()['sig']
+        sig = sig[0] if len(sig) else np.zeros(self.siglen, dtype='int16')
+        if self.scale is not None:
+            sig = (sig * self.scale[i, j]).astype('int16')
+
+        self._sig_cache[(i, j)] = sig
+        if len(self._sig_cache) > self.cache_size:
+            self._sig_cache.popitem(last=False)
+        return sig
+
+    def _pixel_to_spaxel(self, x, y):
+        # the viewer x-axis corresponds to the last spatial axis of cubes
+        # with the spectral axis first
+        return (y, x) if self.spectral_axis_index == 0 else (x, y)
+
+    def contains_pixel(self, x, y):
+        """
+        Whether the viewer pixel ``(x, y)`` is within the cube.
+        """
+        i, j = self._pixel_to_spaxel(x, y)
+        return 0 <= i < self.spatial_shape[0] and 0 <= j < self.spatial_shape[1]
+
+    def pixel_signal(self, x, y):
+        """
+        Audio buffer for the viewer pixel ``(x, y)``.
+        """
+        return self.spaxel_signal(*self._pixel_to_spaxel(x, y))
+
     def player_callback(self, outdata, frames, time, status):
         cur = self.cursig
         new = self.newsig
         sdx = int(time.outputBufferDacTime*self.srate)
-        dxs = np.arange(sdx, sdx+frames).astype(int) % self.sigcube.shape[self.spectral_axis_index]
+        dxs = np.arange(sdx, sdx+frames).astype(int) % self.siglen
         if self.cbuff:
             outdata[:, 0] = (cur[dxs] * self.ofade).astype('int16')
             outdata[:, 0] += (new[dxs] * self.ifade).astype('int16')
@@ -177,19 +241,46 @@ class CubeListenerData:
         outdata[:, 0] //= self.atten_level
 
 
+class CombinedSonifiedGrid:
+    """
+    Sum of the sounds of several sonified layers, computed for a pixel only when
+    it is requested (i.e., when the cursor moves over it).
+
+    Parameters
+    ----------
+    listeners : dict
+        `CubeListenerData` objects, keyed by layer label.
+    volumes : dict
+        Volume (0-100) of each layer, keyed by layer label.
+    """
+    def __init__(self, listeners, volumes):
+        self.listeners = listeners
+        self.volumes = volumes
+
+    def __contains__(self, coord):
+        return any(listener.contains_pixel(*coord) for listener in self.listeners.values())
+
+    def __getitem__(self, coord):
+        x, y = int(coord[0]), int(coord[1])
+        compsig = None
+        for label, listener in self.listeners.items():
+            if not listener.contains_pixel(x, y):
+                continue
+            # TODO: is there a better way to combine sounds or normalize them?
+            # TODO: apply 1/N or 1/N**0.5 normalisation per layer for N layers?
+            sig = (listener.pixel_signal(x, y) * (int(self.volumes[label]) / 100)).astype(int)
+            compsig = sig if compsig is None else compsig + sig
+        if compsig is None:
+            raise KeyError(coord)
+        return compsig
+
+
 class SonifySpaxelWorker:
     """
-    A class with callable instances that perform fitting over a
-    spaxel. It provides the callable for the `Pool.apply_async`
-    function, and also holds everything necessary to perform the
-    fit over one spaxel.
-
-    Additionally, the callable computes the realization of the
-    model just fitted, over that same spaxel. We cannot do these
-    two steps (fit and compute) separately, since we cannot
-    modify parameter values in an already built CompoundModel
-    instance. We need to use the current model instance while
-    it still exists.
+    A class with callable instances that synthesize the audio buffers
+    for a set of spaxels. It provides the callable for the parallel
+    pool (see `~jdaviz.utils.parallelize_calculation`), and also holds
+    everything necessary to sonify those spaxels.
     """
     def __init__(self, flux_cube, spaxel_set, lo2hi, dur, srate, audfrqmin, audfrqmax,
                  eln, maxval, spectral_axis_index=2):
@@ -205,15 +296,12 @@ class SonifySpaxelWorker:
         self.spectral_axis_index = spectral_axis_index
 
     def __call__(self):
-        results = {'x': [], 'y': [], 'sig': []}
+        results = {'i': [], 'j': [], 'sig': []}
 
-        for spaxel in self.spaxel_set:
-            x = spaxel[0]
-            y = spaxel[1]
-            if self.spectral_axis_index in [2, -1]:
-                flux = self.cube[x, y, self.lo2hi]
-            elif self.spectral_axis_index == 0:
-                flux = self.cube[self.lo2hi, y, x]
+        for i, j in self.spaxel_set:
+            index = [i, j]
+            index.insert(self.spectral_axis_index, self.lo2hi)
+            flux = self.cube[tuple(index)]
 
             if flux.any():
                 sig = sonify_spectrum(flux, self.dur,
@@ -225,8 +313,8 @@ class SonifySpaxelWorker:
             else:
                 continue
 
-            results['x'].append(x)
-            results['y'].append(y)
+            results['i'].append(i)
+            results['j'].append(j)
             results['sig'].append(sig)
 
         return results
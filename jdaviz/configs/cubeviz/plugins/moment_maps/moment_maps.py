@@ -5,8 +5,8 @@ from astropy.nddata import CCDData
 from astropy.utils import minversion
 from astropy.wcs import WCS
 from traitlets import Bool, List, Unicode, observe
-from specutils import manipulation, analysis, Spectrum
 
+from jdaviz.core.cube_reduction import spectral_region_slice, tiled_moment
 from jdaviz.core.custom_traitlets import IntHandleEmpty, FloatHandleEmpty
 from jdaviz.core.events import SnackbarMessage, GlobalDisplayUnitChanged
 from jdaviz.core.registries import tray_registry
@@ -96,6 +96,8 @@ class MomentMap(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMix
             self.docs_link = f'https://jdaviz.readthedocs.io/en/{self.vdocs}/plugins/moment_maps.html'  # noqa
 
         self.moment = None
+        # number of threads used to compute the moment map (None: max cores minus one)
+        self.parallel_n_cpu = None
 
         self.continuum_dataset = DatasetSelect(self,
                                                'continuum_dataset_items',
@@ -291,10 +293,10 @@ class MomentMap(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMix
                                              use_display_units=True)
         # We need to convert the spectral region to the display units
 
-        if spec_reg is None:
-            slab = cube
-        else:
-            slab = manipulation.extract_region(cube, spec_reg)
+        # only the (1D) spectral axis is sliced here, the cube itself is reduced
+        # in spatial tiles by tiled_moment without copying the flux
+        spectral_selection = spectral_region_slice(cube.spectral_axis, spec_reg)
+        slab_sa = cube.spectral_axis[spectral_selection]
 
         # Calculate the moment and convert to CCDData to add to the viewers
         # Need transpose to align JWST mirror shape: This is because specutils
@@ -312,19 +314,17 @@ class MomentMap(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMix
                 raise ValueError("reference_wavelength must be set for output in velocity units.")
 
             ref_wavelength = self.reference_wavelength * u.Unit(self.dataset_spectral_unit)
-            slab_sa = slab.spectral_axis.to("km/s", doppler_convention="relativistic",
-                                            doppler_rest=ref_wavelength)
-            slab = Spectrum(slab.flux, slab_sa, uncertainty=slab.uncertainty,
-                            spectral_axis_index=cube.spectral_axis_index)
+            slab_sa = slab_sa.to("km/s", doppler_convention="relativistic",
+                                 doppler_rest=ref_wavelength)
         # Otherwise convert spectral axis to display units, have to do frequency <-> wavelength
         # before calculating
         else:
-            slab_sa = slab.spectral_axis.to(self._app._get_display_unit('spectral'))
-            slab = Spectrum(slab.flux, slab_sa, uncertainty=slab.uncertainty,
-                            spectral_axis_index=cube.spectral_axis_index)
+            slab_sa = slab_sa.to(self._app._get_display_unit('spectral'))
 
         # Finally actually calculate the moment
-        self.moment = analysis.moment(slab, order=n_moment)
+        self.moment = tiled_moment(cube, slab_sa, order=n_moment,
+                                   spectral_selection=spectral_selection,
+                                   n_cpu=self.parallel_n_cpu)
         # If n>1 and velocity is desired, need to take nth root of result
         if n_moment > 0 and self.output_unit_selected.lower() == "velocity":
             self.moment = np.power(self.moment, 1/self.n_moment)
@@ -0,0 +1,213 @@
+import threading
+
+import numpy as np
+
+from jdaviz.configs.default.plugins.export.frame_renderer import ViewerFrameRenderer
+
+__all__ = ['SlicePrefetcher']
+
+
+def _bounds_key(bounds):
+    return tuple(tuple(b) for b in bounds) if bounds is not None else None
+
+
+def _display_settings(composite):
+    # display settings (stretch, colormap, limits, ...) of the layers, without their arrays
+    return {uuid: {key: value for key, value in settings.items() if key != 'array'}
+            for uuid, settings in composite.layers.items()}
+
+
+class _PrefetchedArrayMaker:
+    """
+    Stand-in for the composite image of a viewer (the ``array_maker`` of its
+    ``FRBImage`` mark) while the slice player is running, which serves the
+    prefetched frames and falls back on the composite image otherwise.
+    """
+    def __init__(self, prefetcher, entry, array_maker):
+        self.prefetcher = prefetcher
+        self.entry = entry
+        self.array_maker = array_maker
+
+    def __call__(self, bounds=None):
+        frame = self.prefetcher._get(self.entry, bounds)
+        if frame is None:
+            return self.array_maker(bounds=bounds)
+        return frame
+
+
+class SlicePrefetcher:
+    """
+    Render the upcoming slices of image viewers in a background thread, for the
+    slice player.
+
+    While running, the composite image of each viewer (with the stretch,
+    colormap, contrast, ... of its layers already applied) is served from a
+    bounded cache of frames, rendered by `ViewerFrameRenderer` for the next
+    ``n_ahead`` slices in playback order.  Frames are rendered for the field of
+    view last displayed by each viewer, and are discarded when the field of view
+    or the display settings change, in which case the viewer renders the frame
+    itself.
+
+    Parameters
+    ----------
+    viewers : list
+        Image viewers with slice selection.
+    values : array-like
+        Slice values, in playback order.
+    n_ahead : int
+        Number of upcoming slices to render ahead of the displayed one.
+
+    Attributes
+    ----------
+    hits : int
+        Number of frames served from the cache.
+    misses : int
+        Number of frames rendered by the viewers themselves.
+    """
+    def __init__(self, viewers, values, n_ahead=8):
+        self.values = np.asarray(values, dtype=float)
+        self.n_ahead = n_ahead
+        self.hits = 0
+        self.misses = 0
+        self._position = 0
+        self._step = 1
+        self._frames = {}
+        self._rendering = None
+        self._running = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self._entries = []
+        for viewer in viewers:
+            image = getattr(viewer, '_composite_image', None)
+            if image is None:
+                continue
+            array_maker = image.array_maker
+            if isinstance(array_maker, _PrefetchedArrayMaker):
+                # left over from a player that has not stopped yet
+                array_maker = array_maker.array_maker
+            slice_values = np.asarray(viewer.slice_values, dtype=float)
+            if not len(slice_values):
+                continue
+            self._entries.append({'viewer': viewer, 'image': image, 'composite': array_maker,
+                                  'slice_values': slice_values, 'slices': {},
+                                  'renderer': None, 'settings': None, 'bounds': None})
+
+    def _slice(self, entry, position):
+        # slice index of the viewer for the slice value at this position
+        slices = entry['slices']
+        if position not in slices:
+            value = self.values[position % len(self.values)]
+            slices[position] = int(np.argmin(abs(entry['slice_values'] - value)))
+        return slices[position]
+
+    def _window(self, entry):
+        return {self._slice(entry, (self._position + k * self._step) % len(self.values))
+                for k in range(self.n_ahead + 1)}
+
+    def start(self, position=0):
+        """Serve the composite images of the viewers and start rendering ahead."""
+        self._position = position
+        self._running = True
+        for entry in self._entries:
+            entry['image'].array_maker = _PrefetchedArrayMaker(self, entry, entry['composite'])
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop rendering ahead and restore the composite images of the viewers."""
+        with self._condition:
+            self._running = False
+            self._frames.clear()
+            self._condition.notify_all()
+        for entry in self._entries:
+            maker = entry['image'].array_maker
+            if isinstance(maker, _PrefetchedArrayMaker) and maker.prefetcher is self:
+                entry['image'].array_maker = entry['composite']
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1)
+
+    def advance(self, position, step=1):
+        """
+        Set the position of the player (the index in ``values`` of the slice
+        about to be displayed) and the step between displayed slices, and
+        discard the frames that are no longer ahead.
+        """
+        with self._condition:
+            self._position = position
+            self._step = max(int(step), 1)
+            windows = {id(entry): self._window(entry) for entry in self._entries}
+            self._frames = {key: frame for key, frame in self._frames.items()
+                            if key[1] in windows[key[0]]}
+            self._condition.notify_all()
+
+    def _reset(self, entry, bounds):
+        # new field of view or display settings: frames are rendered again from now on
+        entry['bounds'] = bounds
+        entry['settings'] = _display_settings(entry['composite'])
+        try:
+            entry['renderer'] = ViewerFrameRenderer(entry['viewer'], overlays=False)
+        except ValueError:
+            entry['renderer'] = None
+        self._frames = {key: frame for key, frame in self._frames.items()
+                        if key[0] != id(entry)}
+        self._condition.notify_all()
+
+    def _get(self, entry, bounds):
+        bounds = _bounds_key(bounds)
+        key = (id(entry), entry['viewer'].slice, bounds)
+        with self._condition:
+            try:
+                unchanged = _display_settings(entry['composite']) == entry['settings']
+            except Exception:  # nosec  settings that cannot be compared are treated as changed
+                unchanged = False
+            if not self._running or bounds is None:
+                frame = None
+            elif entry['bounds'] != bounds or not unchanged:
+                self._reset(entry, bounds)
+                frame = None
+            else:
+                if self._rendering == key:
+                    # about to be ready, rather than rendered twice
+                    self._condition.wait_for(lambda: self._rendering != key, timeout=1)
+                frame = self._frames.get(key)
+            if frame is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return frame
+
+    def _next_task(self):
+        for k in range(1, self.n_ahead + 1):
+            position = (self._position + k * self._step) % len(self.values)
+            for entry in self._entries:
+                if entry['renderer'] is None:
+                    continue
+                key = (id(entry), self._slice(entry, position), entry['bounds'])
+                if key not in self._frames:
+                    return key, entry
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                task = self._next_task() if self._running else None
+                while self._running and task is None:
+                    self._condition.wait()
+                    task = self._next_task() if self._running else None
+                if not self._running:
+                    return
+                key, entry = task
+                renderer = entry['renderer']
+                self._rendering = key
+            try:
+                # glue only takes tuples as (min, max, n) bounds
+                frame = renderer.composite(key[1], bounds=list(key[2]))
+            except Exception:  # nosec  the viewer renders the frame itself
+                frame = None
+            with self._condition:
+                self._rendering = None
+                # unless the frame was discarded in the meantime
+                if (self._running and entry['renderer'] is renderer
+                        and key[1] in self._window(entry)):
+                    self._frames[key] = frame
+                self._condition.notify_all()
@@ -13,6 +13,7 @@ from jdaviz.configs.cubeviz.plugins.viewers import (
     CubevizImageView, CubevizProfileView
 )
 from jdaviz.configs.cubeviz.helper import _spectral_axis_names
+from jdaviz.configs.cubeviz.plugins.slice.prefetch import SlicePrefetcher
 from jdaviz.configs.rampviz.helper import _temporal_axis_names
 from jdaviz.configs.rampviz.plugins.viewers import RampvizImageView, RampvizProfileView
 from jdaviz.configs.specviz.plugins.viewers import Spectrum1DViewer
@@ -67,6 +68,7 @@ class BaseSlicePlugin(PluginTemplateMixin, ViewerSelectMixin):
 
     is_playing = Bool(False).tag(sync=True)
     play_interval = Int(200).tag(sync=True)  # milliseconds
+    _player_prefetch = 8  # number of slices rendered ahead while playing
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -84,6 +86,7 @@ class BaseSlicePlugin(PluginTemplateMixin, ViewerSelectMixin):
 
         self._indicator_initialized = False
         self._player = None
+        self._player_stats = {}
 
         # Subscribe to requests from the helper to change the slice across all viewers
         self.session.hub.subscribe(self, SliceSelectSliceMessage,
@@ -389,17 +392,33 @@ class BaseSlicePlugin(PluginTemplateMixin, ViewerSelectMixin):
         if not len(valid_values):
             self.is_playing = False
             return
-        while self.is_playing:
-            # recompute current_ind in case user has moved slider
-            # could optimize this by only recomputing after a select slice message
-            # (will only make a difference if argmin becomes approaches play_interval)
-            current_ind = np.argmin(abs(valid_values - self.value))
-            if len(valid_values) <= current_ind + 1:
-                # wrap
-                self.value = float(valid_values[0])
-            else:
-                self.value = float(valid_values[current_ind + 1])
-            time.sleep(ts)
+        current_ind = int(np.argmin(abs(valid_values - self.value)))
+        # upcoming slices are rendered in the background, with their stretch applied
+        prefetcher = SlicePrefetcher(self.slice_selection_viewers, valid_values,
+                                     n_ahead=self._player_prefetch)
+        prefetcher.start(current_ind)
+        self._player_stats = stats = {'frames': 0, 'dropped': 0, 'elapsed': 0.,
+                                      'prefetcher': prefetcher}
+        start = next_time = time.monotonic()
+        try:
+            while self.is_playing:
+                if self.value != valid_values[current_ind]:
+                    # the user has moved the slider
+                    current_ind = int(np.argmin(abs(valid_values - self.value)))
+                # frames that are already late are dropped rather than shown late,
+                # so that playback keeps to play_interval
+                late = int((time.monotonic() - next_time) / ts) if ts > 0 else 0
+                step = 1 + max(late, 0)
+                next_time += step * ts
+                current_ind = (current_ind + step) % len(valid_values)
+                prefetcher.advance(current_ind, step)
+                self.value = float(valid_values[current_ind])
+                stats['frames'] += 1
+                stats['dropped'] += step - 1
+                stats['elapsed'] = time.monotonic() - start
+                time.sleep(max(next_time - time.monotonic(), 0))
+        finally:
+            prefetcher.stop()
 
     def vue_play_start_stop(self, *args):
         if self.is_playing:  # Stop
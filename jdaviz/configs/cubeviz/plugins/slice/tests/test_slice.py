@@ -1,8 +1,18 @@
+import time
 import warnings
 
+import numpy as np
 import pytest
 
+from jdaviz.configs.cubeviz.plugins.slice import slice as slice_module
+from jdaviz.configs.cubeviz.plugins.slice.prefetch import SlicePrefetcher
 from jdaviz.configs.cubeviz.plugins.slice.slice import SpectralSlice
+from jdaviz.conftest import _create_spectrum1d_cube_with_fluxunit
+
+
+def _random_cube(shape):
+    cube = _create_spectrum1d_cube_with_fluxunit(shape=shape)
+    return cube._copy(flux=np.random.default_rng(42).random(shape) * cube.unit)
 
 
 def test_slice(cubeviz_helper, spectrum1d_cube):
@@ -133,3 +143,106 @@ def test_init_slice(cubeviz_helper, spectrum1d_cube):
     assert sl.value == slice_values[1]
     assert fv.slice == 1
     assert fv.state.slices == (1, 0, 0)
+
+
+def _wait_for(condition, timeout=5):
+    start = time.monotonic()
+    while not condition() and time.monotonic() - start < timeout:
+        time.sleep(0.01)
+
+
+def test_slice_prefetcher(cubeviz_helper):
+    cubeviz_helper.load_data(_random_cube((20, 30, 40)), data_label='test')
+    cubeviz_helper.plugins['Plot Options'].stretch_function = 'sqrt'
+    sl = cubeviz_helper.plugins['Spectral Slice']._obj
+    viewer = cubeviz_helper._app.get_viewer('flux-viewer')
+    # stand-in for a viewer displayed in the browser, which renders its composite image
+    viewer.shape = (30, 40)
+    image = viewer._composite_image
+    composite = image.array_maker
+    values = sl.valid_values_sorted
+
+    prefetcher = SlicePrefetcher(sl.slice_selection_viewers, values, n_ahead=3)
+    prefetcher.start(0)
+    sl.value = float(values[0])
+    assert prefetcher.hits == 0 and prefetcher.misses > 0
+    entry, = [entry for entry in prefetcher._entries if entry['viewer'] is viewer]
+    bounds = list(entry['bounds'])
+
+    def _check_prefetched(position):
+        _wait_for(lambda: len(prefetcher._frames) == 3)
+        assert len(prefetcher._frames) == 3
+        hits = prefetcher.hits
+        prefetcher.advance(position)
+        sl.value = float(values[position])
+        assert prefetcher.hits > hits
+        # same image as the viewer renders
+        np.testing.assert_allclose(image.image, composite(bounds=bounds), rtol=1e-6)
+
+    _check_prefetched(1)
+
+    # new display settings discard the frames, which are then rendered with them
+    misses = prefetcher.misses
+    cubeviz_helper.plugins['Plot Options'].stretch_function = 'log'
+    assert prefetcher.misses > misses
+    _check_prefetched(2)
+
+    prefetcher.stop()
+    assert image.array_maker is composite
+
+
+class _FakeClock:
+    """
+    Stand-in for the ``time`` module of the slice player, whose sleeps advance
+    the clock (and leave the prefetcher the time to render ahead) rather than
+    wait, and in which every ``slow_every`` frame takes ``delay`` longer to show.
+    """
+    def __init__(self, sl, duration, slow_every=5, delay=0.12):
+        self.sl = sl
+        self.duration = duration
+        self.slow_every = slow_every
+        self.delay = delay
+        self.now = 0.
+        self.n_frames = 0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.n_frames += 1
+        self.now += seconds
+        if self.n_frames % self.slow_every == 0:
+            self.now += self.delay
+        prefetcher = self.sl._player_stats['prefetcher']
+
+        def idle():
+            with prefetcher._condition:
+                return prefetcher._rendering is None and prefetcher._next_task() is None
+
+        _wait_for(idle)
+        if self.now >= self.duration:
+            self.sl.is_playing = False
+
+
+def test_slice_player_frame_rate(cubeviz_helper, monkeypatch):
+    cubeviz_helper.load_data(_random_cube((200, 300, 400)), data_label='test')
+    sl = cubeviz_helper.plugins['Spectral Slice']._obj
+    viewer = cubeviz_helper._app.get_viewer('flux-viewer')
+    viewer.shape = (300, 400)
+    composite = viewer._composite_image.array_maker
+
+    clock = _FakeClock(sl, duration=3)
+    monkeypatch.setattr(slice_module, 'time', clock)
+    sl.play_interval = 50
+    sl.is_playing = True
+    sl._player_worker()
+    assert viewer._composite_image.array_maker is composite
+
+    stats = sl._player_stats
+    prefetcher = stats['prefetcher']
+
+    # the requested rate is kept: frames that cannot be shown in time are dropped
+    assert stats['dropped'] > 0
+    assert stats['frames'] + stats['dropped'] == pytest.approx(stats['elapsed'] / 0.05 + 1,
+                                                               abs=1)
+    assert prefetcher.hits > 0
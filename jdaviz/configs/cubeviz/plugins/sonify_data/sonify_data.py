@@ -93,10 +93,13 @@ class SonifyData(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMi
         self.sonification_wl_ranges = None
         self.sonification_wl_unit = None
         self.stream = None
-        # Dictionary that contains keys with UUIDs for each
-        # sonified data layer. The value of each key is another dictionary containing
-        # coordinates as keys and arrays representing sounds as the value.
+        # Dictionary that contains keys with the label of each sonified data layer.
+        # The value of each key is the CubeListenerData holding the sounds for every pixel.
         self.data_lookup = {}
+        # Synthesize sounds only for the pixels visited by the cursor (keeping the
+        # most recent ``lazy_cache_size``) rather than for the entire cube up front.
+        self.lazy = False
+        self.lazy_cache_size = 4096
 
         self._update_label_default(None)
 
@@ -228,56 +231,47 @@ class SonifyData(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMi
             flux_slices[spectrum.spectral_axis_index] = wdx
             flux = flux[*flux_slices]
 
-        pc_cube = np.percentile(np.nan_to_num(flux), np.clip(pccut, 0, 99),
-                                axis=spectrum.spectral_axis_index)
+        # remove NaNs (a single copy of the cube which is then modified in place)
+        clipped_arr = np.nan_to_num(flux)
+        if use_pccut:
+            pc_cube = np.percentile(clipped_arr, np.clip(pccut, 0, 99),
+                                    axis=spectrum.spectral_axis_index, keepdims=True)
 
-        # clip zeros and remove NaNs
-        clipped_arr = np.nan_to_num(np.clip(flux, 0, np.inf), copy=False)
+        # clip zeros
+        np.clip(clipped_arr, 0, np.inf, out=clipped_arr)
 
         # make a rough white-light image from the clipped array
-        whitelight = np.expand_dims(clipped_arr.sum(spectrum.spectral_axis_index),
-                                    axis=spectrum.spectral_axis_index)
+        whitelight = clipped_arr.sum(spectrum.spectral_axis_index)
 
         if use_pccut:
             # subtract any percentile cut
-            clipped_arr -= np.expand_dims(pc_cube, axis=spectrum.spectral_axis_index)
+            clipped_arr -= pc_cube
 
             # and re-clip
-            clipped_arr = np.clip(clipped_arr, 0, np.inf)
+            np.clip(clipped_arr, 0, np.inf, out=clipped_arr)
+
+        np.power(clipped_arr, assidx, out=clipped_arr)
 
-        self.sonified_cube = CubeListenerData(clipped_arr ** assidx, wlens, duration=0.8,
+        self.sonified_cube = CubeListenerData(clipped_arr, wlens, duration=0.8,
                                               samplerate=sample_rate, buffsize=buffer_size,
                                               wl_unit=self.sonification_wl_unit,
                                               audfrqmin=audfrqmin, audfrqmax=audfrqmax,
                                               eln=eln, vol=self.volume,
-                                              spectral_axis_index=spectrum.spectral_axis_index)
+                                              spectral_axis_index=spectrum.spectral_axis_index,
+                                              lazy=self.lazy, cache_size=self.lazy_cache_size)
 
         self.sonified_cube.sonify_cube()
-        self.sonified_cube.sigcube = (
-                self.sonified_cube.sigcube * pow(whitelight / whitelight.max(),
-                                                 ssvidx)).astype('int16')
+        self.sonified_cube.set_spaxel_scale(pow(whitelight / whitelight.max(), ssvidx))
         self.stream = sd.OutputStream(samplerate=sample_rate, blocksize=buffer_size, device=device,
                                       channels=1, dtype='int16', latency='low',
                                       callback=self.sonified_cube.player_callback)
         self.sonified_cube.cbuff = True
 
-        spatial_inds = [0, 1, 2]
-        spatial_inds.remove(spectrum.spectral_axis_index)
-        x_size = self.sonified_cube.sigcube.shape[spatial_inds[0]]
-        y_size = self.sonified_cube.sigcube.shape[spatial_inds[1]]
-
-        # Create a new entry for the sonified layer in data_lookup. The value is a dictionary
-        # containing (x_size * y_size) keys with values being arrays that represent sounds
-        if spectrum.spectral_axis_index == 2:
-            self.data_lookup[results_label] = {(x, y): self.sonified_cube.sigcube[x, y, :]
-                                               for x in range(0, x_size)
-                                               for y in range(0, y_size)}
-        elif spectrum.spectral_axis_index == 0:
-            # This looks wrong but it's because in this case x_size is actually the y axis and vice
-            # versa, wasn't sure about the best way to handle the spatial_inds thing above.
-            self.data_lookup[results_label] = {(y, x): self.sonified_cube.sigcube[:, x, y]
-                                               for x in range(0, x_size)
-                                               for y in range(0, y_size)}
+        x_size, y_size = self.sonified_cube.spatial_shape
+
+        # Sounds for each pixel of the sonified layer are looked up from the
+        # CubeListenerData (one contiguous buffer per pixel, see pixel_signal)
+        self.data_lookup[results_label] = self.sonified_cube
 
         # Create a 2D array with coordinates starting at (0, 0) and going until (x_size, y_size)
         a = np.arange(1, x_size * y_size + 1).reshape((x_size, y_size))
@@ -1,11 +1,15 @@
 import os
 
 import astropy.units as u
-from numpy.testing import assert_allclose
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
 import pytest
 from specutils import SpectralRegion
 
 pytest.importorskip("strauss")
+
+from jdaviz.configs.cubeviz.plugins.cube_listener import (CubeListenerData,  # noqa: E402
+                                                          CombinedSonifiedGrid)
 IN_GITHUB_ACTIONS = os.environ.get("CI", "false") == "true"
 
 
@@ -63,3 +67,54 @@ def test_sonify_data_disabled(cubeviz_helper, spectrum1d_cube_larger):
     assert sonify_plg.disabled_msg
     with pytest.raises(ValueError, match='Unable to sonify cube'):
         sonify_plg.vue_sonify_cube()
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+def test_cube_listener_lazy(spectral_axis_index):
+    # synthesize to arrays only, no sound device needed
+    rng = np.random.default_rng(0)
+    shape = [3, 4]
+    shape.insert(spectral_axis_index, 30)
+    cube = rng.random(shape)
+    zero_spaxel = [0, 1]
+    zero_spaxel.insert(spectral_axis_index, slice(None))
+    cube[tuple(zero_spaxel)] = 0
+    wlens = np.linspace(1e-6, 2e-6, 30)
+    scale = rng.random((3, 4))
+
+    kw = dict(duration=0.1, spectral_axis_index=spectral_axis_index, n_cpu=1)
+    eager = CubeListenerData(cube, wlens, **kw)
+    eager.sonify_cube()
+    eager.set_spaxel_scale(scale)
+    assert eager.sigcube.shape == (3, 4, eager.siglen)
+    assert eager.sigcube.flags.c_contiguous
+    assert not eager.sigcube[0, 1].any()
+
+    lazy = CubeListenerData(cube, wlens, lazy=True, cache_size=2, **kw)
+    lazy.sonify_cube()
+    lazy.set_spaxel_scale(scale)
+    assert lazy.sigcube is None
+    for i in range(3):
+        for j in range(4):
+            sig = lazy.spaxel_signal(i, j)
+            assert sig.dtype == np.int16 and sig.shape == (lazy.siglen,)
+            # (strauss uses random phases, so the buffers are not identical to the eager ones)
+            assert sig.any() == eager.spaxel_signal(i, j).any()
+            assert len(lazy._sig_cache) <= 2
+    # recently visited spaxels are not synthesized again
+    assert lazy.spaxel_signal(2, 3) is lazy.spaxel_signal(2, 3)
+
+    # viewer pixels map to the spaxels (with x along the last spatial axis
+    # for cubes with the spectral axis first)
+    x, y = (3, 2) if spectral_axis_index == 0 else (2, 3)
+    assert lazy.contains_pixel(x, y)
+    assert not lazy.contains_pixel(y + 1, x + 1)
+    assert lazy.pixel_signal(x, y) is lazy.spaxel_signal(2, 3)
+
+    grid = CombinedSonifiedGrid({'a': eager, 'b': lazy}, {'a': 100, 'b': 50})
+    assert (x, y) in grid
+    assert_array_equal(grid[x, y],
+                       eager.spaxel_signal(2, 3).astype(int)
+                       + (lazy.spaxel_signal(2, 3) * 0.5).astype(int))
+    with pytest.raises(KeyError):
+        grid[10, 10]
@@ -7,7 +7,6 @@ from astropy.io import fits
 from astropy.nddata import NDDataArray, StdDevUncertainty
 from astropy.table import QTable
 from astropy.tests.helper import assert_quantity_allclose
-from astropy.utils.exceptions import AstropyUserWarning
 from glue.core.roi import CircularROI, RectangularROI
 from numpy.testing import assert_allclose, assert_array_equal
 from regions import (CirclePixelRegion, CircleAnnulusPixelRegion, EllipsePixelRegion,
@@ -74,10 +73,7 @@ def test_gauss_smooth_before_spec_extract(cubeviz_helper, spectrum1d_cube_with_u
     gs_plugin.mode_selected = 'Spatial'
     gs_plugin.stddev = 3
 
-    with pytest.warns(
-            AstropyUserWarning,
-            match='The following attributes were set on the data object, but will be ignored'):
-        gs_plugin.vue_apply()
+    gs_plugin.vue_apply()
 
     gs_data_label = cubeviz_helper._app.data_collection[3].label
     cubeviz_helper._app.add_data_to_viewer('flux-viewer', gs_data_label)
@@ -442,6 +438,62 @@ def test_autoupdate_results(cubeviz_helper, spectrum1d_cube_largest):
 #    assert new_med_flux > orig_med_flux
 
 
+def test_autoupdate_results_dependencies(cubeviz_helper, spectrum1d_cube_largest,
+                                         monkeypatch):
+    cubeviz_helper.load(spectrum1d_cube_largest)
+    app = cubeviz_helper._app
+    subset_plg = cubeviz_helper.plugins['Subset Tools']
+    subset_plg.import_region(CircularROI(xc=5, yc=5, radius=2))
+    subset_plg.import_region(CircularROI(xc=10, yc=10, radius=2), combination_mode='new')
+
+    extract_plg = cubeviz_helper.plugins['3D Spectral Extraction']
+    for aperture, label in (('Subset 1', 'extracted 1'), ('Subset 2', 'extracted 2')):
+        extract_plg.aperture = aperture
+        extract_plg.add_results.label = label
+        extract_plg.add_results._obj.auto_update_result = True
+        extract_plg.extract()
+
+    # live results (including those extracted automatically for each subset) by subset
+    live = {}
+    for data in app.data_collection:
+        plugin_inputs = data.meta.get('_update_live_plugin_results')
+        if plugin_inputs is not None:
+            live.setdefault(plugin_inputs['aperture'], []).append(data.label)
+    assert 'extracted 1' in live['Subset 1'] and 'extracted 2' in live['Subset 2']
+
+    # count the recomputations of each live result
+    recomputed = []
+    plugin_cls = type(extract_plg._obj)
+    orig_call = plugin_cls.__call__
+
+    def counted_call(self, *args, **kwargs):
+        recomputed.append(self.add_results.label)
+        return orig_call(self, *args, **kwargs)
+
+    monkeypatch.setattr(plugin_cls, '__call__', counted_call)
+
+    orig_sum = np.nansum(cubeviz_helper.get_data('extracted 1').flux.value)
+    subset_plg.import_region(CircularROI(xc=5, yc=5, radius=3), edit_subset='Subset 1',
+                             combination_mode='replace')
+    # only the results that depend on the edited subset are recomputed, once each
+    assert sorted(recomputed) == sorted(live['Subset 1'])
+    assert np.nansum(cubeviz_helper.get_data('extracted 1').flux.value) > orig_sum
+    plg = app._live_plugin_instances['extracted 1']
+
+    # rapid edits are coalesced into a single recomputation, with the same plugin instance
+    recomputed.clear()
+    with app._delay_live_plugin_results():
+        for radius in (1, 2, 3, 4):
+            subset_plg.import_region(CircularROI(xc=10, yc=10, radius=radius),
+                                     edit_subset='Subset 2', combination_mode='replace')
+        assert recomputed == []
+    assert sorted(recomputed) == sorted(live['Subset 2'])
+    subset_plg.import_region(CircularROI(xc=5, yc=5, radius=2), edit_subset='Subset 1',
+                             combination_mode='replace')
+    assert app._live_plugin_instances['extracted 1'] is plg
+    assert_allclose(np.nansum(cubeviz_helper.get_data('extracted 1').flux.value), orig_sum)
+
+
 def test_aperture_composite_detection(cubeviz_helper, spectrum1d_cube):
     cubeviz_helper.load(spectrum1d_cube)
     subset_plugin = cubeviz_helper.plugins['Subset Tools']
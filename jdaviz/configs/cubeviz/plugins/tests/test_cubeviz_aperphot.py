@@ -3,7 +3,6 @@ import pytest
 from astropy import units as u
 from astropy.table import Table
 from astropy.tests.helper import assert_quantity_allclose
-from astropy.utils.exceptions import AstropyUserWarning
 from numpy.testing import assert_allclose
 from regions import RectanglePixelRegion, PixCoord
 
@@ -127,8 +126,7 @@ def test_cubeviz_aperphot_generated_3d_gaussian_smooth(cubeviz_helper, image_cub
 
     gauss_plg = cubeviz_helper.plugins["Gaussian Smooth"]._obj
     gauss_plg.mode_selected = "Spatial"
-    with pytest.warns(AstropyUserWarning, match="The following attributes were set on the data"):
-        _ = gauss_plg.smooth()
+    _ = gauss_plg.smooth()
 
     # Need this to make it available for photometry data drop-down.
     cubeviz_helper._app.add_data_to_viewer("uncert-viewer", "test[FLUX] spatial-smooth stddev-1.0")
@@ -158,6 +156,60 @@ def test_cubeviz_aperphot_generated_3d_gaussian_smooth(cubeviz_helper, image_cub
     assert_quantity_allclose(row["slice_wave"], 4.894499866699333 * u.um)
 
 
+def test_cubeviz_aperphot_spectral_photometry(cubeviz_helper, image_cube_hdu_obj_microns):
+    cubeviz_helper.load_data(image_cube_hdu_obj_microns, data_label="test")
+    flux_unit = u.Unit("1E-17 erg*s^-1*cm^-2*Angstrom^-1*pix^-2")
+
+    # aperture covers the ramp exactly, background is inside the ramp
+    aper = RectanglePixelRegion(center=PixCoord(x=1, y=2), width=3, height=5)
+    bg = RectanglePixelRegion(center=PixCoord(x=1, y=1), width=1, height=1)
+    cubeviz_helper.plugins['Subset Tools'].import_region([aper, bg], combination_mode='new')
+
+    plg = cubeviz_helper.plugins["Aperture Photometry"]
+    plg.dataset.selected = "test[FLUX]"
+    plg.aperture.selected = "Subset 1"
+    plg.background.selected = "Manual"
+    plg.background_value = 0
+
+    sp = plg.calculate_spectral_photometry(chunk_size=3)
+    assert len(sp.spectral_axis) == 8
+    assert_quantity_allclose(sp.spectral_axis[0], 4.8904998665093435 * u.um)
+    # 3 (w) x 5 (h) x (i + 1) (v)
+    assert_allclose(sp.flux, 15 * np.arange(1, 9) * flux_unit * PIX2)
+    assert_allclose(sp.meta['sum_aper_area'], 15 * PIX2)
+
+    # matches the single-slice result for the current slice
+    row, _ = plg.calculate_photometry(add_to_table=False, update_plots=False)
+    assert_allclose(sp.flux[plg._obj._cube_slice_ind], row['sum'][0])
+
+    # background is computed independently for each slice
+    sp, cog = plg.calculate_spectral_photometry(background="Subset 2", slice_range=(2, 5),
+                                                curve_of_growth=True)
+    assert_allclose(sp.meta['background'], np.arange(3, 6) * flux_unit)
+    assert_allclose(sp.flux.value, 0)
+    assert cog['sum'].shape == (3, 10)
+    assert_quantity_allclose(cog['slice_wave'], sp.spectral_axis)
+    assert_allclose(cog.meta['radius'][-1], 2.5 * u.pix)
+
+    sp = plg.calculate_spectral_photometry(slice_range=(4.8925 * u.um, 4.8945 * u.um))
+    assert_quantity_allclose(sp.spectral_axis, [4.8925, 4.8935, 4.8945] * u.um)
+
+    with pytest.raises(ValueError, match="does not include any slices"):
+        plg.calculate_spectral_photometry(slice_range=(1 * u.um, 2 * u.um))
+
+    # a manual background set in display units is converted at the wavelength of each slice
+    cubeviz_helper.plugins['Unit Conversion'].flux_unit = 'Jy'
+    display_unit = u.Unit(plg._obj.display_unit)
+    plg.background_value = 1e-5
+    sp_bg = plg.calculate_spectral_photometry()
+    plg.background_value = 0
+    sp = plg.calculate_spectral_photometry()
+    assert display_unit == u.Jy / PIX2
+    bg = (1e-5 * u.Jy).to(flux_unit * PIX2, u.spectral_density(sp_bg.spectral_axis)) / PIX2
+    assert len(np.unique(bg.value)) == 8
+    assert_quantity_allclose(sp_bg.flux, sp.flux - 15 * PIX2 * bg)
+
+
 @pytest.mark.parametrize("cube_unit", [u.MJy / u.sr, u.MJy, u.MJy / PIX2])
 def test_cubeviz_aperphot_cube_sr_and_pix2(cubeviz_helper,
                                            spectrum1d_cube_custom_fluxunit,
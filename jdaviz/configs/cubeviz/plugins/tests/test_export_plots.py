@@ -1,8 +1,17 @@
 import os
 
+import numpy as np
 import pytest
+from regions import CirclePixelRegion, PixCoord
 
 from jdaviz.configs.default.plugins.export.export import HAS_OPENCV
+from jdaviz.configs.default.plugins.export.frame_renderer import ViewerFrameRenderer
+from jdaviz.conftest import _create_spectrum1d_cube_with_fluxunit
+
+
+def _random_cube(shape):
+    cube = _create_spectrum1d_cube_with_fluxunit(shape=shape)
+    return cube._copy(flux=np.random.default_rng(42).random(shape) * cube.unit)
 
 
 # TODO: Remove skip when https://github.com/bqplot/bqplot/pull/1397/files#r726500097 is resolved.
@@ -85,6 +94,59 @@ def test_export_movie_cubeviz_empty(cubeviz_helper):
         plugin.export()
 
 
+def test_frame_renderer_matches_viewer(cubeviz_helper):
+    cubeviz_helper.load_data(_random_cube((10, 30, 40)), data_label="test")
+    viewer = cubeviz_helper.default_viewer._obj.glue_viewer
+    cubeviz_helper.plugins['Plot Options'].stretch_function = 'sqrt'
+    cubeviz_helper.plugins['Plot Options'].image_colormap = 'Viridis'
+
+    renderer = ViewerFrameRenderer(viewer, overlays=False)
+    assert renderer.n_slices == 10
+    slice_index = viewer.state.slices[renderer.slice_axis]
+    frame = renderer.render(slice_index)
+    assert frame.shape == (30, 40, 3)
+    assert frame.dtype == np.uint8
+    expected = viewer._composite(bounds=renderer.bounds)[::-1, :, :3]
+    np.testing.assert_array_equal(frame, np.round(expected * 255))
+
+    # frames are rendered from the data, independent of the displayed slice
+    frames = list(renderer.iter_frames(range(10), n_cpu=2, batch_size=3))
+    assert len(frames) == 10
+    np.testing.assert_array_equal(frames[slice_index], frame)
+    assert not np.array_equal(frames[0], frames[1])
+
+    # spatial subsets are drawn on top of the image
+    cubeviz_helper.plugins['Subset Tools'].import_region(CirclePixelRegion(PixCoord(10, 12), 3))
+    frame = ViewerFrameRenderer(viewer).render(slice_index)
+    row = 30 - 1 - 12
+    assert not np.array_equal(frame[row, 10], frames[slice_index][row, 10])
+    np.testing.assert_array_equal(frame[row, 30], frames[slice_index][row, 30])
+
+
+@pytest.mark.skipif(not HAS_OPENCV, reason="opencv-python is not installed")
+def test_export_movie_headless(cubeviz_helper, tmp_path):
+    import cv2
+
+    cubeviz_helper.load_data(_random_cube((100, 60, 80)), data_label="test")
+    viewer = cubeviz_helper.default_viewer._obj.glue_viewer
+    assert viewer.shape is None  # never displayed
+    plugin = cubeviz_helper.plugins["Export"]._obj
+    filename = str(tmp_path / "mymovie.mp4")
+
+    plugin.save_movie(viewer, filename, 'mp4', i_start=0, i_end=99, fps=10,
+                      width='160px', height='120px', render_in_browser=False)
+    plugin._movie_thread.join()
+
+    assert not plugin.movie_recording
+    video = cv2.VideoCapture(filename)
+    try:
+        assert int(video.get(cv2.CAP_PROP_FRAME_COUNT)) == 100
+        assert int(video.get(cv2.CAP_PROP_FRAME_WIDTH)) == 160
+        assert int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)) == 120
+    finally:
+        video.release()
+
+
 def test_export_plot_exceptions(cubeviz_helper, spectrum1d_cube):
     cubeviz_helper.load_data(spectrum1d_cube, data_label="test")
     plugin = cubeviz_helper.plugins["Export"]
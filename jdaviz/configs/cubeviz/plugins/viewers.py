@@ -9,7 +9,7 @@ from jdaviz.configs.cubeviz.plugins.mixins import WithSliceIndicator, WithSliceS
 from jdaviz.configs.default.plugins.viewers import JdavizViewerMixin
 from jdaviz.configs.specviz.plugins.viewers import Spectrum1DViewer
 from jdaviz.core.freezable_state import FreezableBqplotImageViewerState
-from jdaviz.configs.cubeviz.plugins.cube_listener import MINVOL
+from jdaviz.configs.cubeviz.plugins.cube_listener import CombinedSonifiedGrid, MINVOL
 from jdaviz.core.sonified_layers import (SonifiedDataLayerArtist,
                                          SonifiedLayerStateWidget,
                                          SonifiedLayerState)
@@ -110,23 +110,12 @@ class CubevizImageView(JdavizViewerMixin, WithSliceSelection, BqplotImageView):
 
     @cached_property
     def combined_sonified_grid(self):
-
-        compiled_coords = {}
-        for k, v in self._sonify_plugin.data_lookup.items():
-            if k not in self.sonified_layers_enabled:
-                continue
-            # Each (x, y) coordinate corresponds to a different sound for each layer.
-            # These sounds can be combined together and played by setting cbuff to True.
-            # TODO: is there a better way to combine sounds or normalize them?
-            # TODO: apply 1/N or 1/N**0.5 normalisation per layer for N layers?
-            for coord, sound_array in v.items():
-                if coord in compiled_coords:
-                    compiled_coords[coord] += ((sound_array * (int(self.layer_volume[k]) / 100)).
-                                               astype(int))
-                else:
-                    compiled_coords[coord] = ((sound_array * (int(self.layer_volume[k]) / 100)).
-                                              astype(int))
-        return compiled_coords
+        # Each (x, y) coordinate corresponds to a different sound for each layer, which
+        # are combined (for the pixel under the cursor only) and played by setting cbuff
+        # to True.
+        listeners = {k: v for k, v in self._sonify_plugin.data_lookup.items()
+                     if k in self.sonified_layers_enabled}
+        return CombinedSonifiedGrid(listeners, dict(self.layer_volume))
 
     def recalculate_combined_sonified_grid(self, event=None):
         self.layer_volume = {}
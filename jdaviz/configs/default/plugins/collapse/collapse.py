@@ -4,9 +4,10 @@ from astropy.nddata import CCDData
 from astropy.wcs import WCS
 from glue.core import Data
 from gwcs import WCS as GWCS
-from specutils.manipulation import spectral_slab
+from specutils import SpectralRegion
 from traitlets import List, Unicode, observe
 
+from jdaviz.core.cube_reduction import spectral_region_slice, tiled_collapse
 from jdaviz.core.events import SnackbarMessage
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
@@ -51,6 +52,8 @@ class Collapse(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMixi
         self._label_counter = 0
 
         self.collapsed_flux = None
+        # number of threads used to collapse the cube (None: max cores minus one)
+        self.parallel_n_cpu = None
 
         self.function = SelectPluginComponent(self,
                                               items='function_items',
@@ -117,10 +120,13 @@ class Collapse(PluginTemplateMixin, DatasetSelectMixin, SpectralSubsetSelectMixi
 
         with warnings.catch_warnings():
             warnings.filterwarnings('ignore', message='No observer defined on WCS')
-            spec = spectral_slab(cube, spec_min, spec_max)
-            # Spatial-spatial image only.
-            collapsed_flux = spec.collapse(self.function_selected.lower(),
-                                           axis=cube.spectral_axis_index)  # Quantity
+            spectral_selection = spectral_region_slice(cube.spectral_axis,
+                                                       SpectralRegion(spec_min, spec_max))
+            # Spatial-spatial image only, reduced in spatial tiles so that the (possibly
+            # memory-mapped) cube is never copied in full.
+            collapsed_flux = tiled_collapse(cube, self.function_selected,
+                                            spectral_selection=spectral_selection,
+                                            n_cpu=self.parallel_n_cpu)  # Quantity
 
             # stuff for exporting to file
             self.collapsed_flux = CCDData(collapsed_flux, wcs=data_wcs)
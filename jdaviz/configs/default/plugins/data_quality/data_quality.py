@@ -3,6 +3,7 @@ import os
 from traitlets import Any, Dict, Bool, List, Unicode, Float, observe
 
 import numpy as np
+from glue.core.message import DataCollectionDeleteMessage
 from glue_jupyter.common.toolbar_vuetify import read_icon
 from echo import delay_callback
 from matplotlib.colors import hex2color
@@ -14,7 +15,7 @@ from jdaviz.core.template_mixin import (
 from jdaviz.core.tools import ICON_DIR
 from jdaviz.core.user_api import PluginUserApi
 from jdaviz.configs.default.plugins.data_quality.dq_utils import (
-    decode_flags, generate_listed_colormap, dq_flag_map_paths, load_flag_map
+    DQFlagIndex, decode_flags, generate_listed_colormap, dq_flag_map_paths, load_flag_map
 )
 
 
@@ -85,6 +86,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
 
         self.icons = {k: v for k, v in self._app.state.icons.items()}
 
+        # DQFlagIndex per DQ data label, rebuilt if the underlying array changes
+        self._flag_indices = {}
+
         self.science_layer = LayerSelect(
             self, 'science_layer_items', 'science_layer_selected',
             'viewer_selected', 'science_layer_multiselect',
@@ -98,6 +102,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
         )
         self.dq_layer.add_filter('is_dq_layer')
 
+        self.hub.subscribe(self, DataCollectionDeleteMessage,
+                           handler=self._on_data_removed)
+
         self.load_default_flag_maps()
         self.init_decoding()
         self._set_irrelevant()
@@ -106,6 +113,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
         if self.config == 'deconfigged':
             self.observe_traitlets_for_relevancy(traitlets_to_observe=['dq_layer_items'])
 
+    def _on_data_removed(self, msg):
+        self._flag_indices.pop(msg.data.label, None)
+
     def _update_available_viewers(self):
         if not hasattr(self, 'viewer'):
             return
@@ -168,14 +178,31 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
         return selected_dq
 
     @property
-    def unique_flags(self):
+    def flag_index(self):
+        """
+        Cached `~jdaviz.configs.default.plugins.data_quality.dq_utils.DQFlagIndex`
+        of the full array of the selected DQ layer (or `None`).
+        """
         selected_dq = self.dq_layer_selected_flattened
         if selected_dq is None or not len(selected_dq):
-            return []
+            return None
 
-        dq = selected_dq[0].get_image_data()
+        dq_layer = selected_dq[0]
+        dq = dq_layer.layer.get_data(dq_layer.state.attribute)
+        flag_index = self._flag_indices.get(dq_layer.layer.label)
+        if flag_index is None or flag_index.dq is not dq:
+            flag_index = DQFlagIndex(dq)
+            self._flag_indices[dq_layer.layer.label] = flag_index
+        return flag_index
 
-        return np.unique(dq[~np.isnan(dq)])
+    @property
+    def unique_flags(self):
+        flag_index = self.flag_index
+        if flag_index is None:
+            return []
+
+        # zero marks unflagged pixels (DQ arrays are not converted to float with NaNs)
+        return flag_index.unique_flags
 
     @property
     def validate_flag_decode_possible(self):
@@ -241,7 +268,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
 
             with delay_callback(dq_layer.state, 'alpha', 'cmap', 'v_min', 'v_max', 'cmap_bad'):
                 if len(flag_bits):
-                    dq_layer.state.v_min = min(flag_bits)
+                    # same as LookupStretch.flag_min, but the stretch of the layer
+                    # may not have been set to 'lookup' yet:
+                    dq_layer.state.v_min = min(0, min(flag_bits))
                     dq_layer.state.v_max = max(flag_bits)
 
                 dq_layer.state.alpha = self.dq_layer_opacity
@@ -302,6 +331,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
         flag_bits = np.array([flag['flag'] for flag in self.decoded_flags])
         rgb_colors = [hex2color(flag['color']) for flag in self.decoded_flags]
 
+        # bits in `flags_filter`, to check each flag against with a single bitwise and:
+        filter_bitmask = sum(1 << int(bit) for bit in self.flags_filter)
+
         hidden_flags = np.array([
             flag['flag'] for flag in self.decoded_flags
 
@@ -309,13 +341,7 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
             if not flag['show'] or
 
             # hide the flag if `flags_filter` has entries but not this one:
-            (
-                len(self.flags_filter) and
-                not np.isin(
-                    list(map(int, flag['decomposed'].keys())),
-                    list(self.flags_filter)
-                ).any()
-            )
+            (filter_bitmask and not int(flag['flag']) & filter_bitmask)
         ])
 
         for dq_layer in dq_layers:
@@ -339,7 +365,9 @@ class DataQuality(PluginTemplateMixin, ViewerSelectMixin):
                 dq_layer.update()
 
                 if len(flag_bits):
-                    dq_layer.state.v_min = min(flag_bits)
+                    # same as LookupStretch.flag_min, but the stretch of the layer
+                    # may not have been set to 'lookup' yet:
+                    dq_layer.state.v_min = min(0, min(flag_bits))
                     dq_layer.state.v_max = max(flag_bits)
 
                 dq_layer.state.alpha = self.dq_layer_opacity
@@ -1,3 +1,4 @@
+from functools import cached_property
 from importlib import resources
 from pathlib import Path
 
@@ -28,6 +29,8 @@ class LookupStretch:
     ----------
     flags : array-like
         DQ flags.
+    hidden_flags : array-like
+        DQ flags which are not displayed.
     """
 
     def __init__(self, flags=None, hidden_flags=None):
@@ -38,27 +41,72 @@ class LookupStretch:
         if hidden_flags is None:
             hidden_flags = []
 
-        self.flags = np.asarray(flags)
-        self.hidden_flags = np.asarray(hidden_flags).astype(int)
+        self.flags = flags
+        self.hidden_flags = hidden_flags
+
+    @property
+    def flags(self):
+        return self._flags
+
+    @flags.setter
+    def flags(self, flags):
+        self._flags = np.asarray(flags)
+        self._lookup = None
+
+    @property
+    def hidden_flags(self):
+        return self._hidden_flags
+
+    @hidden_flags.setter
+    def hidden_flags(self, hidden_flags):
+        self._hidden_flags = np.asarray(hidden_flags).astype(int)
+        self._lookup = None
+
+    @property
+    def flag_min(self):
+        # the interval starts at zero (unless there are negative flags) so that
+        # unflagged pixels (zero) are not clipped onto the smallest flag:
+        return min(0, np.min(self.flags))
 
     @property
     def flag_range(self):
-        return np.max(self.flags) - np.min(self.flags)
+        return np.max(self.flags) - self.flag_min
 
     @property
     def scaled_flags(self):
         # renormalize the flags on range (0, 1):
-        return (self.flags - np.min(self.flags)) / self.flag_range
+        return (self.flags - self.flag_min) / self.flag_range
+
+    @property
+    def lookup(self):
+        """
+        Sorted flags, their indices in ``flags``, and whether each is hidden.
+        Cached until ``flags`` or ``hidden_flags`` are reassigned.
+        """
+        if self._lookup is None:
+            order = np.argsort(self.flags, kind='stable')
+            sorted_flags = self.flags[order]
+            is_hidden = np.isin(sorted_flags.astype(int), self.hidden_flags)
+            self._lookup = (sorted_flags, order, is_hidden)
+        return self._lookup
+
+    def _nearest_sorted_index(self, values):
+        # index of the closest entry in the sorted flags for each of `values`
+        # (in flag units), by binary search rather than a broadcast argmin:
+        sorted_flags = self.lookup[0]
+        if len(sorted_flags) == 1:
+            return np.zeros(np.shape(values), dtype=int)
+        right = np.clip(np.searchsorted(sorted_flags, values), 1, len(sorted_flags) - 1)
+        left = right - 1
+        # ties go to the smaller flag, as np.argmin would:
+        use_left = np.abs(values - sorted_flags[left]) <= np.abs(sorted_flags[right] - values)
+        return np.where(use_left, left, right)
 
     def dq_array_to_flag_index(self, values):
-        # Find the index of the closest entry in `scaled_flags`
-        # for each of `values` using array broadcasting:
-        return np.argmin(
-            np.abs(
-                np.nan_to_num(values, nan=-10).flatten()[None, :] -
-                self.scaled_flags[:, None]
-            ), axis=0
-        ).reshape(values.shape)
+        # Find the index of the closest entry in `flags`
+        # for each of the normalized `values`:
+        denormed = np.nan_to_num(values, nan=-10) * self.flag_range + self.flag_min
+        return self.lookup[1][self._nearest_sorted_index(denormed)]
 
     def __call__(self, values, out=None, clip=False):
         # For our uses, we can ignore `out` and `clip`, but those would need
@@ -72,26 +120,57 @@ class LookupStretch:
         # astropy.visualization.ManualInterval and normalized on (0, 1)
         # before they arrive here. First, remove that interval and get
         # back the integer values:
-        values_integer = np.round(values * self.flag_range + np.min(self.flags))
+        is_nan = np.isnan(values)
+        denormed = np.where(is_nan, -10, values) * self.flag_range + self.flag_min
+        values_integer = np.round(denormed)
+
+        sorted_flags, order, is_hidden = self.lookup
+        nearest = self._nearest_sorted_index(denormed)
 
         # normalize by the number of flags, onto interval (0, 1):
-        renormed = self.dq_array_to_flag_index(values) / len(self.flags)
+        renormed = np.asarray(order[nearest] / len(self.flags), dtype=float)
+
+        # hide values matching one of the hidden flags:
+        value_is_hidden = is_hidden[nearest] & (sorted_flags[nearest] == values_integer)
 
-        if len(self.hidden_flags):
-            # mask that is True for `values` in the hidden flags list:
-            value_is_hidden = np.isin(
-                np.nan_to_num(values_integer, nan=-10).astype(int),
-                self.hidden_flags.astype(int)
-            )
-        else:
-            value_is_hidden = False
+        if 0 not in self.flags:
+            # DQ arrays are stored in their native integer dtype, so unflagged
+            # pixels (zero) are mapped to NaN here rather than in the data:
+            value_is_hidden |= values_integer == 0
 
         # preserve NaNs in values, and make hidden flags NaNs:
-        return np.where(
-            np.isnan(values) | value_is_hidden,
-            np.nan,
-            renormed
-        )
+        renormed[is_nan | value_is_hidden] = np.nan
+        return renormed
+
+
+class DQFlagIndex:
+    """
+    Lazily computed index of the flags present in a DQ array.
+
+    The unique flags are computed with a single pass over the array on first
+    access.  Zero (and NaN, for legacy float DQ arrays) marks unflagged pixels.
+
+    Parameters
+    ----------
+    dq : array-like
+        DQ array.
+    """
+
+    def __init__(self, dq):
+        self.dq = dq
+
+    def _integer_dq(self):
+        dq = np.asarray(self.dq)
+        if dq.dtype.kind == 'f':
+            # legacy float DQ arrays with NaN for unflagged pixels
+            dq = np.nan_to_num(dq, nan=0).astype(np.int64)
+        return dq
+
+    @cached_property
+    def unique_flags(self):
+        """Unique (nonzero) flags, sorted."""
+        flags = np.unique(self._integer_dq()).astype(np.int64)
+        return flags[flags != 0]
 
 
 if "lookup" not in stretches:
@@ -227,13 +306,7 @@ def decompose_bit(bit):
         Powers of two which sum to ``bit``.
     """
     bit = int(bit)
-    powers = []
-    i = 1
-    while i <= bit:
-        if i & bit:
-            powers.append(int(np.log2(i)))
-        i <<= 1
-    return sorted(powers)
+    return [i for i in range(bit.bit_length()) if (bit >> i) & 1]
 
 
 def decode_flags(flag_map, unique_flags, rgba_colors):
@@ -9,7 +9,7 @@ from glue.core.subset import RectangularROI
 
 from jdaviz.configs.imviz.plugins.parsers import HAS_ROMAN_DATAMODELS
 from jdaviz.configs.default.plugins.data_quality.dq_utils import (
-    load_flag_map, write_flag_map
+    DQFlagIndex, LookupStretch, load_flag_map, write_flag_map
 )
 from jdaviz.utils import cached_uri
 
@@ -79,6 +79,45 @@ def test_roman_against_rdm():
         assert flag_map_loaded[flag]['name'] == flag_map_expected[flag]['name']
 
 
+@pytest.mark.parametrize('dtype', [np.uint32, np.float32])
+def test_dq_flag_index(dtype):
+    dq = np.array([[0, 1, 5],
+                   [4, 5, 0]], dtype=dtype)
+    flag_index = DQFlagIndex(dq)
+
+    np.testing.assert_array_equal(flag_index.unique_flags, [1, 4, 5])
+    # computed once:
+    assert flag_index.unique_flags is flag_index.unique_flags
+
+
+def test_lookup_stretch_unflagged_pixels():
+    stretch = LookupStretch(flags=[1, 4, 5])
+
+    # values as normalized by the (v_min, v_max) = (0, 5) interval
+    values = (np.array([0, 1, 4, 5, np.nan]) - stretch.flag_min) / stretch.flag_range
+    result = stretch(values)
+
+    # unflagged (zero) and NaN pixels are transparent, flags map to their index
+    assert np.all(np.isnan(result[[0, 4]]))
+    np.testing.assert_allclose(result[1:4], [0, 1 / 3, 2 / 3])
+
+
+def test_lookup_stretch_full_frame():
+    # full-frame JWST-like DQ array with ~30 unique flags, a third of which are hidden:
+    rng = np.random.default_rng(42)
+    flags = np.unique(rng.integers(1, 2**30, size=30))
+    dq = rng.choice(np.concatenate([[0], flags]), size=(2048, 2048))
+    stretch = LookupStretch(flags=flags, hidden_flags=flags[::3])
+    values = (dq - stretch.flag_min) / stretch.flag_range
+
+    result = stretch(values)
+
+    # compare against the exact flag lookup:
+    flag_index = np.searchsorted(flags, dq).clip(0, len(flags) - 1)
+    expected = np.where((dq == 0) | np.isin(dq, flags[::3]), np.nan, flag_index / len(flags))
+    np.testing.assert_array_equal(result, expected)
+
+
 @pytest.mark.parametrize('helper_name', ['imviz_helper', 'deconfigged_helper'])
 def test_dq_display_without_telescop_metadata(helper_name, request, multi_extension_image_hdu_wcs):
     """
@@ -101,6 +140,10 @@ def test_dq_display_without_telescop_metadata(helper_name, request, multi_extens
     # The flag values from the fixture
     assert decoded_flag_values == [1, 4, 5]
 
+    # the flag index is computed once per DQ layer
+    assert dq_plugin.flag_index is dq_plugin.flag_index
+    np.testing.assert_array_equal(dq_plugin.flag_index.unique_flags, [1, 4, 5])
+
     # DQ layer must have the lookup stretch and transparent bad pixels
     viewer_name = 'Image' if helper_name == 'deconfigged_helper' else 'imviz-0'
     viewer = helper._app.get_viewer(viewer_name)
@@ -112,8 +155,14 @@ def test_dq_display_without_telescop_metadata(helper_name, request, multi_extens
     assert dq_layer.state.cmap_bad == (0, 0, 0, 0)
     assert dq_layer.state.alpha == dq_plugin.dq_layer_opacity
 
-    # v_min/v_max should span the actual flag range
-    assert dq_layer.state.v_min, dq_layer.state.v_max == (1, 5)
+    # v_min/v_max should span the actual flag range, starting from zero (unflagged)
+    assert (dq_layer.state.v_min, dq_layer.state.v_max) == (0, 5)
+
+    # the flag index is dropped along with the DQ data
+    dq_label = dq_layer.layer.label
+    assert dq_label in dq_plugin._flag_indices
+    helper._app.data_collection.remove(helper._app.data_collection[dq_label])
+    assert dq_label not in dq_plugin._flag_indices
 
 
 @pytest.mark.remote_data
@@ -197,7 +246,7 @@ def test_data_quality_plugin(helper_name, request):
     label_mouseover._viewer_mouse_event(viewer,
                                         {'event': 'mousemove', 'domain': {'x': 1361, 'y': 684}})
     dq_val = dq_data[684, 1361]
-    assert np.isnan(dq_val)
+    assert dq_val == 0
     label_mouseover_text = label_mouseover.as_text()[0]
     assert 'DQ' not in label_mouseover_text
 
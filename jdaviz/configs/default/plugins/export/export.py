@@ -22,6 +22,7 @@ from jdaviz.core.template_mixin import (PluginTemplateMixin, SelectPluginCompone
 from jdaviz.core.events import AddDataMessage, SnackbarMessage
 from jdaviz.core.user_api import PluginUserApi
 from jdaviz.core.region_translators import region2stcs_string
+from jdaviz.configs.default.plugins.export.frame_renderer import ViewerFrameRenderer
 
 try:
     import cv2
@@ -130,6 +131,10 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
         # description displayed under plugin title in tray
         self._plugin_description = 'Export data/plots and other outputs to a file.'
 
+        # threads used to render movie frames on the server (None: max cores minus one)
+        self.parallel_n_cpu = None
+        self._movie_thread = None
+
         if self.config == 'deconfigged':
             self.docs_link = f'https://jdaviz.readthedocs.io/en/{self.vdocs}/export/index.html'
 
@@ -775,16 +780,58 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
                 os.remove(filename)
             self.movie_interrupt = False
 
+    @with_spinner('movie_recording')
+    def _render_movie(self, viewer, i_start, i_end, fps, filename, width, height):
+        # Frames are rendered from the data on the server (see ViewerFrameRenderer) and
+        # streamed to the video writer, without any round-trip to the frontend.
+        if not self.movie_enabled:
+            if not HAS_OPENCV:
+                raise ImportError("Please install opencv-python")
+            raise ValueError("movie support disabled")
+
+        video = None
+        try:
+            if width is not None and height is not None:
+                shape = (int(str(height).rstrip('px')), int(str(width).rstrip('px')))
+            else:
+                shape = viewer.shape
+            renderer = ViewerFrameRenderer(viewer, shape=shape)
+            frame_size = (renderer.shape[1], renderer.shape[0])
+            video = cv2.VideoWriter(str(filename), cv2.VideoWriter_fourcc(*'mp4v'), fps, frame_size, True)  # noqa: E501
+            for frame in renderer.iter_frames(range(i_start, i_end + 1),
+                                              n_cpu=self.parallel_n_cpu):
+                if self.movie_interrupt:
+                    break
+                video.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        except Exception as e:
+            self.hub.broadcast(SnackbarMessage(
+                f"Error saving {filename}: {e!r}", sender=self, color="error", traceback=e))
+        finally:
+            if video:
+                video.release()
+
+        if self.movie_interrupt:
+            if os.path.exists(filename):
+                os.remove(filename)
+            self.movie_interrupt = False
+
     def save_movie(self, viewer, filename, filetype, i_start=None, i_end=None, fps=None,
-                   rm_temp_files=True, width=None, height=None):
+                   rm_temp_files=True, width=None, height=None, render_in_browser=True):
         """Save selected slices as a movie.
 
-        This method creates a PNG file per frame (``._cubeviz_movie_frame_<n>.png``)
-        in the working directory before stitching all the frames into a movie.
+        By default, this method creates a PNG file per frame (``._cubeviz_movie_frame_<n>.png``)
+        from the displayed viewer in the working directory before stitching all the frames
+        into a movie.
         Please make sure you have sufficient memory for this operation.
         PNG files are deleted after the movie is created unless otherwise specified.
         If another PNG file with the same name already exists, it will be silently replaced.
 
+        With ``render_in_browser=False``, the frames are instead rendered on the server
+        directly from the data, with the current display settings of the image layers and
+        the spatial subsets shown in the viewer (but without axes, labels or other marks),
+        and written to the movie as they are rendered.  This is much faster and does not
+        require the viewer to be displayed.
+
         Parameters
         ----------
         i_start, i_end : int or `None`
@@ -808,6 +855,7 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
 
         rm_temp_files : bool
             Remove temporary PNG files after movie creation. Default is `True`.
+            Only used with ``render_in_browser=True``.
 
         width : str, optional
             Width of the exported image. Required if height is provided.
@@ -815,6 +863,10 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
         height : str, optional
             Height of the exported image. Required if width is provided.
 
+        render_in_browser : bool
+            Whether to export each frame from the displayed viewer in the browser,
+            rather than rendering it on the server.  Default is `True`.
+
         Returns
         -------
         out_filename : str
@@ -830,7 +882,7 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
         if filetype != "mp4":
             raise NotImplementedError(f"filetype={filetype} not supported")
 
-        if viewer.shape is None:
+        if render_in_browser and viewer.shape is None:
             raise ValueError("Selected viewer has no display shape.")
 
         if fps is None:
@@ -854,10 +906,17 @@ class Export(PluginTemplateMixin, ViewerSelectMixin, SubsetSelectMixin,
         if i_end <= i_start:
             raise ValueError(f"No frames to write: i_start={i_start}, i_end={i_end}")
 
-        threading.Thread(
-            target=lambda: self._save_movie(viewer, i_start, i_end, fps, filename, rm_temp_files,
-                                            width, height)
-        ).start()
+        if render_in_browser:
+            self._movie_thread = threading.Thread(
+                target=lambda: self._save_movie(viewer, i_start, i_end, fps, filename,
+                                                rm_temp_files, width, height)
+            )
+        else:
+            self._movie_thread = threading.Thread(
+                target=lambda: self._render_movie(viewer, i_start, i_end, fps, filename,
+                                                  width, height)
+            )
+        self._movie_thread.start()
 
         return filename
 
@@ -0,0 +1,217 @@
+import copy
+import multiprocessing as mp
+from functools import partial
+
+import numpy as np
+from glue.core import BaseData
+from glue.core.exceptions import IncompatibleAttribute
+from matplotlib.colors import to_rgb
+
+from jdaviz.utils import get_subset_type, parallelize_calculation
+
+__all__ = ['ViewerFrameRenderer']
+
+
+class _FrameWorker:
+    """
+    Render a single frame, for use with `~jdaviz.utils.parallelize_calculation`.
+    """
+    def __init__(self, renderer, slice_index):
+        self.renderer = renderer
+        self.slice_index = slice_index
+
+    def __call__(self):
+        return self.renderer.render(self.slice_index)
+
+
+class ViewerFrameRenderer:
+    """
+    Render frames of an image viewer at different slices directly from the data,
+    without a round-trip to the browser.
+
+    The image layers are composited with the same machinery (and the same stretch,
+    colormap or color, contrast, bias and opacity) that the viewer uses to display
+    them.  The display settings and the field of view of the viewer are captured when
+    the renderer is created, so that the viewer can be used while frames are rendered.
+    Axes, labels and marks other than spatial subsets are not rendered.
+
+    Parameters
+    ----------
+    viewer : `~glue_jupyter.bqplot.image.BqplotImageView`
+        Image viewer showing a cube.
+    shape : tuple of int or `None`
+        Shape of the frames, ``(height, width)``, in pixels.  If `None`, one
+        frame pixel is used per data pixel in the field of view.
+    overlays : bool
+        Whether to draw the visible (spatial) subsets on top of the image.
+    """
+    def __init__(self, viewer, shape=None, overlays=True):
+        state = viewer.state
+        if state.reference_data is None:
+            raise ValueError("viewer has no data to render")
+        self.reference_data = state.reference_data
+        self.x_axis = state.x_att.axis
+        self.y_axis = state.y_att.axis
+        self._view = state.numpy_slice_aggregation_transpose[0]
+        slice_axes = [axis for axis in range(self.reference_data.ndim)
+                      if axis not in (self.x_axis, self.y_axis)]
+        if not len(slice_axes):
+            raise ValueError("viewer does not show a cube")
+        # frames step along the first axis that is not displayed
+        self.slice_axis = slice_axes[0]
+
+        if shape is None:
+            shape = (max(int(round(state.y_max - state.y_min)), 1),
+                     max(int(round(state.x_max - state.x_min)), 1))
+        self.shape = tuple(shape)
+        # (min, max, n) of the pixel centers within the field of view along y and x
+        self.bounds = []
+        for vmin, vmax, n in ((state.y_min, state.y_max, self.shape[0]),
+                              (state.x_min, state.x_max, self.shape[1])):
+            step = (vmax - vmin) / n
+            self.bounds.append((vmin + step / 2, vmax - step / 2, n))
+
+        self._composite = None
+        self._layers = {}
+        self._overlays = []
+        for artist in viewer.layers:
+            if not (artist.visible and artist.state.visible):
+                continue
+            if isinstance(artist.layer, BaseData):
+                composite = getattr(artist, 'composite', None)
+                if composite is None or artist.uuid not in composite.layers:
+                    continue
+                self._composite = composite
+                # snapshot of the display settings of this layer
+                self._layers[artist.uuid] = (artist.layer, artist.state.attribute,
+                                             dict(composite.layers[artist.uuid]))
+            elif (overlays and artist.state.alpha > 0
+                  and get_subset_type(artist.layer) == 'spatial'):
+                self._overlays.append((artist.layer, to_rgb(artist.state.color),
+                                       artist.state.alpha))
+
+    @property
+    def n_slices(self):
+        """Number of slices along the slice axis of the reference data."""
+        return self.reference_data.shape[self.slice_axis]
+
+    def _full_view(self, slice_index, bounds):
+        full_view = list(self._view)
+        full_view[self.slice_axis] = slice_index
+        full_view[self.x_axis] = bounds[1]
+        full_view[self.y_axis] = bounds[0]
+        return full_view
+
+    def _sliced(self, image):
+        # same transpose as glue's ImageLayerState.get_sliced_data
+        if self.y_axis > self.x_axis:
+            image = image.transpose()
+        return image
+
+    def _layer_array(self, data, attribute, slice_index, bounds=None):
+        image = data.compute_fixed_resolution_buffer(
+            self._full_view(slice_index, bounds or self.bounds),
+            target_data=self.reference_data, target_cid=attribute, broadcast=False)
+        return self._sliced(image)
+
+    def _subset_mask(self, subset, slice_index):
+        try:
+            mask = subset.data.compute_fixed_resolution_buffer(
+                self._full_view(slice_index, self.bounds),
+                target_data=self.reference_data, subset_state=subset.subset_state,
+                broadcast=False)
+        except IncompatibleAttribute:
+            # not displayed by the viewer either
+            return np.zeros(self.shape, dtype=bool)
+        return self._sliced(mask)
+
+    def composite(self, slice_index, bounds=None):
+        """
+        Composite of the image layers at one slice, as the viewer computes it.
+
+        Parameters
+        ----------
+        slice_index : int
+            Index along the slice axis of the reference data.
+        bounds : list or `None`
+            Bounds of the image, ``[(ymin, ymax, ny), (xmin, xmax, nx)]``, as
+            passed by the viewer to its composite image.  If `None`, the field of
+            view and shape of the renderer are used.
+
+        Returns
+        -------
+        image : `~numpy.ndarray` or `None`
+            RGBA image, with the first row at the bottom of the image, or `None`
+            if there are no image layers.
+        """
+        if self._composite is None:
+            return None
+        # a copy, so that the viewer (and other frames) are not affected
+        composite = copy.copy(self._composite)
+        composite.layers = {
+            uuid: dict(settings, array=partial(self._layer_array, data, attribute, slice_index))
+            for uuid, (data, attribute, settings) in self._layers.items()
+        }
+        return composite(bounds=bounds or self.bounds)
+
+    def render(self, slice_index):
+        """
+        Render the frame at one slice.
+
+        Parameters
+        ----------
+        slice_index : int
+            Index along the slice axis of the reference data.
+
+        Returns
+        -------
+        frame : `~numpy.ndarray`
+            RGB image of shape ``(height, width, 3)`` and dtype uint8, with
+            the first row at the top of the image.
+        """
+        img = self.composite(slice_index)
+        if img is None:
+            img = np.zeros(self.shape + (4,))
+        rgb = img[..., :3]
+
+        for subset, color, alpha in self._overlays:
+            weight = alpha * self._subset_mask(subset, slice_index).astype(float)[..., None]
+            rgb = rgb * (1 - weight) + np.asarray(color) * weight
+
+        # the bottom of the viewer is the first row of the composite image
+        return np.round(np.flipud(rgb) * 255).astype(np.uint8)
+
+    def iter_frames(self, slice_indices, n_cpu=None, batch_size=None):
+        """
+        Render frames in parallel (in threads), yielding them in order.
+
+        Parameters
+        ----------
+        slice_indices : iterable of int
+            Indices along the slice axis of the reference data.
+        n_cpu : int or `None`
+            Number of threads to use.  If `None`, it will use max cores minus one.
+        batch_size : int or `None`
+            Number of frames to render before yielding them, which bounds the
+            number of frames held in memory.  Defaults to twice ``n_cpu``.
+
+        Yields
+        ------
+        frame : `~numpy.ndarray`
+            See :meth:`render`.
+        """
+        if n_cpu is None:
+            n_cpu = max(mp.cpu_count() - 1, 1)
+        if batch_size is None:
+            batch_size = 2 * n_cpu
+        slice_indices = list(slice_indices)
+        for start in range(0, len(slice_indices), batch_size):
+            batch = slice_indices[start:start + batch_size]
+            if n_cpu == 1:
+                frames = [self.render(slice_index) for slice_index in batch]
+            else:
+                frames = []
+                # numpy and matplotlib colormaps release the GIL for most of the work
+                parallelize_calculation([_FrameWorker(self, slice_index) for slice_index in batch],
+                                        frames.append, n_cpu=n_cpu, prefer='threads')
+            yield from frames
@@ -1,10 +1,8 @@
-import numpy as np
-
-from astropy.convolution import convolve, Gaussian2DKernel
 from specutils import Spectrum
-from specutils.manipulation import gaussian_smooth
 from traitlets import List, Unicode, Bool, observe
 
+from jdaviz.configs.default.plugins.gaussian_smooth.smoothing_backend import (
+    spatial_gaussian_smooth, spectral_gaussian_smooth)
 from jdaviz.core.custom_traitlets import FloatHandleEmpty
 from jdaviz.core.events import SnackbarMessage
 from jdaviz.core.registries import tray_registry
@@ -45,6 +43,12 @@ class GaussianSmooth(PluginTemplateMixin, DatasetSelectMixin, AddResultsMixin):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
+        # Number of threads used to smooth cubes. If None, it will use max cores minus one.
+        self.parallel_n_cpu = None
+        # How to apply the Gaussian kernels, see spatial_gaussian_smooth.  'astropy' restores
+        # the (much slower) reference implementation with astropy and specutils.
+        self.smoothing_method = 'auto'
+
         if self.config == "cubeviz":
             self.docs_description = 'Smooth data cube spatially or spectrally with a Gaussian kernel.'  # noqa
             self.show_modes = True
@@ -234,15 +238,17 @@ class GaussianSmooth(PluginTemplateMixin, DatasetSelectMixin, AddResultsMixin):
         # Takes the user input from the dialog (stddev) and uses it to
         # define a standard deviation for gaussian smoothing
         cube = self.dataset.get_object(cls=Spectrum, statistic=None)
-        spec_smoothed = gaussian_smooth(cube, stddev=self.stddev)
+        spec_smoothed = spectral_gaussian_smooth(cube, stddev=self.stddev,
+                                                 method=self.smoothing_method,
+                                                 n_cpu=self.parallel_n_cpu)
 
         return spec_smoothed
 
     @with_spinner('spinner')
     def spatial_smooth(self):
         """
-        Use astropy convolution machinery to smooth the spatial dimensions of
-        the data cube.  To add the resulting cube into
+        Smooth the spatial dimensions of the data cube with a 2D Gaussian kernel,
+        applied as two 1D convolutions.  To add the resulting cube into
         the app, set label options and use :meth:`smooth` instead.
 
         Returns
@@ -253,18 +259,16 @@ class GaussianSmooth(PluginTemplateMixin, DatasetSelectMixin, AddResultsMixin):
         cube = self.dataset.selected_obj
         flux_unit = cube.flux.unit
 
-        # Extend the 2D kernel to have a length 1 spectral dimension, so that
-        # we can do "3d" convolution to the whole cube
-        kernel = np.expand_dims(Gaussian2DKernel(self.stddev), cube.meta['spectral_axis_index'])
-
-        convolved_data = convolve(cube, kernel)
+        convolved_data = spatial_gaussian_smooth(cube, self.stddev,
+                                                 method=self.smoothing_method,
+                                                 n_cpu=self.parallel_n_cpu)
 
         # Copy 3D WCS from input cube.
         data = self.dataset.selected_dc_item
         w = data.coords
 
-        # Create a new cube with the old metadata. Note that astropy
-        # convolution generates values for masked (NaN) data.
+        # Create a new cube with the old metadata. Note that the convolution
+        # generates values for masked (NaN) data.
         newcube = Spectrum(flux=convolved_data * flux_unit, wcs=w)
 
         return newcube
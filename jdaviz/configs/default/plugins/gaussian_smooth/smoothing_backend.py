@@ -0,0 +1,243 @@
+import copy
+import multiprocessing as mp
+import warnings
+
+import numpy as np
+from astropy import units as u
+from astropy.convolution import convolve, Gaussian1DKernel, Gaussian2DKernel
+from astropy.nddata import InverseVariance, StdDevUncertainty, VarianceUncertainty
+from astropy.utils.exceptions import AstropyUserWarning
+from scipy.ndimage import convolve1d
+from scipy.signal import fftconvolve
+from specutils.manipulation import gaussian_smooth
+
+from jdaviz.utils import parallelize_calculation
+
+__all__ = ['convolve_separable', 'spatial_gaussian_smooth', 'spectral_gaussian_smooth']
+
+# 1D kernels longer than this are convolved by FFT rather than directly
+FFT_KERNEL_SIZE = 100
+
+# the sum of the kernel weights over valid (non-NaN) pixels below which a pixel cannot be
+# interpolated and is set to NaN
+_MIN_VALID_WEIGHT = 1e-8
+
+
+def _convolve1d(arr, kernel, axis, method):
+    if method == 'fft':
+        kernel_shape = [1] * arr.ndim
+        kernel_shape[axis] = -1
+        return fftconvolve(arr, kernel.reshape(kernel_shape), mode='same', axes=axis)
+    return convolve1d(arr, kernel, axis=axis, mode='constant', cval=0.0)
+
+
+class _ConvolveChunkWorker:
+    """
+    Callable that convolves one chunk of an array (split along an axis which
+    is not being convolved), for use with `~jdaviz.utils.parallelize_calculation`.
+    """
+    def __init__(self, data, mask, index, kernels, methods, normalize_kernel):
+        self.data = data
+        self.mask = mask
+        self.index = index
+        self.kernels = kernels
+        self.methods = methods
+        self.normalize_kernel = normalize_kernel
+
+    def __call__(self):
+        chunk = np.array(self.data[self.index], dtype=float)
+        nans = np.isnan(chunk)
+        if self.mask is not None:
+            nans |= np.asarray(self.mask[self.index]) != 0
+        has_nans = nans.any()
+        if has_nans:
+            chunk[nans] = 0.0
+
+        weights = nans.astype(float) if has_nans else None
+        kernel_sum = 1.0
+        for axis, kernel in self.kernels.items():
+            kernel_sum *= kernel.sum()
+            kernel = kernel / kernel.sum()
+            chunk = _convolve1d(chunk, kernel, axis, self.methods[axis])
+            if has_nans:
+                weights = _convolve1d(weights, kernel, axis, self.methods[axis])
+
+        if has_nans:
+            # the fill (zero) boundary counts as valid pixels, so the weight of the valid
+            # pixels under the kernel is one minus the weight of the NaN pixels
+            weights = 1 - weights
+            invalid = weights < _MIN_VALID_WEIGHT
+            weights[invalid] = 1.0
+            chunk /= weights
+            chunk[invalid] = np.nan
+        if not self.normalize_kernel:
+            chunk *= kernel_sum
+        return self.index, chunk
+
+
+def convolve_separable(data, kernels, mask=None, method='auto', normalize_kernel=True,
+                       n_cpu=None):
+    """
+    Convolve an array with a separable kernel, given as one 1D kernel per axis.
+
+    This reproduces :func:`astropy.convolution.convolve` with its default options
+    (``boundary='fill'``, ``fill_value=0``, ``nan_treatment='interpolate'``) and
+    the outer product of the 1D kernels, but applies the 1D kernels one axis at
+    a time, either directly or by FFT.  The array is split into chunks along an
+    axis that is not convolved, which are processed in parallel.
+
+    Parameters
+    ----------
+    data : array-like
+        Input array.
+    kernels : dict
+        1D kernel arrays, keyed by the axis along which they are applied.
+    mask : array-like or `None`
+        Pixels where the mask is nonzero are treated as NaN (and interpolated).
+    method : {'auto', 'direct', 'fft'}
+        How to apply each 1D kernel.  ``'auto'`` uses FFT convolution for
+        kernels longer than ``FFT_KERNEL_SIZE``.
+    normalize_kernel : bool
+        Whether to normalize the kernel to a sum of one.
+    n_cpu : int or `None`
+        Number of threads to use.  If `None`, it will use max cores minus one.
+
+    Returns
+    -------
+    result : `~numpy.ndarray`
+        The convolved array, with the dtype of ``data`` if floating point
+        (otherwise float).
+    """
+    if method not in ('auto', 'direct', 'fft'):
+        raise ValueError("method must be one of 'auto', 'direct', 'fft'")
+    kernels = {axis % np.ndim(data): np.asarray(getattr(kernel, 'array', kernel), dtype=float)
+               for axis, kernel in kernels.items()}
+    methods = {axis: ('fft' if len(kernel) > FFT_KERNEL_SIZE else 'direct')
+               if method == 'auto' else method
+               for axis, kernel in kernels.items()}
+
+    dtype = data.dtype if data.dtype.kind == 'f' else np.dtype(float)
+    result = np.empty(np.shape(data), dtype=dtype)
+
+    def collect_result(results):
+        index, chunk = results
+        result[index] = chunk
+
+    chunk_axes = [axis for axis in range(result.ndim) if axis not in kernels]
+    if n_cpu is None:
+        n_cpu = max(mp.cpu_count() - 1, 1)
+    if not len(chunk_axes) or n_cpu == 1:
+        collect_result(_ConvolveChunkWorker(data, mask, (slice(None),) * result.ndim,
+                                            kernels, methods, normalize_kernel)())
+        return result
+
+    # split along the longest axis which is not being convolved
+    chunk_axis = max(chunk_axes, key=lambda axis: result.shape[axis])
+    workers = []
+    for chunk in np.array_split(np.arange(result.shape[chunk_axis]), n_cpu):
+        if not len(chunk):
+            continue
+        index = [slice(None)] * result.ndim
+        index[chunk_axis] = slice(chunk[0], chunk[-1] + 1)
+        workers.append(_ConvolveChunkWorker(data, mask, tuple(index), kernels, methods,
+                                            normalize_kernel))
+    # numpy and scipy release the GIL, so threads avoid copying the data to other processes
+    parallelize_calculation(workers, collect_result, n_cpu=n_cpu, prefer='threads')
+    return result
+
+
+def spatial_gaussian_smooth(cube, stddev, method='auto', **kwargs):
+    """
+    Smooth each spatial slice of a cube by a 2D Gaussian kernel.
+
+    Equivalent to convolving the cube (respecting its mask) with a
+    `~astropy.convolution.Gaussian2DKernel` that is flat along the spectral axis.
+
+    Parameters
+    ----------
+    cube : `~specutils.Spectrum`
+        Spectral cube.
+    stddev : float
+        Standard deviation of the Gaussian kernel, in pixels.
+    method : {'auto', 'direct', 'fft', 'astropy'}
+        Passed to :func:`convolve_separable`, or ``'astropy'`` to convolve the
+        cube with the 3D kernel using :func:`astropy.convolution.convolve`
+        (the reference implementation, which is much slower).
+    **kwargs
+        Passed to :func:`convolve_separable`.
+
+    Returns
+    -------
+    data : `~numpy.ndarray`
+        The smoothed flux values.
+    """
+    if method == 'astropy':
+        # Extend the 2D kernel to have a length 1 spectral dimension, so that
+        # we can do "3d" convolution to the whole cube
+        kernel = np.expand_dims(Gaussian2DKernel(stddev), cube.spectral_axis_index)
+        return convolve(cube, kernel)
+
+    kernel = Gaussian1DKernel(stddev).array
+    spatial_axes = [axis for axis in range(cube.flux.ndim)
+                    if axis != cube.spectral_axis_index % cube.flux.ndim]
+    return convolve_separable(cube.data, {axis: kernel for axis in spatial_axes},
+                              mask=cube.mask, method=method, **kwargs)
+
+
+def spectral_gaussian_smooth(spectrum, stddev, method='auto', **kwargs):
+    """
+    Smooth every spectrum of a cube along the spectral axis by a Gaussian kernel.
+
+    Equivalent to :func:`specutils.manipulation.gaussian_smooth`, including the
+    propagation of the uncertainties.
+
+    Parameters
+    ----------
+    spectrum : `~specutils.Spectrum`
+        Spectrum or spectral cube.
+    stddev : float
+        Standard deviation of the Gaussian kernel, in pixels.
+    method : {'auto', 'direct', 'fft', 'astropy'}
+        Passed to :func:`convolve_separable`, or ``'astropy'`` to use
+        :func:`specutils.manipulation.gaussian_smooth` (the reference
+        implementation, which is much slower).
+    **kwargs
+        Passed to :func:`convolve_separable`.
+
+    Returns
+    -------
+    spectrum : `~specutils.Spectrum`
+        The smoothed spectrum.
+    """
+    if not isinstance(stddev, (int, float)) or stddev <= 0:
+        raise ValueError(f"The stddev parameter, {stddev}, must be a number greater than 0")
+    if method == 'astropy':
+        return gaussian_smooth(spectrum, stddev=stddev)
+    kwargs['method'] = method
+
+    kernel = Gaussian1DKernel(stddev).array
+    axis = spectrum.spectral_axis_index
+    # NOTE: as in specutils, the mask is not used when smoothing spectrally
+    flux = convolve_separable(spectrum.flux.value, {axis: kernel}, **kwargs)
+
+    uncertainty = copy.deepcopy(spectrum.uncertainty)
+    if uncertainty is not None:
+        # Note that the squared kernel for uncertainty propagation should not be normalized,
+        # but the kernel getting squared needs to be.
+        kernel_squared = {axis: (kernel / kernel.sum()) ** 2}
+        kwargs['normalize_kernel'] = False
+        if isinstance(uncertainty, StdDevUncertainty):
+            ivar = convolve_separable(1 / uncertainty.array**2, kernel_squared, **kwargs)
+            uncertainty.array = 1 / np.sqrt(ivar)
+        elif isinstance(uncertainty, VarianceUncertainty):
+            ivar = convolve_separable(1 / uncertainty.array, kernel_squared, **kwargs)
+            uncertainty.array = 1 / ivar
+        elif isinstance(uncertainty, InverseVariance):
+            uncertainty.array = convolve_separable(uncertainty.array, kernel_squared, **kwargs)
+        else:
+            uncertainty = None
+            warnings.warn(f"Uncertainty is {type(spectrum.uncertainty)} but convolutional "
+                          "error propagation is not defined for that type. Uncertainty will "
+                          "be dropped in the convolved spectrum.", AstropyUserWarning)
+
+    return spectrum._copy(flux=u.Quantity(flux, spectrum.unit), uncertainty=uncertainty)
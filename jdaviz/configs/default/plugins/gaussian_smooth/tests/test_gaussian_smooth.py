@@ -1,5 +1,6 @@
 import numpy as np
 import pytest
+from astropy.tests.helper import assert_quantity_allclose
 from astropy.utils.exceptions import AstropyUserWarning
 from specutils import Spectrum
 
@@ -114,10 +115,7 @@ def test_spatial_convolution(cubeviz_helper, spectrum1d_cube):
     gs.dataset_selected = f'{data_label}[FLUX]'
     gs.stddev = 3
     assert gs.results_label == f'{data_label}[FLUX] spatial-smooth stddev-3.0'
-    with pytest.warns(
-            AstropyUserWarning,
-            match='The following attributes were set on the data object, but will be ignored'):
-        gs.vue_apply()
+    gs.vue_apply()
 
     assert len(dc) == 3
     assert dc[-1].label == f'{data_label}[FLUX] spatial-smooth stddev-3.0'
@@ -126,6 +124,18 @@ def test_spatial_convolution(cubeviz_helper, spectrum1d_cube):
                                                                            statistic=None).shape
             == (2, 2, 4))
 
+    # the reference implementation (astropy convolution) gives the same cube
+    smoothed = gs.spatial_smooth()
+    gs.smoothing_method = 'astropy'
+    with pytest.warns(AstropyUserWarning, match='will be ignored'):
+        expected = gs.spatial_smooth()
+    assert_quantity_allclose(smoothed.flux, expected.flux)
+
+    gs.mode_selected = 'Spectral'
+    expected = gs.spectral_smooth()
+    gs.smoothing_method = 'auto'
+    assert_quantity_allclose(gs.spectral_smooth().flux, expected.flux)
+
 
 def test_specviz_smooth(specviz_helper, spectrum1d):
     data_label = 'test'
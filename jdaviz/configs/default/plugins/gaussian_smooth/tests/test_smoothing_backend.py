@@ -0,0 +1,78 @@
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.convolution import convolve, Gaussian2DKernel
+from astropy.nddata import InverseVariance, StdDevUncertainty, VarianceUncertainty
+from astropy.utils.exceptions import AstropyUserWarning
+from numpy.testing import assert_allclose
+from specutils import Spectrum
+from specutils.manipulation import gaussian_smooth
+
+from jdaviz.configs.default.plugins.gaussian_smooth.smoothing_backend import (
+    convolve_separable, spatial_gaussian_smooth, spectral_gaussian_smooth)
+
+
+def _cube(spectral_axis_index, seed=42):
+    rng = np.random.default_rng(seed)
+    shape = (20, 15, 30) if spectral_axis_index == 2 else (30, 20, 15)
+    flux = rng.random(shape).astype(np.float32)
+    flux[rng.random(shape) > 0.95] = np.nan
+    return Spectrum(flux=flux * u.Jy, mask=rng.random(shape) > 0.9,
+                    spectral_axis=np.linspace(1, 2, shape[spectral_axis_index]) * u.um,
+                    spectral_axis_index=spectral_axis_index)
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+@pytest.mark.parametrize('stddev', (1, 3, 40))
+@pytest.mark.parametrize('method', ('direct', 'fft'))
+@pytest.mark.parametrize('n_cpu', (1, 3))
+def test_spatial_smooth_matches_convolve(spectral_axis_index, stddev, method, n_cpu):
+    cube = _cube(spectral_axis_index)
+    kernel = np.expand_dims(Gaussian2DKernel(stddev), spectral_axis_index)
+    with pytest.warns(AstropyUserWarning, match='will be ignored'):
+        expected = convolve(cube, kernel)
+
+    smoothed = spatial_gaussian_smooth(cube, stddev, method=method, n_cpu=n_cpu)
+    assert smoothed.dtype == expected.dtype
+    assert np.array_equal(np.isnan(smoothed), np.isnan(expected))
+    assert_allclose(smoothed, expected, rtol=1e-5, atol=1e-6)
+
+
+@pytest.mark.parametrize('normalize_kernel', (True, False))
+def test_convolve_separable_normalize(normalize_kernel):
+    data = np.random.default_rng(0).random((10, 12))
+    data[3, 4] = np.nan
+    kernels = {0: np.array([1., 2., 1.]), 1: np.array([1., 1., 1., 1., 1.])}
+    expected = convolve(data, np.outer(kernels[0], kernels[1]),
+                        normalize_kernel=normalize_kernel)
+    assert_allclose(convolve_separable(data, kernels, normalize_kernel=normalize_kernel),
+                    expected)
+
+    with pytest.raises(ValueError, match='method must be one of'):
+        convolve_separable(data, kernels, method='other')
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+@pytest.mark.parametrize('uncertainty', (StdDevUncertainty, VarianceUncertainty,
+                                         InverseVariance))
+def test_spectral_smooth_matches_specutils(spectral_axis_index, uncertainty):
+    rng = np.random.default_rng(42)
+    cube = _cube(spectral_axis_index)
+    cube.uncertainty = uncertainty(rng.random(cube.shape) + 0.1)
+    smoothed = spectral_gaussian_smooth(cube, 2.5, n_cpu=2)
+
+    expected = gaussian_smooth(Spectrum(flux=cube.flux, spectral_axis=cube.spectral_axis,
+                                        spectral_axis_index=spectral_axis_index), 2.5)
+    assert smoothed.unit == expected.unit
+    assert_allclose(smoothed.flux.value, expected.flux.value, rtol=1e-6, atol=1e-7)
+
+    # compare the propagated uncertainties against a single spaxel
+    index = (3, 4, slice(None)) if spectral_axis_index == 2 else (slice(None), 3, 4)
+    expected = gaussian_smooth(Spectrum(flux=cube.flux[index],
+                                        uncertainty=uncertainty(cube.uncertainty.array[index]),
+                                        spectral_axis=cube.spectral_axis), 2.5)
+    assert isinstance(smoothed.uncertainty, uncertainty)
+    assert_allclose(smoothed.uncertainty.array[index], expected.uncertainty.array, rtol=1e-7)
+
+    with pytest.raises(ValueError, match='must be a number greater than 0'):
+        spectral_gaussian_smooth(cube, -1)
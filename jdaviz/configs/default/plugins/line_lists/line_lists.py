@@ -20,7 +20,7 @@ from jdaviz.core.events import (AddDataMessage,
                                 RedshiftMessage,
                                 SpectralMarksChangedMessage)
 from jdaviz.core.linelists import load_preset_linelist, get_linelist_metadata
-from jdaviz.core.marks import SpectralLine
+from jdaviz.core.marks import SpectralLines
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin, ViewerSelectMixin,
                                         CustomToolbarToggleMixin)
@@ -325,8 +325,9 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
 
         for mark in self.spectrum_viewer.figure.marks:
             # update ALL to this redshift, if adding support for per-line redshift
-            # this logic will need to change to not affect ALL lines
-            if not isinstance(mark, SpectralLine):
+            # this logic will need to change to not affect ALL lines.  Each mark
+            # draws a full line list, so this is a single array update per list.
+            if not isinstance(mark, SpectralLines):
                 continue
 
             mark.redshift = z
@@ -370,8 +371,6 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
         self._update_line_positions()
 
         if not self._rs_pause_tables:
-            # TODO: try to avoid essentially repeating the loop from above, careful to minimize
-            # updates to vue, maybe pause traitlets?
             self._update_line_list_obs()
 
             # Send the redshift back to the Specviz helper (and also trigger
@@ -380,6 +379,9 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
             self._app.hub.broadcast(msg)
 
     def _update_line_list_obs(self, *args):
+        # NOTE: the observed wavelengths in the UI are computed by line_lists.vue from the
+        # rest wavelengths and rs_redshift, so the entries are only updated in place here
+        # (for API access) instead of re-sending all of list_contents on every change.
         for list_name, line_list in self.list_contents.items():
             for i, line in enumerate(line_list['lines']):
                 if self._rs_line_obs_change[0] == list_name and self._rs_line_obs_change[1] == i:  # noqa
@@ -387,13 +389,9 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
                     # wavelength and would result in a small change to the value before the
                     # user can finish typing.  So we'll just keep the old value until the
                     # widget is blurred (loses focus)
-                    line_list['lines'][i]['obs'] = self._rs_line_obs_change[2]
+                    line['obs'] = self._rs_line_obs_change[2]
                 else:
-                    line_list['lines'][i]['obs'] = self._rest_to_obs(float(line['rest']))
-
-            self.list_contents[list_name] = line_list
-
-        self.send_state('list_contents')
+                    line['obs'] = self._rest_to_obs(float(line['rest']))
 
     def vue_change_line_obs(self, kwargs):
         # NOTE: we can only pass one argument from vue (it seems), so we'll pass as
@@ -584,8 +582,9 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
     def update_line_mark_dict(self):
         self.line_mark_dict = {}
         for m in self.spectrum_viewer.figure.marks:
-            if isinstance(m, SpectralLine):
-                self.line_mark_dict[m.table_index] = m
+            if isinstance(m, SpectralLines):
+                for name_rest in m.names_rest:
+                    self.line_mark_dict[name_rest] = m
 
         n_lines_shown = len(self.line_mark_dict)
 
@@ -932,9 +931,11 @@ class LineListTool(PluginTemplateMixin, ViewerSelectMixin, CustomToolbarToggleMi
                 # Update the astropy table entry
                 name_rest = line["name_rest"]
                 self.spectrum_viewer.spectral_lines.loc[name_rest]["colors"] = color
-                # Update the color on the plot
-                if name_rest in self.line_mark_dict:
-                    self.line_mark_dict[name_rest].colors = [color]
+
+            # Update the color on the plot (a single mark per line list)
+            for mark in self.spectrum_viewer.figure.marks:
+                if isinstance(mark, SpectralLines) and mark.listname == listname:
+                    mark.set_colors(color)
 
             self.send_state('list_contents')
 
@@ -4,9 +4,10 @@ import pytest
 
 import astropy.units as u
 from astropy.table import QTable
+from astropy.utils.exceptions import AstropyDeprecationWarning
 from specutils import Spectrum
 
-from jdaviz.core.marks import SpectralLine
+from jdaviz.core.marks import SpectralLine, SpectralLines
 from jdaviz.core.linelists import get_available_linelists
 
 
@@ -164,7 +165,7 @@ class TestLineLists:
 
         viewer_lines = [mark for mark in specviz_helper._app.get_viewer(
             specviz_helper._default_spectrum_viewer_reference_name).figure.marks
-            if isinstance(mark, SpectralLine)]
+            if isinstance(mark, SpectralLines)]
 
         assert np.allclose([line.redshift for line in viewer_lines], 0.01)
 
@@ -188,7 +189,7 @@ class TestLineLists:
 
         viewer_lines = [mark for mark in specviz_helper._app.get_viewer(
             specviz_helper._default_spectrum_viewer_reference_name).figure.marks
-            if isinstance(mark, SpectralLine)]
+            if isinstance(mark, SpectralLines)]
 
         assert np.allclose([line.redshift for line in viewer_lines], 0.01)
 
@@ -243,12 +244,74 @@ class TestLineLists:
         if hasattr(helper, '_default_spectrum_viewer_reference_name'):
             viewer_lines = [mark for mark in helper._app.get_viewer(
                             helper._default_spectrum_viewer_reference_name).figure.marks
-                            if isinstance(mark, SpectralLine)]
+                            if isinstance(mark, SpectralLines)]
         else:
             viewer_lines = [mark for mark in helper._app.get_viewer('1D Spectrum').figure.marks
-                            if isinstance(mark, SpectralLine)]
+                            if isinstance(mark, SpectralLines)]
         assert np.all([line.redshift == 0.1 for line in viewer_lines])
 
         # Test erasing lines
         helper.erase_spectral_lines()
         assert np.all(helper.spectral_lines["show"] == False)  # noqa
+
+
+def _spectral_lines_marks(specviz_helper):
+    viewer = specviz_helper._app.get_viewer(specviz_helper._default_spectrum_viewer_reference_name)
+    return [mark for mark in viewer.figure.marks if isinstance(mark, SpectralLines)]
+
+
+def _line_table(n_lines, listname):
+    lt = QTable()
+    lt['linename'] = [f'{listname} {i}' for i in range(n_lines)]
+    lt['rest'] = np.linspace(6000, 7000, n_lines) * u.AA
+    lt['listname'] = listname
+    return lt
+
+
+def test_single_mark_per_list(specviz_helper, spectrum1d):
+    specviz_helper.load_data(spectrum1d)
+    ll_plugin = specviz_helper.plugins['Line Lists']._obj
+    ll_plugin.plugin_opened = True
+    ll_plugin.import_line_list(_line_table(5, 'List A'))
+    ll_plugin.import_line_list(_line_table(3, 'List B'))
+
+    marks = _spectral_lines_marks(specviz_helper)
+    assert sorted(mark.listname for mark in marks) == ['List A', 'List B']
+    assert ll_plugin.rs_enabled
+
+    ll_plugin.rs_redshift = 0.1
+    for mark in marks:
+        assert_allclose(mark.obs_values, mark.rest_values * 1.1)
+    line = ll_plugin.list_contents['List B']['lines'][1]
+    assert_allclose(line['obs'], line['rest'] * 1.1)
+
+    # identifying a line highlights it in the mark of its list only
+    ll_plugin.vue_set_identify(('List B', line, 1))
+    mark_a, mark_b = sorted(marks, key=lambda mark: mark.listname)
+    assert mark_b.identify and mark_b.highlight.visible
+    assert_allclose(mark_b.highlight.x, mark_b.obs_values[1])
+    assert not mark_a.identify and not mark_a.highlight.visible
+
+    # hiding a single line removes it from the mark of its list
+    ll_plugin.vue_change_visible(('List B', line, 1))
+    assert line['name_rest'] not in mark_b.names_rest
+    assert len(mark_b.obs_values) == 2
+    assert not mark_b.highlight.visible
+
+    ll_plugin.vue_set_color({'listname': 'List A', 'color': '#00FF00FF'})
+    assert mark_a.colors == ['#00FF00FF'] * 5
+
+    ll_plugin.vue_hide_all_in_list('List B')
+    assert [mark.listname for mark in _spectral_lines_marks(specviz_helper)] == ['List A']
+
+
+def test_spectral_line_deprecated(specviz_helper, spectrum1d):
+    specviz_helper.load_data(spectrum1d)
+    viewer = specviz_helper._app.get_viewer('spectrum-viewer')
+    with pytest.warns(AstropyDeprecationWarning, match='SpectralLines'):
+        line = SpectralLine(viewer, 6563, redshift=0.1, name='H alpha', table_index='H alpha 6563')
+    assert isinstance(line, SpectralLines)
+    assert line.name == 'H alpha'
+    assert line.name_rest == line.table_index == 'H alpha 6563'
+    assert line.rest_value == 6563
+    assert_allclose(line.obs_value, 6563 * 1.1)
@@ -11,6 +11,7 @@ from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin, ViewerSelectMixin, TableMixin,
                                         Table, _is_image_viewer)
 from jdaviz.core.user_api import PluginUserApi
+from jdaviz.core.wcs_surrogate import get_interactive_wcs
 
 
 __all__ = ['Markers']
@@ -257,7 +258,7 @@ class Markers(PluginTemplateMixin, ViewerSelectMixin, TableMixin):
             orig_world_x = np.asarray(self.table._qtable['world_ra'][in_viewer])
             orig_world_y = np.asarray(self.table._qtable['world_dec'][in_viewer])
             pixel_unreliable = np.asarray(self.table._qtable['pixel:unreliable'][in_viewer])
-            new_wcs = viewer.state.reference_data.coords
+            new_wcs = get_interactive_wcs(viewer.state.reference_data)
             try:
                 new_x, new_y = new_wcs.world_to_pixel_values(orig_world_x*u.deg,
                                                              orig_world_y*u.deg)
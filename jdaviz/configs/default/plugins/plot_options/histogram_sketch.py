@@ -0,0 +1,282 @@
+import numpy as np
+
+__all__ = ['HistogramSketch']
+
+# default tiling: up to MAX_TILES tiles along each axis (which bounds the memory
+# of the integral histogram), but no smaller than MIN_TILE_SIZE pixels
+MAX_TILES = 64
+MIN_TILE_SIZE = 32
+
+
+def _ceil_to(value, step):
+    return -(-value // step) * step
+
+
+class HistogramSketch:
+    """
+    Precomputed histogram of an image, to approximate the histogram and percentiles
+    of any rectangular region without reading all of its pixels.
+
+    Bin edges are the quantiles of a random sample of the finite values (so every
+    bin holds a similar fraction of the pixels).  Pixel counts per bin are computed
+    once for square tiles over the first two axes (with any other axes included in
+    every tile) and accumulated into an integral histogram, so the counts of all the
+    whole tiles within a region take four lookups.  Only the pixels in partial tiles
+    along the edges of a region are binned on request.
+
+    Because the bin counts are exact, every percentile computed from the sketch lies
+    in the same bin as the exact percentile, see :meth:`percentile_bounds`.
+
+    Parameters
+    ----------
+    data : array-like
+        Image (or cube, with the spatial axes first) to sketch.
+    n_bins : int
+        Number of bins between the minimum and maximum of the random sample.
+    tile_size : int or `None`
+        Size of the tiles, in pixels along each of the first two axes.  If `None`,
+        the image is divided into up to ``MAX_TILES`` tiles along each axis.
+    sample_size : int
+        Size of the random sample from which the bin edges are computed.
+    stride : int
+        Only bin every ``stride``-th pixel along the first two axes.  Percentiles are
+        then computed from this subsample (and are no longer within the bounds).
+    exact_size : int
+        Regions with up to this many pixels are not approximated.
+    seed : int
+        Seed for the random sample.
+    """
+
+    def __init__(self, data, n_bins=256, tile_size=None, sample_size=100_000, stride=1,
+                 exact_size=10_000, seed=0):
+        self.data = data
+        self.stride = max(int(stride), 1)
+        if tile_size is None:
+            tile_size = max(-(-max(self.shape) // MAX_TILES), MIN_TILE_SIZE)
+        # tiles must start on the subsampled grid
+        self.tile_size = max(int(tile_size) // self.stride, 1) * self.stride
+        self.exact_size = exact_size
+
+        arr = self._array
+        rng = np.random.default_rng(seed)
+        n_sample = min(sample_size, arr.size)
+        sample = arr[np.unravel_index(rng.choice(arr.size, n_sample, replace=False),
+                                      arr.shape)] if n_sample else np.array([])
+        sample = sample[np.isfinite(sample)]
+        if len(sample):
+            self.edges = np.unique(np.quantile(sample, np.linspace(0, 1, n_bins + 1)))
+        else:
+            self.edges = np.array([0.])
+        self._build()
+
+    @property
+    def _array(self):
+        arr = np.asarray(self.data)
+        if arr.ndim == 1:
+            arr = arr[:, None]
+        return arr
+
+    @property
+    def shape(self):
+        """Shape of the first two (spatial) axes."""
+        return self._array.shape[:2]
+
+    def _bin(self, values):
+        """
+        Counts, minimum and maximum of the finite values, where the first count is of
+        values below ``edges[0]`` and the last of those at or above ``edges[-1]``.
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[np.isfinite(values)]
+        counts = np.bincount(np.searchsorted(self.edges, values, side='right'),
+                             minlength=len(self.edges) + 1)
+        if not len(values):
+            return counts, np.inf, -np.inf
+        return counts, values.min(), values.max()
+
+    def _region_values(self, y0, y1, x0, x1):
+        return self._array[_ceil_to(y0, self.stride):y1:self.stride,
+                           _ceil_to(x0, self.stride):x1:self.stride]
+
+    def _build(self):
+        ny, nx = self.shape
+        size = self.tile_size
+        n_ty, n_tx = -(-ny // size), -(-nx // size)
+        integral = np.zeros((n_ty + 1, n_tx + 1, len(self.edges) + 1), dtype=np.int64)
+        self._tile_min = np.full((n_ty, n_tx), np.inf)
+        self._tile_max = np.full((n_ty, n_tx), -np.inf)
+        for ty in range(n_ty):
+            for tx in range(n_tx):
+                values = self._region_values(ty * size, (ty + 1) * size,
+                                             tx * size, (tx + 1) * size)
+                counts, vmin, vmax = self._bin(values)
+                integral[ty + 1, tx + 1] = counts
+                self._tile_min[ty, tx], self._tile_max[ty, tx] = vmin, vmax
+        self._integral = integral.cumsum(axis=0).cumsum(axis=1)
+
+    def _region(self, region):
+        ny, nx = self.shape
+        if region is None:
+            return 0, ny, 0, nx
+        (y0, y1, _), (x0, x1, _) = (sl.indices(n) for sl, n in zip(region, (ny, nx)))
+        return y0, max(y0, y1), x0, max(x0, x1)
+
+    def size(self, region=None):
+        """
+        Number of (binned) pixels in ``region``, including non-finite values.
+
+        Parameters
+        ----------
+        region : tuple of slice or `None`
+            Slices along the first two axes, or `None` for the entire image.
+        """
+        y0, y1, x0, x1 = self._region(region)
+        n_y = len(range(_ceil_to(y0, self.stride), y1, self.stride))
+        n_x = len(range(_ceil_to(x0, self.stride), x1, self.stride))
+        return n_y * n_x * int(np.prod(self._array.shape[2:]))
+
+    def histogram(self, region=None):
+        """
+        Bin counts and the minimum and maximum finite values within ``region``.
+
+        Parameters
+        ----------
+        region : tuple of slice or `None`
+            Slices along the first two axes, or `None` for the entire image.
+
+        Returns
+        -------
+        counts : `~numpy.ndarray`
+            Counts below ``edges[0]``, within each bin, and at or above ``edges[-1]``.
+        vmin, vmax : float
+            Minimum and maximum finite values.
+        """
+        y0, y1, x0, x1 = self._region(region)
+        ny, nx = self.shape
+        size = self.tile_size
+        # whole tiles within the region (including tiles cut off by the edge of the image)
+        ty0, ty1 = _ceil_to(y0, size) // size, -(-ny // size) if y1 == ny else y1 // size
+        tx0, tx1 = _ceil_to(x0, size) // size, -(-nx // size) if x1 == nx else x1 // size
+        if ty0 >= ty1 or tx0 >= tx1:
+            return self._bin(self._region_values(y0, y1, x0, x1))
+
+        integral = self._integral
+        counts = (integral[ty1, tx1] - integral[ty0, tx1]
+                  - integral[ty1, tx0] + integral[ty0, tx0])
+        vmin = self._tile_min[ty0:ty1, tx0:tx1].min()
+        vmax = self._tile_max[ty0:ty1, tx0:tx1].max()
+
+        # partial tiles: rows above and below, then columns left and right of the whole tiles
+        iy0, iy1 = ty0 * size, min(ty1 * size, ny)
+        ix0, ix1 = tx0 * size, min(tx1 * size, nx)
+        for strip in ((y0, iy0, x0, x1), (iy1, y1, x0, x1),
+                      (iy0, iy1, x0, ix0), (iy0, iy1, ix1, x1)):
+            if strip[0] >= strip[1] or strip[2] >= strip[3]:
+                continue
+            strip_counts, strip_min, strip_max = self._bin(self._region_values(*strip))
+            counts = counts + strip_counts
+            vmin, vmax = min(vmin, strip_min), max(vmax, strip_max)
+        return counts, vmin, vmax
+
+    def _bin_limits(self, vmin, vmax):
+        lower = np.concatenate([[vmin], self.edges])
+        upper = np.concatenate([self.edges, [vmax]])
+        # the outer bins (and bins beyond the data) are limited by the data
+        return np.clip(lower, vmin, vmax), np.clip(upper, vmin, vmax)
+
+    def _ranks(self, percentile, counts):
+        # same (linear) interpolation between ranks as numpy.percentile
+        return np.asarray(percentile, dtype=float) / 100 * (counts.sum() - 1)
+
+    def percentile(self, percentile, region=None):
+        """
+        Approximate percentile(s) of the finite values within ``region``.
+
+        Within the bin holding the requested rank, values are assumed to be uniformly
+        distributed.  Regions with up to ``exact_size`` pixels are computed exactly.
+
+        Parameters
+        ----------
+        percentile : float or array-like
+            Percentile(s), between 0 and 100.
+        region : tuple of slice or `None`
+            Slices along the first two axes, or `None` for the entire image.
+        """
+        if self.size(region) <= self.exact_size:
+            y0, y1, x0, x1 = self._region(region)
+            values = np.asarray(self._region_values(y0, y1, x0, x1), dtype=float)
+            values = values[np.isfinite(values)]
+            if not len(values):
+                return np.full(np.shape(percentile), np.nan)
+            return np.percentile(values, percentile)
+
+        counts, vmin, vmax = self.histogram(region)
+        if not counts.sum():
+            return np.full(np.shape(percentile), np.nan)
+        ranks = self._ranks(percentile, counts)
+        cumulative = np.cumsum(counts)
+        index = np.searchsorted(cumulative, ranks, side='right')
+        below = cumulative[index] - counts[index]
+        lower, upper = self._bin_limits(vmin, vmax)
+        fraction = (ranks - below + 0.5) / counts[index]
+        values = lower[index] + np.clip(fraction, 0, 1) * (upper[index] - lower[index])
+        # the minimum and maximum are known exactly
+        return np.where(ranks <= 0, vmin, np.where(ranks >= counts.sum() - 1, vmax, values))
+
+    def percentile_bounds(self, percentile, region=None):
+        """
+        Lower and upper bounds on the exact percentile(s) within ``region``, given by
+        the limits of the bins that hold the (interpolated) rank.
+
+        Parameters
+        ----------
+        percentile : float or array-like
+            Percentile(s), between 0 and 100.
+        region : tuple of slice or `None`
+            Slices along the first two axes, or `None` for the entire image.
+
+        Returns
+        -------
+        lower, upper : `~numpy.ndarray`
+        """
+        counts, vmin, vmax = self.histogram(region)
+        ranks = self._ranks(percentile, counts)
+        cumulative = np.cumsum(counts)
+        lower, upper = self._bin_limits(vmin, vmax)
+        return (lower[np.searchsorted(cumulative, np.floor(ranks), side='right')],
+                upper[np.searchsorted(cumulative, np.ceil(ranks), side='right')])
+
+    def counts(self, edges, region=None):
+        """
+        Approximate number of finite values within ``region`` in each of the bins given
+        by ``edges`` (for example, to display their histogram).
+
+        Within each bin of the sketch, values are assumed to be uniformly distributed.
+        Regions with up to ``exact_size`` pixels are binned exactly.
+
+        Parameters
+        ----------
+        edges : array-like
+            Increasing bin edges, the last bin includes its upper edge (as for
+            `numpy.histogram`).
+        region : tuple of slice or `None`
+            Slices along the first two axes, or `None` for the entire image.
+
+        Returns
+        -------
+        counts : `~numpy.ndarray`
+        """
+        edges = np.asarray(edges, dtype=float)
+        if self.size(region) <= self.exact_size:
+            y0, y1, x0, x1 = self._region(region)
+            values = np.asarray(self._region_values(y0, y1, x0, x1), dtype=float).ravel()
+            return np.histogram(values[np.isfinite(values)], edges)[0].astype(float)
+
+        counts, vmin, vmax = self.histogram(region)
+        if not counts.sum():
+            return np.zeros(len(edges) - 1)
+        lower, upper = self._bin_limits(vmin, vmax)
+        # cumulative counts at the edges, linear within each bin of the sketch
+        cumulative = np.interp(edges, np.concatenate([lower[:1], upper]),
+                               np.concatenate([[0], np.cumsum(counts)]))
+        return np.diff(cumulative)
@@ -4,9 +4,13 @@ import warnings
 
 import matplotlib
 import numpy as np
-from functools import cached_property
+from functools import cached_property, partial
 from echo import delay_callback
 from astropy.visualization import ManualInterval, ContrastBiasStretch
+from glue.core import Data
+from glue.core.message import (DataCollectionAddMessage, DataCollectionDeleteMessage,
+                               NumericalDataChangedMessage)
+from glue.core.units import UnitConverter
 from glue.core.subset_group import GroupedSubset
 from glue.config import stretches as glue_stretches
 from glue.viewers.histogram.state import HistogramViewerState
@@ -21,6 +25,7 @@ from glue_jupyter.common.toolbar_vuetify import read_icon
 from scipy.interpolate import PchipInterpolator
 from traitlets import Any, Dict, Float, Bool, Int, List, Unicode, observe
 
+from jdaviz.configs.default.plugins.plot_options.histogram_sketch import HistogramSketch
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin, ViewerSelectMixin, LayerSelect,
                                         PlotOptionsSyncState, Plot,
@@ -31,7 +36,7 @@ from jdaviz.core.tools import ICON_DIR
 from jdaviz.core.custom_traitlets import IntHandleEmpty
 from jdaviz.core.sonified_layers import SonifiedLayerState
 # by importing from utils, glue_colormaps will include the custom Random colormap
-from jdaviz.utils import is_not_wcs_only, cmap_samples, glue_colormaps
+from jdaviz.utils import is_not_wcs_only, cmap_samples, glue_colormaps, layer_is_image_data
 
 __all__ = ['PlotOptions']
 
@@ -108,6 +113,77 @@ def _round_step(step):
     return float(np.round(step, decimals)), decimals
 
 
+class _SketchHistogramData(Data):
+    """
+    Data of the stretch histogram.  If a `HistogramSketch` is set, the histogram is
+    computed from its bin counts (within ``region``) instead of from the values of ``x``.
+    """
+    sketch = None
+    region = None
+
+    def set_sketch(self, sketch, region=None):
+        self.sketch, self.region = sketch, region
+        if self.hub is not None:
+            self.hub.broadcast(NumericalDataChangedMessage(self))
+
+    def compute_histogram(self, cids, weights=None, range=None, bins=None, log=None,
+                          **kwargs):
+        if self.sketch is None or (log is not None and log[0]):
+            return super().compute_histogram(cids, weights=weights, range=range, bins=bins,
+                                             log=log, **kwargs)
+        edges = np.linspace(range[0][0], range[0][1], bins[0] + 1)
+        return self.sketch.counts(edges, self.region)
+
+
+def _sketch_stretch_presets(lim_helper, get_sketch):
+    """
+    Compute the limits of the stretch presets (percentiles) of an image layer from the
+    `HistogramSketch` of its attribute, when available, instead of from a random subset
+    of its pixels.
+
+    This wraps ``update_values`` of the ``StateAttributeLimitsHelper`` of the layer state
+    and otherwise defers to it (for custom limits, log stretches, per-slice limits of
+    cubes, or attributes that are not sketched).
+    """
+    update_values = lim_helper.update_values
+
+    def sketch_update_values(force=False, use_default_modifiers=False, **properties):
+        if use_default_modifiers:
+            percentile, log, display_units = 100, False, None
+        else:
+            percentile = getattr(lim_helper, 'percentile', None) or 100
+            log = getattr(lim_helper, 'log', None) or False
+            display_units = getattr(lim_helper, 'display_units', None) or None
+        recompute = force or any(prop in properties
+                                 for prop in ('attribute', ) + lim_helper.modifiers_names)
+        sketch = None
+        if (recompute and percentile != 'Custom' and not log
+                and lim_helper._subset_state is None
+                and set(properties) != {'display_units'}
+                and lim_helper.attribute is not None):
+            sketch = get_sketch(lim_helper.data, lim_helper.component_id)
+        if sketch is None:
+            return update_values(force=force, use_default_modifiers=use_default_modifiers,
+                                 **properties)
+
+        exclude = (100 - percentile) / 2.
+        lower, upper = sketch.percentile([exclude, 100 - exclude])
+        if np.isnan(lower):
+            return update_values(force=force, use_default_modifiers=use_default_modifiers,
+                                 **properties)
+        if display_units:
+            lower, upper = UnitConverter().to_unit(lim_helper.data, lim_helper.component_id,
+                                                   np.hstack([lower, upper]), display_units)
+        lim_helper._previous_units = display_units
+        value_range = upper - lower
+        lim_helper.set(lower=lower - value_range * lim_helper.margin,
+                       upper=upper + value_range * lim_helper.margin,
+                       percentile=percentile, log=log)
+
+    lim_helper.update_values = sketch_update_values
+    lim_helper._sketch_stretch_presets = True
+
+
 @tray_registry('g-plot-options', label="Plot Options",
                category='core', sidebar='settings', subtab=0)
 class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
@@ -516,6 +592,10 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
         # description displayed under plugin title in tray
         self._plugin_description = 'Set viewer and layer display options.'
 
+        # HistogramSketch per (data label, attribute) for the stretch histogram and the
+        # stretch presets, built when data are added and rebuilt if their array changes
+        self._histogram_sketches = {}
+
         if self.config == 'deconfigged':
             self.docs_link = f'https://jdaviz.readthedocs.io/en/{self.vdocs}/settings/plot_options.html'  # noqa
 
@@ -822,12 +902,20 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
         # Add layer callback to image viewers to track active layer
         for viewer in self._app._viewer_store.values():
             viewer.state.add_callback('layers', lambda msg: self._layers_changed(viewer=viewer))
+            viewer.state.add_callback('layers', partial(self._sketch_layer_presets, viewer))
 
         self.hub.subscribe(self, ViewerAddedMessage, handler=self._on_viewer_added)
 
         self.hub.subscribe(self, ChangeRefDataMessage,
                            handler=self._on_refdata_change)
 
+        self.hub.subscribe(self, DataCollectionAddMessage,
+                           handler=self._build_histogram_sketches)
+        self.hub.subscribe(self, NumericalDataChangedMessage,
+                           handler=self._build_histogram_sketches)
+        self.hub.subscribe(self, DataCollectionDeleteMessage,
+                           handler=self._prune_histogram_sketches)
+
         if self.config == 'deconfigged':
             self.observe_traitlets_for_relevancy(traitlets_to_observe=['viewer_items'])
 
@@ -896,7 +984,7 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
         stretch_histogram.tools_nested.append(["jdaviz:stretch_bounds"])
         stretch_histogram._initialize_toolbar(["jdaviz:stretch_bounds"])
 
-        stretch_histogram._add_data('histogram', x=[0, 1])
+        stretch_histogram._add_data('histogram', x=[0, 1], data_cls=_SketchHistogramData)
 
         stretch_histogram.add_line('vmin', x=[0, 0], y=[0, 1], ynorm=True, color='#c75d2c')
         stretch_histogram.add_line('vmax', x=[0, 0], y=[0, 1], ynorm='vmin', color='#c75d2c')
@@ -959,9 +1047,39 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
         self.send_state('display_units')
         self._update_viewer_zoom_steps()
 
+    def _build_histogram_sketches(self, msg):
+        # sketch the image components of new (or changed) data up front, so that the stretch
+        # histogram and presets never need to read all of their pixels when displayed
+        data = msg.data
+        if data not in self._app.data_collection or not layer_is_image_data(data):
+            return
+        for cid in data.main_components:
+            if data.get_kind(cid) == 'numerical':
+                self._get_histogram_sketch(data, cid)
+
+    def _prune_histogram_sketches(self, msg=None):
+        # release the sketches of data removed from the data collection
+        labels = self._app.data_collection.labels
+        for key in list(self._histogram_sketches):
+            if key[0] not in labels:
+                del self._histogram_sketches[key]
+
+    def _sketch_layer_presets(self, viewer, *args):
+        # image layers compute the limits of their stretch presets from the sketches
+        for layer in viewer.state.layers:
+            lim_helper = getattr(layer, 'attribute_lim_helper', None)
+            if (not isinstance(layer, BqplotImageLayerState) or lim_helper is None
+                    or getattr(lim_helper, '_sketch_stretch_presets', False)):
+                continue
+            _sketch_stretch_presets(lim_helper, self._get_existing_histogram_sketch)
+            if isinstance(layer.percentile, (int, float)):
+                # the initial limits were computed when the layer was created
+                lim_helper.update_values(force=True)
+
     def _on_viewer_added(self, msg):
         viewer = self._app.get_viewer_by_id(msg.viewer_id)
         viewer.state.add_callback('layers', lambda msg: self._layers_changed(viewer=viewer))
+        viewer.state.add_callback('layers', partial(self._sketch_layer_presets, viewer))
 
     @observe('viewer_selected')
     def _layers_changed(self, msg=None, viewer=None):
@@ -1197,7 +1315,8 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
 
         comp = data.get_component(layer.state.attribute)
 
-        # TODO: further optimization could be done by caching sub_data
+        sketch = None
+        region = None
         if self.stretch_hist_zoom_limits and (not self.layer_multiselect or len(self.layer_selected) == 1):  # noqa
             if hasattr(viewer, '_get_zoom_limits'):
                 # Viewer limits. This takes account of Imviz linking.
@@ -1209,7 +1328,8 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
                 y_min = max(y_limits.min(), 0)
                 y_max = y_limits.max()
 
-                sub_data = comp.data[y_min:y_max, x_min:x_max]
+                sketch = self._get_histogram_sketch(data, layer.state.attribute)
+                region = (slice(y_min, y_max), slice(x_min, x_max))
 
             else:
                 # spectrum-2d-viewer, for example.  We'll assume the viewer
@@ -1230,24 +1350,42 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
 
         else:
             # include all data, regardless of zoom limits
-            sub_data = comp.data
+            sketch = self._get_histogram_sketch(data, layer.state.attribute)
+
+        hist_sketch = None
+        if sketch is not None:
+            n_pixels = sketch.size(region)
+            if n_pixels <= RANDOM_SUBSET_SIZE:
+                sub_data = comp.data if region is None else comp.data[region]
+            else:
+                # the histogram is binned from the counts of the sketch (so the pixels in
+                # the region do not have to be read), x only holds the range of the values
+                hist_sketch = sketch
+                sub_data = sketch.percentile([0, 100], region)
+        else:
+            n_pixels = np.size(sub_data)
 
         self.stretch_histogram.viewer.state.random_subset = RANDOM_SUBSET_SIZE
         self.stretch_histogram._update_data('histogram', x=sub_data)
+        self.stretch_histogram._app.data_collection['histogram'].set_sketch(hist_sketch, region)
 
-        if len(sub_data) > 0:
+        if n_pixels > 0:
 
-            # Use glue to compute the statistics since this allows us to use
-            # a random subset of the data to compute the histogram.
             # The 2.5 and 97.5 hardcoded here is equivalent to
             # PercentileInterval(95).get_limits(sub_data)
-            glue_data = self.stretch_histogram._app.data_collection['histogram']
-            hist_lims = (
-                glue_data.compute_statistic('percentile', glue_data.id['x'],
-                                            percentile=2.5, random_subset=RANDOM_SUBSET_SIZE),
-                glue_data.compute_statistic('percentile', glue_data.id['x'],
-                                            percentile=97.5, random_subset=RANDOM_SUBSET_SIZE)
-            )
+            if sketch is not None:
+                # approximated from the precomputed histogram, unless the region is small
+                hist_lims = tuple(sketch.percentile([2.5, 97.5], region))
+            else:
+                # Use glue to compute the statistics since this allows us to use
+                # a random subset of the data to compute the histogram.
+                glue_data = self.stretch_histogram._app.data_collection['histogram']
+                hist_lims = (
+                    glue_data.compute_statistic('percentile', glue_data.id['x'],
+                                                percentile=2.5, random_subset=RANDOM_SUBSET_SIZE),
+                    glue_data.compute_statistic('percentile', glue_data.id['x'],
+                                                percentile=97.5, random_subset=RANDOM_SUBSET_SIZE)
+                )
 
             # set the stepsize for vmin/vmax to be approximately 1% of the range of the
             # histogram (within the percentile interval), rounded to 1-2 significant digits
@@ -1260,13 +1398,33 @@ class PlotOptions(PluginTemplateMixin, ViewerSelectMixin):
                 self.stretch_histogram.viewer.state.hist_x_min = hist_lims[0]
                 self.stretch_histogram.viewer.state.hist_x_max = hist_lims[1]
 
-        self.stretch_histogram.figure.title = f"{len(sub_data)} pixels"
+        self.stretch_histogram.figure.title = f"{n_pixels} pixels"
 
         # update the n_bins since this may be a new layer
         self._histogram_nbins_changed()
         # update the curve/colorbar
         self._update_stretch_curve(msg)
 
+    def _get_existing_histogram_sketch(self, data, attribute):
+        # only the components sketched when the data were added (see _build_histogram_sketches)
+        if (data.label, attribute.label) not in self._histogram_sketches:
+            return None
+        return self._get_histogram_sketch(data, attribute)
+
+    def _get_histogram_sketch(self, data, attribute):
+        """
+        Cached `~jdaviz.configs.default.plugins.plot_options.histogram_sketch.HistogramSketch`
+        of a component of a data layer, used for the stretch histogram, its limits and the
+        stretch presets.
+        """
+        comp = data.get_component(attribute)
+        key = (data.label, attribute.label)
+        sketch = self._histogram_sketches.get(key)
+        if sketch is None or sketch.data is not comp.data:
+            sketch = HistogramSketch(comp.data, exact_size=RANDOM_SUBSET_SIZE)
+            self._histogram_sketches[key] = sketch
+        return sketch
+
     @observe('image_color_mode_value', 'image_color_value', 'image_colormap_value',
              'image_contrast_value', 'image_bias_value',
              'stretch_hist_nbins',
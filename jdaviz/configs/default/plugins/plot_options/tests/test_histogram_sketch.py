@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+from numpy.testing import assert_allclose
+
+from jdaviz.configs.default.plugins.plot_options.histogram_sketch import HistogramSketch
+
+
+@pytest.fixture(scope='module')
+def image():
+    rng = np.random.default_rng(42)
+    image = rng.lognormal(size=(1000, 700)).astype(np.float32)
+    image[rng.random(image.shape) > 0.99] = np.nan
+    return image
+
+
+@pytest.mark.parametrize('region', (
+    None,
+    (slice(37, 981), slice(3, 650)),
+    (slice(0, 1000), slice(300, 700)),
+    (slice(10, 70), slice(600, 690)),
+    (slice(-20, None), slice(None, 10))))
+def test_histogram_sketch_bounds(image, region):
+    sketch = HistogramSketch(image, tile_size=64)
+    sub_data = image if region is None else image[region]
+    assert sketch.size(region) == sub_data.size
+
+    counts, vmin, vmax = sketch.histogram(region)
+    assert counts.sum() == np.isfinite(sub_data).sum()
+    assert vmin == np.nanmin(sub_data)
+    assert vmax == np.nanmax(sub_data)
+
+    percentiles = [0, 2.5, 50, 97.5, 100]
+    exact = np.nanpercentile(sub_data, percentiles)
+    lower, upper = sketch.percentile_bounds(percentiles, region)
+    assert np.all((lower <= exact) & (exact <= upper))
+
+    approx = sketch.percentile(percentiles, region)
+    if sketch.size(region) > sketch.exact_size:
+        assert np.all((lower <= approx) & (approx <= upper))
+    # the bins hold ~1/256 of the pixels each
+    assert_allclose(approx, exact, rtol=0.01)
+
+
+def test_histogram_sketch_edge_cases():
+    rng = np.random.default_rng(0)
+    cube = rng.random((300, 200, 5))
+    sketch = HistogramSketch(cube, tile_size=64)
+    assert sketch.shape == (300, 200)
+    region = (slice(3, 290), slice(70, 199))
+    assert sketch.size(region) == cube[region].size
+    assert_allclose(sketch.percentile([2.5, 97.5], region),
+                    np.percentile(cube[region], [2.5, 97.5]), rtol=0.01)
+
+    # subsampling at load
+    sketch = HistogramSketch(cube, stride=3, tile_size=64)
+    assert sketch.tile_size == 63
+    assert sketch.size() == cube[::3, ::3].size
+    assert_allclose(sketch.percentile([2.5, 97.5]),
+                    np.percentile(cube, [2.5, 97.5]), rtol=0.05)
+
+    # small regions are exact
+    assert_allclose(sketch.percentile(50, (slice(0, 10), slice(0, 10))),
+                    np.percentile(cube[0:10:3, 0:10:3], 50))
+
+    sketch = HistogramSketch(np.full((200, 200), np.nan))
+    assert np.all(np.isnan(sketch.percentile([2.5, 97.5])))
+    assert np.all(np.isnan(sketch.percentile([2.5, 97.5], (slice(0, 10), slice(0, 10)))))
+
+
+@pytest.mark.parametrize('region', (None, (slice(37, 981), slice(3, 650)),
+                                    (slice(10, 70), slice(600, 690))))
+def test_histogram_sketch_counts(image, region):
+    sketch = HistogramSketch(image, tile_size=64)
+    sub_data = image if region is None else image[region]
+    finite = sub_data[np.isfinite(sub_data)]
+    edges = np.linspace(0, np.percentile(finite, 99), 31)
+    exact = np.histogram(finite, edges)[0]
+
+    counts = sketch.counts(edges, region)
+    if sketch.size(region) <= sketch.exact_size:
+        assert_allclose(counts, exact)
+    else:
+        # values beyond the edges are not counted, and bins are approximated to within
+        # the counts of the (much narrower) bins of the sketch
+        assert_allclose(counts.sum(), exact.sum(), rtol=1e-3)
+        assert_allclose(counts, exact, rtol=0.02, atol=0.002 * finite.size)
+
+    assert np.all(HistogramSketch(np.full((200, 200), np.nan)).counts(edges) == 0)
+
+
+def test_histogram_sketch_pan():
+    image = np.random.default_rng(0).normal(size=(2000, 1500)).astype(np.float32)
+    sketch = HistogramSketch(image)
+
+    # count the pixels read (binned) on request, rather than from the precomputed tiles
+    n_read = 0
+    _bin = sketch._bin
+
+    def counting_bin(values):
+        nonlocal n_read
+        n_read += np.size(values)
+        return _bin(values)
+    sketch._bin = counting_bin
+
+    # pan across the image
+    regions = [(slice(y, y + 1000), slice(x, x + 750))
+               for y, x in zip(range(0, 1000, 100), range(0, 750, 75))]
+    exact = [np.nanpercentile(image[region], [2.5, 97.5]) for region in regions]
+    approx = [sketch.percentile([2.5, 97.5], region) for region in regions]
+
+    # only the pixels in the partial tiles along the edges of the regions are read
+    n_pixels = sum(image[region].size for region in regions)
+    assert n_read < 0.1 * n_pixels
+
+    assert np.max(np.abs(np.array(approx) - np.array(exact))) < 0.01
+    for region, expected in zip(regions, exact):
+        lower, upper = sketch.percentile_bounds([2.5, 97.5], region)
+        assert np.all((lower <= expected) & (expected <= upper))
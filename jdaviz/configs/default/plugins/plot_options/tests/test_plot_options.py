@@ -166,6 +166,56 @@ def test_stretch_histogram(cubeviz_helper, spectrum1d_cube_with_uncerts):
     po_prevzoom.activate()
 
 
+@pytest.mark.filterwarnings('ignore')
+def test_stretch_histogram_sketch(imviz_helper):
+    arr = np.random.default_rng(42).normal(size=(300, 200))
+    imviz_helper.load_data(arr, data_label='large')
+    po = imviz_helper._app.get_tray_item_from_name('g-plot-options')
+    # the sketch is built when the data is added
+    sketch, = po._histogram_sketches.values()
+
+    # the histogram is binned from the counts of the sketch rather than all the pixels
+    po.plugin_opened = True
+    hist_lyr = po.stretch_histogram.layers['histogram']
+    assert hist_lyr.layer.data['x'].size == 2
+    assert po.stretch_histogram.figure.title == f"{arr.size} pixels"
+    lower, upper = sketch.percentile_bounds([2.5, 97.5])
+    hist_lims = (po.stretch_histogram.viewer.state.hist_x_min,
+                 po.stretch_histogram.viewer.state.hist_x_max)
+    assert np.all((lower <= hist_lims) & (hist_lims <= upper))
+    edges, counts = hist_lyr.state.histogram
+    exact = np.histogram(arr, edges)[0]
+    assert_allclose(counts * exact.sum() / counts.sum(), exact, rtol=0.05, atol=20)
+
+    # the stretch presets are computed from the sketch
+    layer = imviz_helper.default_viewer._obj.glue_viewer.layers[0]
+    for preset in (99, 100):
+        po.stretch_preset.value = preset
+        exclude = (100 - preset) / 2
+        assert_allclose((layer.state.v_min, layer.state.v_max),
+                        sketch.percentile([exclude, 100 - exclude]))
+        lower, upper = sketch.percentile_bounds([exclude, 100 - exclude])
+        assert np.all((lower <= (layer.state.v_min, layer.state.v_max))
+                      & ((layer.state.v_min, layer.state.v_max) <= upper))
+        assert layer.state.percentile == preset
+
+    # zooming in uses the same sketch
+    po.stretch_hist_zoom_limits = True
+    iv = imviz_helper.default_viewer._obj.glue_viewer
+    iv.state.x_min, iv.state.x_max = 10, 60
+    iv.state.y_min, iv.state.y_max = 20, 80
+    assert len(po._histogram_sketches) == 1
+    assert po.stretch_histogram.figure.title != f"{arr.size} pixels"
+
+    # the sketch is released once the data is removed from the data collection
+    imviz_helper.load_data(arr + 1, data_label='other')
+    assert [key[0] for key in po._histogram_sketches] == ['large', 'other']
+    imviz_helper._app.remove_data_from_viewer('imviz-0', 'large')
+    assert [key[0] for key in po._histogram_sketches] == ['large', 'other']
+    imviz_helper._app.data_collection.remove(imviz_helper._app.data_collection['large'])
+    assert [key[0] for key in po._histogram_sketches] == ['other']
+
+
 @pytest.mark.filterwarnings('ignore')
 def test_user_api(cubeviz_helper, spectrum1d_cube):
     cubeviz_helper.load_data(spectrum1d_cube)
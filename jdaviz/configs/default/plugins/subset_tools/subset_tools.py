@@ -9,9 +9,10 @@ from astropy.utils import minversion
 from glue.core.message import EditSubsetMessage, SubsetUpdateMessage
 from glue.core.edit_subset_mode import (AndMode, AndNotMode, OrMode,
                                         ReplaceMode, XorMode, NewMode)
-from glue.core.roi import CircularROI, CircularAnnulusROI, EllipticalROI, RectangularROI
+from glue.core.roi import (Roi, CircularROI, CircularAnnulusROI, EllipticalROI,
+                           RectangularROI)
 from glue.core.subset import (RoiSubsetState, RangeSubsetState, CompositeSubsetState,
-                              MaskSubsetState)
+                              MaskSubsetState, roi_to_subset_state)
 from glue.icons import icon_path
 from glue_jupyter.widgets.subset_mode_vuetify import SelectionModeMenu
 from glue_jupyter.common.toolbar_vuetify import read_icon
@@ -28,7 +29,7 @@ from regions import (Regions, CirclePixelRegion, CircleSkyRegion,
                      RectanglePixelRegion, RectangleSkyRegion,
                      CircleAnnulusPixelRegion, CircleAnnulusSkyRegion)
 
-from jdaviz.core.region_translators import regions2roi, aperture2regions
+from jdaviz.core.region_translators import regions2roi, regions2rois, aperture2regions
 from jdaviz.core.events import (SnackbarMessage, GlobalDisplayUnitChanged,
                                 LinkUpdatedMessage, SubsetRenameMessage, DataRenamedMessage)
 from jdaviz.core.registries import tray_registry
@@ -38,8 +39,8 @@ from jdaviz.core.template_mixin import (PluginTemplateMixin, DatasetSelect,
 from jdaviz.core.tools import ICON_DIR
 from jdaviz.core.user_api import PluginUserApi
 from jdaviz.core.helpers import _next_subset_num
-from jdaviz.utils import (MultiMaskSubsetState, _chain_regions, data_has_valid_wcs,
-                          _get_celestial_wcs)
+from jdaviz.utils import (MultiMaskSubsetState, MultiRoiSubsetState, _chain_regions,
+                          data_has_valid_wcs, _get_celestial_wcs)
 
 from jdaviz.configs.default.plugins.subset_tools import utils
 
@@ -1145,9 +1146,9 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
     def vue_delete_subset(self, msg):
         self.delete_subset(msg['subset_label'])
 
-    def import_region(self, region, edit_subset=None, combination_mode=None, max_num_regions=20,
-                      refdata_label=None, return_bad_regions=False, region_format=None,
-                      subset_label=None):
+    def import_region(self, region, edit_subset=None, combination_mode=None,
+                      max_num_regions='default', refdata_label=None, return_bad_regions=False,
+                      region_format=None, subset_label=None, bulk=False):
         """
         Method for creating subsets from regions or region files.
 
@@ -1173,10 +1174,12 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
             Options are ['new', 'replace', 'or', 'and', 'xor', 'andnot']
 
 
-        max_num_regions : int or `None`
+        max_num_regions : int, `None`, or 'default'
             Maximum number of regions to load, starting from top of the list.
-            Default is 20.  If you want to load everything, set it to `None`.
-            Loading a large number of regions is not recommended due to performance impact.
+            If you want to load everything, set it to `None`.  The default is 20,
+            as loading a large number of regions is not recommended due to performance
+            impact, unless ``bulk=True`` in which case all the regions are loaded by
+            default.  With ``bulk=True``, a warning is issued if regions are dropped.
 
         refdata_label : str or `None`
             **This is only applicable to non-spectral regions.**
@@ -1199,6 +1202,14 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
             naming scheme. If multiple regions are input, this should be a list of strings
             with length matching the number of resulting subsets.
 
+        bulk : bool
+            If `True`, combine all the spatial regions into a single subset (using
+            ``combination_mode``) instead of applying them one at a time.  This is much
+            faster for large numbers of regions (e.g., thousands of source apertures
+            from a DS9 file).  If ``subset_label`` is a list with one (not necessarily
+            unique) label per region, one subset is created per label instead.
+            Regions that cannot be converted to a ``glue`` ROI are not supported.
+
         Returns
         -------
         bad_regions : list of (obj, str) or `None`
@@ -1209,22 +1220,26 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
 
         """
         if isinstance(region, str):
-            if os.path.exists(region):
-                from regions import Regions
-                try:
-                    raw_regs = Regions.read(region, format=region_format)
-                except Exception:  # nosec
-                    raw_regs = SpectralRegion.read(region)
+            if not os.path.exists(region):
+                return
+            from regions import Regions
+            try:
+                region = Regions.read(region, format=region_format)
+            except Exception:  # nosec
+                region = SpectralRegion.read(region)
 
-                return self._load_regions(raw_regs, edit_subset, combination_mode, max_num_regions,
-                                          refdata_label, return_bad_regions,
-                                          subset_label=subset_label)
-        else:
+        if max_num_regions == 'default':
+            max_num_regions = None if bulk else 20
+
+        # live-updating plugin results are recomputed once, after all the subsets are updated
+        with self._app._delay_live_plugin_results():
             return self._load_regions(region, edit_subset, combination_mode, max_num_regions,
-                                      refdata_label, return_bad_regions, subset_label=subset_label)
+                                      refdata_label, return_bad_regions, subset_label=subset_label,
+                                      bulk=bulk)
 
     def _load_regions(self, regions, edit_subset=None, combination_mode=None, max_num_regions=None,
-                      refdata_label=None, return_bad_regions=False, subset_label=None, **kwargs):
+                      refdata_label=None, return_bad_regions=False, subset_label=None,
+                      bulk=False, **kwargs):
         """Load given region(s) into the viewer.
         WCS-to-pixel translation and mask creation, if needed, is relative
         to the image defined by ``refdata_label``. Meanwhile, the rest of
@@ -1281,6 +1296,10 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
             naming scheme. If multiple regions are input, this should be a list of strings
             with length matching the number of resulting subsets.
 
+        bulk : bool
+            If `True`, combine all the spatial regions into a single subset, or one
+            subset per label in ``subset_label``.  See ``import_region``.
+
         kwargs : dict
             Extra keywords to be passed into the region's ``to_mask`` method.
             **This is ignored if the region can be made interactive.**
@@ -1301,19 +1320,23 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
             regions = [regions]
 
         if isinstance(subset_label, (list, tuple)):
-            if len(subset_label) > 1 and len(set(subset_label)) < len(subset_label):
+            if bulk:
+                if len(subset_label) not in (1, len(regions)):
+                    raise ValueError("subset_label must have one entry per region when bulk=True")
+            elif len(subset_label) > 1 and len(set(subset_label)) < len(subset_label):
                 raise ValueError("Each subset label must be unique")
         elif isinstance(subset_label, str):
             subset_label = [subset_label]
 
         bad_labels = []
         if subset_label is not None:
-            for label in subset_label:
+            for label in set(subset_label):
                 if not self._app._check_valid_subset_label(label, raise_if_invalid=False):
                     bad_labels.append(label)
         if len(bad_labels) > 0:
             raise ValueError(f"subset_label contained invalid labels: {bad_labels}")
 
+        n_reg_in = len(regions)
         n_loaded = 0
         bad_regions = []
 
@@ -1337,7 +1360,9 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
         has_wcs = data_has_valid_wcs(data, ndim=2) or data_has_valid_wcs(data, ndim=3)
 
         combo_mode_is_list = isinstance(combination_mode, list)
-        if combo_mode_is_list and len(combination_mode) != (len(regions)):
+        if combo_mode_is_list and bulk:
+            raise ValueError("combination_mode cannot be a list when bulk=True")
+        elif combo_mode_is_list and len(combination_mode) != (len(regions)):
             raise ValueError("list of mode must be size of regions")
         elif combo_mode_is_list:
             unknown_options = list(set(combination_mode) - set(COMBO_OPTIONS))
@@ -1363,6 +1388,12 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
                     # self.app.session.edit_subset_mode.edit_subset = None
                     self.subset.selected = self.subset.default_text
 
+                if bulk:
+                    n_loaded, bad_regions = self._load_regions_bulk(
+                        regions, combination_mode, max_num_regions, subset_label,
+                        viewer, data, has_wcs)
+                    regions = []
+
                 label_index = 0
                 for index, region in enumerate(regions):
                     # Set combination mode for how region will be applied to current subset
@@ -1496,7 +1527,6 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
         self._app.session.edit_subset_mode.edit_subset = previous_subset
         self._app.session.edit_subset_mode.mode = previous_mode
 
-        n_reg_in = len(regions)
         n_reg_bad = len(bad_regions)
         if n_loaded == 0:
             snack_color = "error"
@@ -1513,6 +1543,107 @@ class SubsetTools(PluginTemplateMixin, LoadersMixin):
         if return_bad_regions:
             return bad_regions
 
+    def _load_regions_bulk(self, regions, combination_mode, max_num_regions, subset_label,
+                           viewer, data, has_wcs):
+        """
+        Convert all spatial ``regions`` to ROIs at once and apply them to ``viewer`` as a
+        single `~jdaviz.utils.MultiRoiSubsetState` per subset (see ``_load_regions``).
+        Returns the number of regions loaded and the list of bad regions.
+        """
+        bad_regions = []
+        wcs = data.coords if has_wcs else None
+        if getattr(wcs, 'world_n_dim', None) == 3:
+            wcs = _get_celestial_wcs(wcs)
+
+        shapes, labels = [], []
+        for index, region in enumerate(regions):
+            if isinstance(region, (CircularAperture, SkyCircularAperture,
+                                   EllipticalAperture, SkyEllipticalAperture,
+                                   RectangularAperture, SkyRectangularAperture,
+                                   CircularAnnulus, SkyCircularAnnulus)):
+                region = aperture2regions(region)
+
+            if isinstance(region, (CircleSkyRegion, EllipseSkyRegion,
+                                   RectangleSkyRegion, CircleAnnulusSkyRegion)) and not has_wcs:
+                bad_regions.append((region, 'Sky region provided but data has no valid WCS'))
+                continue
+            elif (isinstance(region, (CirclePixelRegion, EllipsePixelRegion,
+                                      RectanglePixelRegion, CircleAnnulusPixelRegion))
+                    and self._app._align_by == 'wcs'):
+                if not has_wcs:
+                    bad_regions.append((region, 'Pixel region provided but data '
+                                                'is aligned by WCS with no valid '
+                                                'WCS for conversion'))
+                    continue
+                region = region.to_sky(wcs)
+            elif not isinstance(region, (CirclePixelRegion, CircleSkyRegion,
+                                         EllipsePixelRegion, EllipseSkyRegion,
+                                         RectanglePixelRegion, RectangleSkyRegion,
+                                         CircleAnnulusPixelRegion, CircleAnnulusSkyRegion,
+                                         CircularROI, CircularAnnulusROI,
+                                         EllipticalROI, RectangularROI)):
+                bad_regions.append((region, 'Region type not supported in bulk import'))
+                continue
+
+            shapes.append(region)
+            if subset_label is None:
+                labels.append(None)
+            else:
+                labels.append(subset_label[index] if len(subset_label) > 1 else subset_label[0])
+            if (max_num_regions is not None and len(shapes) >= max_num_regions
+                    and index < len(regions) - 1):
+                warnings.warn(f'Only the first {index + 1} of {len(regions)} regions were '
+                              f'imported (max_num_regions={max_num_regions}), set '
+                              'max_num_regions=None to import all of them.', UserWarning)
+                break
+
+        # regions shapes are converted together, ROIs are used as-is
+        to_convert = [i for i, shape in enumerate(shapes) if not isinstance(shape, Roi)]
+        rois = list(shapes)
+        try:
+            for i, roi in zip(to_convert, regions2rois([shapes[i] for i in to_convert], wcs=wcs)):
+                rois[i] = roi
+        except ValueError:
+            # find the shape(s) that failed and convert the rest individually,
+            # falling back on the original spatial WCS as for single regions
+            orig_wcs = data.meta.get('_orig_spatial_wcs')
+            for i in to_convert:
+                try:
+                    rois[i] = regions2roi(shapes[i], wcs=wcs)
+                except ValueError:
+                    if orig_wcs is None:
+                        bad_regions.append((shapes[i], f'Failed to load: _orig_spatial_wcs'
+                                                       f' meta tag not in {data.label}'))
+                        rois[i] = None
+                    else:
+                        rois[i] = regions2roi(shapes[i], wcs=orig_wcs)
+
+        states = {}
+        for roi, label in zip(rois, labels):
+            if roi is None:
+                continue
+            states.setdefault(label, []).append(
+                roi_to_subset_state(roi, x_att=viewer.state.x_att, y_att=viewer.state.y_att))
+
+        for label_index, (label, label_states) in enumerate(states.items()):
+            if label_index > 0:
+                # every additional label is a new subset
+                self.combination_mode.selected = 'new'
+            elif combination_mode is None:
+                self.combination_mode.selected = 'new'
+            else:
+                self.combination_mode.selected = combination_mode
+
+            if len(label_states) == 1:
+                viewer.apply_subset_state(label_states[0])
+            else:
+                viewer.apply_subset_state(MultiRoiSubsetState.from_states(label_states))
+
+            if label is not None and self.combination_mode.selected in ('new', 'replace'):
+                self.rename_selected(label)
+
+        return sum(len(label_states) for label_states in states.values()), bad_regions
+
     @observe('combination_mode_selected')
     def _combination_mode_selected_updated(self, change):
         self._app.session.edit_subset_mode.mode = SUBSET_MODES_PRETTY[change['new']]
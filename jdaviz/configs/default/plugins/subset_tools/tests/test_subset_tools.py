@@ -17,6 +17,7 @@ from specutils import SpectralRegion
 
 from jdaviz.configs.default.plugins.subset_tools import utils
 from jdaviz.core.region_translators import regions2roi
+from jdaviz.utils import MultiRoiSubsetState
 
 
 def test_plugin(specviz_helper, spectrum1d):
@@ -657,3 +658,68 @@ def test_data_menu_subset_delete(cubeviz_helper, spectrum1d_cube):
     assert (len(cubeviz_helper.viewers['spectrum-viewer'].data_menu.layer.choices) ==
             expected_dm_layer_len)
     assert dm.layer not in cubeviz_helper.viewers['spectrum-viewer'].data_menu.data_labels_loaded
+
+
+def _random_circles(n_regions, shape=(100, 100), seed=42):
+    rng = np.random.default_rng(seed)
+    xs = rng.uniform(0, shape[1], n_regions)
+    ys = rng.uniform(0, shape[0], n_regions)
+    radii = rng.uniform(0.5, 3, n_regions)
+    return [CirclePixelRegion(center=PixCoord(x=x, y=y), radius=r)
+            for x, y, r in zip(xs, ys, radii)]
+
+
+def test_import_region_bulk(imviz_helper):
+    imviz_helper.load_data(NDData(np.ones((100, 100)) * u.nJy), data_label='image')
+    st = imviz_helper.plugins['Subset Tools']
+    regions = _random_circles(30)
+
+    # one region at a time, as the reference
+    st.import_region(regions, combination_mode='or', edit_subset=None,
+                     max_num_regions=None)
+    # all the regions are imported in bulk by default
+    st.import_region(regions, bulk=True, subset_label='Sources')
+
+    subsets = {sg.label: sg for sg in imviz_helper._app.data_collection.subset_groups}
+    assert len(subsets) == 2
+    state = subsets['Sources'].subset_state
+    assert isinstance(state, MultiRoiSubsetState)
+    assert len(state.roi_states()) == len(regions)
+
+    data = imviz_helper._app.data_collection['image[DATA]']
+    assert_allclose(subsets['Sources'].subsets[0].to_mask(),
+                    subsets['Subset 1'].subsets[0].to_mask())
+
+    # slicing goes through the general (sorted) path
+    view = (slice(10, 60), slice(5, 95))
+    assert_allclose(state.to_mask(data, view), subsets['Subset 1'].subset_state.to_mask(data, view))
+
+    # regions beyond max_num_regions are not dropped silently
+    with pytest.warns(UserWarning, match='Only the first 20 of 30 regions were imported'):
+        st.import_region(regions, max_num_regions=20, bulk=True, subset_label='Truncated')
+    subsets = {sg.label: sg for sg in imviz_helper._app.data_collection.subset_groups}
+    assert len(subsets['Truncated'].subset_state.roi_states()) == 20
+
+
+def test_import_region_bulk_labels(imviz_helper, image_2d_wcs):
+    imviz_helper.load_data(NDData(np.ones((100, 100)) * u.nJy, wcs=image_2d_wcs),
+                           data_label='image')
+    st = imviz_helper.plugins['Subset Tools']
+    regions = [reg.to_sky(image_2d_wcs) for reg in _random_circles(6)]
+    regions.append(SpectralRegion(1 * u.um, 2 * u.um))
+
+    bad_regions = st.import_region(regions, max_num_regions=None, bulk=True,
+                                   subset_label=['Stars'] * 4 + ['Galaxies'] * 3,
+                                   return_bad_regions=True)
+    assert len(bad_regions) == 1
+    assert bad_regions[0][1] == 'Region type not supported in bulk import'
+
+    subsets = {sg.label: sg.subset_state for sg in imviz_helper._app.data_collection.subset_groups}
+    assert sorted(subsets) == ['Galaxies', 'Stars']
+    assert len(subsets['Stars'].roi_states()) == 4
+    assert len(subsets['Galaxies'].roi_states()) == 2
+
+    with pytest.raises(ValueError, match='one entry per region'):
+        st.import_region(regions, bulk=True, subset_label=['A', 'B'])
+    with pytest.raises(ValueError, match='cannot be a list'):
+        st.import_region(regions[:2], bulk=True, combination_mode=['new', 'or'])
@@ -7,6 +7,7 @@ from astropy import units as u
 from astropy.modeling.fitting import TRFLSQFitter
 from astropy.modeling import Parameter
 from astropy.modeling.models import Gaussian1D
+from astropy.table import QTable
 from astropy.time import Time
 from astropy.utils import minversion
 from glue.core.message import SubsetUpdateMessage
@@ -15,6 +16,7 @@ import photutils
 from photutils.aperture import (ApertureStats, CircularAperture, EllipticalAperture,
                                 RectangularAperture)
 from photutils.profiles import CurveOfGrowth, RadialProfile
+from specutils import Spectrum
 from traitlets import Any, Bool, Integer, List, Unicode, observe
 
 from jdaviz.core.custom_traitlets import FloatHandleEmpty
@@ -62,6 +64,7 @@ class SimpleAperturePhotometry(PluginTemplateMixin, ApertureSubsetSelectMixin,
     * :meth:`~jdaviz.core.template_mixin.TableMixin.export_table`
     * :meth:`calculate_batch_photometry`
     * :meth:`calculate_photometry`
+    * :meth:`calculate_spectral_photometry`
     * ``fitted_models``
       Dictionary of fitted models.
     * ``fit_radial_profile``
@@ -217,8 +220,8 @@ class SimpleAperturePhotometry(PluginTemplateMixin, ApertureSubsetSelectMixin,
         expose = ('multiselect', 'dataset', 'aperture', 'background',
                   'background_value', 'pixel_area', 'counts_factor', 'flux_scaling',
                   'calculate_photometry', 'unpack_batch_options',
-                  'calculate_batch_photometry', 'table', 'clear_table',
-                  'export_table', 'fitted_models', 'current_plot_type',
+                  'calculate_batch_photometry', 'calculate_spectral_photometry',
+                  'table', 'clear_table', 'export_table', 'fitted_models', 'current_plot_type',
                   'fit_radial_profile', 'plot')
 
         if self.config == 'Imviz':
@@ -1357,6 +1360,172 @@ class SimpleAperturePhotometry(PluginTemplateMixin, ApertureSubsetSelectMixin,
                 err_msg += "  To see full exceptions, run individually or pass full_exceptions=True"  # noqa
             raise RuntimeError(err_msg)
 
+    @with_spinner()
+    def calculate_spectral_photometry(self, dataset=None, aperture=None, background=None,
+                                      background_value=None, pixel_area=None,
+                                      slice_range=None, curve_of_growth=False, chunk_size=64):
+        """
+        Calculate aperture photometry through a fixed aperture for every spectral slice
+        of a cube (or a range of slices), resulting in a photometric spectrum.
+
+        The aperture mask is computed once and the cube is read in chunks of
+        ``chunk_size`` slices, so memory use stays bounded for large cubes.  Unprovided
+        options will remain at their values defined in the plugin.
+
+        Parameters
+        ----------
+        dataset : str, optional
+            Cube to use for photometry.
+        aperture : str, optional
+            Subset to use as the aperture.
+        background : str, optional
+            Subset to use to calculate the background.  The background median is computed
+            independently for every slice.
+        background_value : float, optional
+            Background to subtract from every slice, same unit as data.  Only applicable
+            if ``background`` is 'Manual'.
+        pixel_area : float, optional
+            Pixel area in arcsec squared, only used if data unit is a surface brightness unit.
+        slice_range : tuple, optional
+            ``(start, stop)`` of the slices to include, either as slice indices (``stop``
+            exclusive) or as `~astropy.units.Quantity` spectral values (inclusive).
+            All slices are included if not provided.
+        curve_of_growth : bool, optional
+            Whether to also compute the curve of growth for every slice.
+        chunk_size : int, optional
+            Maximum number of slices to read from the cube at once.
+
+        Returns
+        -------
+        spectrum : `~specutils.Spectrum`
+            Background-subtracted aperture sum per slice.  The background level and
+            aperture area of each slice are stored in ``meta``.
+        cog : `~astropy.table.QTable`
+            Only returned if ``curve_of_growth=True``.  One row per slice with the
+            curve of growth sampled at the radii in ``cog.meta['radius']``.
+        """
+        if self.multiselect and (dataset is None or aperture is None):  # pragma: no cover
+            raise ValueError("dataset and aperture must be provided in multiselect mode")
+
+        if dataset is not None:
+            if dataset not in self.dataset.choices:  # pragma: no cover
+                raise ValueError(f"dataset must be one of {self.dataset.choices}")
+            data = self.dataset._get_dc_item(dataset)
+        else:
+            data = self.dataset.selected_dc_item
+        if data.ndim != 3:
+            raise ValueError(f"{data.label} is not a cube")
+        spectral_axis_index = getattr(data, "meta", {}).get("spectral_axis_index", 0)
+
+        if aperture is not None and aperture not in self.aperture.choices:
+            raise ValueError(f"aperture must be one of {self.aperture.choices}")
+        aperture = aperture if aperture is not None else self.aperture.selected
+        _, _, validity = self.aperture._get_mark_coords_and_validate(selected=aperture)
+        if not validity.get('is_aperture'):
+            raise ValueError(f"Selected aperture {aperture} is not valid: {validity.get('aperture_message')}")  # noqa
+
+        w = _get_celestial_wcs(data.coords)
+        reg = self.aperture._get_spatial_region(subset=aperture, dataset=data.label)
+        if hasattr(reg, 'to_pixel'):
+            reg = reg.to_pixel(w)
+        pix_aperture = regions2aperture(reg)
+
+        comp = data.get_component(data.main_components[0])
+        img_unit = u.Unit(comp.units) if comp.units else u.dimensionless_unscaled
+
+        if (not self.multiselect and dataset in (None, self.dataset.selected)
+                and self.dataset.selected_obj is not None):
+            spectral_axis = self.dataset.selected_obj.spectral_axis
+        else:
+            spectral_axis = data.get_object(cls=Spectrum).spectral_axis
+
+        if background is not None and background not in self.background.choices:  # pragma: no cover  # noqa
+            raise ValueError(f"background must be one of {self.background.choices}")
+        background = background if background is not None else self.background.selected
+        bg_reg = None
+        if background == 'Manual':
+            convert_bg = background_value is None
+            if convert_bg:
+                background_value = self.background_value
+            try:
+                bg = float(background_value)
+            except ValueError:  # Clearer error message
+                raise ValueError('Missing or invalid background value')
+            # background_value set in plugin is in display units, which are converted
+            # at the spectral value of each slice
+            if convert_bg and self._has_display_unit_support and comp.units:
+                bg = flux_conversion_general(
+                    np.full(len(spectral_axis), bg), u.Unit(self.display_unit), img_unit,
+                    u.spectral_density(spectral_axis), with_unit=False)
+        elif background_value is not None:
+            raise ValueError("cannot provide background_value with background!='Manual'")
+        else:
+            bg = 0
+            bg_reg = self.aperture._get_spatial_region(subset=background, dataset=data.label)
+            if hasattr(bg_reg, 'to_pixel'):
+                bg_reg = bg_reg.to_pixel(w)
+
+        slice_ind = np.arange(len(spectral_axis))
+        if slice_range is not None:
+            start, stop = slice_range
+            if isinstance(start, u.Quantity):
+                sa = spectral_axis.to_value(start.unit, equivalencies=u.spectral())
+                lo, hi = sorted([start.value,
+                                 stop.to_value(start.unit, equivalencies=u.spectral())])
+                # by index into the sorted spectral axis, with a tolerance on the bounds
+                # (a fraction of the slice spacing) so that slices at the bounds are kept
+                tol = 1e-3 * np.median(np.abs(np.diff(sa))) if len(sa) > 1 else 0
+                order = np.argsort(sa)
+                i0 = np.searchsorted(sa[order], lo - tol, side='left')
+                i1 = np.searchsorted(sa[order], hi + tol, side='right')
+                slice_ind = np.sort(order[i0:i1])
+            else:
+                slice_ind = slice_ind[int(start):int(stop)]
+            if not len(slice_ind):
+                raise ValueError(f"slice_range {slice_range} does not include any slices")
+
+        if np.ndim(bg):
+            bg = bg[slice_ind]
+
+        cog_radii = _curve_of_growth_radii(pix_aperture, 11) if curve_of_growth else None
+        sums, areas, bkg, cog = _aperture_photometry_per_slice(
+            comp.data, pix_aperture, spectral_axis_index=spectral_axis_index,
+            slice_ind=slice_ind, background=bg, background_region=bg_reg,
+            cog_radii=cog_radii, chunk_size=chunk_size)
+
+        # multiply out the solid angle so that sums are in flux, as in calculate_photometry
+        sum_unit = img_unit
+        solid_angle_unit = check_if_unit_is_per_solid_angle(img_unit, return_unit=True)
+        if solid_angle_unit == PIX2:
+            sum_unit = img_unit * PIX2
+        elif solid_angle_unit is not None:
+            try:
+                pixarea = float(pixel_area if pixel_area is not None else self.pixel_area)
+            except ValueError:  # Clearer error message
+                raise ValueError('Missing or invalid pixel area')
+            if not np.allclose(pixarea, 0):
+                pixarea_fac = PIX2 * (pixarea * u.arcsec * u.arcsec / PIX2).to(
+                    solid_angle_unit / PIX2)
+                sum_unit = img_unit * pixarea_fac.unit
+                sums = sums * pixarea_fac.value
+                if cog is not None:
+                    cog = cog * pixarea_fac.value
+
+        spectrum = Spectrum(flux=sums * sum_unit,
+                            spectral_axis=spectral_axis[slice_ind],
+                            meta={'data_label': data.label,
+                                  'subset_label': aperture,
+                                  'background': bkg * img_unit,
+                                  'sum_aper_area': areas * PIX2})
+
+        if not curve_of_growth:
+            return spectrum
+
+        cog_table = QTable([spectral_axis[slice_ind], cog * sum_unit],
+                           names=['slice_wave', 'sum'],
+                           meta={'radius': cog_radii * u.pix})
+        return spectrum, cog_table
+
 
 # NOTE: These are hidden because the APIs are for internal use only
 # but we need them as a separate functions for unit testing.
@@ -1433,6 +1602,23 @@ def _radial_profile(data, reg_bb, centroid, raw=False,
     return x_arr, y_arr
 
 
+def _curve_of_growth_radii(aperture, n_datapoints):
+    """Radii (in pixels) at which to sample the curve of growth for a pixel aperture.
+
+    ``n_datapoints`` includes the zero radius, which is dropped from the output.
+    """
+    if isinstance(aperture, CircularAperture):
+        r = aperture.r
+    elif isinstance(aperture, EllipticalAperture):
+        r = max(aperture.a, aperture.b)
+    elif isinstance(aperture, RectangularAperture):
+        r = max(aperture.w, aperture.h) * 0.5
+    else:
+        raise TypeError(f'Unsupported aperture: {aperture}')
+
+    return np.linspace(0, r, num=n_datapoints)[1:]
+
+
 def _curve_of_growth(data, centroid, aperture, wcs=None, background=0, n_datapoints=10,
                      pixarea_fac=None, image_unit=None, display_unit=None, equivalencies=[]):
     """Calculate curve of growth for aperture photometry.
@@ -1503,16 +1689,7 @@ def _curve_of_growth(data, centroid, aperture, wcs=None, background=0, n_datapoi
     if hasattr(aperture, 'to_pixel'):
         aperture = aperture.to_pixel(wcs)
 
-    if isinstance(aperture, CircularAperture):
-        r = aperture.r
-    elif isinstance(aperture, EllipticalAperture):
-        r = max(aperture.a, aperture.b)
-    elif isinstance(aperture, RectangularAperture):
-        r = max(aperture.w, aperture.h) * 0.5
-    else:
-        raise TypeError(f'Unsupported aperture: {aperture}')
-
-    radii = np.linspace(0, r, num=n_datapoints)[1:]
+    radii = _curve_of_growth_radii(aperture, n_datapoints)
     cog = CurveOfGrowth(data, centroid, radii, error=None, mask=None)
     x_arr = cog.radius
     sum_arr = cog.profile - (cog.radii ** 2 * np.pi * background)
@@ -1551,3 +1728,137 @@ def _curve_of_growth(data, centroid, aperture, wcs=None, background=0, n_datapoi
         y_label = 'Value'
 
     return x_arr, sum_arr, 'Radius (pix)', y_label
+
+
+def _iter_cube_chunks(cube, yx_slices, slice_ind, spectral_axis_index=0, chunk_size=64):
+    """Yield ``(start, chunk)`` pairs of a spatial cutout of a cube.
+
+    Each ``chunk`` has shape ``(n_slices, ny, nx)`` and covers at most ``chunk_size``
+    consecutive spectral slices from ``slice_ind``, so only the cutout of one chunk is
+    ever resident in memory (relevant for memory-mapped cubes).
+    """
+    ys, xs = yx_slices
+    for start in range(0, len(slice_ind), chunk_size):
+        zs = slice_ind[start:start + chunk_size]
+        zslice = slice(zs[0], zs[-1] + 1)
+        if spectral_axis_index == 0:
+            chunk = cube[zslice, ys, xs]
+        else:
+            # glue stores these cubes as (nx, ny, nz)
+            chunk = np.transpose(cube[xs, ys, zslice], (2, 1, 0))
+        yield start, np.asarray(chunk, dtype=float)
+
+
+def _aperture_photometry_per_slice(cube, aperture, spectral_axis_index=0, slice_ind=None,
+                                   background=0, background_region=None, cog_radii=None,
+                                   chunk_size=64):
+    """Background-subtracted aperture sums for every spectral slice of a cube.
+
+    The aperture (and background) masks are computed once and applied to each chunk
+    of slices in a single vectorized pass.  Non-finite pixels are excluded, as
+    ``ApertureStats`` does for a single slice.
+
+    Parameters
+    ----------
+    cube : ndarray
+        Cube data in glue order, i.e., ``(nz, ny, nx)`` if ``spectral_axis_index`` is 0,
+        ``(nx, ny, nz)`` otherwise.
+
+    aperture : obj
+        ``photutils`` pixel aperture.
+
+    spectral_axis_index : int
+        Index of the spectral axis in ``cube``.
+
+    slice_ind : ndarray or `None`
+        Sorted, contiguous slice indices to process. All slices if `None`.
+
+    background : float or ndarray
+        Background level per pixel to subtract, either a scalar or one value per slice.
+        Ignored if ``background_region`` is given.
+
+    background_region : obj or `None`
+        Pixel region whose per-slice median is used as the background.
+
+    cog_radii : ndarray or `None`
+        If given, also compute the (background-subtracted) curve of growth at these
+        radii from the aperture center for every slice.
+
+    chunk_size : int
+        Maximum number of slices to read at once.
+
+    Returns
+    -------
+    sums, areas, bkg : ndarray
+        Background-subtracted sums, unmasked aperture areas (in pixels), and the
+        background level for each slice.
+
+    cog : ndarray or `None`
+        Curve of growth with shape ``(n_slices, n_radii)``.
+
+    """
+    if spectral_axis_index == 0:
+        nz, ny, nx = cube.shape
+    else:
+        nx, ny, nz = cube.shape
+    if slice_ind is None:
+        slice_ind = np.arange(nz)
+    n_slices = len(slice_ind)
+
+    aper_mask = aperture.to_mask(method='exact')
+    large, small = aper_mask.get_overlap_slices((ny, nx))
+    if large is None:
+        raise ValueError('Aperture does not overlap with the data.')
+    weights = aper_mask.data[small]
+
+    sums = np.zeros(n_slices)
+    areas = np.zeros(n_slices)
+    for start, chunk in _iter_cube_chunks(cube, large, slice_ind,
+                                          spectral_axis_index, chunk_size):
+        finite = np.isfinite(chunk)
+        sums[start:start + len(chunk)] = np.einsum('zyx,yx->z', np.where(finite, chunk, 0),
+                                                   weights)
+        areas[start:start + len(chunk)] = np.einsum('zyx,yx->z', finite, weights)
+
+    if background_region is not None:
+        bg_mask = background_region.to_mask(mode='center')
+        bg_large, bg_small = bg_mask.get_overlap_slices((ny, nx))
+        if bg_large is None:
+            raise ValueError('Background region does not overlap with the data.')
+        bg_pix = bg_mask.data[bg_small] > 0
+        bkg = np.zeros(n_slices)
+        with warnings.catch_warnings():
+            # all-NaN slices result in a NaN background, as for a single slice
+            warnings.simplefilter('ignore', RuntimeWarning)
+            for start, chunk in _iter_cube_chunks(cube, bg_large, slice_ind,
+                                                  spectral_axis_index, chunk_size):
+                bkg[start:start + len(chunk)] = np.nanmedian(chunk[:, bg_pix], axis=1)
+    else:
+        bkg = np.full(n_slices, background, dtype=float)
+
+    sums -= bkg * areas
+
+    if cog_radii is None:
+        return sums, areas, bkg, None
+
+    # stack the circular masks for all radii onto the bounding box of the largest one
+    cog_masks = [CircularAperture(aperture.positions, r).to_mask(method='exact')
+                 for r in cog_radii]
+    bbox = cog_masks[-1].bbox
+    stack = np.zeros((len(cog_radii),) + bbox.shape)
+    for i, m in enumerate(cog_masks):
+        y0 = m.bbox.iymin - bbox.iymin
+        x0 = m.bbox.ixmin - bbox.ixmin
+        stack[i, y0:y0 + m.shape[0], x0:x0 + m.shape[1]] = m.data
+    large, small = cog_masks[-1].get_overlap_slices((ny, nx))
+    stack = stack[(slice(None),) + small]
+
+    cog = np.zeros((n_slices, len(cog_radii)))
+    for start, chunk in _iter_cube_chunks(cube, large, slice_ind,
+                                          spectral_axis_index, chunk_size):
+        chunk = np.where(np.isfinite(chunk), chunk, 0)
+        cog[start:start + len(chunk)] = np.einsum('zyx,ryx->zr', chunk, stack)
+    # same analytic background area as _curve_of_growth
+    cog -= bkg[:, None] * (np.asarray(cog_radii)[None, :] ** 2 * np.pi)
+
+    return sums, areas, bkg, cog
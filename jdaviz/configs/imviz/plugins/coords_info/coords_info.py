@@ -22,6 +22,7 @@ from jdaviz.core.template_mixin import TemplateMixin, DatasetSelectMixin
 from jdaviz.core.unit_conversion_utils import (all_flux_unit_conversion_equivs,
                                                check_if_unit_is_per_solid_angle,
                                                flux_conversion_general)
+from jdaviz.core.wcs_surrogate import get_interactive_wcs
 
 __all__ = ['CoordsInfo']
 
@@ -443,7 +444,7 @@ class CoordsInfo(TemplateMixin, DatasetSelectMixin):
 
             if coords_status:
                 try:
-                    sky = image.coords.pixel_to_world(x, y).icrs
+                    sky = get_interactive_wcs(image).pixel_to_world(x, y).icrs
                 except Exception:  # WCS might not be celestial
                     coords_status = False
 
@@ -702,7 +703,8 @@ class CoordsInfo(TemplateMixin, DatasetSelectMixin):
             self.row1b_title = 'Value'
 
             if associated_dq_layers is not None:
-                if np.isnan(dq_value):
+                # unflagged pixels are either zero or NaN (legacy float DQ arrays)
+                if np.isnan(dq_value) or dq_value == 0:
                     dq_text = ''
                 else:
                     dq_text = f' (DQ: {int(dq_value):d})'
@@ -7,7 +7,8 @@ from glue.core.message import (
 from glue.core.subset import Subset
 from glue.core.subset_group import GroupedSubset
 from glue.core.component_link import ComponentLink
-from glue.plugins.wcs_autolinking.wcs_autolinking import WCSLink, NoAffineApproximation
+from glue.plugins.wcs_autolinking.wcs_autolinking import (AffineLink, WCSLink,
+                                                          NoAffineApproximation)
 from glue.viewers.image.state import ImageSubsetLayerState
 from traitlets import List, Unicode, Bool, Dict, observe
 
@@ -677,6 +678,9 @@ def link_image_data(app, align_by='pixels', wcs_fallback_scheme=None, wcs_fast_a
         full WCS transformations). If approximation fails, it will automatically
         fall back to full WCS transformation. This is only used when ``align_by='wcs'``.
         Affine approximation is much more performant at the cost of accuracy.
+        The transformation of each image to a common sky tangent plane is cached,
+        so relinking to another reference composes the cached transformations
+        instead of solving the approximation again for every image.
 
     error_on_fail : bool
         If `True`, any failure in linking will raise an exception.
@@ -807,6 +811,16 @@ def link_image_data(app, align_by='pixels', wcs_fallback_scheme=None, wcs_fast_a
     ids0 = refdata.pixel_component_ids
     ndim_range = range(2)  # We only support 2D
 
+    # Affine approximations composed from cached per-image tangent-plane fits.
+    # Images for which this fails go through WCSLink.as_affine_link below.
+    affine_matrices = {}
+    if align_by == 'wcs' and wcs_fast_approximation and hasattr(refdata.coords, 'world_to_pixel'):
+        to_link = [data for i, data in enumerate(app.data_collection)
+                   if i != iref and data not in data_already_linked
+                   and data.meta.get('_importer') != 'CatalogImporter'
+                   and layer_is_2d(data) and hasattr(data.coords, 'pixel_to_world')]
+        affine_matrices = app._wcs_tangent_plane_cache.affine_matrices(refdata, to_link)
+
     for i, data in enumerate(app.data_collection):
 
         # Do not link with self or existing links.
@@ -875,6 +889,9 @@ def link_image_data(app, align_by='pixels', wcs_fallback_scheme=None, wcs_fast_a
             try:
                 if align_by == 'pixels':
                     new_links = [LinkSame(ids0[i], ids1[i]) for i in ndim_range]
+                elif data.label in affine_matrices:
+                    new_links = [AffineLink(data1=refdata, data2=data, cids1=ids0, cids2=ids1,
+                                            matrix=affine_matrices[data.label])]
                 else:  # wcs
                     wcslink = WCSLink(data1=refdata, data2=data, cids1=ids0, cids2=ids1)
                     if wcs_fast_approximation:
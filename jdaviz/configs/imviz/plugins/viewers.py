@@ -15,6 +15,8 @@ from jdaviz.core.astrowidgets_api import AstrowidgetsImageViewerMixin
 from jdaviz.core.events import SnackbarMessage
 from jdaviz.core.marks import RegionOverlay
 from jdaviz.core.registries import viewer_registry
+from jdaviz.core.wcs_surrogate import get_interactive_wcs
+from jdaviz.core.image_pyramid import PyramidImageLayerArtist, get_image_pyramid
 from jdaviz.core.freezable_state import FreezableBqplotImageViewerState
 from jdaviz.configs.default.plugins.viewers import JdavizViewerMixin
 from jdaviz.utils import (get_wcs_only_layer_labels, data_has_valid_wcs,
@@ -73,6 +75,12 @@ class ImvizImageView(JdavizViewerMixin, BqplotImageView, AstrowidgetsImageViewer
         self.data_menu._obj.dataset.add_filter('is_catalog_or_image_not_spectrum')
         self.aid = aida.AID(self)
 
+    def get_data_layer_artist(self, layer=None, layer_state=None):
+        if layer.ndim == 2 and get_image_pyramid(layer) is not None:
+            return self.get_layer_artist(PyramidImageLayerArtist, layer=layer,
+                                         layer_state=layer_state)
+        return super().get_data_layer_artist(layer, layer_state)
+
     def on_mouse_or_key_event(self, data):
         active_image_layer = self.active_image_layer
         if active_image_layer is None:
@@ -218,7 +226,8 @@ class ImvizImageView(JdavizViewerMixin, BqplotImageView, AstrowidgetsImageViewer
                         # Convert X,Y from reference data to the one we are actually seeing.
 
                         x_image_coords, y_image_coords = list(map(float, pixel_to_pixel(
-                            self.state.reference_data.coords, image.coords, x, y)))
+                            get_interactive_wcs(self.state.reference_data),
+                            get_interactive_wcs(image), x, y)))
                         outside_image_bounding_box = wcs_utils.data_outside_gwcs_bounding_box(
                             image, x_image_coords, y_image_coords)
 
@@ -237,7 +246,8 @@ class ImvizImageView(JdavizViewerMixin, BqplotImageView, AstrowidgetsImageViewer
                         # viewer. At this point, we no longer know if input (x, y) is accurate
                         # or not.
                         x, y = list(map(float, pixel_to_pixel(
-                            image.coords, self.state.reference_data.coords, x, y)))
+                            get_interactive_wcs(image),
+                            get_interactive_wcs(self.state.reference_data), x, y)))
                 else:  # pixels or self
                     unreliable_world = wcs_utils.data_outside_gwcs_bounding_box(image, x, y)
 
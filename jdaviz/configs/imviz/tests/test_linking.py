@@ -1,6 +1,7 @@
 import warnings
 import numpy as np
 import pytest
+from astropy.io import fits
 from astropy.table import Table
 from astropy.wcs import WCS
 from glue.core.link_helpers import LinkSame
@@ -341,3 +342,50 @@ def test_imviz_no_data(imviz_helper):
 
     with pytest.raises(ValueError, match='No reference data for link look-up'):
         imviz_helper.default_viewer._obj.glue_viewer.get_alignment_method('foo')
+
+
+def _mosaic_tile(i, shape=(50, 50), n_columns=10, rotation=0):
+    """Tile ``i`` of a mosaic with a shared TAN projection."""
+    hdu = fits.ImageHDU(np.zeros(shape), name='SCI')
+    cos_t, sin_t = np.cos(np.radians(rotation)), np.sin(np.radians(rotation))
+    hdu.header.update({'CTYPE1': 'RA---TAN', 'CUNIT1': 'deg', 'CRVAL1': 337.5202808,
+                       'CRPIX1': 1 - (i % n_columns) * shape[1],
+                       'CDELT1': -0.0002777777778,
+                       'CTYPE2': 'DEC--TAN', 'CUNIT2': 'deg', 'CRVAL2': -20.83333306,
+                       'CRPIX2': 1 - (i // n_columns) * shape[0],
+                       'CDELT2': 0.0002777777778,
+                       'PC1_1': cos_t, 'PC1_2': -sin_t, 'PC2_1': sin_t, 'PC2_2': cos_t})
+    return hdu
+
+
+def test_wcslink_tangent_plane_cache(imviz_helper):
+    with imviz_helper.batch_load():
+        for i in range(4):
+            imviz_helper.load_data(_mosaic_tile(i, rotation=10 * i), data_label=f'tile_{i}')
+    imviz_helper.plugins['Orientation'].align_by = 'WCS'
+
+    app = imviz_helper._app
+    links = app.data_collection.external_links
+    assert len(links) == 4
+    assert all(isinstance(link, AffineLink) for link in links)
+    # one cached fit per image and for the default orientation layer
+    cache = app._wcs_tangent_plane_cache
+    assert len(cache) == 5
+
+    # the composed links agree with the full WCS transformations
+    refdata = links[0].data1
+    yr, xr = np.mgrid[:10, :10]
+    for link in links:
+        data = link.data2
+        x_expected, y_expected = data.coords.world_to_pixel(refdata.coords.pixel_to_world(xr, yr))
+        assert_allclose(refdata[data.pixel_component_ids[1]], x_expected, atol=0.05)
+        assert_allclose(refdata[data.pixel_component_ids[0]], y_expected, atol=0.05)
+
+    # linking a new orientation layer only fits that layer
+    imviz_helper.plugins['Orientation'].set_north_up_east_right()
+    assert len(cache) == 6
+    assert all(isinstance(link, AffineLink) for link in app.data_collection.external_links)
+
+    # removing data releases its fit
+    app.data_collection.remove(app.data_collection['tile_3[SCI,1]'])
+    assert len(cache) == 5
@@ -4,7 +4,10 @@
 """This module handles calculations based on world coordinate system (WCS)."""
 
 import base64
+import hashlib
 import math
+import multiprocessing as mp
+import pickle
 from io import BytesIO
 import warnings
 
@@ -14,13 +17,13 @@ from astropy import units as u
 from astropy import coordinates as coord
 from astropy.coordinates import SkyCoord
 from astropy.nddata import NDData
-from astropy.wcs import WCS
+from astropy.wcs import WCS, NoConvergence
 from astropy.wcs.utils import proj_plane_pixel_scales
 
 from gwcs.wcs import WCS as GWCS
 
 from matplotlib.patches import Polygon
-from jdaviz.utils import _wcs_only_label
+from jdaviz.utils import _wcs_only_label, parallelize_calculation
 
 __all__ = ['get_compass_info', 'draw_compass_mpl']
 
@@ -583,3 +586,279 @@ def compute_scale(wcs, fiducial, disp_axis, pscale_ratio=1):
         return yscale if disp_axis == 1 else xscale
 
     return np.sqrt(xscale * yscale)
+
+
+def _wcs_fingerprint(wcs):
+    """
+    Hash of the transformation defined by ``wcs``, or `None` if it cannot be
+    computed.  A FITS WCS without lookup-table distortions is hashed from its
+    header, anything else from its pickled form.
+    """
+    if isinstance(wcs, WCS) and all(getattr(wcs, attr, None) is None
+                                    for attr in ('cpdis1', 'cpdis2', 'det2im1', 'det2im2')):
+        content = wcs.to_header_string(relax=True).encode()
+    else:
+        try:
+            content = pickle.dumps(wcs)
+        except Exception:  # pragma: no cover
+            return None
+    return hashlib.sha256(content).hexdigest()
+
+
+def _gnomonic_projection(ra, dec, ra0, dec0):
+    """
+    Project ``ra`` and ``dec`` (degrees) on the plane tangent to the sphere at
+    ``ra0``, ``dec0``.  Returns the plane coordinates (degrees) and whether each
+    point is on the visible hemisphere (where the projection is defined).
+    """
+    ra, dec, ra0, dec0 = map(np.radians, (ra, dec, ra0, dec0))
+    cos_c = np.sin(dec0) * np.sin(dec) + np.cos(dec0) * np.cos(dec) * np.cos(ra - ra0)
+    xi = np.cos(dec) * np.sin(ra - ra0) / cos_c
+    eta = (np.cos(dec0) * np.sin(dec) - np.sin(dec0) * np.cos(dec) * np.cos(ra - ra0)) / cos_c
+    return np.degrees(xi), np.degrees(eta), cos_c > 0
+
+
+def _apply_homography(matrix, x, y):
+    """Apply the 3x3 projective transformation ``matrix`` to ``x``, ``y``."""
+    w = matrix[2, 0] * x + matrix[2, 1] * y + matrix[2, 2]
+    return ((matrix[0, 0] * x + matrix[0, 1] * y + matrix[0, 2]) / w,
+            (matrix[1, 0] * x + matrix[1, 1] * y + matrix[1, 2]) / w)
+
+
+def _fit_homography(x, y, u, v):
+    """
+    Least-squares projective transformation from ``x``, ``y`` to ``u``, ``v``
+    (normalized direct linear transform).  Returns the 3x3 matrix and the
+    largest distance between the transformed points and ``u``, ``v``.
+    """
+    def _normalization(a, b):
+        a0, b0 = np.mean(a), np.mean(b)
+        scale = np.sqrt(2) / max(np.mean(np.hypot(a - a0, b - b0)), np.finfo(float).tiny)
+        return np.array([[scale, 0, -scale * a0], [0, scale, -scale * b0], [0, 0, 1]])
+
+    t_in, t_out = _normalization(x, y), _normalization(u, v)
+    xn, yn = _apply_homography(t_in, x, y)
+    un, vn = _apply_homography(t_out, u, v)
+    zeros, ones = np.zeros_like(xn), np.ones_like(xn)
+    design = np.concatenate([
+        np.column_stack([xn, yn, ones, zeros, zeros, zeros, -un * xn, -un * yn, -un]),
+        np.column_stack([zeros, zeros, zeros, xn, yn, ones, -vn * xn, -vn * yn, -vn])])
+    matrix = np.linalg.svd(design)[2][-1].reshape(3, 3)
+    matrix = np.linalg.inv(t_out) @ matrix @ t_in
+    matrix /= matrix[2, 2]
+
+    u_fit, v_fit = _apply_homography(matrix, x, y)
+    return matrix, np.max(np.hypot(u_fit - u, v_fit - v))
+
+
+class _TangentPlaneWorker:
+    """
+    Fit a single image, for use with `~jdaviz.utils.parallelize_calculation`.
+    """
+    def __init__(self, cache, data):
+        self.cache = cache
+        self.data = data
+
+    def __call__(self):
+        try:
+            return self.cache._fit(self.data)
+        except Exception:  # pragma: no cover
+            return None
+
+
+class TangentPlaneCache:
+    """
+    Cache of the projective transformation from the pixels of each image to a
+    sky plane shared by all images (the gnomonic projection tangent at the
+    center of the first image fitted), keyed by a fingerprint of the image WCS
+    and its shape.
+
+    The transformation is exact for a TAN projection without distortions,
+    otherwise it is a least-squares fit.  Composing the transformations of two
+    images gives their pixel-to-pixel transformation without solving it again,
+    so that Imviz can relink any number of images to a new reference by
+    combining cached fits (see `affine_matrices`).
+
+    Parameters
+    ----------
+    n_grid : int
+        Number of samples along each axis of an image used to fit and check
+        the transformations.
+
+    n_cpu : int or `None`
+        Number of threads used to fit the images not yet cached.  If `None`,
+        it will use max cores minus one.
+    """
+    def __init__(self, n_grid=10, n_cpu=None):
+        self.n_grid = n_grid
+        self.n_cpu = n_cpu
+        self.tangent_point = None
+        self._entries = {}
+        # key of the cached fit of each data label
+        self._keys = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Forget all the cached fits and the tangent point."""
+        self.tangent_point = None
+        self._entries.clear()
+        self._keys.clear()
+
+    def discard(self, label):
+        """
+        Forget the fit of the data ``label`` (e.g., once it is removed from the
+        app), unless it is shared with other data.
+        """
+        key = self._keys.pop(label, None)
+        if key is not None and key not in self._keys.values():
+            self._entries.pop(key, None)
+        if not self._entries:
+            self.tangent_point = None
+
+    def _key(self, data):
+        fingerprint = _wcs_fingerprint(data.coords)
+        if fingerprint is None:  # pragma: no cover
+            return None
+        return fingerprint, tuple(data.shape)
+
+    def _sky(self, data, x, y):
+        sky = data.coords.pixel_to_world(x, y)
+        if not isinstance(sky, SkyCoord):
+            return None, None
+        sky = sky.icrs
+        return sky.ra.deg, sky.dec.deg
+
+    def _fit(self, data):
+        ny, nx = data.shape[:2]
+        x, y = np.meshgrid(np.linspace(0, max(nx - 1, 1), self.n_grid),
+                           np.linspace(0, max(ny - 1, 1), self.n_grid))
+        x, y = x.ravel(), y.ravel()
+        ra, dec = self._sky(data, x, y)
+        if ra is None or not np.all(np.isfinite(ra) & np.isfinite(dec)):
+            return None
+        xi, eta, visible = _gnomonic_projection(ra, dec, *self.tangent_point)
+        if not np.all(visible):
+            return None
+
+        matrix, residual = _fit_homography(x, y, xi, eta)
+        # local pixel scale (degrees per pixel) at the image center
+        xc, yc = (nx - 1) / 2, (ny - 1) / 2
+        (u0, u1, u2), (v0, v1, v2) = _apply_homography(
+            matrix, np.array([xc, xc + 1, xc]), np.array([yc, yc, yc + 1]))
+        scale = np.sqrt(np.abs((u1 - u0) * (v2 - v0) - (u2 - u0) * (v1 - v0)))
+        return {'matrix': matrix, 'residual': residual, 'scale': scale,
+                'x': x, 'y': y, 'ra': ra, 'dec': dec}
+
+    def get(self, datasets):
+        """
+        Tangent-plane fits of ``datasets``, keyed by data label, fitting (in
+        parallel) only the images not cached yet.  The fit is `None` for an
+        image whose WCS is not celestial or covers the opposite hemisphere.
+        """
+        if not len(datasets):
+            return {}
+        if self.tangent_point is None:
+            ny, nx = datasets[0].shape[:2]
+            ra, dec = self._sky(datasets[0], (nx - 1) / 2, (ny - 1) / 2)
+            if ra is None:
+                return {data.label: None for data in datasets}
+            self.tangent_point = (float(ra), float(dec))
+
+        keys = {data.label: self._key(data) for data in datasets}
+        self._keys.update({label: key for label, key in keys.items() if key is not None})
+        entries = {}
+        missing = {}
+        for data in datasets:
+            key = keys[data.label]
+            if key in self._entries:
+                entries[data.label] = self._entries[key]
+            else:
+                # images sharing a WCS are only fitted once
+                missing.setdefault(key if key is not None else data.label, data)
+
+        if missing:
+            workers = [_TangentPlaneWorker(self, data) for data in missing.values()]
+            n_cpu = self.n_cpu if self.n_cpu is not None else max(mp.cpu_count() - 1, 1)
+            if len(workers) == 1 or n_cpu == 1:
+                results = [worker() for worker in workers]
+            else:
+                results = []
+                # WCS transformations are numpy/wcslib work that releases the GIL
+                parallelize_calculation(workers, results.append, n_cpu=n_cpu, prefer='threads')
+            fitted = dict(zip(missing.keys(), results))
+            for key, entry in fitted.items():
+                if not isinstance(key, str):
+                    self._entries[key] = entry
+            for data in datasets:
+                if data.label not in entries:
+                    key = keys[data.label]
+                    entries[data.label] = fitted[key if key is not None else data.label]
+        return entries
+
+    def affine_matrices(self, refdata, datasets, tolerance=1):
+        """
+        Affine transformations from the pixels of ``refdata`` to the pixels of
+        each of ``datasets``, composed from the cached tangent-plane fits.
+
+        The composition is checked against the full WCS of ``refdata`` at the
+        sampled positions of every image (with a single WCS call), and images
+        for which the error exceeds ``tolerance`` pixels are left out.
+
+        Returns
+        -------
+        matrices : dict
+            3x3 matrices keyed by data label, acting on homogeneous pixel
+            coordinates in array order (y, x, 1), as for the pixel component IDs.
+            Empty if the transformations cannot be composed for ``refdata``
+            (e.g., its WCS cannot be inverted).
+        """
+        entries = self.get([refdata] + list(datasets))
+        ref = entries.get(refdata.label)
+        if ref is None or not datasets:
+            return {}
+
+        try:
+            ref_inv = np.linalg.inv(ref['matrix'])
+        except np.linalg.LinAlgError:  # pragma: no cover
+            return {}
+        candidates = []
+        for data in datasets:
+            entry = entries[data.label]
+            if entry is None:
+                continue
+            # pixels of the image -> pixels of the reference through the tangent plane
+            xr, yr = _apply_homography(ref_inv @ entry['matrix'], entry['x'], entry['y'])
+            candidates.append((data, entry, xr, yr))
+        if not candidates:
+            return {}
+
+        sky = SkyCoord(np.concatenate([entry['ra'] for _, entry, _, _ in candidates]),
+                       np.concatenate([entry['dec'] for _, entry, _, _ in candidates]),
+                       unit='deg', frame='icrs')
+        try:
+            xr_true, yr_true = refdata.coords.world_to_pixel(sky)
+        except (NoConvergence, NotImplementedError, ValueError):  # pragma: no cover
+            # no (convergent) inverse transformation for the reference WCS
+            return {}
+
+        # (x, y) <-> (y, x) for pixel component IDs in array order
+        swap = np.array([[0, 1, 0], [1, 0, 0], [0, 0, 1]])
+        matrices = {}
+        start = 0
+        for data, entry, xr, yr in candidates:
+            stop = start + len(xr)
+            ref_error = (np.hypot(xr - xr_true[start:stop], yr - yr_true[start:stop])
+                         * ref['scale'] / entry['scale'])
+            start = stop
+
+            design = np.column_stack([xr, yr, np.ones_like(xr)])
+            target = np.column_stack([entry['x'], entry['y']])
+            coeffs = np.linalg.lstsq(design, target, rcond=None)[0]
+            fit_error = np.hypot(*(design @ coeffs - target).T)
+            if not np.max(fit_error + ref_error) < tolerance:
+                continue
+            matrix = np.vstack([coeffs.T, [0, 0, 1]])
+            matrices[data.label] = swap @ matrix @ swap
+        return matrices
@@ -17,6 +17,7 @@ from jdaviz.configs.specviz import Specviz
 from jdaviz.configs.specviz.helper import _apply_redshift_to_spectra
 from jdaviz.configs.specviz2d import Specviz2d
 from jdaviz.configs.mosviz.plugins import jwst_header_to_skyregion
+from jdaviz.configs.mosviz.plugins.lazy_rows import LazyRowLoader
 from jdaviz.configs.mosviz.plugins.parsers import (
     FALLBACK_NAME, mos_spec1d_parser, mos_spec2d_parser)
 from jdaviz.configs.default.plugins.line_lists.line_list_mixin import LineListMixin
@@ -75,6 +76,10 @@ class Mosviz(ConfigHelper, LineListMixin):
 
         self._update_in_progress = False
 
+        # placeholders for data loaded with lazy=True, which are only read when
+        # their row is selected
+        self._lazy_rows = LazyRowLoader(self._app)
+
         self._initialize_table()
         self._default_visible_columns = []
 
@@ -99,6 +104,9 @@ class Mosviz(ConfigHelper, LineListMixin):
         self._freeze_states_on_row_change = msg.is_locked
 
     def _on_row_selected_begin(self, event):
+        # read the data of the row, if loaded lazily, before it is added to the viewers
+        self._lazy_rows.materialize(event['new'])
+
         self._redshift_cache = self.get_column("Redshift")[event['new']]
 
         if not self._freeze_states_on_row_change:
@@ -117,6 +125,10 @@ class Mosviz(ConfigHelper, LineListMixin):
     def _on_row_selected_end(self, event):
         self._apply_redshift_from_table(value=self._redshift_cache, row=None)
 
+        # read ahead the neighbouring rows and release the data of distant rows
+        self._lazy_rows.evict_far_from(event['new'])
+        self._lazy_rows.prefetch_around(event['new'])
+
         if not self._freeze_states_on_row_change:
             return
 
@@ -245,16 +257,23 @@ class Mosviz(ConfigHelper, LineListMixin):
             except IncompatibleAttribute:
                 sp1_val = None
             else:
-                sp1 = self._app.data_collection[sp1_name].get_object()
-                sp1_val = getattr(sp1, attr, None)
+                if self._lazy_rows.is_loaded(sp1_name):
+                    sp1 = self._app.data_collection[sp1_name].get_object()
+                    sp1_val = getattr(sp1, attr, None)
+                else:
+                    # not read yet (see LazyRowLoader)
+                    sp1_val = None
 
             try:
                 sp2_name = table_data['2D Spectra'][row]
             except IncompatibleAttribute:
                 sp2_val = None
             else:
-                sp2 = self._app.data_collection[sp2_name].get_object()
-                sp2_val = getattr(sp2, attr, sp1_val)
+                if self._lazy_rows.is_loaded(sp2_name):
+                    sp2 = self._app.data_collection[sp2_name].get_object()
+                    sp2_val = getattr(sp2, attr, sp1_val)
+                else:
+                    sp2_val = sp1_val
 
             if sp1_val is not None and sp1_val != sp2_val:
                 # then there was a conflict
@@ -275,7 +294,7 @@ class Mosviz(ConfigHelper, LineListMixin):
 
     def load_data(self, spectra_1d=None, spectra_2d=None, images=None,
                   spectra_1d_label=None, spectra_2d_label=None,
-                  images_label=None, directory=None, instrument=None):
+                  images_label=None, directory=None, instrument=None, lazy=False):
         """
         Load and parse a set of MOS spectra and images.
 
@@ -318,6 +337,13 @@ class Mosviz(ConfigHelper, LineListMixin):
 
         instrument : {'niriss', 'nircam', 'nirspec'}, optional
             Required and only used if ``directory`` is specified. Value is not case sensitive.
+
+        lazy : bool, optional
+            If `True`, spectra and images given as lists of file paths (one per row), or in
+            a NIRSpec ``directory``, are only read when their row is selected in the table.
+            The neighbouring rows are read ahead in the background, and the data of rows
+            far from the selected row are released again.  Table columns that are taken
+            from the metadata are read from the FITS headers.
         """
         # Link data after everything is loaded
         self._app.auto_link = False
@@ -340,7 +366,8 @@ class Mosviz(ConfigHelper, LineListMixin):
                         "Ambiguous MOS Instrument: Only JWST NIRSpec, NIRCam, and "
                         f"NIRISS folder parsing are currently supported but got '{instrument}'")
                 if instrument == "nirspec":
-                    super().load_data(directory, parser_reference="mosviz-nirspec-directory-parser")
+                    super().load_data(directory, parser_reference="mosviz-nirspec-directory-parser",
+                                      lazy=lazy)
                 else:  # niriss or nircam
                     self.load_jwst_directory(directory, instrument=instrument)
             else:
@@ -350,8 +377,8 @@ class Mosviz(ConfigHelper, LineListMixin):
 
         elif (spectra_1d is not None and spectra_2d is not None
                 and images is not None):
-            n_specs = self.load_1d_spectra(spectra_1d, spectra_1d_label)
-            self.load_2d_spectra(spectra_2d, spectra_2d_label)
+            n_specs = self.load_1d_spectra(spectra_1d, spectra_1d_label, lazy=lazy)
+            self.load_2d_spectra(spectra_2d, spectra_2d_label, lazy=lazy)
 
             # If we have a single image for multiple spectra, tell the table viewer.
             if single_image:
@@ -360,19 +387,19 @@ class Mosviz(ConfigHelper, LineListMixin):
                 if n_specs > 1:
                     self.load_images(images, images_label, share_image=n_specs)
                 else:
-                    self.load_images(images, images_label)
+                    self.load_images(images, images_label, lazy=lazy)
             else:
-                self.load_images(images, images_label)
+                self.load_images(images, images_label, lazy=lazy)
 
             self.load_metadata()
 
         elif spectra_1d is not None and spectra_2d is not None:
-            self.load_1d_spectra(spectra_1d, spectra_1d_label)
-            self.load_2d_spectra(spectra_2d, spectra_2d_label)
+            self.load_1d_spectra(spectra_1d, spectra_1d_label, lazy=lazy)
+            self.load_2d_spectra(spectra_2d, spectra_2d_label, lazy=lazy)
             self.load_metadata()
 
         elif spectra_1d and images:
-            n_specs = self.load_1d_spectra(spectra_1d, spectra_1d_label)
+            n_specs = self.load_1d_spectra(spectra_1d, spectra_1d_label, lazy=lazy)
 
             # If we have a single image for multiple spectra, tell the table viewer.
             if single_image:
@@ -381,14 +408,14 @@ class Mosviz(ConfigHelper, LineListMixin):
                 if n_specs > 1:
                     self.load_images(images, images_label, share_image=n_specs)
                 else:
-                    self.load_images(images, images_label)
+                    self.load_images(images, images_label, lazy=lazy)
             else:
-                self.load_images(images, images_label)
+                self.load_images(images, images_label, lazy=lazy)
 
             allow_link_table = False
 
         elif spectra_2d and images:
-            n_specs = self.load_2d_spectra(spectra_2d, spectra_2d_label)
+            n_specs = self.load_2d_spectra(spectra_2d, spectra_2d_label, lazy=lazy)
 
             # If we have a single image for multiple spectra, tell the table viewer.
             if single_image:
@@ -397,18 +424,18 @@ class Mosviz(ConfigHelper, LineListMixin):
                 if n_specs > 1:
                     self.load_images(images, images_label, share_image=n_specs)
                 else:
-                    self.load_images(images, images_label)
+                    self.load_images(images, images_label, lazy=lazy)
             else:
-                self.load_images(images, images_label)
+                self.load_images(images, images_label, lazy=lazy)
 
             allow_link_table = False
 
         elif spectra_1d:
-            self.load_1d_spectra(spectra_1d, spectra_1d_label)
+            self.load_1d_spectra(spectra_1d, spectra_1d_label, lazy=lazy)
             allow_link_table = False
 
         elif spectra_2d:
-            self.load_2d_spectra(spectra_2d, spectra_2d_label)
+            self.load_2d_spectra(spectra_2d, spectra_2d_label, lazy=lazy)
             allow_link_table = False
 
         else:
@@ -508,7 +535,8 @@ class Mosviz(ConfigHelper, LineListMixin):
         """
         self._app.load_data(file_obj=None, parser_reference="mosviz-metadata-parser")
 
-    def load_1d_spectra(self, data_obj, data_labels=None, add_redshift_column=False):
+    def load_1d_spectra(self, data_obj, data_labels=None, add_redshift_column=False,
+                        lazy=False):
         """
         Load and parse a set of 1D spectra objects.
 
@@ -524,6 +552,8 @@ class Mosviz(ConfigHelper, LineListMixin):
             for each item in ``data_obj`` if  ``data_obj`` is a list.
         add_redshift_column : bool
             Add redshift column to Mosviz table.
+        lazy : bool
+            Only read files when their row is selected, see :meth:`load_data`.
 
         Returns
         -------
@@ -531,12 +561,13 @@ class Mosviz(ConfigHelper, LineListMixin):
             Number of data objects loaded.
 
         """
-        n_specs = mos_spec1d_parser(self._app, data_obj, data_labels=data_labels)
+        n_specs = mos_spec1d_parser(self._app, data_obj, data_labels=data_labels, lazy=lazy)
         if add_redshift_column:
             self._add_redshift_column()
         return n_specs
 
-    def load_2d_spectra(self, data_obj, data_labels=None, add_redshift_column=False):
+    def load_2d_spectra(self, data_obj, data_labels=None, add_redshift_column=False,
+                        lazy=False):
         """
         Load and parse a set of 2D spectra objects.
 
@@ -552,6 +583,8 @@ class Mosviz(ConfigHelper, LineListMixin):
             for each item in ``data_obj`` if  ``data_obj`` is a list.
         add_redshift_column : bool
             Add redshift column to Mosviz table.
+        lazy : bool
+            Only read files when their row is selected, see :meth:`load_data`.
 
         Returns
         -------
@@ -559,7 +592,7 @@ class Mosviz(ConfigHelper, LineListMixin):
             Number of data objects loaded.
 
         """
-        n_specs = mos_spec2d_parser(self._app, data_obj, data_labels=data_labels)
+        n_specs = mos_spec2d_parser(self._app, data_obj, data_labels=data_labels, lazy=lazy)
         if add_redshift_column:
             self._add_redshift_column()
         return n_specs
@@ -577,7 +610,8 @@ class Mosviz(ConfigHelper, LineListMixin):
 
         self._app.auto_link = True
 
-    def load_images(self, data_obj, data_labels=None, share_image=0, add_redshift_column=False):
+    def load_images(self, data_obj, data_labels=None, share_image=0, add_redshift_column=False,
+                    lazy=False):
         """
         Load and parse a set of image objects. If providing a file path, it
         must be readable by ``astropy.io.fits``.
@@ -600,9 +634,11 @@ class Mosviz(ConfigHelper, LineListMixin):
             spectra.
         add_redshift_column : bool
             Add redshift column to Mosviz table.
+        lazy : bool
+            Only read files when their row is selected, see :meth:`load_data`.
         """
         super().load_data(data_obj, parser_reference="mosviz-image-parser",
-                          data_labels=data_labels, share_image=share_image)
+                          data_labels=data_labels, share_image=share_image, lazy=lazy)
         if add_redshift_column:
             self._add_redshift_column()
 
@@ -909,6 +945,7 @@ class Mosviz(ConfigHelper, LineListMixin):
             raise ValueError(f"row must be between 0 and {len(data_labels)-1}")
 
         data_label = data_labels[row]
+        self._lazy_rows.materialize(row)
         spectra = self._app.data_collection[data_label].get_object()
         if not apply_slider_redshift:
             return spectra
@@ -0,0 +1,240 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from astropy.io import fits
+
+from jdaviz.configs.mosviz.plugins.parsers import _link_1d_2d
+from jdaviz.utils import standardize_metadata, PRIHDR_KEY
+
+__all__ = ['LazyRowLoader']
+
+
+class _Placeholder:
+    """
+    A file in one column of a row of the MOS table, which is only read when needed.
+
+    Parameters
+    ----------
+    row : int
+        Row of the MOS table.
+    column : str
+        Column of the MOS table, e.g. ``'1D Spectra'``.
+    filename : str
+        File to read.
+    read : callable
+        Function without arguments returning the object to add to the data collection.
+    ext : int or `None`
+        Extension whose header holds the metadata of the data.  If `None`, the first
+        extension with a 2D image is used.
+    """
+    def __init__(self, row, column, filename, read, ext=1):
+        self.row = row
+        self.column = column
+        self.filename = filename
+        self.read = read
+        self.ext = ext
+        self._meta = None
+
+    @property
+    def meta(self):
+        """Metadata from the FITS headers, without reading the data."""
+        if self._meta is None:
+            # HDUs (and their data) are only read from disk when accessed
+            with fits.open(self.filename) as hdulist:
+                ext = self.ext
+                if ext is None:
+                    ext = next((i for i, hdu in enumerate(hdulist)
+                                if hdu.header.get('NAXIS', 0) == 2), 0)
+                header = hdulist[ext].header if ext < len(hdulist) else fits.Header()
+                meta = standardize_metadata(header)
+                meta[PRIHDR_KEY] = standardize_metadata(hdulist[0].header)
+            meta['mosviz_row'] = self.row
+            self._meta = meta
+        return self._meta
+
+
+class LazyRowLoader:
+    """
+    Placeholders for the data of the rows of the MOS table, which are only read and added
+    to the data collection when their row is selected.
+
+    When a row is selected, the files of the ``prefetch`` rows on either side of it are read
+    in a background thread, so that stepping through the table does not wait on disk, and
+    the data of rows more than ``keep`` rows away are removed from the data collection (they
+    are read again if their row is selected later).
+
+    Parameters
+    ----------
+    app : `~jdaviz.app.PrivateApplication`
+        The application-level object.
+    prefetch : int
+        Number of neighbouring rows on either side of the selected row to read ahead.
+    keep : int
+        Rows up to this many rows away from the selected row are kept loaded.
+    """
+    def __init__(self, app, prefetch=1, keep=2):
+        self.app = app
+        self.prefetch = prefetch
+        self.keep = max(keep, prefetch)
+        # data label: _Placeholder
+        self._placeholders = {}
+        # data label: future of the object read in the background
+        self._prefetched = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __contains__(self, label):
+        return label in self._placeholders
+
+    def __len__(self):
+        return len(self._placeholders)
+
+    def register(self, label, row, column, filename, read, ext=1):
+        """
+        Register a placeholder for data that is read by ``read`` when ``row`` is selected.
+        See ``_Placeholder`` for the parameters.
+        """
+        self._placeholders[label] = _Placeholder(row, column, filename, read, ext=ext)
+
+    def is_loaded(self, label):
+        """Whether data with this label is in the data collection."""
+        return label in self.app.data_collection
+
+    def meta(self, label):
+        """Metadata of the data with this label, without loading it if it is a placeholder."""
+        if self.is_loaded(label) or label not in self._placeholders:
+            return self.app.data_collection[label].meta
+        return self._placeholders[label].meta
+
+    def _labels(self, row):
+        return [label for label, placeholder in self._placeholders.items()
+                if placeholder.row == row]
+
+    @property
+    def _n_rows(self):
+        return max(placeholder.row for placeholder in self._placeholders.values()) + 1
+
+    def _distance(self, row, other_row):
+        # the table wraps around when stepping past either end
+        distance = abs(row - other_row)
+        return min(distance, self._n_rows - distance)
+
+    def _read(self, label):
+        with self._lock:
+            future = self._prefetched.pop(label, None)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception:  # nosec
+                # read again below, to raise any error in the calling thread
+                pass
+        return self._placeholders[label].read()
+
+    def materialize(self, row):
+        """
+        Read the data of a row that are not loaded yet and add them to the data collection.
+
+        Parameters
+        ----------
+        row : int
+            Row of the MOS table.
+
+        Returns
+        -------
+        labels : list of str
+            Labels of the data that were added.
+        """
+        labels = [label for label in self._labels(row) if not self.is_loaded(label)]
+        if not len(labels):
+            return []
+
+        # these are linked to the rest of their row below, rather than automatically
+        auto_link = self.app.auto_link
+        self.app.auto_link = False
+        try:
+            with self.app.data_collection.delay_link_manager_update():
+                for label in labels:
+                    data = self._read(label)
+                    if self._placeholders[label].column == '2D Spectra':
+                        self.app.data_collection[label] = data
+                    else:
+                        self.app.add_data(data, label, notify_done=False)
+                _link_row(self.app, row)
+        finally:
+            self.app.auto_link = auto_link
+        return labels
+
+    def prefetch_around(self, row):
+        """
+        Read the data of the rows next to ``row`` in a background thread.
+
+        Parameters
+        ----------
+        row : int
+            Row of the MOS table.
+        """
+        if not len(self._placeholders) or self.prefetch < 1:
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+        n_rows = self._n_rows
+        for offset in range(1, self.prefetch + 1):
+            for neighbour in ((row + offset) % n_rows, (row - offset) % n_rows):
+                for label in self._labels(neighbour):
+                    with self._lock:
+                        if self.is_loaded(label) or label in self._prefetched:
+                            continue
+                        self._prefetched[label] = self._executor.submit(
+                            self._placeholders[label].read)
+
+    def evict_far_from(self, row):
+        """
+        Remove the data of rows more than ``keep`` rows away from ``row`` from the data
+        collection (and discard what was read ahead for them), unless shown in a viewer.
+
+        Parameters
+        ----------
+        row : int
+            Row of the MOS table.
+
+        Returns
+        -------
+        labels : list of str
+            Labels of the data that were removed.
+        """
+        in_viewers = {layer.layer.label for viewer in self.app._viewer_store.values()
+                      for layer in viewer.layers}
+        evicted = []
+        for label, placeholder in self._placeholders.items():
+            if self._distance(row, placeholder.row) <= self.keep:
+                continue
+            with self._lock:
+                future = self._prefetched.pop(label, None)
+            if future is not None:
+                future.cancel()
+            if self.is_loaded(label) and label not in in_viewers:
+                self.app.data_collection.remove(self.app.data_collection[label])
+                evicted.append(label)
+        return evicted
+
+    def clear(self):
+        """Forget all placeholders and anything read ahead."""
+        with self._lock:
+            for future in self._prefetched.values():
+                future.cancel()
+            self._prefetched = {}
+        self._placeholders = {}
+
+
+def _link_row(app, row):
+    if 'MOS Table' not in app.data_collection:
+        return
+    mos_data = app.data_collection['MOS Table']
+    columns = [comp.label for comp in mos_data.main_components]
+    if '1D Spectra' not in columns or '2D Spectra' not in columns:
+        return
+    link = _link_1d_2d(app, mos_data.get_component('1D Spectra').data[row],
+                       mos_data.get_component('2D Spectra').data[row])
+    if link is not None:
+        app.data_collection.add_link(link)
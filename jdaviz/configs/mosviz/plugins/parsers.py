@@ -1,6 +1,7 @@
 from collections.abc import Iterable
 import csv
 import os
+from functools import partial
 from pathlib import Path
 import warnings
 
@@ -107,10 +108,36 @@ def _fields_from_ecsv(fname, fields, delimiter=","):
     return parsed_fields
 
 
+def _link_1d_2d(app, spec_1d, spec_2d):
+    """
+    Link the spectral axis of a 1D spectrum to that of the 2D spectrum in the same row,
+    or return `None` if either is not loaded (see ``LazyRowLoader``).
+    """
+    dc = app.session.data_collection
+    if spec_1d not in dc or spec_2d not in dc:
+        return None
+    return LinkSameWithUnits(dc[spec_1d].world_component_ids[0],
+                             dc[spec_2d].world_component_ids[1])
+
+
+def _lazy_rows(app, lazy):
+    """The ``LazyRowLoader`` of the Mosviz helper, if ``lazy`` and available."""
+    if not lazy:
+        return None
+    return getattr(app._jdaviz_helper, '_lazy_rows', None)
+
+
+def _is_file_list(data_obj):
+    # lazily loaded rows need one file per row
+    return (isinstance(data_obj, (list, tuple)) and len(data_obj) > 0
+            and all(_check_is_file(x) for x in data_obj))
+
+
 @data_parser_registry("mosviz-link-data")
 def link_data_in_table(app, data_obj=None):
     """
-    Batch links data in the mosviz table viewer.
+    Batch links data in the mosviz table viewer.  Rows that are not loaded yet are
+    linked when they are loaded.
 
     Parameters
     ----------
@@ -132,15 +159,10 @@ def link_data_in_table(app, data_obj=None):
         spectra_2d = mos_data.get_component('2D Spectra').data
 
         # Link each 1D spectrum with its corresponding 2D spectrum
-        for index in range(len(spectra_1d)):
-
-            spec_1d = spectra_1d[index]
-            spec_2d = spectra_2d[index]
-
-            wc_spec_1d = app.session.data_collection[spec_1d].world_component_ids
-            wc_spec_2d = app.session.data_collection[spec_2d].world_component_ids
-
-            wc_spec_ids.append(LinkSameWithUnits(wc_spec_1d[0], wc_spec_2d[1]))
+        for spec_1d, spec_2d in zip(spectra_1d, spectra_2d):
+            link = _link_1d_2d(app, spec_1d, spec_2d)
+            if link is not None:
+                wc_spec_ids.append(link)
 
     # Use delay_link_manager_update() to prevent widget trait modification during iteration
     with app.session.data_collection.delay_link_manager_update():
@@ -148,7 +170,7 @@ def link_data_in_table(app, data_obj=None):
 
 
 @data_parser_registry("mosviz-nirspec-directory-parser")
-def mos_nirspec_directory_parser(app, data_obj, data_labels=None):
+def mos_nirspec_directory_parser(app, data_obj, data_labels=None, lazy=False):
 
     spectra_1d = []
     spectra_2d = []
@@ -162,8 +184,8 @@ def mos_nirspec_directory_parser(app, data_obj, data_labels=None):
         elif 's2d' in file_path:
             spectra_2d.append(file_path)
 
-    n_specs = mos_spec1d_parser(app, spectra_1d)
-    mos_spec2d_parser(app, spectra_2d)
+    n_specs = mos_spec1d_parser(app, spectra_1d, lazy=lazy)
+    mos_spec2d_parser(app, spectra_2d, lazy=lazy)
 
     # Load images, if present
     image_path = None
@@ -189,7 +211,7 @@ def mos_nirspec_directory_parser(app, data_obj, data_labels=None):
                 kwargs = {}
             mos_image_parser(app, str(images[0]), **kwargs)
         elif n_images == n_specs:
-            mos_image_parser(app, list(map(str, images)))
+            mos_image_parser(app, list(map(str, images)), lazy=lazy)
         else:
             app.hub.broadcast(SnackbarMessage(
                 "The number of images in this directory does not match the "
@@ -201,7 +223,7 @@ def mos_nirspec_directory_parser(app, data_obj, data_labels=None):
 
 @data_parser_registry("mosviz-spec1d-parser")
 def mos_spec1d_parser(app, data_obj, data_labels=None,
-                      table_viewer_reference_name='table-viewer'):
+                      table_viewer_reference_name='table-viewer', lazy=False):
     """
     Attempts to parse a 1D spectrum object.
 
@@ -214,6 +236,9 @@ def mos_spec1d_parser(app, data_obj, data_labels=None,
         the mosviz table.
     data_labels : str, optional
         The label applied to the glue data component.
+    lazy : bool, optional
+        If `True` and ``data_obj`` is a list of file paths (one per row), the files
+        are only read when their row is selected (see ``LazyRowLoader``).
 
     Returns
     -------
@@ -224,6 +249,27 @@ def mos_spec1d_parser(app, data_obj, data_labels=None,
     if isinstance(data_labels, str):
         data_labels = [data_labels]
 
+    lazy_rows = _lazy_rows(app, lazy)
+    if lazy_rows is not None and _is_file_list(data_obj):
+        if data_labels is None:
+            data_labels = [f"1D Spectrum {i}" for i in range(len(data_obj))]
+        elif len(data_obj) != len(data_labels):
+            data_labels = [f"{data_labels[0]} {i}" for i in range(len(data_obj))]
+
+        def read(filename, row):
+            spec = Spectrum.read(filename)
+            # Make metadata layout conform with other viz.
+            spec.meta = standardize_metadata(spec.meta)
+            spec.meta['mosviz_row'] = row
+            return spec
+
+        for i, (filename, cur_label) in enumerate(zip(data_obj, data_labels)):
+            lazy_rows.register(cur_label, i, '1D Spectra', filename, partial(read, filename, i))
+
+        _add_to_table(app, data_labels, '1D Spectra',
+                      table_viewer_reference_name=table_viewer_reference_name)
+        return len(data_obj)
+
     # Coerce into list if needed
     if not isinstance(data_obj, (list, tuple, SpectrumCollection)):
         data_obj = [data_obj]
@@ -262,7 +308,7 @@ def mos_spec1d_parser(app, data_obj, data_labels=None,
 @data_parser_registry("mosviz-spec2d-parser")
 def mos_spec2d_parser(app, data_obj, data_labels=None, add_to_table=True,
                       show_in_viewer=False, ext=1, transpose=False,
-                      cache=None, local_path=None, timeout=None):
+                      cache=None, local_path=None, timeout=None, lazy=False):
     """
     Attempts to parse a 2D spectrum object.
 
@@ -295,6 +341,9 @@ def mos_spec2d_parser(app, data_obj, data_labels=None, add_to_table=True,
         remote requests in seconds (passed to
         `~astropy.utils.data.download_file` or
         `~astroquery.mast.Conf.timeout`).
+    lazy : bool, optional
+        If `True` and ``data_obj`` is a list of file paths (one per row), the files
+        are only read when their row is selected (see ``LazyRowLoader``).
 
     Returns
     -------
@@ -334,13 +383,48 @@ def mos_spec2d_parser(app, data_obj, data_labels=None, add_to_table=True,
 
         return Spectrum(flux=data * data_unit, meta=metadata, **kw)
 
+    def _read(data, index):
+        # If we got a filepath, first try and parse using the Spectrum and
+        # SpectrumList parsers, and then fall back to parsing it as a generic
+        # FITS file.
+
+        # try parsing file_obj as a URI/URL:
+        data = download_uri_to_path(data, cache=cache, local_path=local_path, timeout=timeout)
+
+        if _check_is_file(data):
+            try:
+                if ext != 1 or transpose:
+                    with fits.open(data) as hdulist:
+                        data = _parse_as_spectrum1d(hdulist, ext, transpose)
+                else:
+                    data = Spectrum.read(data)
+            except IORegistryError:
+                with fits.open(data) as hdulist:
+                    data = _parse_as_spectrum1d(hdulist, ext, transpose)
+        elif isinstance(data, fits.HDUList):
+            data = _parse_as_spectrum1d(data, ext, transpose)
+
+        # Make metadata layout conform with other viz.
+        data.meta = standardize_metadata(data.meta)
+
+        # Set the instrument
+        # TODO: this should not be set to nirspec for all datasets
+        data.meta['INSTRUME'] = 'nirspec'
+
+        data.meta['mosviz_row'] = index
+        return data
+
+    lazy_rows = _lazy_rows(app, lazy)
+    lazy_rows = lazy_rows if (lazy_rows is not None and _is_file_list(data_obj)) else None
+
     # Coerce into list-like object
     if (not isinstance(data_obj, (list, tuple, SpectrumCollection)) or
             isinstance(data_obj, fits.HDUList)):
         data_obj = [data_obj]
 
     # See if this is a multi s2d file
-    if app.config == "mosviz" and len(data_obj) == 1 and _check_is_file(data_obj[0]):
+    if (lazy_rows is None and app.config == "mosviz" and len(data_obj) == 1
+            and _check_is_file(data_obj[0])):
         if identify_jwst_s2d_multi_fits("test", data_obj[0]):
             data_obj = SpectrumList.read(data_obj[0])
 
@@ -358,37 +442,13 @@ def mos_spec2d_parser(app, data_obj, data_labels=None, add_to_table=True,
 
     with app.data_collection.delay_link_manager_update():
         for index, data in enumerate(data_obj):
-            # If we got a filepath, first try and parse using the Spectrum and
-            # SpectrumList parsers, and then fall back to parsing it as a generic
-            # FITS file.
-
-            # try parsing file_obj as a URI/URL:
-            data = download_uri_to_path(data, cache=cache, local_path=local_path, timeout=timeout)
-
-            if _check_is_file(data):
-                try:
-                    if ext != 1 or transpose:
-                        with fits.open(data) as hdulist:
-                            data = _parse_as_spectrum1d(hdulist, ext, transpose)
-                    else:
-                        data = Spectrum.read(data)
-                except IORegistryError:
-                    with fits.open(data) as hdulist:
-                        data = _parse_as_spectrum1d(hdulist, ext, transpose)
-            elif isinstance(data, fits.HDUList):
-                data = _parse_as_spectrum1d(data, ext, transpose)
-
-            # Make metadata layout conform with other viz.
-            data.meta = standardize_metadata(data.meta)
-
-            # Set the instrument
-            # TODO: this should not be set to nirspec for all datasets
-            data.meta['INSTRUME'] = 'nirspec'
-
-            data.meta['mosviz_row'] = index
             # Get the corresponding label for this data product
             label = data_labels[index]
-            app.data_collection[label] = data
+            if lazy_rows is not None:
+                lazy_rows.register(label, index, '2D Spectra', data,
+                                   partial(_read, data, index), ext=ext)
+                continue
+            app.data_collection[label] = _read(data, index)
 
         if add_to_table:
             _add_to_table(
@@ -414,7 +474,7 @@ def _load_fits_image_from_filename(filename, app):
 
 @data_parser_registry("mosviz-image-parser")
 def mos_image_parser(app, data_obj, data_labels=None, share_image=0,
-                     image_viewer_reference_name="image-viewer"):
+                     image_viewer_reference_name="image-viewer", lazy=False):
     """
     Attempts to parse an image-like object or list of images.
 
@@ -433,11 +493,35 @@ def mos_image_parser(app, data_obj, data_labels=None, share_image=0,
         different row in the table does not reload the displayed image.
         Currently, if non-zero, the provided number must match the number of
         spectra.
+    lazy : bool, optional
+        If `True` and ``data_obj`` is a list of file paths (one per row), the files
+        are only read when their row is selected (see ``LazyRowLoader``).  Only the
+        first image in each file is loaded.
     """
 
     if data_obj is None:
         return
 
+    lazy_rows = _lazy_rows(app, lazy)
+    if lazy_rows is not None and share_image == 0 and _is_file_list(data_obj):
+        if data_labels is None:
+            data_labels = [f"Image {i}" for i in range(len(data_obj))]
+        elif isinstance(data_labels, str):
+            data_labels = [f"{data_labels} {i}" for i in range(len(data_obj))]
+
+        def read(filename, label, row):
+            data = _load_fits_image_from_filename(filename, app)[0]
+            data.label = label
+            data.meta['mosviz_row'] = row
+            return data
+
+        for i, (filename, label) in enumerate(zip(data_obj, data_labels)):
+            lazy_rows.register(label, i, 'Images', filename, partial(read, filename, label, i),
+                               ext=None)
+
+        _add_to_table(app, data_labels, 'Images')
+        return
+
     # The label does not matter here. We overwrite later.
     if isinstance(data_obj, str):
         data_obj = _load_fits_image_from_filename(data_obj, app)
@@ -574,8 +658,13 @@ def query_metadata_by_component(app, keys, data_type, fallback=FALLBACK_NAME):
     if not isinstance(keys, Iterable) or isinstance(keys, str):
         keys = [keys]
 
+    lazy_rows = getattr(app._jdaviz_helper, '_lazy_rows', None)
     for data in app._jdaviz_helper.get_column(data_type):
-        meta = app.data_collection[data].meta
+        if lazy_rows is not None and data in lazy_rows:
+            # from the headers, rather than loading the data
+            meta = lazy_rows.meta(data)
+        else:
+            meta = app.data_collection[data].meta
 
         # Search all given keys to see if they exist. Return the first hit
         key_found = False
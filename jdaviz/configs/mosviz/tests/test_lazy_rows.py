@@ -0,0 +1,52 @@
+from astropy.io import fits
+
+from jdaviz.conftest import _generate_mos_spectrum2d
+
+
+def _write_rows(tmp_path, spectrum1d, n_rows):
+    data, header = _generate_mos_spectrum2d()
+    spectra_1d, spectra_2d = [], []
+    for i in range(n_rows):
+        spectra_1d.append(str(tmp_path / f"row{i}_x1d.fits"))
+        spectrum1d.write(spectra_1d[-1], format='tabular-fits')
+
+        hdu = fits.ImageHDU(data.value, name='SCI')
+        hdu.header.update(header)
+        hdu.header['FILTER'] = f'F{i}'
+        hdu.header['GRATING'] = 'PRISM'
+        spectra_2d.append(str(tmp_path / f"row{i}_s2d.fits"))
+        fits.HDUList([fits.PrimaryHDU(), hdu]).writeto(spectra_2d[-1])
+    return spectra_1d, spectra_2d
+
+
+def test_lazy_rows(mosviz_helper, mos_spectrum1d, tmp_path):
+    n_rows = 10
+    spectra_1d, spectra_2d = _write_rows(tmp_path, mos_spectrum1d, n_rows)
+    mosviz_helper.load_data(spectra_1d=spectra_1d, spectra_2d=spectra_2d, lazy=True)
+
+    dc = mosviz_helper._app.data_collection
+    lazy_rows = mosviz_helper._lazy_rows
+    assert len(lazy_rows) == 2 * n_rows
+    assert len(mosviz_helper.get_column('1D Spectra')) == n_rows
+    # only the selected (first) row was read
+    assert sorted(dc.labels) == ['1D Spectrum 0', '2D Spectrum 0', 'MOS Table']
+    # the table is filled from the headers
+    assert mosviz_helper.get_column('Filter/Grating')[3] == 'F3/PRISM'
+
+    table = mosviz_helper._app.get_viewer(mosviz_helper._default_table_viewer_reference_name)
+    table.widget_table.vue_on_row_clicked(4)
+
+    assert lazy_rows.is_loaded('1D Spectrum 4')
+    assert lazy_rows.is_loaded('2D Spectrum 4')
+    # more than two rows away from the selected row, and no longer in a viewer
+    assert not lazy_rows.is_loaded('1D Spectrum 0')
+    assert not lazy_rows.is_loaded('2D Spectrum 0')
+
+    spec_viewer = mosviz_helper._app.get_viewer(
+        mosviz_helper._default_spectrum_viewer_reference_name)
+    assert [layer.layer.label for layer in spec_viewer.layers] == ['1D Spectrum 4']
+    assert mosviz_helper.get_data('1D Spectrum 4').flux.shape == mos_spectrum1d.flux.shape
+
+    # the evicted row is read again when selected
+    table.widget_table.vue_on_row_clicked(0)
+    assert lazy_rows.is_loaded('1D Spectrum 0')
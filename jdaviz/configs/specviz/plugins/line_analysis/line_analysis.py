@@ -6,9 +6,12 @@ from glue.core.message import (SubsetDeleteMessage,
 from glue_jupyter.common.toolbar_vuetify import read_icon
 from traitlets import Bool, List, Float, Unicode, observe
 from astropy import units as u
+from astropy.nddata import CCDData, StdDevUncertainty
+from astropy.wcs import WCS
 from specutils import analysis, Spectrum
 
 from jdaviz.configs.specviz.plugins.viewers import Spectrum1DViewer
+from jdaviz.core.cube_reduction import line_statistics
 from jdaviz.core.events import (AddDataMessage,
                                 RemoveDataMessage,
                                 SpectralMarksChangedMessage,
@@ -21,6 +24,8 @@ from jdaviz.core.events import (AddDataMessage,
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
                                         DatasetSelectMixin,
+                                        DatasetSelect,
+                                        AddResultsMixin,
                                         TableMixin,
                                         SpectralSubsetSelectMixin,
                                         DatasetSpectralSubsetValidMixin,
@@ -45,7 +50,7 @@ FUNCTIONS = {"Line Flux": analysis.line_flux,
 @tray_registry('specviz-line-analysis', label="Line Analysis", category="data:analysis")
 class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
                    SpectralSubsetSelectMixin, DatasetSpectralSubsetValidMixin,
-                   SpectralContinuumMixin, CustomToolbarToggleMixin):
+                   SpectralContinuumMixin, CustomToolbarToggleMixin, AddResultsMixin):
     """
     The Line Analysis plugin returns specutils analysis for a single spectral line.
     See the :ref:`Line Analysis Plugin Documentation <line-analysis>` for more details.
@@ -69,6 +74,10 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
       only.
     * :meth:`get_results`
     * :meth:`~jdaviz.core.template_mixin.TableMixin.export_table`
+    * ``cube`` (:class:`~jdaviz.core.template_mixin.DatasetSelect`):
+      Cube to use for spatially resolved maps of the line statistics (Cubeviz only).
+    * ``add_results`` (:class:`~jdaviz.core.template_mixin.AddResults`)
+    * :meth:`calculate_maps`
 
     """
     dialog = Bool(False).tag(sync=True)
@@ -87,6 +96,9 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
     selected_line = Unicode("").tag(sync=True)
     selected_line_redshift = Float(0).tag(sync=True)
 
+    cube_items = List().tag(sync=True)
+    cube_selected = Unicode().tag(sync=True)
+
     def __init__(self, *args, **kwargs):
 
         super().__init__(**kwargs)
@@ -105,6 +117,13 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
         # continuum selection is mandatory for line-analysis
         self._continuum_remove_none_option()
 
+        # cube for spatially resolved maps of the statistics, sharing the line and
+        # continuum regions defined for the spectrum in ``dataset``
+        self.cube = DatasetSelect(self, 'cube_items', 'cube_selected',
+                                  filters=['is_flux_cube'])
+        self.results_label_default = 'line map'
+        self.add_results.viewer.filters = ['is_image_viewer']
+
         def custom_toolbar(viewer):
             if isinstance(viewer, Spectrum1DViewer):
                 return viewer.toolbar._original_tools_nested[:3] + [['jdaviz:selectline']], 'jdaviz:selectline'  # noqa
@@ -167,7 +186,8 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
     def user_api(self):
         return PluginUserApi(self, expose=('dataset', 'spectral_subset',
                                            'continuum', 'continuum_width', 'get_results',
-                                           'export_table'))
+                                           'export_table', 'cube', 'add_results',
+                                           'calculate_maps'))
 
     @property
     def line_items(self):
@@ -304,10 +324,135 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
     def vue_calculate_results(self, *args):
         self.get_results(add_to_table=True)
 
+    @with_spinner()
+    def calculate_maps(self, add_data=True):
+        """
+        Compute the line statistics for every spaxel of ``cube`` at once.
+
+        The line and continuum regions are the same as for the spectrum in ``dataset``,
+        with the linear continuum fitted to all spaxels together.  Spaxels with masked
+        values are computed one at a time to match the results for a single spectrum.
+
+        Parameters
+        ----------
+        add_data : bool
+            Whether to add the resulting maps (without their uncertainties) to the app
+            according to ``add_results``, labeled by the name of the statistic appended
+            to ``add_results.label``.
+
+        Returns
+        -------
+        dict
+            `~astropy.nddata.CCDData` map (with the uncertainty, if available) keyed by the
+            name of the statistic.
+        """
+        if self.cube_selected == '':
+            raise ValueError("no cube selected for line analysis maps")
+        if not self.spectral_subset_valid:
+            valid, spec_range, subset_range = self._check_dataset_spectral_subset_valid(return_ranges=True)  # noqa
+            raise ValueError(f"spectral subset '{self.spectral_subset.selected}' {subset_range}"
+                             f" is outside data range of '{self.dataset.selected}' {spec_range}")
+
+        spectrum, continuum, spec_subtracted = self._get_continuum(self.dataset,
+                                                                   self.spectral_subset,
+                                                                   per_pixel=True,
+                                                                   cube_dataset=self.cube)
+        if spectrum is None:
+            raise ValueError("could not compute the continuum for line analysis maps")
+
+        flux_unit, add_flux, line_flux_spectral_axis, final_unit = \
+            self._line_flux_spectral_axis_and_units(spec_subtracted)
+        statistics = line_statistics(spectrum, continuum,
+                                     line_flux_spectral_axis=line_flux_spectral_axis)
+        if add_flux:
+            statistics['Line Flux'] = statistics['Line Flux'] * flux_unit
+        if final_unit is not None:
+            statistics['Line Flux'] = self._to_final_unit(statistics['Line Flux'], final_unit)
+        statistics = {function: coerce_unit(result) for function, result in statistics.items()}
+        values = {function: result.value for function, result in statistics.items()}
+        uncertainties = {function: None if getattr(result, 'uncertainty', None) is None
+                         else result.uncertainty.value
+                         for function, result in statistics.items()}
+
+        if spec_subtracted.mask is not None:
+            # specutils interpolates over (or excises) masked values, which depends on
+            # the mask of each spaxel, so fall back on the single-spectrum statistics
+            axis = spectrum.spectral_axis_index
+            mask = np.moveaxis(np.asarray(spec_subtracted.mask, dtype=bool), axis, -1)
+
+            def spaxel(cube, index):
+                uncertainty = cube.uncertainty
+                if uncertainty is not None:
+                    uncertainty = uncertainty.__class__(
+                        np.moveaxis(uncertainty.array, axis, -1)[index],
+                        unit=uncertainty.unit)
+                return Spectrum(flux=np.moveaxis(cube.flux, axis, -1)[index],
+                                spectral_axis=cube.spectral_axis,
+                                uncertainty=uncertainty,
+                                mask=mask[index])
+
+            for index in zip(*np.nonzero(mask.any(axis=-1))):
+                try:
+                    spaxel_statistics = self._line_statistics(
+                        spaxel(spectrum, index),
+                        np.moveaxis(continuum, axis, -1)[index],
+                        spaxel(spec_subtracted, index))
+                except ValueError:
+                    spaxel_statistics = {}
+                for function, result in statistics.items():
+                    spaxel_result = spaxel_statistics.get(function)
+                    if spaxel_result is None:
+                        values[function][index] = np.nan
+                        if uncertainties[function] is not None:
+                            uncertainties[function][index] = np.nan
+                        continue
+                    values[function][index] = spaxel_result.to_value(result.unit)
+                    if uncertainties[function] is not None:
+                        spaxel_uncertainty = getattr(spaxel_result, 'uncertainty', None)
+                        uncertainties[function][index] = (
+                            np.nan if spaxel_uncertainty is None
+                            else spaxel_uncertainty.to_value(result.unit))
+
+        # Reattach the celestial WCS of the cube so we can load the maps
+        w = self.cube.selected_dc_item.coords
+        if hasattr(w, 'celestial'):
+            # This is the FITS WCS case
+            data_wcs = getattr(w, 'celestial', None)
+        elif hasattr(w, 'to_fits_sip'):
+            # If it's a GWCS we pull out the celestial part
+            data_wcs = WCS(w.to_fits_sip())
+        else:
+            data_wcs = None
+
+        maps = {}
+        for function, result in statistics.items():
+            uncertainty = uncertainties[function]
+            maps[function] = CCDData(
+                values[function], unit=result.unit, wcs=data_wcs,
+                uncertainty=None if uncertainty is None else StdDevUncertainty(uncertainty))
+            if add_data:
+                # only the values are loaded, an uncertainty would be loaded as a separate entry
+                self.add_results.add_results_from_plugin(
+                    CCDData(values[function], unit=result.unit, wcs=data_wcs),
+                    label=f"{self.results_label}: {function}", format='Image')
+
+        if add_data:
+            self.hub.broadcast(SnackbarMessage(
+                f"{len(maps)} line analysis maps added to data collection",
+                sender=self, color="success"))
+
+        return maps
+
+    def vue_calculate_maps(self, *args):
+        self.calculate_maps(add_data=True)
+
     def _on_plotted_lines_changed(self, msg):
         self.line_marks = msg.marks
-        self.line_menu_items = [{"title": f"{mark.name} {mark.rest_value} {mark.xunit}", "value": name_rest}  # noqa
-                                for mark, name_rest in zip(msg.marks, msg.names_rest)]
+        self.line_menu_items = [{"title": f"{name} {rest_value} {mark.xunit}", "value": name_rest}  # noqa
+                                for mark in msg.marks
+                                for name, rest_value, name_rest in zip(mark.names,
+                                                                       mark.rest_values,
+                                                                       mark.names_rest)]
         if self.selected_line not in self.line_items:
             # default to identified line if available
             self.selected_line = self.identified_line
@@ -321,6 +466,120 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
             # in which case we'll default to the identified line
             self.selected_line = self.identified_line
 
+    def _line_flux_units(self, flux_unit):
+        """
+        Spectral unit in which to integrate the line flux and unit in which to report
+        it, for a spectrum with ``flux_unit`` (both `None` to keep the default
+        specutils result).
+        """
+        solid_angle_in_flux_unit = check_if_unit_is_per_solid_angle(flux_unit,
+                                                                    return_unit=True)
+        if solid_angle_in_flux_unit is None:
+            # use dimensionless_unscaled as a placeholder unit.
+            # is_equivalent() checks won't pass anyway if theres no
+            # solid angle in the unit, so it won't matter what this is
+            solid_angle_in_flux_unit = u.dimensionless_unscaled
+
+        solid_angle_string = solid_angle_in_flux_unit.to_string()
+
+        # If the flux unit is equivalent to Jy, or Jy per spaxel for Cubeviz,
+        # enforce integration in frequency space
+        if (flux_unit.is_equivalent(u.Jy) or
+           flux_unit.is_equivalent(u.Jy / solid_angle_in_flux_unit)):
+            # When flux is equivalent to Jy, lineflux result should be shown in W/m2
+            if flux_unit.is_equivalent(u.Jy/solid_angle_in_flux_unit):
+                return u.Hz, u.Unit(f'W/(m2 {solid_angle_string})')
+            return u.Hz, u.Unit('W/m2')
+
+        # If the flux unit is instead equivalent to power density
+        # (Jy, but defined in wavelength), enforce integration in wavelength space
+        # using MKS unit (meters)
+        if (flux_unit.is_equivalent(u.Unit('W/(m2 m)')) or
+                flux_unit.is_equivalent(u.Unit(f'W/(m2 m {solid_angle_string})'))):
+            if flux_unit.is_equivalent(u.W / (u.m * u.m * u.m * solid_angle_in_flux_unit)):
+                return u.m, u.Unit(f'W/(m2 {solid_angle_string})')
+            return u.m, u.Unit('W/m2')
+
+        # Otherwise, just rely on the default specutils line_flux result
+        return None, None
+
+    def _line_flux_spectral_axis_and_units(self, spectrum):
+        """
+        Flux unit of ``spectrum`` (falling back on the display unit if dimensionless),
+        whether that unit needs to be applied to the line flux, the spectral axis over
+        which to integrate the line flux (`None` for the default) and the final unit.
+        """
+        flux_unit = spectrum.flux.unit
+        if flux_unit == u.dimensionless_unscaled:
+            add_flux = True
+            flux_unit = u.Unit(self.spectrum_viewer.state.y_display_unit)
+        else:
+            add_flux = False
+
+        integration_unit, final_unit = self._line_flux_units(flux_unit)
+        if integration_unit is None:
+            return flux_unit, add_flux, None, None
+        spectral_axis = spectrum.spectral_axis.to(integration_unit, equivalencies=u.spectral())
+        return flux_unit, add_flux, spectral_axis, final_unit
+
+    @staticmethod
+    def _to_final_unit(raw_result, final_unit):
+        temp_result = raw_result.to(final_unit)
+        if getattr(raw_result, 'uncertainty', None) is not None:
+            temp_result.uncertainty = raw_result.uncertainty.to(final_unit)
+        return temp_result
+
+    def _line_statistics(self, spectrum, continuum, spec_subtracted):
+        """
+        Compute all line analysis statistics for a single spectrum.
+
+        Returns a dictionary of results (with their ``uncertainty`` attribute) keyed by the
+        name of the statistic, with `None` for the equivalent width when the continuum is
+        not positive.
+        """
+        if spec_subtracted.mask is not None:
+            # temporary fix while mask may contain None:
+            spec_subtracted.mask = spec_subtracted.mask.astype(bool)
+
+        statistics = {}
+        for function in FUNCTIONS:
+            # TODO: update specutils to allow ALL analysis to take regions and continuum so we
+            # don't need these if statements
+            if function == "Line Flux":
+                flux_unit, add_flux, spectral_axis, final_unit = \
+                    self._line_flux_spectral_axis_and_units(spec_subtracted)
+                if spectral_axis is None:
+                    temp_result = analysis.line_flux(spec_subtracted)
+                else:
+                    integration_spec = Spectrum(spectral_axis=spectral_axis,
+                                                flux=spec_subtracted.flux,
+                                                uncertainty=spec_subtracted.uncertainty)
+                    raw_result = analysis.line_flux(integration_spec)
+                    if add_flux:
+                        raw_result = raw_result * flux_unit
+                    temp_result = self._to_final_unit(raw_result, final_unit)
+
+            elif function == "Equivalent Width":
+                if np.any(continuum <= 0):
+                    statistics[function] = None
+                    continue
+                else:
+                    spec_normalized = spectrum / continuum
+                    if spec_normalized.mask is not None:
+                        spec_normalized.mask = spec_normalized.mask.astype(bool)
+
+                    temp_result = FUNCTIONS[function](spec_normalized)
+            elif function == "Centroid":
+                # TODO: update specutils to be consistent with region vs regions and default to
+                # regions=None so this elif can be removed
+                temp_result = FUNCTIONS[function](spec_subtracted, region=None)
+            else:
+                temp_result = FUNCTIONS[function](spec_subtracted)
+
+            statistics[function] = coerce_unit(temp_result)
+
+        return statistics
+
     @observe("dataset_selected", "spectral_subset_selected",
              "continuum_subset_selected", "continuum_width")
     @with_spinner('results_computing')
@@ -366,130 +625,30 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
             else:
                 return ''
 
-        temp_results = []
-
-        if spec_subtracted.mask is not None:
-            # temporary fix while mask may contain None:
-            spec_subtracted.mask = spec_subtracted.mask.astype(bool)
-
-        for function in FUNCTIONS:
-            # TODO: update specutils to allow ALL analysis to take regions and continuum so we
-            # don't need these if statements
-            if function == "Line Flux":
-                flux_unit = spec_subtracted.flux.unit
-                if flux_unit == u.dimensionless_unscaled:
-                    add_flux = True
-                    flux_unit = u.Unit(self.spectrum_viewer.state.y_display_unit)
-                else:
-                    add_flux = False
-
-                solid_angle_in_flux_unit = check_if_unit_is_per_solid_angle(flux_unit,
-                                                                            return_unit=True)
-                if solid_angle_in_flux_unit is None:
-                    # use dimensionless_unscaled as a placeholder unit.
-                    # is_equivalent() checks won't pass anyway if theres no
-                    # solid angle in the unit, so it won't matter what this is
-                    solid_angle_in_flux_unit = u.dimensionless_unscaled
-
-                solid_angle_string = solid_angle_in_flux_unit.to_string()
-
-                # If the flux unit is equivalent to Jy, or Jy per spaxel for Cubeviz,
-                # enforce integration in frequency space
-                if (flux_unit.is_equivalent(u.Jy) or
-                   flux_unit.is_equivalent(u.Jy / solid_angle_in_flux_unit)):
-                    # Perform integration in frequency space
-                    freq_spec = Spectrum(
-                        spectral_axis=spec_subtracted.spectral_axis.to(u.Hz,
-                                                                       equivalencies=u.spectral()),
-                        flux=spec_subtracted.flux,
-                        uncertainty=spec_subtracted.uncertainty)
-
-                    try:
-                        if add_flux:
-                            raw_result = analysis.line_flux(freq_spec) * flux_unit
-                        else:
-                            raw_result = analysis.line_flux(freq_spec)
-                    except ValueError as e:
-                        # can happen if interpolation out-of-bounds or any error from specutils
-                        # let's avoid the whole app crashing and instead expose the error to the
-                        # user
-                        self.hub.broadcast(SnackbarMessage(
-                            f"failed to calculate line analysis statistics: {e}", sender=self,
-                            color="warning", traceback=e))
-                        self.update_results(None)
-                        return
-
-                    # When flux is equivalent to Jy, lineflux result should be shown in W/m2
-                    if flux_unit.is_equivalent(u.Jy/solid_angle_in_flux_unit):
-                        final_unit = u.Unit(f'W/(m2 {solid_angle_string})')
-                    else:
-                        final_unit = u.Unit('W/m2')
-
-                    temp_result = raw_result.to(final_unit)
-                    if getattr(raw_result, 'uncertainty', None) is not None:
-                        temp_result.uncertainty = raw_result.uncertainty.to(final_unit)
-
-                # If the flux unit is instead equivalent to power density
-                # (Jy, but defined in wavelength), enforce integration in wavelength space
-                elif (flux_unit.is_equivalent(u.Unit('W/(m2 m)')) or
-                        flux_unit.is_equivalent(u.Unit(f'W/(m2 m {solid_angle_string})'))):
-                    # Perform integration in wavelength space using MKS unit (meters)
-                    wave_spec = Spectrum(
-                        spectral_axis=spec_subtracted.spectral_axis.to(u.m,
-                                                                       equivalencies=u.spectral()),
-                        flux=spec_subtracted.flux,
-                        uncertainty=spec_subtracted.uncertainty)
-                    try:
-                        if add_flux:
-                            raw_result = analysis.line_flux(wave_spec) * flux_unit
-                        else:
-                            raw_result = raw_result = analysis.line_flux(wave_spec)
-                    except ValueError as e:
-                        # can happen if interpolation out-of-bounds or any error from specutils
-                        # let's avoid the whole app crashing and instead expose the error to the
-                        # user
-                        self.hub.broadcast(SnackbarMessage(
-                            f"failed to calculate line analysis statistics: {e}", sender=self,
-                            color="warning", traceback=e))
-                        self.update_results(None)
-                        return
-                    # When flux is equivalent to Jy, lineflux result should be shown in W/m2
-                    if flux_unit.is_equivalent(u.W / (u.m * u.m * u.m * solid_angle_in_flux_unit)):
-                        final_unit = u.Unit(f'W/(m2 {solid_angle_string})')
-                    else:
-                        final_unit = u.Unit('W/m2')
-
-                    temp_result = raw_result.to(final_unit)
-                    if getattr(raw_result, 'uncertainty', None) is not None:
-                        temp_result.uncertainty = raw_result.uncertainty.to(final_unit)
-
-                # Otherwise, just rely on the default specutils line_flux result
-                else:
-                    temp_result = analysis.line_flux(spec_subtracted)
-
-            elif function == "Equivalent Width":
-                if np.any(continuum <= 0):
-                    temp_results.append({'function': function,
-                                         'result': '',
-                                         'error_msg': 'N/A (continuum <= 0)',
-                                         'uncertainty': '',
-                                         'unit': ''})
-                    continue
-                else:
-                    spec_normalized = spectrum / continuum
-                    if spec_normalized.mask is not None:
-                        spec_normalized.mask = spec_normalized.mask.astype(bool)
+        try:
+            statistics = self._line_statistics(spectrum, continuum, spec_subtracted)
+        except ValueError as e:
+            # can happen if interpolation out-of-bounds or any error from specutils
+            # let's avoid the whole app crashing and instead expose the error to the
+            # user
+            self.hub.broadcast(SnackbarMessage(
+                f"failed to calculate line analysis statistics: {e}", sender=self,
+                color="warning", traceback=e))
+            self.update_results(None)
+            return
 
-                    temp_result = FUNCTIONS[function](spec_normalized)
-            elif function == "Centroid":
-                # TODO: update specutils to be consistent with region vs regions and default to
-                # regions=None so this elif can be removed
-                temp_result = FUNCTIONS[function](spec_subtracted, region=None)
+        temp_results = []
+        for function, temp_result in statistics.items():
+            if temp_result is None:
+                temp_results.append({'function': function,
+                                     'result': '',
+                                     'error_msg': 'N/A (continuum <= 0)',
+                                     'uncertainty': '',
+                                     'unit': ''})
+                continue
+            if function == "Centroid":
                 self.results_centroid = temp_result.to_value(u.AA, equivalencies=u.spectral())
-            else:
-                temp_result = FUNCTIONS[function](spec_subtracted)
 
-            temp_result = coerce_unit(temp_result)
             temp_results.append({'function': function,
                                  'result': str(temp_result.value),
                                  'uncertainty': _uncertainty(temp_result),
@@ -502,10 +661,11 @@ class LineAnalysis(PluginTemplateMixin, DatasetSelectMixin, TableMixin,
         self.update_results(temp_results)
 
     def _compute_redshift_for_selected_line(self):
-        index = self.line_items.index(self.selected_line)
-        line_mark = self.line_marks[index]
-        rest_value = (line_mark.rest_value * line_mark.xunit).to_value(u.AA,
-                                                                       equivalencies=u.spectral())
+        line_mark = [mark for mark in self.line_marks
+                     if self.selected_line in mark.names_rest][0]
+        index = line_mark.names_rest.index(self.selected_line)
+        rest_value = (line_mark.rest_values[index] * line_mark.xunit).to_value(
+            u.AA, equivalencies=u.spectral())
         return (self.results_centroid - rest_value) / rest_value
 
     @observe('sync_identify')
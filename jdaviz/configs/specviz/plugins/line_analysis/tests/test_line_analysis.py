@@ -1,8 +1,10 @@
 import pytest
 import numpy as np
 from astropy import units as u
+from astropy.nddata import StdDevUncertainty
 from astropy.table import QTable
 from astropy.tests.helper import assert_quantity_allclose
+from astropy.wcs import WCS
 from numpy.testing import assert_allclose
 from regions import RectanglePixelRegion, PixCoord
 from specutils import Spectrum, SpectralRegion
@@ -253,10 +255,11 @@ def test_line_identify(specviz_helper, spectrum1d):
     # manually update redshift
     la_plugin.vue_line_assign()
     assert_allclose(la_plugin.results_centroid, 7307.4232674401555)
-    line_mark = la_plugin.line_marks[la_plugin.line_items.index(la_plugin.selected_line)]
-    assert_allclose(line_mark.rest_value, 5007)
+    line_mark = la_plugin.line_marks[0]
+    rest_value = line_mark.rest_values[line_mark.names_rest.index(la_plugin.selected_line)]
+    assert_allclose(rest_value, 5007)
     z = la_plugin._compute_redshift_for_selected_line()
-    assert_allclose(z, (la_plugin.results_centroid - line_mark.rest_value)/line_mark.rest_value)
+    assert_allclose(z, (la_plugin.results_centroid - rest_value)/rest_value)
     assert_allclose(la_plugin.selected_line_redshift, z)
 
 
@@ -648,3 +651,65 @@ def test_line_analysis_load_table_into_data_collection(deconfigged_helper, spect
 
     # Verify the table can be accessed and has correct data
     assert len(loaded_table) == 1
+
+
+def _line_cube(ny=5, nx=4, nz=40, seed=0):
+    rng = np.random.default_rng(seed)
+    w = WCS({"CTYPE1": "RA---TAN", "CTYPE2": "DEC--TAN", "CTYPE3": "WAVE",
+             "CRVAL1": 205, "CRVAL2": 27, "CRVAL3": 4.6e-7,
+             "CDELT1": -0.0001, "CDELT2": 0.0001, "CDELT3": 1e-10,
+             "CRPIX1": 0, "CRPIX2": 0, "CRPIX3": 0})
+    k = np.arange(nz)[:, None, None]
+    amplitude = rng.uniform(1, 5, (1, ny, nx))
+    flux = (10 + 0.05 * k + amplitude * np.exp(-0.5 * ((k - nz / 2) / 3) ** 2)
+            + rng.normal(0, 0.1, (nz, ny, nx)))
+    return Spectrum(flux=flux * u.Jy, wcs=w,
+                    uncertainty=StdDevUncertainty(np.full(flux.shape, 0.1) * u.Jy))
+
+
+def _spaxel_results(cubeviz_helper, cube, y, x):
+    # run the single-spectrum path of the plugin on the spectrum of a single spaxel
+    spaxel = Spectrum(flux=cube.flux[:, y, x], spectral_axis=cube.spectral_axis,
+                      uncertainty=cube.uncertainty[:, y, x])
+    cubeviz_helper.load(spaxel, data_label=f'spaxel {y} {x}', format='1D Spectrum')
+    la = cubeviz_helper.plugins['Line Analysis']
+    la.dataset = f'spaxel {y} {x}'
+    return la.get_results(add_to_table=False)
+
+
+def test_line_analysis_maps(cubeviz_helper):
+    cube = _line_cube()
+    cubeviz_helper.load(cube, data_label='cube')
+    unit = u.Unit(cubeviz_helper.plugins['Unit Conversion'].spectral_unit.selected)
+    cubeviz_helper.plugins['Subset Tools'].import_region(SpectralRegion(4.6165e-7 * unit,
+                                                                        4.6235e-7 * unit))
+
+    la = cubeviz_helper.plugins['Line Analysis']
+    assert la.cube.selected == 'cube'
+    la.spectral_subset = 'Subset 1'
+    la.continuum = 'Surrounding'
+    la.continuum_width = 3
+
+    maps = la.calculate_maps()
+    assert list(maps) == ['Line Flux', 'Equivalent Width', 'Gaussian Sigma Width',
+                          'Gaussian FWHM', 'Centroid']
+    for function, result_map in maps.items():
+        assert result_map.shape == (5, 4)
+        assert f'line map: {function}' in cubeviz_helper._app.data_collection
+
+    for y, x in [(0, 0), (3, 2), (4, 3)]:
+        for result in _spaxel_results(cubeviz_helper, cube, y, x):
+            result_map = maps[result['function']]
+            if result['function'] == 'Line Flux':
+                # the cube is loaded per spaxel (as surface brightness)
+                assert result_map.unit == u.Unit(result['unit']) / PIX2
+            else:
+                assert result_map.unit == u.Unit(result['unit'])
+            assert_allclose(result_map.data[y, x], float(result['result']), rtol=1e-8)
+            if result['uncertainty'] != '':
+                assert_allclose(result_map.uncertainty.array[y, x],
+                                float(result['uncertainty']), rtol=1e-6)
+
+    la.cube = ''
+    with pytest.raises(ValueError, match='no cube selected'):
+        la.calculate_maps()
@@ -17,7 +17,7 @@ from jdaviz.core.events import (AddDataToViewerMessage,
                                 LineIdentifyMessage)
 from jdaviz.core.freezable_state import FreezableBqplotImageViewerState
 from jdaviz.core.registries import viewer_registry
-from jdaviz.core.marks import SpectralLine
+from jdaviz.core.marks import SpectralLines, SpectralLineHighlight
 from jdaviz.core.linelists import load_preset_linelist, get_available_linelists
 from jdaviz.core.unit_conversion_utils import (spectral_axis_conversion,
                                                flux_conversion_general,
@@ -182,7 +182,7 @@ class Spectrum1DViewer(JdavizProfileView, WithSliceIndicator):
 
     def _broadcast_plotted_lines(self, marks=None):
         if marks is None:
-            marks = [x for x in self.figure.marks if isinstance(x, SpectralLine)]
+            marks = [x for x in self.figure.marks if isinstance(x, SpectralLines)]
 
         msg = SpectralMarksChangedMessage(marks, sender=self)
         self.session.hub.broadcast(msg)
@@ -196,16 +196,16 @@ class Spectrum1DViewer(JdavizProfileView, WithSliceIndicator):
         """
         Erase either all spectral lines, all spectral lines sharing the same
         name (e.g. 'He II') or a specific name-rest value combination (e.g.
-        'HE II 1640.5', stored in SpectralLine as 'table_index').
+        'HE II 1640.5', stored in SpectralLines as 'names_rest').
         """
         fig = self.figure
         if name is None and name_rest is None:
-            fig.marks = [x for x in fig.marks if not isinstance(x, SpectralLine)]
+            fig.marks = [x for x in fig.marks
+                         if not isinstance(x, (SpectralLines, SpectralLineHighlight))]
             if show_none:
                 self.spectral_lines["show"] = False
             self._broadcast_plotted_lines([])
         else:
-            temp_marks = []
             # Toggle "show" value in main astropy table. The astropy table
             # machinery only allows updating a single row at a time.
             if name_rest is not None:
@@ -214,35 +214,34 @@ class Spectrum1DViewer(JdavizProfileView, WithSliceIndicator):
                 elif isinstance(name_rest, list):
                     for nr in name_rest:
                         self.spectral_lines.loc[nr]["show"] = False
-            # Get rid of the marks we no longer want
+            if name is not None:
+                self.spectral_lines["show"][self.spectral_lines["linename"] == name] = False
+            # Get rid of the lines we no longer want, and any list mark left empty
+            empty_marks = []
             for x in fig.marks:
-                if isinstance(x, SpectralLine):
+                if isinstance(x, SpectralLines):
                     if name is not None:
-                        self.spectral_lines.loc[name]["show"] = False
-                        if x.name == name:
-                            continue
+                        n_remaining = x.remove_lines(names=name)
                     else:
-                        if isinstance(name_rest, str):
-                            if x.table_index == name_rest:
-                                continue
-                        elif isinstance(name_rest, list):
-                            if x.table_index in name_rest:
-                                continue
-                temp_marks.append(x)
-            fig.marks = temp_marks
+                        n_remaining = x.remove_lines(names_rest=name_rest)
+                    if n_remaining == 0:
+                        empty_marks += x.marks
+            if len(empty_marks):
+                fig.marks = [x for x in fig.marks if x not in empty_marks]
             self._broadcast_plotted_lines()
 
-    def _create_spectral_mark(self, line, plot_units, redshift, color, **kwargs):
+    def _create_spectral_marks(self, lines, plot_units, redshift, colors, **kwargs):
         """
-        Create and return a SpectralLine mark for a table row.
-        This centralizes construction to prevent duplicating SpectralLine(...) calls.
+        Create and return a SpectralLines mark for table rows of a single line list.
+        This centralizes construction to prevent duplicating SpectralLines(...) calls.
         """
-        return SpectralLine(self,
-                            line['rest'].to_value(plot_units),
-                            redshift,
-                            name=line["linename"],
-                            table_index=line["name_rest"],
-                            colors=[color], **kwargs)
+        return SpectralLines(self,
+                             u.Quantity(lines['rest']).to_value(plot_units),
+                             redshift,
+                             names=list(lines["linename"]),
+                             names_rest=list(lines["name_rest"]),
+                             listname=lines["listname"][0],
+                             colors=list(colors), **kwargs)
 
     @deprecated(since="5.2", alternative="plot_spectral_lines")
     def plot_spectral_line(self, line, global_redshift=None, plot_units=None, **kwargs):
@@ -309,11 +308,18 @@ class Spectrum1DViewer(JdavizProfileView, WithSliceIndicator):
 
             color = colors if colors is not None else line["colors"]
 
-            mark = self._create_spectral_mark(line, plot_units, redshift, color,
-                                              **kwargs)
-
-            # Add mark and broadcast
-            self.figure.marks = self.figure.marks + [mark]
+            # Add to the mark of its line list if already plotted, otherwise
+            # create a new mark for the list, and broadcast
+            list_marks = [x for x in self.figure.marks
+                          if isinstance(x, SpectralLines) and x.listname == line["listname"]]
+            if len(list_marks):
+                list_marks[0].add_lines([line['rest'].to_value(plot_units)],
+                                        [line["linename"]], [line["name_rest"]], [color])
+            else:
+                rows = self.spectral_lines[self.spectral_lines["name_rest"] == line["name_rest"]]
+                mark = self._create_spectral_marks(rows, plot_units, redshift, [color],
+                                                   **kwargs)
+                self.figure.marks = self.figure.marks + mark.marks
             self._broadcast_plotted_lines()
             return
 
@@ -336,13 +342,18 @@ class Spectrum1DViewer(JdavizProfileView, WithSliceIndicator):
         elif len(colors) != len(lines_to_plot):
             colors = colors * len(lines_to_plot)
 
+        # Plot only the lines with show=True, with a single mark per line list
+        colors = np.asarray(colors)
+        if "show" in lines_to_plot.colnames:
+            show = np.asarray(lines_to_plot["show"], dtype=bool)
+        else:
+            show = np.ones(len(lines_to_plot), dtype=bool)
         marks = []
-        for line_row, color in zip(lines_to_plot, colors):
-            # Plot only the lines with show=True
-            if "show" in lines_to_plot.colnames and not line_row["show"]:
-                continue
-            marks.append(self._create_spectral_mark(line_row, plot_units, redshift,
-                                                    color, **kwargs))
+        for listname in table.unique(lines_to_plot[show], keys="listname")["listname"]:
+            in_list = show & (np.asarray(lines_to_plot["listname"]) == listname)
+            marks += self._create_spectral_marks(lines_to_plot[in_list], plot_units,
+                                                 redshift, colors[in_list],
+                                                 **kwargs).marks
         self.figure.marks = self.figure.marks + marks
         self._broadcast_plotted_lines()
         return
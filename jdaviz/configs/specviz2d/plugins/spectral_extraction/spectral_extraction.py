@@ -1,10 +1,12 @@
 import numpy as np
-from functools import cached_property
+from functools import cached_property, wraps
 
+from glue_jupyter.utils import debounced
 from traitlets import Bool, List, Unicode, observe
 
 from jdaviz.configs.mosviz.plugins.viewers import Spectrum1DViewer
 from jdaviz.core.events import (SnackbarMessage, NewViewerMessage,
+                                GlobalDisplayUnitChanged,
                                 ViewerVisibleLayersChangedMessage)
 from jdaviz.core.registries import tray_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
@@ -34,6 +36,42 @@ _model_cls = {'Spline': models.Spline1D,
               'Legendre': models.Legendre1D,
               'Chebyshev': models.Chebyshev1D}
 
+# traitlets (and dataset selections) that each step of the extraction pipeline depends on
+_step_traitlets = {'trace': ('trace_dataset_selected', 'trace_type_selected',
+                             'trace_trace_selected', 'trace_offset', 'trace_order',
+                             'trace_pixel', 'trace_peak_method_selected',
+                             'trace_do_binning', 'trace_bins', 'trace_window'),
+                   'bg': ('bg_dataset_selected', 'bg_type_selected', 'bg_trace_selected',
+                          'bg_trace_pixel', 'bg_separation', 'bg_width',
+                          'bg_statistic_selected'),
+                   'ext': ('ext_dataset_selected', 'ext_trace_selected', 'ext_type_selected',
+                           'ext_width', 'horne_ext_profile_selected', 'self_prof_n_bins',
+                           'self_prof_interp_degree_x', 'self_prof_interp_degree_y')}
+_step_datasets = {'trace': ('trace_dataset', 'trace_trace'),
+                  'bg': ('bg_dataset', 'bg_trace'),
+                  'ext': ('ext_dataset', 'ext_trace')}
+# each cached stage is invalidated by changes to its own step and any upstream step
+_stage_steps = {'trace': ('trace',),
+                'bg': ('trace', 'bg'),
+                'bg_spec': ('trace', 'bg'),
+                'bg_sub': ('trace', 'bg'),
+                'ext_spectrum': ('trace', 'bg', 'ext')}
+
+
+def _uses_stage_cache(meth):
+    """
+    Decorator for live-preview methods, within which the results of the individual
+    pipeline stages are memoized on their inputs (see ``SpectralExtraction2D._stage``).
+    """
+    @wraps(meth)
+    def wrapper(self, *args, **kwargs):
+        self._previewing += 1
+        try:
+            return meth(self, *args, **kwargs)
+        finally:
+            self._previewing -= 1
+    return wrapper
+
 
 @tray_registry('spectral-extraction-2d', label="2D Spectral Extraction",
                category="data:reduction")
@@ -271,6 +309,9 @@ class SpectralExtraction2D(PluginTemplateMixin):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        # memoized live-preview results, see _stage
+        self._stage_cache = {}
+        self._previewing = 0
 
         # description displayed under plugin title in tray
         self._plugin_description = 'Extract 1D spectrum from 2D image.'
@@ -461,6 +502,8 @@ class SpectralExtraction2D(PluginTemplateMixin):
 
         self._app.hub.subscribe(self, ViewerVisibleLayersChangedMessage,
                                 lambda _: self._update_plugin_marks())
+        self._app.hub.subscribe(self, GlobalDisplayUnitChanged,
+                                lambda _: self._stage_cache.clear())
 
         if self.config == "deconfigged":
             self.observe_traitlets_for_relevancy(traitlets_to_observe=['trace_dataset_items'])
@@ -636,6 +679,8 @@ class SpectralExtraction2D(PluginTemplateMixin):
         if not (self.is_active):
             for step, mark in self.marks.items():
                 mark.clear()
+            # release any cached intermediate products while the plugin is closed
+            self._stage_cache.clear()
             return
 
         if self.active_step == '':
@@ -696,40 +741,90 @@ class SpectralExtraction2D(PluginTemplateMixin):
 
         return {k: v['mark'] for k, v in self.marks_info().items()}
 
+    def _stage_key(self, stage):
+        key = []
+        for step in _stage_steps[stage]:
+            key += [getattr(self, attr) for attr in _step_traitlets[step]]
+            # changing the underlying data (but not the selected label) must also
+            # invalidate the cache (choices such as 'From Plugin' are not in the data collection)
+            labels = self._app.data_collection.labels
+            key += [getattr(self, attr).selected_dc_item.uuid
+                    if getattr(self, attr).selected in labels else None
+                    for attr in _step_datasets[step]]
+        return tuple(key)
+
+    def _stage(self, stage, func, **kwargs):
+        """
+        Return the output of ``func`` for a given stage of the extraction pipeline.
+
+        While computing the live-preview, the result is memoized on the inputs of that stage
+        and all upstream stages, so that, for example, dragging the extraction width does not
+        refit the trace or recompute the background.  Outside of the preview (or when passing
+        kwargs), ``func`` is always called.
+        """
+        if len(kwargs) or not self._previewing:
+            return func(**kwargs)
+        key = self._stage_key(stage)
+        cached_key, result = self._stage_cache.get(stage, (None, None))
+        if cached_key != key:
+            result = func()
+            self._stage_cache[stage] = (key, result)
+        return result
+
     @observe('interactive_extract')
     @skip_if_no_updates_since_last_active()
     @skip_if_not_tray_instance()
     @skip_if_not_relevant()
     def _update_interactive_extract(self, event={}):
         # also called by any of the _interaction_in_*_step
+        self._update_interactive_extract_marks()
+
+    @debounced(delay_seconds=0.1, method=True)
+    @_uses_stage_cache
+    def _update_interactive_extract_marks(self):
+        # rapid edits (e.g., dragging a slider) are coalesced, so that the extraction
+        # is only previewed for the latest inputs
+        if not self.is_active:
+            # the plugin was closed in the meantime
+            return
+        sp1d, bg_spec = self._compute_interactive_extract()
+
+        if isinstance(sp1d, Exception):
+            # NOTE: ignore error, but will be raised when clicking ANY of the export buttons
+            # NOTE: FitTrace or manual background are often giving a
+            # "background regions overlapped" error from specreduce
+            self.ext_specreduce_err = repr(sp1d)
+            self.marks['extract'].clear()
+        elif sp1d is None:
+            self.marks['extract'].clear()
+        else:
+            self.ext_specreduce_err = ''
+            self.marks['extract'].update_xy(sp1d.spectral_axis.value,
+                                            sp1d.flux.value,
+                                            viewers=self.marks_viewers1d)
+
+        if bg_spec is None or isinstance(bg_spec, Exception):
+            self.marks['bg_spec'].clear()
+        else:
+            self.marks['bg_spec'].update_xy(bg_spec.spectral_axis,
+                                            bg_spec.flux,
+                                            viewers=self.marks_viewers1d)
+
+    def _compute_interactive_extract(self):
+        sp1d, bg_spec = None, None
         if self.interactive_extract:
             try:
-                sp1d = self.export_extract_spectrum(add_data=False)
+                sp1d = self._stage('ext_spectrum', self.export_extract_spectrum)
             except Exception as e:
-                # NOTE: ignore error, but will be raised when clicking ANY of the export buttons
-                # NOTE: FitTrace or manual background are often giving a
-                # "background regions overlapped" error from specreduce
-                self.ext_specreduce_err = repr(e)
-                self.marks['extract'].clear()
-            else:
-                self.ext_specreduce_err = ''
-                self.marks['extract'].update_xy(sp1d.spectral_axis.value,
-                                                sp1d.flux.value,
-                                                viewers=self.marks_viewers1d)
-        else:
-            self.marks['extract'].clear()
+                sp1d = e
 
         if self.interactive_extract and self.active_step == 'bg':
             try:
-                spec = self.export_bg_spectrum()
-            except Exception:
-                self.marks['bg_spec'].clear()
-            else:
-                self.marks['bg_spec'].update_xy(spec.spectral_axis,
-                                                spec.flux,
-                                                viewers=self.marks_viewers1d)
-        else:
-            self.marks['bg_spec'].clear()
+                bg_spec = self._stage('bg_spec', self.export_bg_spectrum)
+            except Exception as e:
+                bg_spec = e
+
+        return sp1d, bg_spec
 
     @observe('is_active', 'trace_dataset_selected', 'trace_type_selected',
              'trace_trace_selected', 'trace_offset', 'trace_order',
@@ -738,13 +833,14 @@ class SpectralExtraction2D(PluginTemplateMixin):
     @skip_if_not_tray_instance()
     @skip_if_no_updates_since_last_active()
     @skip_if_not_relevant()
+    @_uses_stage_cache
     def _interaction_in_trace_step(self, event={}):
         if ((event.get('name', '') in ('active_step', 'is_active') and self.active_step != 'trace')
                 or not self.is_active):
             return
 
         try:
-            trace = self.export_trace(add_data=False)
+            trace = self._stage('trace', self.export_trace)
         except Exception:
             # NOTE: ignore error, but will be raised when clicking ANY of the export buttons
             self.marks['trace'].clear()
@@ -764,6 +860,7 @@ class SpectralExtraction2D(PluginTemplateMixin):
     @skip_if_not_tray_instance()
     @skip_if_no_updates_since_last_active()
     @skip_if_not_relevant()
+    @_uses_stage_cache
     def _interaction_in_bg_step(self, event={}):
         if ((event.get('name', '') in ('active_step', 'is_active') and self.active_step != 'bg')
                 or not self.is_active):
@@ -827,6 +924,7 @@ class SpectralExtraction2D(PluginTemplateMixin):
     @skip_if_not_tray_instance()
     @skip_if_no_updates_since_last_active()
     @skip_if_not_relevant()
+    @_uses_stage_cache
     def _interaction_in_ext_step(self, event={}):
         if ((event.get('name', '') in ('active_step', 'is_active') and self.active_step not in ('ext', ''))  # noqa
                 or not self.is_active):
@@ -963,7 +1061,7 @@ class SpectralExtraction2D(PluginTemplateMixin):
                                       use_display_units=True),
                                       self.bg_trace_pixel)
         elif self.bg_trace_selected == 'From Plugin':
-            trace = self.export_trace(add_data=False)
+            trace = self._stage('trace', self.export_trace)
         else:
             trace = self.bg_trace.get_selected_spectrum(use_display_units=True)
 
@@ -1080,7 +1178,7 @@ class SpectralExtraction2D(PluginTemplateMixin):
             Whether to add the resulting spectrum to the application, according to the options
             defined in the plugin.
         """
-        spec = self.export_bg(**kwargs).bkg_spectrum()
+        spec = self._stage('bg', self.export_bg, **kwargs).bkg_spectrum()
 
         if add_data:
             self.bg_spec_add_results.add_results_from_plugin(spec,
@@ -1103,7 +1201,7 @@ class SpectralExtraction2D(PluginTemplateMixin):
             Whether to add the resulting image to the application, according to the options
             defined in the plugin.
         """
-        bg_sub_spec = self.export_bg(**kwargs).sub_image()
+        bg_sub_spec = self._stage('bg', self.export_bg, **kwargs).sub_image()
 
         if add_data:
             self.bg_sub_add_results.add_results_from_plugin(bg_sub_spec,
@@ -1117,13 +1215,13 @@ class SpectralExtraction2D(PluginTemplateMixin):
 
     def _get_ext_trace(self):
         if self.ext_trace_selected == 'From Plugin':
-            return self.export_trace(add_data=False)
+            return self._stage('trace', self.export_trace)
         else:
             return self.ext_trace.get_selected_spectrum(use_display_units=True)
 
     def _get_ext_input_spectrum(self):
         if self.ext_dataset_selected == 'From Plugin':
-            return self.export_bg_sub(add_data=False)
+            return self._stage('bg_sub', self.export_bg_sub)
         else:
             return self.ext_dataset.get_selected_spectrum(use_display_units=True)
 
@@ -1,3 +1,4 @@
+import glue_jupyter.utils
 import gwcs
 import pytest
 import specreduce
@@ -551,6 +552,106 @@ def test_spectral_extraction_preview(deconfigged_helper, spectrum2d):
                        len(mark.x) == len(spectrum2d.spectral_axis)]) == int(interactive_extract)
 
 
+@pytest.mark.filterwarnings('ignore')
+def test_spectral_extraction_preview_stage_cache(deconfigged_helper, monkeypatch):
+    nx, ny = 2000, 60
+    yy = np.arange(ny)[:, np.newaxis]
+    flux = np.exp(-0.5 * ((yy - 30) / 2) ** 2) * np.ones(nx) + 0.1
+    deconfigged_helper.load(Spectrum(flux=flux * u.MJy,
+                                     spectral_axis=np.arange(1, nx + 1) * u.um),
+                            format='2D Spectrum')
+    pext = deconfigged_helper.plugins['2D Spectral Extraction']._obj
+
+    calls = {'export_trace': 0, 'export_bg': 0}
+
+    def count_calls(attr):
+        orig = getattr(pext, attr)
+
+        def wrapper(*args, **kwargs):
+            calls[attr] += 1
+            return orig(*args, **kwargs)
+        monkeypatch.setattr(pext, attr, wrapper)
+
+    count_calls('export_trace')
+    count_calls('export_bg')
+
+    with pext.as_active():
+        pext.trace_type_selected = 'Polynomial'
+        calls['export_trace'] = calls['export_bg'] = 0
+
+        # simulate dragging the extraction width slider, the trace and
+        # background are upstream and should not be recomputed
+        n_steps = 20
+        for width in range(2, 2 + n_steps):
+            pext.ext_width = width
+
+        assert calls == {'export_trace': 0, 'export_bg': 0}
+        assert pext.ext_specreduce_err == ''
+        assert_allclose(pext.marks['ext_upper'].marks_list[0].y
+                        - pext.marks['ext_lower'].marks_list[0].y, width)
+        # the cached preview matches a fresh (uncached) extraction
+        assert_allclose(pext.marks['extract'].marks_list[0].y,
+                        pext.export_extract_spectrum().flux.value)
+
+        # changing the background only rebuilds the background (once) and
+        # downstream stages, but re-uses the trace
+        calls['export_trace'] = calls['export_bg'] = 0
+        pext.bg_width = 3
+        assert calls == {'export_trace': 0, 'export_bg': 1}
+
+    # cache is released when closing the plugin
+    assert pext._stage_cache == {}
+
+
+def test_spectral_extraction_preview_coalesced(deconfigged_helper, spectrum2d, monkeypatch):
+    deconfigged_helper.load(spectrum2d, format='2D Spectrum')
+    pext = deconfigged_helper.plugins['2D Spectral Extraction']._obj
+
+    class FakeLoop:
+        # defers the debounced callbacks until flushed, as the kernel's event loop would
+        def __init__(self):
+            self.pending = []
+
+        def call_soon_threadsafe(self, callback):
+            callback()
+
+        def call_later(self, delay, callback):
+            self.pending.append(callback)
+
+        def flush(self):
+            pending, self.pending = self.pending, []
+            for callback in pending:
+                callback()
+
+    loop = FakeLoop()
+    monkeypatch.setattr(glue_jupyter.utils, 'get_ioloop', lambda: loop)
+
+    n_extract = 0
+    orig = pext.export_extract_spectrum
+
+    def count_extract(*args, **kwargs):
+        nonlocal n_extract
+        n_extract += 1
+        return orig(*args, **kwargs)
+    monkeypatch.setattr(pext, 'export_extract_spectrum', count_extract)
+
+    with pext.as_active():
+        loop.flush()
+        n_extract = 0
+        # dragging the slider only previews the extraction for the last width
+        for width in range(2, 12):
+            pext.ext_width = width
+        assert n_extract == 0
+        loop.flush()
+        assert n_extract == 1
+        assert_allclose(pext.marks['extract'].marks_list[0].y, orig().flux.value)
+
+        # the preview is not computed if the plugin is closed in the meantime
+        pext.ext_width = 3
+    loop.flush()
+    assert n_extract == 1
+
+
 class TestTwo2dSpectra:
 
     def load_2d_spectrum(self, helper, spec2d, spec2d_label_idx=0, spec2d_ext_label_idx=1):
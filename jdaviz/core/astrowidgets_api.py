@@ -10,6 +10,7 @@ from glue.core import Data
 
 from jdaviz.utils import get_top_layer_index, get_reference_image_data, data_has_valid_wcs
 from jdaviz.core.events import SnackbarMessage, AstrowidgetMarkersChangedMessage
+from jdaviz.core.wcs_surrogate import get_interactive_wcs
 
 __all__ = ['AstrowidgetsImageViewerMixin']
 
@@ -83,7 +84,7 @@ class AstrowidgetsImageViewerMixin:
         if isinstance(point, SkyCoord):
             if data_has_valid_wcs(image):
                 try:
-                    point = image.coords.world_to_pixel(point)  # 0-indexed X, Y
+                    point = get_interactive_wcs(image).world_to_pixel(point)  # 0-indexed X, Y
                 except NoConvergence as e:  # pragma: no cover
                     self.session.hub.broadcast(SnackbarMessage(
                         f'{point} is likely out of bounds: {repr(e)}',
@@ -0,0 +1,360 @@
+import itertools
+import multiprocessing as mp
+
+import numpy as np
+from astropy import units as u
+from astropy.nddata import StdDevUncertainty
+from astropy.stats import gaussian_sigma_to_fwhm
+from specutils import Spectrum
+from specutils.manipulation import extract_region
+from specutils.spectra.spectral_axis import SpectralAxis
+
+from jdaviz.utils import parallelize_calculation
+
+__all__ = ['spectral_region_slice', 'tiled_collapse', 'tiled_moment',
+           'linear_continuum_fit', 'line_statistics']
+
+# same reductions (and NaN handling) as specutils.Spectrum.collapse
+_collapse_funcs = {'mean': np.nanmean, 'max': np.nanmax, 'min': np.nanmin,
+                   'median': np.nanmedian, 'sum': np.nansum}
+
+# default upper limit on the size of a single tile (in bytes)
+_default_tile_bytes = 2**25
+
+
+def spectral_region_slice(spectral_axis, region=None):
+    """
+    Indices along the spectral axis that ``extract_region`` would select for
+    a given spectral region, computed without touching the flux of a cube.
+
+    Parameters
+    ----------
+    spectral_axis : `~astropy.units.Quantity` or `~specutils.SpectralAxis`
+        Spectral axis of the cube.
+    region : `~specutils.SpectralRegion` or `None`
+        Spectral region.  If `None`, the entire spectral axis is selected.
+
+    Returns
+    -------
+    selection : slice or `~numpy.ndarray`
+        Slice (or integer index array, if the selected channels are not contiguous)
+        along the spectral axis.
+    """
+    if region is None:
+        return slice(None)
+    indices = Spectrum(flux=np.arange(len(spectral_axis), dtype=float) * u.one,
+                       spectral_axis=spectral_axis)
+    selected = extract_region(indices, region, return_single_spectrum=True)
+    selected = selected.flux.value.astype(int)
+    if not len(selected):
+        return slice(0, 0)
+    if np.all(np.diff(selected) == 1):
+        return slice(selected[0], selected[-1] + 1)
+    return selected
+
+
+def _spatial_tiles(shape, spectral_axis_index, spectral_selection, tile_bytes, itemsize):
+    """
+    Yield the index into the cube and the corresponding index into the
+    spatial (output) map for each tile.
+    """
+    spectral_axis_index = spectral_axis_index % len(shape)
+    spatial_axes = [i for i in range(len(shape)) if i != spectral_axis_index]
+    n_spectral = len(np.arange(shape[spectral_axis_index])[spectral_selection])
+    max_spaxels = max(tile_bytes // max(n_spectral * itemsize, 1), 1)
+    # roughly square tiles in the spatial dimensions
+    side = max(int(max_spaxels ** (1 / len(spatial_axes))), 1)
+
+    starts = [range(0, shape[axis], side) for axis in spatial_axes]
+    for corner in itertools.product(*starts):
+        out_index = tuple(slice(start, min(start + side, shape[axis]))
+                          for start, axis in zip(corner, spatial_axes))
+        cube_index = list(out_index)
+        cube_index.insert(spectral_axis_index,
+                          spectral_selection if isinstance(spectral_selection, slice)
+                          else slice(None))
+        yield tuple(cube_index), out_index
+
+
+class _TileWorker:
+    """
+    Reduce a single spatial tile of a cube along its spectral axis.
+    """
+    def __init__(self, func, flux, cube_index, out_index, spectral_axis_index,
+                 spectral_selection, **kwargs):
+        self.func = func
+        self.flux = flux
+        self.cube_index = cube_index
+        self.out_index = out_index
+        self.spectral_axis_index = spectral_axis_index
+        self.spectral_selection = spectral_selection
+        self.kwargs = kwargs
+
+    def _tile(self, arr):
+        # only this tile is read into memory (which matters for memory-mapped cubes)
+        tile = np.asarray(arr[self.cube_index])
+        if not isinstance(self.spectral_selection, slice):
+            tile = np.take(tile, self.spectral_selection, axis=self.spectral_axis_index)
+        return tile
+
+    def __call__(self):
+        tile = self._tile(self.flux)
+        kwargs = {k: self._tile(v) if k == 'mask' and v is not None else v
+                  for k, v in self.kwargs.items()}
+        return self.out_index, self.func(tile, axis=self.spectral_axis_index, **kwargs)
+
+
+def _reduce_tiles(func, flux, spectral_axis_index, spectral_selection, tile_bytes, n_cpu,
+                  dtype, **kwargs):
+    out_shape = tuple(s for i, s in enumerate(flux.shape)
+                      if i != spectral_axis_index % flux.ndim)
+    out = np.empty(out_shape, dtype=dtype)
+
+    def collect_result(result):
+        out_index, values = result
+        out[out_index] = values
+
+    workers = (_TileWorker(func, flux, cube_index, out_index, spectral_axis_index,
+                           spectral_selection, **kwargs)
+               for cube_index, out_index in _spatial_tiles(flux.shape, spectral_axis_index,
+                                                           spectral_selection, tile_bytes,
+                                                           flux.dtype.itemsize))
+    if n_cpu is None:
+        n_cpu = max(mp.cpu_count() - 1, 1)
+    if n_cpu > 1:
+        # numpy releases the GIL, so threads avoid copying tiles to other processes
+        parallelize_calculation(workers, collect_result, n_cpu=n_cpu, prefer='threads')
+    else:
+        for worker in workers:
+            collect_result(worker())
+    return out
+
+
+def _collapse_tile(tile, axis, function, mask=None):
+    if mask is not None:
+        tile = np.array(tile, dtype=np.result_type(tile.dtype, np.float32))
+        tile[mask != 0] = np.nan
+    return function(tile, axis=axis)
+
+
+def _moment_tile(tile, axis, order, dispersion, dx):
+    shape = [1] * tile.ndim
+    shape[axis] = -1
+    dispersion = dispersion.reshape(shape)
+    weighted = tile * dx.reshape(shape)
+    m0 = np.sum(weighted, axis=axis)
+    if order == 0:
+        return m0
+    m1 = np.sum(weighted * dispersion, axis=axis, keepdims=True) / np.expand_dims(m0, axis)
+    if order == 1:
+        return np.squeeze(m1, axis=axis)
+    return np.sum(weighted * (dispersion - m1) ** order, axis=axis) / m0
+
+
+def tiled_collapse(cube, function, spectral_selection=slice(None),
+                   tile_bytes=_default_tile_bytes, n_cpu=None):
+    """
+    Collapse a spectral cube over its spectral axis, one spatial tile at a time.
+
+    This gives the same result as ``Spectrum.collapse(function, axis='spectral')``
+    (respecting the mask), but without creating full-size copies of the cube, which
+    keeps the peak memory bounded for large (or memory-mapped) cubes.
+
+    Parameters
+    ----------
+    cube : `~specutils.Spectrum`
+        Spectral cube.
+    function : {'mean', 'median', 'min', 'max', 'sum'}
+        Reduction to apply over the spectral axis.
+    spectral_selection : slice or `~numpy.ndarray`
+        Channels to include, see :func:`spectral_region_slice`.
+    tile_bytes : int
+        Approximate upper limit on the size of each tile, in bytes.
+    n_cpu : int or `None`
+        Number of threads to use.  If `None`, it will use max cores minus one.
+
+    Returns
+    -------
+    collapsed : `~astropy.units.Quantity`
+        The collapsed spatial map.
+    """
+    function = function.lower()
+    if function not in _collapse_funcs:
+        raise ValueError(f"function must be one of {list(_collapse_funcs.keys())}")
+    flux = cube.data
+    dtype = np.result_type(flux.dtype, np.float32)
+    collapsed = _reduce_tiles(_collapse_tile, flux, cube.spectral_axis_index,
+                              spectral_selection, tile_bytes, n_cpu, dtype,
+                              function=_collapse_funcs[function], mask=cube.mask)
+    return collapsed << cube.flux.unit
+
+
+def tiled_moment(cube, spectral_axis, order=0, spectral_selection=slice(None),
+                 tile_bytes=_default_tile_bytes, n_cpu=None):
+    """
+    Compute a moment map of a spectral cube, one spatial tile at a time.
+
+    This gives the same result as :func:`specutils.analysis.moment` (which ignores
+    the mask), but without creating full-size copies of the cube.
+
+    Parameters
+    ----------
+    cube : `~specutils.Spectrum`
+        Spectral cube.
+    spectral_axis : `~astropy.units.Quantity`
+        Spectral axis of the selected channels, in the units in which to compute
+        the moment (for example velocity).
+    order : int
+        Order of the moment.
+    spectral_selection : slice or `~numpy.ndarray`
+        Channels to include, see :func:`spectral_region_slice`.
+    tile_bytes : int
+        Approximate upper limit on the size of each tile, in bytes.
+    n_cpu : int or `None`
+        Number of threads to use.  If `None`, it will use max cores minus one.
+
+    Returns
+    -------
+    moment : `~astropy.units.Quantity`
+        The moment map.
+    """
+    if int(order) != order or order < 0:
+        raise ValueError("Order must be a positive integer.")
+    spectral_axis = SpectralAxis(spectral_axis)
+    dx = np.abs(np.diff(spectral_axis.bin_edges))
+    flux = cube.data
+    dtype = np.result_type(flux.dtype, dx.dtype)
+    moment = _reduce_tiles(_moment_tile, flux, cube.spectral_axis_index,
+                           spectral_selection, tile_bytes, n_cpu, dtype,
+                           order=int(order), dispersion=spectral_axis.value, dx=dx.value)
+    if order == 0:
+        return moment << (cube.flux.unit * spectral_axis.unit)
+    return moment << spectral_axis.unit ** order
+
+
+def linear_continuum_fit(x, y, axis=-1):
+    """
+    Fit a straight line to every spectrum of a cube at once.
+
+    All spectra share the same abscissa, so the least-squares solution is a single
+    pseudo-inverse of the shared design matrix applied along ``axis``, rather than
+    one `~numpy.polyfit` per spectrum.  A spectrum with non-finite values only
+    affects its own fit.
+
+    Parameters
+    ----------
+    x : array-like
+        Abscissa of the continuum points.
+    y : array-like
+        Continuum points, with ``len(x)`` elements along ``axis``.
+    axis : int
+        Axis of ``y`` corresponding to ``x``.
+
+    Returns
+    -------
+    slope, intercept : `~numpy.ndarray`
+        Coefficients of the fit, with the shape of ``y`` without ``axis``.
+    """
+    design = np.vander(np.asarray(x, dtype=float), 2)
+    coeffs = np.moveaxis(np.asarray(y), axis, -1) @ np.linalg.pinv(design).T
+    return coeffs[..., 0], coeffs[..., 1]
+
+
+def _with_uncertainty(values, uncertainty, unit):
+    # same convention as the results of specutils.analysis
+    result = values << unit
+    result.uncertainty = None if uncertainty is None else uncertainty << unit
+    result.uncertainty_type = 'stddev'
+    return result
+
+
+def line_statistics(spectrum, continuum, line_flux_spectral_axis=None):
+    """
+    Line statistics for every spectrum of a cube, vectorized along the spectral axis.
+
+    This gives the same results as the line analysis plugin does for a single
+    spectrum (the analytic :func:`~specutils.analysis.line_flux`,
+    :func:`~specutils.analysis.gaussian_sigma_width`, :func:`~specutils.analysis.gaussian_fwhm`
+    and :func:`~specutils.analysis.centroid` of the continuum-subtracted spectrum and
+    the :func:`~specutils.analysis.equivalent_width` of the continuum-normalized spectrum),
+    ignoring the mask of ``spectrum``.
+
+    Parameters
+    ----------
+    spectrum : `~specutils.Spectrum`
+        Spectral cube, before continuum subtraction.
+    continuum : `~numpy.ndarray`
+        Continuum in the flux units of ``spectrum``, broadcastable to its shape.
+    line_flux_spectral_axis : `~astropy.units.Quantity` or `None`
+        Spectral axis over which to integrate the line flux (for example converted
+        to frequency).  If `None`, the spectral axis of ``spectrum`` is used.
+
+    Returns
+    -------
+    statistics : dict
+        Maps (`~astropy.units.Quantity` with an ``uncertainty`` attribute that is `None`
+        if ``spectrum`` has no uncertainty), keyed by the name of the statistic.
+        The equivalent width is NaN wherever the continuum is not positive.
+    """
+    axis = spectrum.spectral_axis_index
+    flux = np.moveaxis(spectrum.flux.value, axis, -1)
+    continuum = np.moveaxis(np.broadcast_to(continuum, spectrum.flux.shape), axis, -1)
+    subtracted = flux - continuum
+    if spectrum.uncertainty is not None:
+        stddev = spectrum.uncertainty.represent_as(StdDevUncertainty).array
+        stddev = np.moveaxis(np.broadcast_to(stddev, spectrum.flux.shape), axis, -1)
+    else:
+        stddev = None
+    spectral_unit = spectrum.spectral_axis.unit
+    dispersion = spectrum.spectral_axis.value
+    dx = np.abs(np.diff(spectrum.spectral_axis.bin_edges.value))
+
+    if line_flux_spectral_axis is None:
+        line_flux_dx = dx << spectral_unit
+    else:
+        line_flux_dx = np.abs(np.diff(SpectralAxis(line_flux_spectral_axis).bin_edges))
+    line_flux_unit = spectrum.flux.unit * line_flux_dx.unit
+    line_flux_dx = line_flux_dx.value
+    line_flux = np.sum(subtracted * line_flux_dx, axis=-1)
+    line_flux_uncertainty = None
+    if stddev is not None:
+        line_flux_uncertainty = np.sqrt(np.sum(stddev**2 * line_flux_dx**2, axis=-1))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # equivalent width of the continuum-normalized spectrum (relative to a continuum of 1)
+        ew = np.sum(dx) - np.sum(flux / continuum * dx, axis=-1)
+        ew_uncertainty = None
+        if stddev is not None:
+            ew_uncertainty = np.sqrt(np.sum((stddev / np.abs(continuum))**2 * dx**2, axis=-1)
+                                     * len(dx))
+
+        total = np.sum(subtracted, axis=-1)
+        centroid = np.sum(subtracted * dispersion, axis=-1) / total
+        offset = dispersion - centroid[..., np.newaxis]
+        numerator = np.sum(offset**2 * subtracted, axis=-1)
+        sigma2 = numerator / total
+        sigma = np.sqrt(sigma2)
+        centroid_uncertainty = sigma_uncertainty = None
+        if stddev is not None:
+            centroid_uncertainty = np.sqrt(np.sum(stddev**2 * offset**2, axis=-1)) / np.abs(total)
+            numerator_uncertainty2 = np.sum(
+                2 * offset**2 * subtracted**2 * centroid_uncertainty[..., np.newaxis]**2
+                + offset**4 * stddev**2, axis=-1)
+            total_uncertainty2 = np.sum(stddev**2, axis=-1)
+            sigma2_uncertainty = sigma2 * np.sqrt(numerator_uncertainty2 / numerator**2
+                                                  + total_uncertainty2 / total**2)
+            sigma_uncertainty = 0.5 * sigma2_uncertainty / sigma2 * sigma
+
+    invalid_continuum = np.any(continuum <= 0, axis=-1)
+    ew = np.where(invalid_continuum, np.nan, ew)
+    if ew_uncertainty is not None:
+        ew_uncertainty = np.where(invalid_continuum, np.nan, ew_uncertainty)
+
+    return {'Line Flux': _with_uncertainty(line_flux, line_flux_uncertainty, line_flux_unit),
+            'Equivalent Width': _with_uncertainty(ew, ew_uncertainty, spectral_unit),
+            'Gaussian Sigma Width': _with_uncertainty(sigma, sigma_uncertainty, spectral_unit),
+            'Gaussian FWHM': _with_uncertainty(
+                sigma * gaussian_sigma_to_fwhm,
+                None if sigma_uncertainty is None else sigma_uncertainty * gaussian_sigma_to_fwhm,
+                spectral_unit),
+            'Centroid': _with_uncertainty(centroid, centroid_uncertainty, spectral_unit)}
@@ -364,7 +364,8 @@ class SpectralMarksChangedMessage(Message):
 
     @property
     def names_rest(self):
-        return [m.name_rest for m in self.marks]
+        # each mark draws all plotted lines of a single line list
+        return [name_rest for m in self.marks for name_rest in m.names_rest]
 
     @property
     def marks(self):
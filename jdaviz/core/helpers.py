@@ -6,6 +6,7 @@ application objects.
 See also https://github.com/spacetelescope/jdaviz/issues/104 for more details
 on the motivation behind this concept.
 """
+import os
 import warnings
 from contextlib import contextmanager
 from inspect import isclass
@@ -18,6 +19,7 @@ from glue.core.subset import Subset, MaskSubsetState
 from glue.config import data_translator
 from ipywidgets.widgets import widget_serialization
 
+from astropy.io import fits
 from astropy.nddata import NDDataArray, CCDData, StdDevUncertainty
 import astropy.units as u
 from astropy.utils.decorators import deprecated
@@ -27,12 +29,14 @@ from specutils import Spectrum, SpectralRegion
 from jdaviz.app import PrivateApplication
 from jdaviz.configs.default.plugins.viewers import JdavizViewerWindow
 from jdaviz.core.events import SnackbarMessage, ExitBatchLoadMessage, SliceSelectSliceMessage
+from jdaviz.core.loaders.importers.importer import _HDU_DATA_HASHES
+from jdaviz.core.loaders.parsers.fits.fits import _PREPARSED_FITS
 from jdaviz.core.loaders.resolvers import find_matching_resolver
 from jdaviz.core.template_mixin import show_widget
 from jdaviz.core.user_api import (DataApi, SpectralDataApi, SpatialDataApi,
                                   TemporalSpatialDataApi, SpectralSpatialDataApi)
 from jdaviz.utils import (JDAVIZ_CONFIGS, data_has_valid_wcs, CONFIGS_WITH_LOADERS,
-                          suppress_widget_comms)
+                          create_data_hash, parallelize_calculation, suppress_widget_comms)
 from jdaviz.core.unit_conversion_utils import (all_flux_unit_conversion_equivs,
                                                check_if_unit_is_per_solid_angle,
                                                flux_conversion_general,
@@ -177,7 +181,10 @@ class ConfigHelper(HubListener):
 
         from jdaviz.core.registries import loader_importer_registry
         ImporterCls = loader_importer_registry.members.get(importer_name)
-        return ImporterCls(app=self._app, resolver=resolver, parser=parser, input=input)
+        importer = ImporterCls(app=self._app, resolver=resolver, parser=parser, input=input)
+        # run the validity check outside of is_valid, which would catch any internal error
+        importer._check_is_valid()
+        return importer
 
     @property
     def new_viewers(self):
@@ -255,6 +262,78 @@ class ConfigHelper(HubListener):
         resolver._obj._cleanup()
         return out
 
+    def load_many(self, inputs, loader=None, format=None, target=None,
+                  n_cpu=None, **kwargs):
+        """
+        Load several inputs (e.g., a list of filenames) at once.
+
+        Local FITS files are first opened and the data of their extensions
+        hashed concurrently in a thread pool.  The inputs are then loaded (as
+        with ``load``) in their original order within `batch_load`, so that
+        linking and adding data to viewers happens once for all of them, and
+        data labels are the same as when loading the inputs one after another.
+
+        An input that cannot be loaded does not prevent the others from being
+        loaded: a warning is raised for it instead.
+
+        Parameters
+        ----------
+        inputs : list
+            Input filenames, urls, data objects, etc.
+        loader, format, target : string, optional
+            Only consider a specific loader/resolver, format or target, for all
+            the inputs.
+        n_cpu : int, optional
+            Number of threads.  Defaults to the number of CPU cores - 1.
+        kwargs :
+            Additional kwargs are passed on to the loader and importer of every
+            input, as in ``load``.
+
+        Returns
+        -------
+        errors : dict
+            Exception raised for each input that could not be loaded, by index
+            of the input in ``inputs``.
+        """
+        inputs = list(inputs)
+        preparsed = {}
+
+        def collect(result):
+            path, hdulist, hashes = result
+            if hdulist is not None:
+                preparsed[path] = hdulist
+                _HDU_DATA_HASHES.update(hashes)
+
+        # the threads only read and hash the files: resolvers and importers
+        # (which are widgets) are only created from this thread
+        if not self._app.state.settings.get('data', {}).get('lazy_load', False):
+            paths = {os.path.abspath(inp) for inp in inputs
+                     if isinstance(inp, (str, os.PathLike)) and os.path.isfile(inp)}
+            if n_cpu is None:
+                n_cpu = max((os.cpu_count() or 1) - 1, 1)
+            parallelize_calculation([_FITSParseWorker(path) for path in sorted(paths)],
+                                    collect, n_cpu=n_cpu, prefer='threads')
+        _PREPARSED_FITS.update(preparsed)
+
+        errors = {}
+        try:
+            with self.batch_load():
+                for index, inp in enumerate(inputs):
+                    try:
+                        self._load(inp, loader=loader, format=format, target=target, **kwargs)
+                    except Exception as err:  # nosec
+                        errors[index] = err
+        finally:
+            # files that were not parsed as FITS by any loader
+            for path, hdulist in preparsed.items():
+                if _PREPARSED_FITS.pop(path, None) is not None:
+                    hdulist.close()
+
+        for index in sorted(errors):
+            warnings.warn(f"Could not load input {index} ({inputs[index]!r}): {errors[index]}",
+                          UserWarning)
+        return errors
+
     @property
     def datasets(self):
         """
@@ -711,6 +790,10 @@ class ConfigHelper(HubListener):
 
     def _get_data(self, data_label=None, spatial_subset=None, spectral_subset=None,
                   temporal_subset=None, mask_subset=None, cls=None, use_display_units=False):
+        # live plugin results whose recomputation is deferred (to coalesce subset edits)
+        # are brought up to date first
+        self._app._flush_live_plugin_results()
+
         list_of_valid_subset_names = [x.label for x in self._app.data_collection.subset_groups]
         for subset in (spatial_subset, spectral_subset, mask_subset):
             if subset and subset not in list_of_valid_subset_names:
@@ -1150,6 +1233,28 @@ class ImageConfigHelper(ConfigHelper):
         self._app.data_collection.remove_subset_group(subset_grp)
 
 
+class _FITSParseWorker:
+    """
+    Open a local file as FITS and hash the data of its extensions, for
+    `ConfigHelper.load_many`.  Returns the path with the ``HDUList`` and the
+    hash of each HDU, or with `None` if the file could not be read as FITS.
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def __call__(self):
+        try:
+            hdulist = fits.open(self.path)
+        except Exception:  # nosec
+            return self.path, None, {}
+        try:
+            hashes = {hdu: create_data_hash(hdu) for hdu in hdulist}
+        except Exception:  # nosec
+            hdulist.close()
+            return self.path, None, {}
+        return self.path, hdulist, hashes
+
+
 def _next_subset_num(label_prefix, subset_groups):
     """Assumes ``prefix i`` format.
     Does not go back and fill in lower but available numbers. This is consistent with Glue.
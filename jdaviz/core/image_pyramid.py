@@ -0,0 +1,309 @@
+"""Multi-resolution image pyramids for zoomed-out views of large images.
+
+When an image is zoomed out, the viewers sample a fixed resolution buffer
+(at screen resolution) from the full-resolution array, which reads pixels
+across the whole image on every pan or zoom.  `ImagePyramid` keeps downsampled
+levels of the image, split in tiles which are only computed once they cover
+the viewport, so that zoomed-out views are sampled from the smallest level
+that still has at least one pixel per screen pixel.  The pyramid is only used
+for display: ``data`` itself (used by statistics and analysis plugins) is
+unchanged.
+"""
+import json
+import os
+import re
+import threading
+import weakref
+
+import numpy as np
+from glue.core.component import Component, CoordinateComponent, DerivedComponent
+from glue.core.exceptions import IncompatibleAttribute
+from glue_jupyter.bqplot.image.layer_artist import BqplotImageLayerArtist
+
+__all__ = ['ImagePyramid', 'get_image_pyramid', 'PyramidImageLayerArtist']
+
+_PYRAMID_META_KEY = '_image_pyramid'
+
+
+def _block_mean(array):
+    """Mean over blocks of 2x2 pixels, ignoring non-finite values."""
+    h, w = array.shape
+    if h % 2 or w % 2:
+        padded = np.full((h + h % 2, w + w % 2), np.nan, dtype=np.float32)
+        padded[:h, :w] = array
+        array = padded
+    blocks = array.reshape(array.shape[0] // 2, 2, array.shape[1] // 2, 2)
+    finite = np.isfinite(blocks)
+    sums = np.where(finite, blocks, 0).sum(axis=(1, 3), dtype=np.float64)
+    counts = finite.sum(axis=(1, 3))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums / counts).astype(np.float32)
+
+
+class _ComponentPyramid:
+    """Levels of one component, computed tile by tile."""
+    def __init__(self, pyramid, label, array, reset=False):
+        self.pyramid = pyramid
+        self.array = array
+        self._name = re.sub(r'[^\w.-]', '_', str(label))
+        self._reset = reset
+        self._tiles = {}
+        self._stored = {}
+
+    def _storage(self, level):
+        # memory-mapped level and flags of its computed tiles, if persisted
+        if level in self._stored:
+            return self._stored[level]
+        directory = self.pyramid._prepare_directory()
+        stored = None
+        if directory is not None:
+            shape = self.pyramid.level_shape(level)
+            tiles_shape = tuple(-(-n // self.pyramid.tile_size) for n in shape)
+            path = os.path.join(directory, f'{self._name}_level{level}.npy')
+            tiles_path = os.path.join(directory, f'{self._name}_level{level}_tiles.npy')
+            try:
+                if self._reset:
+                    raise FileNotFoundError
+                stored = (np.load(path, mmap_mode='r+'), np.load(tiles_path, mmap_mode='r+'))
+                if stored[0].shape != shape or stored[1].shape != tiles_shape:
+                    raise ValueError('pyramid level does not match the image')
+            except (OSError, ValueError):
+                try:
+                    stored = (np.lib.format.open_memmap(path, mode='w+', dtype=np.float32,
+                                                        shape=shape),
+                              np.lib.format.open_memmap(tiles_path, mode='w+', dtype=bool,
+                                                        shape=tiles_shape))
+                except OSError:
+                    # not writable: the level is kept in memory
+                    stored = None
+        self._stored[level] = stored
+        return stored
+
+    def tile(self, level, ty, tx):
+        size = self.pyramid.tile_size
+        height, width = self.pyramid.level_shape(level)
+        y0, y1 = ty * size, min((ty + 1) * size, height)
+        x0, x1 = tx * size, min((tx + 1) * size, width)
+        stored = self._storage(level)
+        if stored is not None and stored[1][ty, tx]:
+            return stored[0][y0:y1, x0:x1]
+        if stored is None and (level, ty, tx) in self._tiles:
+            return self._tiles[(level, ty, tx)]
+
+        height_below, width_below = self.pyramid.level_shape(level - 1)
+        tile = _block_mean(self.region(level - 1, 2 * y0, min(2 * y1, height_below),
+                                       2 * x0, min(2 * x1, width_below)))
+        if stored is not None:
+            stored[0][y0:y1, x0:x1] = tile
+            stored[1][ty, tx] = True
+        else:
+            self._tiles[(level, ty, tx)] = tile
+        return tile
+
+    def region(self, level, y0, y1, x0, x1):
+        """Values of a level within ``[y0:y1, x0:x1]``, from the tiles that cover it."""
+        if level == 0:
+            return np.asarray(self.array[y0:y1, x0:x1], dtype=np.float32)
+        size = self.pyramid.tile_size
+        region = np.empty((y1 - y0, x1 - x0), dtype=np.float32)
+        for ty in range(y0 // size, (y1 - 1) // size + 1):
+            for tx in range(x0 // size, (x1 - 1) // size + 1):
+                tile = self.tile(level, ty, tx)
+                ty0, tx0 = ty * size, tx * size
+                ys = slice(max(y0, ty0), min(y1, ty0 + tile.shape[0]))
+                xs = slice(max(x0, tx0), min(x1, tx0 + tile.shape[1]))
+                region[ys.start - y0:ys.stop - y0, xs.start - x0:xs.stop - x0] = \
+                    tile[ys.start - ty0:ys.stop - ty0, xs.start - tx0:xs.stop - tx0]
+        return region
+
+
+class ImagePyramid:
+    """
+    Multi-resolution pyramid of the 2D components of a glue ``Data``.
+
+    Level ``k`` of the pyramid averages blocks of ``2**k`` x ``2**k`` pixels of
+    the image (ignoring non-finite values), down to a single pixel, so that
+    views zoomed out by any factor are sampled from a level at their own scale.
+    Levels are split in tiles of ``tile_size`` pixels, which
+    are computed from the level below when they are first needed, so that
+    nothing is computed when the pyramid is created (e.g., at import), and
+    only the tiles that cover the viewports are ever computed.
+
+    Parameters
+    ----------
+    data : `~glue.core.data.Data`
+        2D data.  The pyramid is only used for this data (see
+        `get_image_pyramid`).
+    directory : str or `None`
+        If given, the levels are persisted in this directory (as memory-mapped
+        ``.npy`` files), and reused across sessions as long as ``source`` has
+        not changed.  Otherwise, they are kept in memory.
+    source : str or `None`
+        File the data were read from, whose size and modification time are
+        checked before reusing persisted levels.
+    tile_size : int
+        Size of the tiles, in pixels.
+    """
+    def __init__(self, data, directory=None, source=None, tile_size=256):
+        if data.ndim != 2:
+            raise ValueError(f'image pyramid requires 2D data, got ndim={data.ndim}')
+        self._data = weakref.ref(data)
+        self.shape = tuple(data.shape)
+        self.directory = directory
+        self.source = source
+        self.tile_size = tile_size
+        n_levels = 1
+        while max(self.level_shape(n_levels - 1)) > 1:
+            n_levels += 1
+        self.n_levels = n_levels
+        self._components = {}
+        self._directory_ready = False
+        self._lock = threading.RLock()
+
+    @property
+    def data(self):
+        return self._data()
+
+    def level_shape(self, level):
+        """Shape of a level of the pyramid."""
+        return tuple(-(-n // 2 ** level) for n in self.shape)
+
+    def _source_info(self):
+        info = {'shape': list(self.shape), 'tile_size': self.tile_size}
+        if self.source is not None and os.path.exists(self.source):
+            stat = os.stat(self.source)
+            info.update(source=os.path.abspath(self.source),
+                        source_size=stat.st_size, source_mtime=stat.st_mtime)
+        return info
+
+    def _prepare_directory(self):
+        # on first use: levels persisted for another version of the source are removed
+        if self.directory is None or self._directory_ready:
+            return self.directory
+        info = self._source_info()
+        info_path = os.path.join(self.directory, 'pyramid.json')
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            try:
+                with open(info_path) as f:
+                    valid = json.load(f) == info
+            except (OSError, ValueError):
+                valid = False
+            if not valid:
+                for filename in os.listdir(self.directory):
+                    if filename.endswith('.npy'):
+                        os.remove(os.path.join(self.directory, filename))
+                with open(info_path, 'w') as f:
+                    json.dump(info, f)
+        except OSError:
+            # not writable: levels are kept in memory
+            self.directory = None
+        self._directory_ready = True
+        return self.directory
+
+    def _component(self, label, array):
+        component = self._components.get(label)
+        if component is None or component.array is not array:
+            # values computed for another array (if any) are not reused
+            component = _ComponentPyramid(self, label, array, reset=component is not None)
+            self._components[label] = component
+        return component
+
+    def level_for_bounds(self, bounds):
+        """
+        Level to sample for a fixed resolution buffer with these bounds, i.e.
+        the smallest level with at least one pixel per pixel of the buffer.
+        """
+        steps = [abs(vmax - vmin) / max(n - 1, 1) for vmin, vmax, n in bounds]
+        step = min(steps)
+        if step < 2:
+            return 0
+        return min(int(np.floor(np.log2(step))), self.n_levels - 1)
+
+    def fixed_resolution_buffer(self, label, array, bounds):
+        """
+        Sample a level of the pyramid of a component on a regular grid, like
+        `glue.core.fixed_resolution_buffer.compute_fixed_resolution_buffer`
+        does for the full-resolution array.
+
+        Parameters
+        ----------
+        label : str
+            Label of the component.
+        array : array-like
+            Full-resolution values of the component.
+        bounds : list
+            ``[(ymin, ymax, ny), (xmin, xmax, nx)]``, in pixels of the image.
+
+        Returns
+        -------
+        image : `~numpy.ndarray` or `None`
+            Values of shape ``(ny, nx)``, with NaN outside of the image, or
+            `None` if the full-resolution array should be sampled instead.
+        """
+        level = self.level_for_bounds(bounds)
+        if level == 0:
+            return None
+        factor = 2 ** level
+        coords = []
+        for (vmin, vmax, n), size in zip(bounds, self.shape):
+            pixel = np.round(np.linspace(vmin, vmax, n)).astype(int)
+            invalid = (pixel < 0) | (pixel >= size)
+            # index of the block of the level that holds the nearest pixel
+            coords.append((np.clip(pixel, 0, size - 1) // factor, invalid))
+        (iy, invalid_y), (ix, invalid_x) = coords
+
+        with self._lock:
+            region = self._component(label, array).region(level, iy.min(), iy.max() + 1,
+                                                          ix.min(), ix.max() + 1)
+        image = region[np.ix_(iy - iy.min(), ix - ix.min())].astype(float)
+        image[invalid_y, :] = np.nan
+        image[:, invalid_x] = np.nan
+        return image
+
+
+def get_image_pyramid(data):
+    """
+    The `ImagePyramid` attached to ``data`` (e.g., by the image importer), if
+    any and if it was built for ``data`` itself, otherwise `None`.
+    """
+    pyramid = getattr(data, 'meta', {}).get(_PYRAMID_META_KEY)
+    if pyramid is not None and pyramid.data is data:
+        return pyramid
+    return None
+
+
+class PyramidImageLayerArtist(BqplotImageLayerArtist):
+    """
+    Image layer artist that samples zoomed-out views from the `ImagePyramid`
+    of the data, when it has one and is the reference data of the viewer,
+    instead of from the full-resolution array.
+    """
+    def _get_pyramid_image_data(self, bounds):
+        if self.uuid is None or bounds is None:
+            return None
+        data = self.layer
+        pyramid = get_image_pyramid(data)
+        viewer_state = self._viewer_state
+        if (pyramid is None or viewer_state.reference_data is not data
+                or viewer_state.x_att is None or viewer_state.y_att is None
+                or (viewer_state.y_att.axis, viewer_state.x_att.axis) != (0, 1)):
+            return None
+        attribute = self.state.attribute
+        if attribute is None:
+            return None
+        try:
+            component = data.get_component(attribute)
+        except IncompatibleAttribute:
+            return None
+        if (not isinstance(component, Component)
+                or isinstance(component, (DerivedComponent, CoordinateComponent))):
+            return None
+        return pyramid.fixed_resolution_buffer(attribute.label, component.data, bounds)
+
+    def get_image_data(self, bounds=None):
+        image = self._get_pyramid_image_data(bounds)
+        if image is None:
+            return super().get_image_data(bounds=bounds)
+        self.enable()
+        return image
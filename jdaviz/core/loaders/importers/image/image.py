@@ -1,4 +1,6 @@
+import os
 import warnings
+import weakref
 
 import asdf
 import numpy as np
@@ -20,6 +22,8 @@ from jdaviz.core.template_mixin import (SelectFileExtensionComponent,
 from jdaviz.core.loaders.importers import BaseImporterToDataCollection
 from jdaviz.core.registries import loader_importer_registry
 from jdaviz.core.user_api import ImporterUserApi
+from jdaviz.core.wcs_surrogate import _SURROGATE_META_KEY, _try_gwcs_surrogate
+from jdaviz.core.image_pyramid import _PYRAMID_META_KEY, ImagePyramid
 from jdaviz.utils import wcs_is_spectral, hst_obstype
 
 from jdaviz.utils import (
@@ -35,6 +39,9 @@ else:
     HAS_ROMAN_DATAMODELS = True
 
 MAX_N_SLICE = 16
+# parsed ASDF trees of JWST ASDF-in-FITS files, by id of their HDUList (which
+# is not hashable), see _jwst_asdf_tree
+_JWST_ASDF_TREES = {}
 roman_extensions = ['data', 'err', 'dq', 'var_poisson']
 
 __all__ = ['ImageImporter', '_spatial_assign_component_type']
@@ -69,6 +76,11 @@ class ImageImporter(BaseImporterToDataCollection):
 
     # Use FITS approximation instead of original image GWCS
     gwcs_to_fits_sip = Bool(False).tag(sync=True)
+    # Build an interpolated surrogate of the GWCS for interactive use
+    gwcs_surrogate = Bool(False).tag(sync=True)
+    # Build a multi-resolution pyramid for display, optionally persisted next to the file
+    image_pyramid = Bool(False).tag(sync=True)
+    image_pyramid_persist = Bool(False).tag(sync=True)
 
     # Alignment options
     align_by_items = List().tag(sync=True)
@@ -134,7 +146,7 @@ class ImageImporter(BaseImporterToDataCollection):
                                 'ver': hdu.ver,
                                 'name_ver': f"{hdu.name},{hdu.ver}",
                                 'index': index,
-                                'data_hash': create_data_hash(hdu),
+                                'data_hash': self._hash_hdu(hdu),
                                 'obj': hdu}
                                for index, hdu in enumerate(input)]
             elif input_is_roman_asdf:
@@ -197,7 +209,8 @@ class ImageImporter(BaseImporterToDataCollection):
 
     @property
     def user_api(self):
-        expose = ['parent', 'data_label_as_prefix', 'gwcs_to_fits_sip', 'align_by']
+        expose = ['parent', 'data_label_as_prefix', 'gwcs_to_fits_sip', 'gwcs_surrogate',
+                  'image_pyramid', 'image_pyramid_persist', 'align_by']
         if self.input_has_extensions:
             expose += ['extension']
         return ImporterUserApi(self, expose)
@@ -294,6 +307,33 @@ class ImageImporter(BaseImporterToDataCollection):
             glue_data.coords = _try_gwcs_to_fits_sip(glue_data.coords)
         return glue_data
 
+    def _glue_data_wcs_surrogate(self, glue_data):
+        """
+        Attach an interpolated surrogate of the GWCS, used for interactive
+        coordinate transformations, if gwcs_surrogate is True and data.coords
+        is a GWCS.  If the surrogate is not accurate enough, a warning will be
+        emitted and the GWCS will be used everywhere.
+        """
+        surrogate = _try_gwcs_surrogate(glue_data.coords, glue_data.shape)
+        if surrogate is not None:
+            glue_data.meta[_SURROGATE_META_KEY] = surrogate
+        return glue_data
+
+    def _glue_data_image_pyramid(self, glue_data):
+        """
+        Attach a multi-resolution pyramid, used by the image viewers to display
+        zoomed-out views, if image_pyramid is True.  Its levels are computed
+        when first displayed and, if image_pyramid_persist is True and the
+        input was read from a file, persisted in ``<file>.pyramid``.
+        """
+        source = self.input.filename() if isinstance(self.input, fits.HDUList) else None
+        if source is None or not os.path.isfile(source):
+            source = None
+        directory = f'{source}.pyramid' if self.image_pyramid_persist and source else None
+        glue_data.meta[_PYRAMID_META_KEY] = ImagePyramid(glue_data, directory=directory,
+                                                         source=source)
+        return glue_data
+
     def _get_label_with_extension(self, prefix, ext=None, ver=None):
         full_ext = ",".join([str(e) for e in (ext, ver) if e is not None])
         return f"{prefix}[{full_ext}]" if len(full_ext) else prefix
@@ -391,15 +431,9 @@ class ImageImporter(BaseImporterToDataCollection):
         for d, ext_name in zip(data, ext_names):
             if d is None:
                 continue
+            # NOTE: DQ components are kept in their native integer dtype, unflagged (zero)
+            # pixels are made transparent at render time by the DQ lookup stretch
             d.meta['_extname'] = ext_name
-            for component_id in d.main_components:
-                if component_id.label.lower().startswith("dq"):
-                    # for DQ components, map zeros to nans
-                    # so that they are not displayed in the DQ colormap
-                    cid = d.get_component(component_id)
-                    data_arr = np.float32(cid.data)
-                    data_arr[data_arr == 0] = np.nan
-                    d.update_components({cid: data_arr})
 
         return data
 
@@ -465,6 +499,10 @@ class ImageImporter(BaseImporterToDataCollection):
 
             if self.gwcs_to_fits_sip:
                 output = self._glue_data_wcs_to_fits(output)
+            if self.gwcs_surrogate and isinstance(output.coords, GWCS):
+                output = self._glue_data_wcs_surrogate(output)
+            if self.image_pyramid and output.ndim == 2:
+                output = self._glue_data_image_pyramid(output)
 
             self.add_to_data_collection(output, data_label, data_hash=ext_item.get('data_hash'),
                                         parent=parent_data_label if parent_data_label != data_label else None,  # noqa
@@ -480,7 +518,9 @@ class ImageImporter(BaseImporterToDataCollection):
 
 def _validate_fits_image2d(item):
     hdu = item.get('obj')
-    return (hdu.data is not None and hdu.is_image and hdu.data.ndim == 2
+    # NOTE: shape is read from the header so that the data of (lazily loaded)
+    # extensions which are not selected are never read
+    return (hdu.is_image and len(getattr(hdu, 'shape', ())) == 2
             and not wcs_is_spectral(getattr(hdu, 'coords', None)))
 
 
@@ -597,6 +637,42 @@ def _roman_asdf_2d_to_glue_data(file_obj, ext=None, try_gwcs_to_fits_sip=False):
     return data
 
 
+def _jwst_asdf_tree(hdulist):
+    """
+    Parse the ASDF tree of a JWST ASDF-in-FITS file and return its
+    standardized metadata, its GWCS (or `None`) and the names of the
+    top-level entries of the tree.
+
+    The tree is parsed once per ``hdulist`` object, for as long as it is
+    open, and shared by all the extensions imported from it (as well as by
+    the validity checks that build the output before the import).  Image
+    arrays are not kept, since they are the data of the corresponding
+    extensions of ``hdulist``.
+
+    Raises
+    ------
+    ValueError
+        The ASDF tree could not be parsed or has no ``meta``.
+    """
+    key = id(hdulist)
+    try:
+        parsed = _JWST_ASDF_TREES[key]
+    except KeyError:
+        try:
+            # This is very specific to JWST pipeline image output.
+            with asdf_in_fits.open(hdulist) as af:
+                dm_meta = af.tree["meta"]
+                parsed = (standardize_metadata(dm_meta), dm_meta.get('wcs'), frozenset(af.tree))
+        except Exception:  # nosec
+            parsed = None
+        _JWST_ASDF_TREES[key] = parsed
+        # forget the tree once hdulist is garbage collected (before its id is reused)
+        weakref.finalize(hdulist, _JWST_ASDF_TREES.pop, key, None)
+    if parsed is None:
+        raise ValueError('could not parse the ASDF tree')
+    return parsed
+
+
 def _jwst2data(hdu, hdulist, try_gwcs_to_fits_sip=False):
     comp_label = hdu.name.lower()
     if comp_label.startswith("sci"):
@@ -605,40 +681,36 @@ def _jwst2data(hdu, hdulist, try_gwcs_to_fits_sip=False):
     unit_attr = f'bunit_{comp_label}'
 
     try:
-        # This is very specific to JWST pipeline image output.
-        with asdf_in_fits.open(hdulist) as af:
-            dm = af.tree
-            dm_meta = af.tree["meta"]
-            data.meta.update(standardize_metadata(dm_meta))
-
-            if unit_attr in dm_meta:
-                bunit = _validate_bunit(dm_meta[unit_attr], raise_error=False)
-            else:
-                bunit = ''
-
-            # This is instance of gwcs.WCS, not astropy.wcs.WCS
-            if 'wcs' in dm_meta:
-                gwcs = dm_meta['wcs']
+        dm_meta, gwcs, dm_keys = _jwst_asdf_tree(hdulist)
+        # keys in the asdf tree are lower case
+        if comp_label not in dm_keys:
+            raise KeyError(comp_label)
+        data.meta.update(dm_meta)
+
+        if unit_attr in dm_meta:
+            bunit = _validate_bunit(dm_meta[unit_attr], raise_error=False)
+        else:
+            bunit = ''
 
-                if try_gwcs_to_fits_sip:
-                    data.coords = _try_gwcs_to_fits_sip(gwcs)
-                else:
-                    data.coords = gwcs
-            # keys in the asdf tree are lower case
-            imdata = dm[comp_label]
-            component = Component.autotyped(imdata, units=bunit)
+        # This is instance of gwcs.WCS, not astropy.wcs.WCS
+        if gwcs is not None:
+            if try_gwcs_to_fits_sip:
+                data.coords = _try_gwcs_to_fits_sip(gwcs)
+            else:
+                data.coords = gwcs
+        component = Component.autotyped(hdu.data, units=bunit)
 
-            # Might have bad GWCS. If so, we exclude it.
-            try:
-                data.add_component(component=component, label=comp_label)
+        # Might have bad GWCS. If so, we exclude it.
+        try:
+            data.add_component(component=component, label=comp_label)
 
-            except Exception:  # pragma: no cover
-                data.coords = None
-                data.add_component(component=component, label=comp_label)
+        except Exception:  # pragma: no cover
+            data.coords = None
+            data.add_component(component=component, label=comp_label)
 
     # TODO: Do not need this when jwst.datamodels finally its own package.
     # This might happen for grism image; fall back to FITS loader without WCS.
-    except Exception:
+    except (KeyError, ValueError):
         if comp_label == 'data':
             new_ext = 'sci'
         else:
@@ -1,10 +1,15 @@
 import numpy as np
+import pytest
 import astropy.units as u
 from astropy.nddata import NDData, StdDevUncertainty
 from astropy.io import fits
+from gwcs import WCS as GWCS
 from specutils import Spectrum
+from stdatamodels import asdf_in_fits
 
-from jdaviz.core.loaders.importers.image.image import ImageImporter
+from jdaviz.configs.imviz.tests.utils import create_example_gwcs
+from jdaviz.core.loaders.importers.image.image import (ImageImporter, _jwst2data,
+                                                       _jwst_asdf_tree)
 
 
 def test_image_importer_is_valid(deconfigged_helper):
@@ -51,3 +56,57 @@ def test_image_importer_is_valid(deconfigged_helper):
                     wcs=s.wcs)
     importer = _create_importer(input_data=nddata)
     assert importer._check_is_valid() == 'Input has spectral WCS coordinates.'
+
+
+def _jwst_like_file(filename, shape=(64, 64), n_meta=1000):
+    """Write an ASDF-in-FITS file with SCI, ERR and DQ extensions and a GWCS."""
+    hdulist = fits.HDUList([fits.PrimaryHDU(),
+                            fits.ImageHDU(np.ones(shape), name='SCI'),
+                            fits.ImageHDU(np.full(shape, 0.1), name='ERR'),
+                            fits.ImageHDU(np.zeros(shape, dtype=np.uint32), name='DQ')])
+    tree = {'meta': {'wcs': create_example_gwcs(shape),
+                     'bunit_data': 'MJy/sr', 'bunit_err': 'MJy/sr',
+                     'extra': {f'key{i}': {'value': i, 'unit': 'pix'} for i in range(n_meta)}},
+            'data': hdulist['SCI'].data,
+            'err': hdulist['ERR'].data,
+            'dq': hdulist['DQ'].data}
+    asdf_in_fits.write(filename, tree, hdulist=hdulist, overwrite=True)
+    return filename
+
+
+def test_jwst_asdf_tree_parsed_once(imviz_helper, tmp_path, monkeypatch):
+    filename = _jwst_like_file(str(tmp_path / 'jwst_like.fits'))
+
+    n_parse = []
+    asdf_open = asdf_in_fits.open
+
+    def counting_open(*args, **kwargs):
+        n_parse.append(1)
+        return asdf_open(*args, **kwargs)
+
+    monkeypatch.setattr(asdf_in_fits, 'open', counting_open)
+
+    imviz_helper.load(filename, format='Image', extension=('SCI', 'ERR', 'DQ'),
+                      data_label='jwst')
+    assert len(n_parse) == 1
+
+    sci, err, dq = imviz_helper._app.data_collection
+    assert [d.label for d in (sci, err, dq)] == ['jwst[SCI,1]', 'jwst[ERR,1]', 'jwst[DQ,1]']
+    assert isinstance(sci.coords, GWCS)
+    assert err.coords is sci.coords and dq.coords is sci.coords
+    assert sci.get_component('data').units == 'MJy/sr'
+    assert dq.get_component('dq').units == ''
+    np.testing.assert_allclose(err.get_component('err').data, 0.1)
+    # metadata is standardized once but each data has its own copy
+    assert sci.meta is not err.meta
+    assert sci.meta['extra'] == err.meta['extra']
+
+
+def test_jwst_asdf_tree_fallback():
+    # no meta in the tree, the FITS loader is used without WCS
+    hdulist = fits.HDUList([fits.PrimaryHDU(), fits.ImageHDU(np.ones((5, 5)), name='SCI')])
+    hdulist.append(fits.ImageHDU(name='ASDF'))
+    data = _jwst2data(hdulist['SCI'], hdulist)
+    assert [comp.label for comp in data.main_components] == ['SCI,1']
+    with pytest.raises(ValueError, match='could not parse'):
+        _jwst_asdf_tree(hdulist)
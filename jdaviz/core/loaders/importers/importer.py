@@ -1,4 +1,5 @@
 import os
+import weakref
 
 from astropy import units as u
 from traitlets import Any, Bool, List, Unicode, observe
@@ -6,6 +7,7 @@ from glue.core.message import (DataCollectionAddMessage,
                                DataCollectionDeleteMessage)
 
 from jdaviz.core.events import NewViewerMessage, SnackbarMessage
+from jdaviz.core.range_file import RangeRequestFile
 from jdaviz.core.registries import viewer_registry
 from jdaviz.core.template_mixin import (PluginTemplateMixin,
                                         AutoTextField,
@@ -16,10 +18,14 @@ from jdaviz.core.user_api import ImporterUserApi
 from jdaviz.utils import (standardize_metadata,
                           _wcs_only_label,
                           CONFIGS_WITH_LOADERS,
-                          create_data_hash)
+                          create_data_hash,
+                          create_hdu_hash)
 
 __all__ = ['BaseImporter', 'BaseImporterToDataCollection', 'BaseImporterToPlugin']
 
+# data hashes of HDUs computed ahead of the import, see ConfigHelper.load_many
+_HDU_DATA_HASHES = weakref.WeakKeyDictionary()
+
 
 def _physical_type_from_component(comp_id, comp):
     """
@@ -83,6 +89,32 @@ class BaseImporter(PluginTemplateMixin, ValidatorMixin):
 
         return applied_kwargs
 
+    @property
+    def lazy_load(self):
+        """
+        Whether the ``lazy_load`` data setting of the app is enabled, in which case
+        FITS extensions are kept memory-mapped and identified by header-based hashes.
+        """
+        return self._app.state.settings.get('data', {}).get('lazy_load', False)
+
+    def _hash_hdu(self, hdu):
+        # the data of remote files read with range requests are not transferred
+        # only to be hashed
+        file_obj = getattr(getattr(hdu, '_file', None), '_file', None)
+        if self.lazy_load or isinstance(file_obj, RangeRequestFile):
+            return create_hdu_hash(hdu)
+        if hdu in _HDU_DATA_HASHES:
+            return _HDU_DATA_HASHES[hdu]
+        return create_data_hash(hdu)
+
+    def _selected_extension_hash(self, attr='extension'):
+        # only used in lazy_load mode to avoid reading (and hashing) the full array
+        # when adding to the data collection
+        if not self.lazy_load:
+            return None
+        data_hash = getattr(getattr(self, attr, None), 'selected_item', {}).get('data_hash')
+        return data_hash if isinstance(data_hash, str) else None
+
     def _check_is_valid(self):
         """
         Checks if the importer input is valid (override in subclasses).
@@ -482,7 +514,7 @@ class BaseImporterToDataCollection(BaseImporter):
         # NOTE: if data hashing performance becomes an issue for importers that
         # don't overwrite __call__, we can pass the pre-computed hash from
         # self.data_hashes as a kwarg here
-        self.add_to_data_collection(self.output)
+        self.add_to_data_collection(self.output, data_hash=self._selected_extension_hash())
 
 
 class BaseImporterToPlugin(BaseImporter):
@@ -3,6 +3,7 @@ from traitlets import Any, Bool, List, Unicode, observe
 from astropy import units as u
 from astropy.nddata import StdDevUncertainty
 from specutils import Spectrum
+from glue.config import data_translator
 from glue.core.message import DataCollectionAddMessage, DataCollectionDeleteMessage
 
 from jdaviz.core.custom_units_and_equivs import PIX2
@@ -18,6 +19,7 @@ from jdaviz.core.template_mixin import (AutoTextField,
 from jdaviz.core.unit_conversion_utils import (check_if_unit_is_per_solid_angle,
                                                _eqv_flux_to_sb_pixel)
 from jdaviz.core.user_api import ImporterUserApi
+from jdaviz.utils import create_data_hash
 
 
 __all__ = ['Spectrum3DImporter']
@@ -151,7 +153,10 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
             self.viewer.selected = ['flux-viewer']
 
         # UNCERTAINTY CUBE
-        self.has_unc = self.spectrum.uncertainty is not None
+        if self._lazy_fits_input:
+            self.has_unc = self._extension_distinct_from_flux(self.unc_extension)
+        else:
+            self.has_unc = self.spectrum.uncertainty is not None
         self.unc_data_label = AutoTextField(self,
                                             'unc_data_label_value',
                                             'unc_data_label_default',
@@ -182,7 +187,10 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
             self.unc_viewer.select_default()
 
         # MASK CUBE
-        self.has_mask = self.spectrum.mask is not None
+        if self._lazy_fits_input:
+            self.has_mask = self._extension_distinct_from_flux(self.mask_extension)
+        else:
+            self.has_mask = self.spectrum.mask is not None
         self.mask_data_label = AutoTextField(self,
                                              'mask_data_label_value',
                                              'mask_data_label_default',
@@ -423,10 +431,32 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
             expose += ['dq_extension']
         return ImporterUserApi(self, expose)
 
+    @property
+    def _lazy_fits_input(self):
+        # in lazy_load mode, FITS inputs are inspected through their headers so that
+        # building and validating this importer never reads extension data from disk
+        return self.lazy_load and self.input_type == 'fits:hdulist'
+
+    @property
+    def _flux_hdu(self):
+        # the uncertainty extension is used as the flux if no flux extension is selected
+        return self.extension.selected_obj or self.unc_extension.selected_obj
+
+    def _extension_distinct_from_flux(self, extension):
+        if extension.selected in ('', 'None'):
+            return False
+        flux_hdu = self._flux_hdu
+        return flux_hdu is not None and extension.selected_obj is not flux_hdu
+
     def _check_is_valid(self):
         if self._app.config not in ('deconfigged', 'cubeviz'):
             # NOTE: temporary during deconfig process
             return 'Importer only supported in deconfigged and cubeviz'
+        if self._lazy_fits_input:
+            flux_hdu = self._flux_hdu
+            if flux_hdu is None or flux_hdu.header.get('NAXIS') != 3:
+                return 'Spectrum flux must be 3D.'
+            return ''
         if self.spectrum.flux.ndim != 3:
             return 'Spectrum flux must be 3D.'
         self.output
@@ -490,28 +520,35 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
         if not getattr(self._app._jdaviz_helper, '_loaded_flux_cube', None):
             self._app._jdaviz_helper._loaded_flux_cube = self._app.data_collection[data_label]
 
-        if self.has_unc and not self.flux_only and self.output.uncertainty is not None:
+        # output may apply a unit conversion (and therefore a copy) on every access
+        output = self.output
+
+        if self.has_unc and not self.flux_only and output.uncertainty is not None:
             # TODO: detect if uncertainty exists and hide section from UI
-            uncert = Spectrum(spectral_axis=self.output.spectral_axis,
-                              flux=self.output.uncertainty.represent_as(StdDevUncertainty).quantity,
-                              wcs=self.output.wcs,
-                              meta=self.output.meta,
-                              spectral_axis_index=self.output.spectral_axis_index)
+            uncert = Spectrum(spectral_axis=output.spectral_axis,
+                              flux=output.uncertainty.represent_as(StdDevUncertainty).quantity,
+                              wcs=output.wcs,
+                              meta=output.meta,
+                              spectral_axis_index=output.spectral_axis_index)
             self.add_to_data_collection(uncert,
                                         unc_data_label,
+                                        data_hash=self._selected_extension_hash('unc_extension'),
                                         viewer_select=self.unc_viewer)
             # TODO: this will need to be removed when removing restriction of a single flux cube
             self._app._jdaviz_helper._loaded_uncert_cube = self._app.data_collection[unc_data_label]
 
-        if self.has_mask and not self.flux_only and self.output.mask is not None:
-            mask = Spectrum(spectral_axis=self.output.spectral_axis,
-                            flux=self.output.mask * u.dimensionless_unscaled,
-                            wcs=self.output.wcs,
-                            meta=self.output.meta,
-                            spectral_axis_index=self.output.spectral_axis_index)
+        if self.has_mask and not self.flux_only and output.mask is not None:
+            mask_data = np.asarray(output.mask)
+            if mask_data.dtype == bool:
+                # uint8 view of the boolean mask (no copy)
+                mask_data = mask_data.view(np.uint8)
+            mask = self._compact_cube_to_data(output, mask_data, output.meta)
             self.add_to_data_collection(mask,
                                         mask_data_label,
-                                        viewer_select=self.mask_viewer)
+                                        data_hash=(self._selected_extension_hash('mask_extension')
+                                                   or create_data_hash(mask_data)),
+                                        viewer_select=self.mask_viewer,
+                                        cls=Spectrum)
             # TODO: this will need to be removed when removing restriction of a single flux cube
             self._app._jdaviz_helper._loaded_mask_cube = self._app.data_collection[mask_data_label]
 
@@ -552,20 +589,15 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
                 if dq_hdu is None:
                     return
 
-                # for DQ components, map zeros to nans
-                # so that they are not displayed in the colormap
-                dq_data = np.float32(dq_hdu.data)
-                dq_data[dq_data == 0] = np.nan
+                # DQ flags are kept in their native integer dtype, unflagged (zero)
+                # pixels are made transparent at render time by the DQ stretch
+                dq_data = np.asarray(dq_hdu.data)
 
                 # Set _extname so the DQ plugin can identify this as a DQ layer
-                dq_meta = dict(self.output.meta)
+                dq_meta = dict(output.meta)
                 dq_meta['_extname'] = 'DQ'
 
-                dq_cube = Spectrum(spectral_axis=self.output.spectral_axis,
-                                   flux=dq_data * u.dimensionless_unscaled,
-                                   wcs=self.output.wcs,
-                                   meta=dq_meta,
-                                   spectral_axis_index=self.output.spectral_axis_index)
+                dq_cube = self._compact_cube_to_data(output, dq_data, dq_meta)
 
                 # in cubeviz, use the dq_viewer selection. in deconfigged, optionally
                 # add to flux viewer based on checkbox, or don't add to any viewer
@@ -576,11 +608,33 @@ class Spectrum3DImporter(BaseImporterToDataCollection, SpectrumInputExtensionsMi
 
                 self.add_to_data_collection(dq_cube,
                                             dq_data_label,
+                                            data_hash=(self._selected_extension_hash('dq_extension')
+                                                       or create_data_hash(dq_data)),
                                             parent=data_label,
-                                            viewer_select=viewer_for_dq)
+                                            viewer_select=viewer_for_dq,
+                                            cls=Spectrum)
 
                 self._app._jdaviz_helper._loaded_dq_cube = self._app.data_collection[dq_data_label]
 
+    def _compact_cube_to_data(self, output, arr, meta):
+        """
+        Translate a mask or DQ cube to glue Data sharing the coordinates of the
+        flux cube ``output``, storing ``arr`` as the flux component in its native
+        dtype rather than as a float copy.
+        """
+        # translate a zero-strided placeholder (which allocates no memory) so that the
+        # spectral axis and WCS are handled as for the flux cube, then swap in the array
+        placeholder = np.broadcast_to(np.float32(0), arr.shape)
+        spec = Spectrum(spectral_axis=output.spectral_axis,
+                        flux=u.Quantity(placeholder, u.dimensionless_unscaled, copy=False),
+                        wcs=output.wcs,
+                        meta=meta,
+                        spectral_axis_index=output.spectral_axis_index)
+        handler, _ = data_translator.get_handler_for(spec)
+        data = handler.to_data(spec)
+        data.update_components({data.id['flux']: arr})
+        return data
+
     def assign_component_type(self, comp_id, comp, units, physical_type):
         comp_type = _spatial_assign_component_type(comp_id, comp, units, physical_type)
         return _spectrum_assign_component_type(comp_id, comp, units, comp_type)
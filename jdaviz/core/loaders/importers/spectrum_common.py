@@ -79,7 +79,7 @@ class SpectrumInputExtensionsMixin(VuetifyTemplate, HubListener):
                             'ver': hdu.ver,
                             'name_ver': f"{hdu.name},{hdu.ver}",
                             'index': index,
-                            'data_hash': create_data_hash(hdu),
+                            'data_hash': self._hash_hdu(hdu),
                             'obj': hdu}
                            for index, hdu in enumerate(self.input)
                            ]
@@ -563,6 +563,10 @@ class SpectrumInputExtensionsMixin(VuetifyTemplate, HubListener):
         except Exception:
             data_unit = u.count
 
+        def as_quantity(arr, unit):
+            # in lazy_load mode attach the unit without copying the (memory-mapped) array
+            return arr << unit if self.lazy_load else arr * unit
+
         # Check if the current HDU is the same as the uncertainty HDU
         # (happens when loading uncertainty extension as primary data)
         if self.unc_extension.selected not in ('', 'None'):
@@ -594,7 +598,7 @@ class SpectrumInputExtensionsMixin(VuetifyTemplate, HubListener):
                 unc = VarianceUncertainty(unc_data).represent_as(StdDevUncertainty)
                 unc.unit = data_unit
             else:
-                unc = StdDevUncertainty(unc_data * data_unit)
+                unc = StdDevUncertainty(as_quantity(unc_data, data_unit))
         else:
             unc = None
 
@@ -654,7 +658,7 @@ class SpectrumInputExtensionsMixin(VuetifyTemplate, HubListener):
                 wcs = None
 
         try:
-            sc = Spectrum(flux=data * data_unit, uncertainty=unc,
+            sc = Spectrum(flux=as_quantity(data, data_unit), uncertainty=unc,
                           mask=mask_data, meta=metadata, wcs=wcs,
                           spectral_axis_index=spectral_axis_index)
         except ValueError:
@@ -667,7 +671,7 @@ class SpectrumInputExtensionsMixin(VuetifyTemplate, HubListener):
             except Exception:
                 # specutils.Spectrum reader would fail, so use no WCS
                 sc = Spectrum(
-                        flux=data * data_unit, uncertainty=unc,
+                        flux=as_quantity(data, data_unit), uncertainty=unc,
                         meta=metadata, spectral_axis_index=self.default_spectral_axis_index)
             else:
                 # raising an error here will consider this parser as non-valid
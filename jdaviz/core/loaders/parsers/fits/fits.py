@@ -1,3 +1,4 @@
+import os
 from functools import cached_property
 from astropy.io import fits
 
@@ -7,6 +8,10 @@ from jdaviz.core.registries import loader_parser_registry
 
 __all__ = ['FITSParser']
 
+# files opened (and their HDUs hashed) ahead of the import, by absolute path,
+# see ConfigHelper.load_many
+_PREPARSED_FITS = {}
+
 
 @loader_parser_registry('fits')
 class FITSParser(BaseParser):
@@ -26,6 +31,13 @@ class FITSParser(BaseParser):
 
     @cached_property
     def output(self):
+        if isinstance(self.input, (str, os.PathLike)):
+            hdulist = _PREPARSED_FITS.pop(os.path.abspath(self.input), None)
+            if hdulist is not None:
+                return hdulist
+        if self._app.state.settings.get('data', {}).get('lazy_load', False):
+            # keep arrays as memory-mapped views and only read an HDU once accessed
+            return fits.open(self.input, memmap=True, lazy_load_hdus=True)
         return fits.open(self.input)
 
     def _cleanup(self):
@@ -0,0 +1,142 @@
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import numpy as np
+import pytest
+from astropy.io import fits
+
+from jdaviz.core.loaders.resolvers.url.url import URLResolver
+from jdaviz.core.range_file import RangeRequestFile, open_fits_by_range
+
+SHAPE = (512, 512)
+
+
+def _fits_bytes():
+    """Primary HDU and three float32 image extensions of 1 MB each."""
+    hdul = fits.HDUList([fits.PrimaryHDU()]
+                        + [fits.ImageHDU(np.full(SHAPE, i, dtype=np.float32)
+                                         + np.arange(SHAPE[1], dtype=np.float32),
+                                         name='SCI', ver=i) for i in (1, 2, 3)])
+    buffer = BytesIO()
+    hdul.writeto(buffer)
+    return buffer.getvalue()
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a file server, which counts the bytes it sends."""
+    def do_GET(self):
+        content = self.server.content
+        match = re.match(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if match is None or not self.server.accept_ranges:
+            start, end = 0, len(content)
+            self.send_response(200)
+            self.server.n_full_downloads += 1
+        else:
+            start, end = int(match.group(1)), min(int(match.group(2)) + 1, len(content))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end - 1}/{len(content)}')
+        self.send_header('Content-Length', str(end - start))
+        self.end_headers()
+        self.wfile.write(content[start:end])
+        self.server.n_requests += 1
+        self.server.bytes_sent += end - start
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fits_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _RangeHandler)
+    server.content = _fits_bytes()
+    server.accept_ranges = True
+    server.n_requests = 0
+    server.n_full_downloads = 0
+    server.bytes_sent = 0
+    server.url = f'http://127.0.0.1:{server.server_address[1]}/mosaic.fits'
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_range_request_file(fits_server):
+    content = fits_server.content
+    f = RangeRequestFile(fits_server.url, block_size=1000, cache_size=5000)
+    assert f.size == len(content)
+    assert f.n_requests == 1
+
+    # reads across blocks, and from the cache
+    f.seek(2500)
+    assert f.read(1000) == content[2500:3500]
+    assert f.n_requests == 2
+    f.seek(-1500, 2)
+    assert f.read() == content[-1500:]
+    f.seek(2200)
+    assert f.read(100) == content[2200:2300]
+    assert f.n_requests == 3
+    assert f.bytes_transferred == fits_server.bytes_sent
+
+    # the least recently used blocks are dropped
+    assert len(f._blocks) == 5
+    assert 0 not in f._blocks
+
+    f.seek(len(content) + 10)
+    assert f.read(10) == b''
+    f.close()
+    with pytest.raises(ValueError, match='closed'):
+        f.read()
+
+    fits_server.accept_ranges = False
+    with pytest.raises(ValueError, match='does not support range requests'):
+        RangeRequestFile(fits_server.url)
+
+
+def test_open_fits_by_range(fits_server):
+    with open_fits_by_range(fits_server.url, block_size=8192) as hdul:
+        # only the headers are transferred
+        assert [hdu.name for hdu in hdul] == ['PRIMARY', 'SCI', 'SCI', 'SCI']
+        assert fits_server.bytes_sent < 10 * 8192
+
+        # a single extension
+        np.testing.assert_array_equal(hdul['SCI', 2].data,
+                                      np.full(SHAPE, 2) + np.arange(SHAPE[1]))
+        assert fits_server.bytes_sent < 1.1 * 1024**2
+
+        # a cutout
+        bytes_sent = fits_server.bytes_sent
+        cutout = hdul['SCI', 3].section[100:120, 200:240]
+        np.testing.assert_array_equal(cutout, np.full((20, 40), 3) + np.arange(200, 240))
+        assert fits_server.bytes_sent - bytes_sent <= 20 * 8192
+    assert fits_server.bytes_sent < len(fits_server.content) / 2
+
+
+def test_url_resolver_partial_read(deconfigged_helper, fits_server):
+    ldr = deconfigged_helper.loaders['url']
+    # set before the URL, so that the file is never downloaded
+    ldr.partial_read = True
+    ldr.url = fits_server.url
+    assert fits_server.n_full_downloads == 0
+    ldr.format = 'Image'
+    ldr.importer.extension = [2]
+    ldr.importer.data_label = 'remote'
+    ldr.load()
+
+    data = deconfigged_helper._app.data_collection[0]
+    np.testing.assert_array_equal(data.get_component('SCI,2').data,
+                                  np.full(SHAPE, 2) + np.arange(SHAPE[1]))
+    # only the default extension (read to validate the importer) and the selected
+    # one were transferred, not the third one (each extension is 1 MiB)
+    assert fits_server.n_full_downloads == 0
+    assert fits_server.bytes_sent < 2.5 * 1024**2
+
+    # without range requests, the file is downloaded
+    fits_server.accept_ranges = False
+    resolver = URLResolver(app=deconfigged_helper._app)
+    resolver.partial_read = True
+    resolver.cache = False
+    resolver.url = fits_server.url
+    assert isinstance(resolver._uri_output_file, str)
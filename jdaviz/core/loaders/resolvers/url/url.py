@@ -5,6 +5,7 @@ from functools import cached_property
 from pathlib import Path
 
 from jdaviz.core.custom_traitlets import FloatHandleEmpty
+from jdaviz.core.range_file import open_fits_by_range
 from jdaviz.core.registries import loader_resolver_registry
 from jdaviz.core.loaders.resolvers import BaseResolver
 from jdaviz.core.user_api import LoaderUserApi
@@ -25,6 +26,7 @@ class URLResolver(BaseResolver):
     url_not_whitelisted = Bool(False).tag(sync=True)
     url_prefix_whitelist = List([]).tag(sync=True)
     cache = Bool(True).tag(sync=True)
+    partial_read = Bool(False).tag(sync=True)
     local_path = Unicode("").tag(sync=True)
     timeout = FloatHandleEmpty(10).tag(sync=True)
     fsspec_filesystem = None
@@ -67,7 +69,8 @@ class URLResolver(BaseResolver):
 
     @property
     def user_api(self):
-        return LoaderUserApi(self, expose=['url', 'cache', 'local_path', 'timeout'])
+        return LoaderUserApi(self, expose=['url', 'cache', 'partial_read',
+                                           'local_path', 'timeout'])
 
     def _check_is_valid(self):
         """
@@ -100,7 +103,7 @@ class URLResolver(BaseResolver):
             return os.path.splitext(os.path.basename(self.url.strip()))[0]
         return None
 
-    @observe('url', 'cache', 'timeout')
+    @observe('url', 'cache', 'partial_read', 'timeout')
     def _on_url_changed(self, change):
         self.url_scheme = urlparse(self.url.strip()).scheme
 
@@ -116,14 +119,30 @@ class URLResolver(BaseResolver):
 
         # Clear the cached property to force re-download
         # or otherwise read from local file cache.
-        if '_uri_output_file' in self.__dict__ and change['name'] in ('url', 'cache'):
+        if ('_uri_output_file' in self.__dict__
+                and change['name'] in ('url', 'cache', 'partial_read')):
             del self._uri_output_file
 
+        if change['name'] != 'url' and not self.url.strip():
+            # options set before the URL (e.g. partial_read, which must be set before
+            # the URL to avoid downloading the whole file), nothing to resolve yet
+            return
+
         self._resolver_input_updated()
 
     @cached_property
     def _uri_output_file(self):
         url_file_extension = Path(self.url.strip()).suffix.lower()  # like '.fits'
+        if (self.partial_read and self.url_scheme in ('http', 'https', 's3')
+                and url_file_extension in ['.fits', '.fit']):
+            # only transfer the headers, and then the data that are accessed
+            try:
+                return open_fits_by_range(self.url.strip(), timeout=self.timeout,
+                                          fsspec_filesystem=self.fsspec_filesystem)
+            except ValueError:
+                # the server does not support range requests, download the file instead
+                pass
+
         if self.url_scheme == 's3':
 
             if url_file_extension in ['.fits', '.fit']:
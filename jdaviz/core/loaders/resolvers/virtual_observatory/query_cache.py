@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import time
+
+from astropy.config.paths import get_cache_dir
+from astropy.table import Table
+
+__all__ = ['VOQueryCache']
+
+
+class VOQueryCache:
+    """
+    Persistent cache of Virtual Observatory query results.
+
+    Each result is stored in ``directory`` under a key built from the kind of
+    query (e.g., ``'registry'``, ``'name'`` or ``'archive'``) and its
+    parameters, so that repeated queries (also across sessions) do not reach
+    the network.  Tables are written as VOTables and anything else as JSON.
+
+    Parameters
+    ----------
+    directory : str, optional
+        Directory of the cache.  Defaults to ``vo_queries`` in the jdaviz
+        cache directory (see `astropy.config.paths.get_cache_dir`).
+    ttl : dict, optional
+        Time to live, in seconds, by kind of query.  Results older than that
+        are queried again, but are still used if the query fails (e.g., when
+        offline).  Kinds that are not listed use ``DEFAULT_TTL['default']``.
+    max_size : int, optional
+        Maximum total size of the cache, in bytes.  When it is exceeded, the
+        least recently used results are removed.
+    """
+    DEFAULT_TTL = {'registry': 7 * 86400,
+                   'name': 30 * 86400,
+                   'archive': 86400,
+                   'default': 86400}
+
+    def __init__(self, directory=None, ttl=None, max_size=100 * 1024**2):
+        self._directory = directory
+        self.ttl = {**self.DEFAULT_TTL, **(ttl or {})}
+        self.max_size = max_size
+
+    @property
+    def directory(self):
+        # resolved on first use, since get_cache_dir creates the directory
+        if self._directory is None:
+            self._directory = os.path.join(get_cache_dir('jdaviz'), 'vo_queries')
+        return self._directory
+
+    @staticmethod
+    def key(kind, params):
+        """Key of the result of a query of this kind with these parameters."""
+        params = json.dumps(params, sort_keys=True, default=str)
+        return f"{kind}-{hashlib.sha256(params.encode()).hexdigest()[:32]}"
+
+    def _paths(self, key):
+        path = os.path.join(self.directory, key)
+        return f"{path}.json", f"{path}.vot"
+
+    def get(self, kind, params, allow_expired=False):
+        """
+        Return the cached result of a query, or `None` if there is no such
+        result (or if it has expired, unless ``allow_expired``).
+        """
+        entry_path, table_path = self._paths(self.key(kind, params))
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+            if (not allow_expired
+                    and time.time() - entry['created'] > self.ttl.get(kind, self.ttl['default'])):
+                return None
+            value = Table.read(table_path, format='votable') if entry['table'] else entry['value']
+        except Exception:  # nosec  missing or unreadable entry is a cache miss
+            return None
+        # last access time, for pruning
+        os.utime(entry_path)
+        return value
+
+    def set(self, kind, params, value):
+        """Store the result of a query, and prune the cache if needed."""
+        os.makedirs(self.directory, exist_ok=True)
+        entry_path, table_path = self._paths(self.key(kind, params))
+        is_table = isinstance(value, Table)
+        if is_table:
+            value.write(table_path, format='votable', overwrite=True)
+        entry = {'created': time.time(), 'params': params, 'table': is_table,
+                 'value': None if is_table else value}
+        with open(entry_path, 'w') as f:
+            json.dump(entry, f, default=str)
+        self.prune()
+
+    def fetch(self, kind, params, query):
+        """
+        Return the cached result of a query if it has not expired, otherwise
+        call ``query()`` and cache its result.  If ``query()`` raises an error
+        and an expired result is available (e.g., when offline), that result
+        is returned instead.
+        """
+        value = self.get(kind, params)
+        if value is not None:
+            return value
+        try:
+            value = query()
+        except Exception:
+            value = self.get(kind, params, allow_expired=True)
+            if value is None:
+                raise
+            return value
+        try:
+            self.set(kind, params, value)
+        except Exception:  # nosec  a result that cannot be cached is still returned
+            pass
+        return value
+
+    def prune(self):
+        """Remove the least recently used results until within ``max_size``."""
+        entries = {}
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            key = os.path.splitext(filename)[0]
+            size, atime = entries.get(key, (0, 0))
+            stat = os.stat(path)
+            entries[key] = (size + stat.st_size,
+                            max(atime, stat.st_mtime) if filename.endswith('.json') else atime)
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_size:
+                break
+            for path in self._paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+            total -= size
+
+    def clear(self):
+        """Remove all the cached results."""
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            if filename.endswith(('.json', '.vot')):
+                os.remove(os.path.join(self.directory, filename))
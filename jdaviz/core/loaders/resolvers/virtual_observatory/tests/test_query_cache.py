@@ -0,0 +1,206 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from astropy import units as u
+from astropy.coordinates import SkyCoord
+from astropy.table import Table
+
+from jdaviz.core.loaders.resolvers.virtual_observatory import vo
+from jdaviz.core.loaders.resolvers.virtual_observatory.query_cache import VOQueryCache
+
+SIA_RESPONSE = b"""<?xml version="1.0" encoding="utf-8"?>
+<VOTABLE version="1.3" xmlns="http://www.ivoa.net/xml/VOTable/v1.3">
+ <RESOURCE type="results">
+  <INFO name="QUERY_STATUS" value="OK"/>
+  <TABLE>
+   <FIELD name="title" datatype="char" arraysize="*" ucd="VOX:Image_Title"/>
+   <FIELD name="access_url" datatype="char" arraysize="*" ucd="VOX:Image_AccessReference"/>
+   <FIELD name="format" datatype="char" arraysize="*" ucd="VOX:Image_Format"/>
+   <DATA><TABLEDATA>
+    <TR><TD>image 1</TD><TD>http://127.0.0.1/image_1.fits</TD><TD>image/fits</TD></TR>
+    <TR><TD>image 2</TD><TD>http://127.0.0.1/image_2.fits</TD><TD>image/fits</TD></TR>
+   </TABLEDATA></DATA>
+  </TABLE>
+ </RESOURCE>
+</VOTABLE>
+"""
+
+
+class _SIAHandler(BaseHTTPRequestHandler):
+    """Local stand-in for a SIA service, which counts the searches."""
+    def do_GET(self):
+        if 'POS' in parse_qs(urlparse(self.path).query):
+            self.server.n_search += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/xml')
+        self.end_headers()
+        self.wfile.write(SIA_RESPONSE)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sia_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _SIAHandler)
+    server.n_search = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_query_cache_fetch(tmp_path):
+    cache = VOQueryCache(tmp_path)
+    calls = []
+
+    def query():
+        calls.append(1)
+        return [1.5, 2.5]
+
+    assert cache.fetch('name', {'name': 'M51'}, query) == [1.5, 2.5]
+    assert cache.fetch('name', {'name': 'M51'}, query) == [1.5, 2.5]
+    assert len(calls) == 1
+    # the cache persists across instances
+    assert VOQueryCache(tmp_path).get('name', {'name': 'M51'}) == [1.5, 2.5]
+    assert cache.get('name', {'name': 'M31'}) is None
+
+    def offline():
+        raise ConnectionError('offline')
+
+    # expired results are queried again, but still used when the query fails
+    expired = VOQueryCache(tmp_path, ttl={'name': 0})
+    time.sleep(0.01)
+    assert expired.get('name', {'name': 'M51'}) is None
+    assert expired.fetch('name', {'name': 'M51'}, offline) == [1.5, 2.5]
+    with pytest.raises(ConnectionError):
+        expired.fetch('name', {'name': 'M31'}, offline)
+
+    cache.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_query_cache_tables_and_size(tmp_path):
+    cache = VOQueryCache(tmp_path, max_size=20000)
+    for i in range(10):
+        table = Table({'access_url': [f'http://127.0.0.1/{i}_{j}.fits' for j in range(50)],
+                       'size': list(range(50))})
+        cache.set('archive', {'i': i}, table)
+        time.sleep(0.01)
+
+    cached = cache.get('archive', {'i': 9})
+    assert isinstance(cached, Table)
+    assert list(cached['access_url'])[-1] == 'http://127.0.0.1/9_49.fits'
+
+    # the least recently used results were removed
+    assert sum(os.path.getsize(tmp_path / f) for f in os.listdir(tmp_path)) <= 20000
+    assert cache.get('archive', {'i': 0}) is None
+
+
+def test_vo_resolver_cached_archive_query(imviz_helper, tmp_path, sia_server):
+    access_url = f'http://127.0.0.1:{sia_server.server_address[1]}/sia'
+
+    def _vo_loader(cache):
+        vo_ldr = imviz_helper.loaders["virtual observatory"]._obj
+        vo_ldr._query_cache = cache
+        vo_ldr._full_registry_results = {'local': ('ivo://local/sia', access_url)}
+        vo_ldr.resource.choices = ['local']
+        vo_ldr.resource_selected = 'local'
+        vo_ldr.source = '337.5 -20.8'
+        return vo_ldr
+
+    vo_ldr = _vo_loader(VOQueryCache(tmp_path))
+    vo_ldr.query_archive()
+    assert len(vo_ldr._output) == 2
+    assert len(vo_ldr.file_table.items) == 2
+    vo_ldr.query_archive()
+    assert sia_server.n_search == 1
+
+    # other query parameters are searched
+    vo_ldr.radius = 0.5
+    vo_ldr.query_archive()
+    assert sia_server.n_search == 2
+
+    # same results from a new cache instance, even once the service is offline
+    # and the results have expired
+    sia_server.shutdown()
+    sia_server.server_close()
+    vo_ldr = _vo_loader(VOQueryCache(tmp_path, ttl={'archive': 0}))
+    vo_ldr.query_archive()
+    assert list(vo_ldr._output['location']) == ['http://127.0.0.1/image_1.fits',
+                                                'http://127.0.0.1/image_2.fits']
+
+    # without the cache, the query fails
+    vo_ldr.query_cache = False
+    vo_ldr._output = None
+    vo_ldr.query_archive()
+    assert vo_ldr._output is None
+
+
+class _FakeInterface:
+    def __init__(self, access_url):
+        self.access_url = access_url
+
+
+class _FakeResource:
+    """Stand-in for a registry resource with a single service."""
+    def __init__(self, short_name, protocol):
+        self.short_name = short_name
+        self.ivoid = f'ivo://local/{short_name}'
+        self.protocol = protocol
+
+    def get_interface(self, service_type, lax=True, std_only=False):
+        if service_type != self.protocol:
+            raise ValueError(f'no {service_type} interface')
+        return _FakeInterface(f'http://127.0.0.1/{self.short_name}')
+
+
+def test_vo_resolver_cached_registry_and_names(imviz_helper, tmp_path, monkeypatch):
+    searches = []
+    resources = [_FakeResource('images', 'sia'), _FakeResource('spectra', 'ssa'),
+                 _FakeResource('images', 'sia')]
+
+    def search(*args):
+        searches.append(args)
+        return resources
+
+    names = []
+
+    def from_name(name, *args, **kwargs):
+        names.append(name)
+        return SkyCoord(202.47 * u.deg, 47.2 * u.deg)
+
+    monkeypatch.setattr(vo.registry, 'search', search)
+    # the waveband constraint checks its value against a vocabulary fetched online
+    monkeypatch.setattr(vo.registry, 'Waveband', lambda *args: ('waveband', args))
+    monkeypatch.setattr(SkyCoord, 'from_name', from_name)
+
+    vo_ldr = imviz_helper.loaders["virtual observatory"]._obj
+    vo_ldr._query_cache = VOQueryCache(tmp_path)
+    vo_ldr.waveband_selected = 'optical'
+    assert vo_ldr.resource.choices == ['images']
+    assert vo_ldr._full_registry_results == {'images': ('ivo://local/images',
+                                                        'http://127.0.0.1/images')}
+
+    vo_ldr.producttype_selected = 'Spectrum'
+    assert vo_ldr.resource.choices == ['spectra']
+    vo_ldr.producttype_selected = 'Image'
+    assert vo_ldr.resource.choices == ['images']
+    assert len(searches) == 2
+
+    # name resolution, also used for the coverage filter of the registry query
+    vo_ldr.source = 'M51'
+    vo_ldr.resource_filter_coverage = True
+    assert len(searches) == 3 and names == ['M51']
+    coord = vo_ldr._resolve_source()
+    assert names == ['M51']
+    assert coord.separation(SkyCoord(202.47 * u.deg, 47.2 * u.deg)).arcsec < 1e-3
+
+    vo_ldr.coordframe_selected = 'galactic'
+    assert vo_ldr._resolve_source().frame.name == 'galactic'
+    assert names == ['M51']
@@ -2,6 +2,7 @@ from astropy.coordinates import SkyCoord
 from astropy import units as u
 
 from pyvo import registry
+from pyvo.dal import SCSService, SIAService, SSAService
 from pyvo.dal.exceptions import DALFormatError, DALQueryError
 from pyvo.utils.vocabularies import VocabularyError
 from requests.exceptions import ConnectionError as RequestConnectionError
@@ -14,6 +15,7 @@ from jdaviz.core.template_mixin import (
     with_spinner,
 )
 from jdaviz.core.loaders.resolvers import BaseConeSearchResolver
+from jdaviz.core.loaders.resolvers.virtual_observatory.query_cache import VOQueryCache
 from jdaviz.core.user_api import LoaderUserApi
 
 
@@ -22,6 +24,24 @@ __all__ = ["VOResolver"]
 VO_PROTOCOL = {"Image": {'protocol': 'sia', 'size_arg': 'size'},
                "Spectrum": {'protocol': 'ssa', 'size_arg': 'diameter'},
                "Catalog": {'protocol': 'scs', 'size_arg': 'radius'}}
+# service classes by protocol, as returned by RegistryResource.get_service
+VO_SERVICE_CLASSES = {'sia': SIAService, 'ssa': SSAService, 'scs': SCSService}
+
+
+def _registry_listing(registry_results, protocol):
+    """
+    Short name, IVOID and access URL of the service for ``protocol`` of each
+    resource found in the registry (which, unlike the registry results, can
+    be cached).
+    """
+    listing = []
+    for resource in registry_results:
+        try:
+            interface = resource.get_interface(service_type=protocol, lax=True, std_only=True)
+        except Exception:  # nosec  resource without a standard interface for this protocol
+            continue
+        listing.append([resource.short_name, resource.ivoid, interface.access_url])
+    return listing
 
 
 @loader_resolver_registry("virtual observatory")
@@ -37,6 +57,8 @@ class VOResolver(BaseConeSearchResolver):
     resource_items = List([]).tag(sync=True)
     resource_selected = Any().tag(sync=True)  # Any to accept Nonetype
     resources_loading = Bool(False).tag(sync=True)
+    # cache registry listings, name resolutions and query results on disk
+    query_cache = Bool(True).tag(sync=True)
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -57,7 +79,9 @@ class VOResolver(BaseConeSearchResolver):
 
         self.waveband_selected = ""
 
+        # resource short name: (IVOID, access URL)
         self._full_registry_results = None
+        self._query_cache = VOQueryCache()
         self.resource_selected = ""
         self.resource = SelectPluginComponent(
             self, items="resource_items", selected="resource_selected"
@@ -72,7 +96,7 @@ class VOResolver(BaseConeSearchResolver):
                 "producttype", "viewer", "coordframe", "radius", "radius_unit",
                 "source",
                 "resource_filter_coverage", "waveband", "resource",
-                "query_archive"
+                "query_cache", "query_archive"
             ],
         )
 
@@ -116,46 +140,43 @@ class VOResolver(BaseConeSearchResolver):
         self.resource_selected = ""
 
         try:
+            protocol = VO_PROTOCOL[self.producttype_selected]['protocol']
             registry_args = [
-                registry.Servicetype(VO_PROTOCOL[self.producttype_selected]['protocol']),
+                registry.Servicetype(protocol),
                 registry.Waveband(self.waveband_selected),
             ]
+            registry_params = {'protocol': protocol, 'waveband': self.waveband_selected}
             # If coverage filtering is enabled, lookup current
             # source coordinate and add a Spatial search constraint
             if self.resource_filter_coverage:
                 try:
-                    # First parse user-provided source as direct coordinates
-                    coord = SkyCoord(
-                        self.source, unit=u.deg, frame=self.coordframe_selected
-                    )
-                except Exception:
-                    try:
-                        # If that didn't work, try parsing it as an object name
-                        coord = SkyCoord.from_name(
-                            self.source, frame=self.coordframe_selected
-                        )
-                    except Exception as e:
-                        self.hub.broadcast(
-                            SnackbarMessage(
-                                f"Unable to resolve source coordinates: {self.source}",
-                                sender=self,
-                                color="error",
-                                traceback=e
-                            )
-                        )
-                        raise LookupError(
-                            f"Unable to resolve source coordinates: {self.source}"
+                    coord = self._resolve_source()
+                except Exception as e:
+                    self.hub.broadcast(
+                        SnackbarMessage(
+                            f"Unable to resolve source coordinates: {self.source}",
+                            sender=self,
+                            color="error",
+                            traceback=e
                         )
-                registry_args.append(
-                    registry.Spatial(
-                        (coord, (self.radius * u.Unit(self.radius_unit.selected))),
-                        intersect="overlaps",
                     )
+                    raise LookupError(
+                        f"Unable to resolve source coordinates: {self.source}"
+                    )
+                radius = self.radius * u.Unit(self.radius_unit.selected)
+                registry_args.append(
+                    registry.Spatial((coord.icrs, radius), intersect="overlaps")
                 )
-            self._full_registry_results = registry.search(*registry_args)
-            self.resource.choices = list(
-                self._full_registry_results.getcolumn("short_name")
-            )
+                registry_params.update(self._coord_params(coord),
+                                       radius_deg=radius.to_value(u.deg))
+            listing = self._cached_query(
+                'registry', registry_params,
+                lambda: _registry_listing(registry.search(*registry_args), protocol))
+            self._full_registry_results = {}
+            for short_name, ivoid, access_url in listing:
+                # keep the first of resources with the same short name
+                self._full_registry_results.setdefault(short_name, (ivoid, access_url))
+            self.resource.choices = list(self._full_registry_results)
         except (DALFormatError, VocabularyError) as e:
             # HTTP Error 403 is being issued as a string as part of the
             # VocabularyError when the registry is having issues.
@@ -188,74 +209,39 @@ class VOResolver(BaseConeSearchResolver):
         User input for source is first attempted to be parsed as a SkyCoord coordinate. If not,
         then attempts to parse as a target name.
         """
+        vo_results = None
         try:
             # Query service
             # Service is indexed via short name (resource_selected), which is the suggested way
             # according to PyVO docs. Though disclaimer that collisions COULD occur. If so,
             # consider indexing on the full IVOID, which is guaranteed unique.
-            vo_service = self._full_registry_results[
-                self.resource_selected
-            ].get_service(service_type=VO_PROTOCOL[self.producttype_selected]['protocol'])
+            protocol = VO_PROTOCOL[self.producttype_selected]['protocol']
+            access_url = self._full_registry_results[self.resource_selected][1]
             try:
-                # First parse user-provided source as direct coordinates
-                coord = SkyCoord(
-                    self.source, unit=u.deg, frame=self.coordframe_selected
-                )
-            except Exception:
-                try:
-                    # If that didn't work, try parsing it as an object name
-                    coord = SkyCoord.from_name(
-                        self.source, frame=self.coordframe_selected
-                    )
-                except Exception as e:
-                    self.hub.broadcast(
-                        SnackbarMessage(
-                            f"Unable to resolve source coordinates: {self.source}",
-                            sender=self,
-                            color="error",
-                            traceback=e
-                        )
+                coord = self._resolve_source()
+            except Exception as e:
+                self.hub.broadcast(
+                    SnackbarMessage(
+                        f"Unable to resolve source coordinates: {self.source}",
+                        sender=self,
+                        color="error",
+                        traceback=e
                     )
-            # Once coordinate lookup is complete, search service using these coords.
-            try:
-                vo_results = vo_service.search(
-                    coord,
-                    **{
-                        VO_PROTOCOL[self.producttype_selected]['size_arg']: (
-                            (self.radius * u.Unit(self.radius_unit.selected))
-                            if self.radius > 0.0
-                            else None
-                        )
-                    },
-                    format=("" if self.producttype_selected == "Catalog" else "fits"),
                 )
-            except DALQueryError as e:
-                # We've run into issues where the service assumes a FORMAT and injects it for us.
-                # If the "image/fits" is duplicated, remove our requested format and rely on theirs
-                if "Wrong FORMAT=image/fits,image/fits" in str(e):
-                    vo_results = vo_service.search(
-                        coord,
-                        **{
-                            "diameter" if self.producttype_selected == "Spectrum" else "size": (
-                                (self.radius * u.Unit(self.radius_unit.selected))
-                                if self.radius > 0.0
-                                else None
-                            )
-                        },
-                    )
-                else:
-                    self.hub.broadcast(
-                        SnackbarMessage(
-                            f"Query failed: {e}",
-                            sender=self,
-                            traceback=e,
-                            color="error",
-                        )
-                    )
+            # Once coordinate lookup is complete, search service using these coords.
+            size = ((self.radius * u.Unit(self.radius_unit.selected))
+                    if self.radius > 0.0 else None)
+            archive_params = {'protocol': protocol, 'access_url': access_url,
+                              'size_deg': None if size is None else size.to_value(u.deg),
+                              **self._coord_params(coord)}
+            vo_results = self._cached_query(
+                'archive', archive_params,
+                lambda: self._search_service(VO_SERVICE_CLASSES[protocol](access_url),
+                                             coord, size))
             if len(vo_results) == 0:
                 self.hub.broadcast(
                     SnackbarMessage(
-                        f"No observations returned at coords {coord} from VO resource: {vo_service.baseurl}",  # noqa: E501
+                        f"No observations returned at coords {coord} from VO resource: {access_url}",  # noqa: E501
                         sender=self,
                         color="error",
                     )
@@ -277,19 +263,77 @@ class VOResolver(BaseConeSearchResolver):
                     traceback=e
                 )
             )
-        try:
-            self._output = vo_results.to_table()
-        except Exception as e:
+        if vo_results is None:
             self.hub.broadcast(
                 SnackbarMessage(
-                    f"Unable to populate table for source {self.source}: {e}",
+                    f"Unable to populate table for source {self.source}",
                     sender=self,
                     color="error",
-                    traceback=e
                 )
             )
+        else:
+            self._output = vo_results
         self._resolver_input_updated()
 
+    def _search_service(self, vo_service, coord, size):
+        """Search the service and return the results as a table."""
+        try:
+            vo_results = vo_service.search(
+                coord,
+                **{VO_PROTOCOL[self.producttype_selected]['size_arg']: size},
+                format=("" if self.producttype_selected == "Catalog" else "fits"),
+            )
+        except DALQueryError as e:
+            # We've run into issues where the service assumes a FORMAT and injects it for us.
+            # If the "image/fits" is duplicated, remove our requested format and rely on theirs
+            if "Wrong FORMAT=image/fits,image/fits" in str(e):
+                vo_results = vo_service.search(
+                    coord,
+                    **{"diameter" if self.producttype_selected == "Spectrum" else "size": size},
+                )
+            else:
+                self.hub.broadcast(
+                    SnackbarMessage(
+                        f"Query failed: {e}",
+                        sender=self,
+                        traceback=e,
+                        color="error",
+                    )
+                )
+                raise
+        return vo_results.to_table()
+
+    def _resolve_source(self):
+        """
+        Coordinates of the source, parsed as coordinates or otherwise
+        resolved as an object name.
+        """
+        try:
+            # First parse user-provided source as direct coordinates
+            return SkyCoord(self.source, unit=u.deg, frame=self.coordframe_selected)
+        except Exception:
+            pass
+
+        # If that didn't work, try parsing it as an object name
+        def resolve_name():
+            coord = SkyCoord.from_name(self.source).icrs
+            return [coord.ra.deg, coord.dec.deg]
+
+        ra, dec = self._cached_query('name', {'name': self.source.strip()}, resolve_name)
+        return SkyCoord(ra * u.deg, dec * u.deg, frame='icrs').transform_to(
+            self.coordframe_selected)
+
+    @staticmethod
+    def _coord_params(coord):
+        # position in the cache keys, to a precision well below that of any query
+        coord = coord.icrs
+        return {'ra_deg': round(coord.ra.deg, 7), 'dec_deg': round(coord.dec.deg, 7)}
+
+    def _cached_query(self, kind, params, query):
+        if not self.query_cache:
+            return query()
+        return self._query_cache.fetch(kind, params, query)
+
     def vue_query_archive(self, _=None):
         self.query_archive()
 
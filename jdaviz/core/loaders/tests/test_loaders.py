@@ -15,7 +15,7 @@ from specutils import SpectralRegion, Spectrum
 
 from jdaviz.core.registries import loader_resolver_registry
 from jdaviz.core.loaders.resolvers import find_matching_resolver
-from jdaviz.utils import cached_uri
+from jdaviz.utils import cached_uri, create_hdu_hash
 
 
 def test_loaders_registry(specviz_helper):
@@ -798,6 +798,41 @@ def test_loaders_extension_select(imviz_helper):
     assert ldr.importer.extension.selected == ['1: [SCI,1]', '3: [SCI,2]']
 
 
+@pytest.mark.parametrize('lazy_load', [True, False])
+def test_load_fits_lazy_load(deconfigged_helper, tmp_path, lazy_load):
+    deconfigged_helper._app.state.settings['data']['lazy_load'] = lazy_load
+
+    arr = np.arange(64 * 64, dtype=np.float32).reshape((64, 64))
+    filename = tmp_path / 'lazy.fits'
+    fits.HDUList([fits.PrimaryHDU(),
+                  fits.ImageHDU(arr, name='SCI'),
+                  fits.ImageHDU(np.ones((4, 64, 64), dtype=np.float32), name='ERR')
+                  ]).writeto(filename)
+
+    ldr = deconfigged_helper.loaders['file']
+    ldr.filepath = str(filename)
+    hdul = ldr.importer.input
+    if lazy_load:
+        # resolving the formats (including the 3D spectrum importer, for which
+        # the ERR cube is a candidate) never reads the unselected extension
+        assert '3D Spectrum' in ldr.format.choices
+        assert not hdul['ERR']._data_loaded
+
+    ldr.format = 'Image'
+    ldr.importer.extension = 'SCI'
+    ldr.importer.data_label = 'lazy'
+    ldr.load()
+
+    assert list(deconfigged_helper.datasets) == ['lazy']
+    np.testing.assert_array_equal(deconfigged_helper.get_data('lazy').data, arr)
+    if lazy_load:
+        # the unselected extension is never read from disk and the hash
+        # of the loaded extension is header-based
+        assert not hdul['ERR']._data_loaded
+        data = deconfigged_helper._app.data_collection['lazy']
+        assert data.meta['_data_hash'] == create_hdu_hash(hdul['SCI'])
+
+
 def test_load_image_align_by(deconfigged_helper, image_nddata_wcs):
     ldr = deconfigged_helper.loaders['object']
     ldr.object = image_nddata_wcs
@@ -1082,3 +1117,46 @@ def test_load_cube_no_dq_in_viewer(deconfigged_helper):
     datasets = deconfigged_helper.datasets
     assert len(datasets) == 3
     assert '3D Spectrum [DQ]' in datasets
+
+
+def test_spectrum3d_compact_mask(deconfigged_helper):
+    mask_data = np.zeros((10, 10, 5), dtype=bool)
+    mask_data[2, 3, :] = True
+    spectrum3d = Spectrum(flux=np.ones((10, 10, 5)) * u.Jy,
+                          spectral_axis=np.arange(5) * u.um,
+                          mask=mask_data)
+
+    deconfigged_helper.load(spectrum3d, format='3D Spectrum')
+
+    # mask is stored as a uint8 view rather than a float copy
+    mask_cube = deconfigged_helper._app.data_collection['3D Spectrum [MASK]']
+    stored_mask = mask_cube.get_component('flux').data
+    assert stored_mask.dtype == np.uint8
+    np.testing.assert_array_equal(stored_mask, mask_data)
+
+    # and is still respected when building the extraction mask
+    spext = deconfigged_helper.plugins['3D Spectral Extraction']._obj
+    np.testing.assert_array_equal(spext.inverted_mask_non_science, ~mask_data)
+
+
+def test_spectrum3d_compact_dq(deconfigged_helper):
+    dq_data = np.zeros((5, 10, 10), dtype=np.int32)
+    dq_data[:, 2, 3] = 1
+    dq_data[:, 4, 4] = 5
+
+    hdul = fits.HDUList([
+        fits.PrimaryHDU(),
+        fits.ImageHDU(data=np.ones((5, 10, 10), dtype=np.float32), name='FLUX'),
+        fits.ImageHDU(data=dq_data, name='DQ')
+    ])
+    deconfigged_helper.load(hdul, format='3D Spectrum')
+
+    # DQ flags keep their native integer dtype, zeros are not replaced by NaNs
+    dq_cube = deconfigged_helper._app.data_collection['3D Spectrum [DQ]']
+    stored_dq = dq_cube.get_component('flux').data
+    assert np.issubdtype(stored_dq.dtype, np.integer)
+    np.testing.assert_array_equal(stored_dq, dq_data)
+
+    # unflagged pixels are not decoded as a flag
+    dq_plugin = deconfigged_helper.plugins['Data Quality']._obj
+    assert [flag['flag'] for flag in dq_plugin.decoded_flags] == [1, 5]
@@ -2,6 +2,7 @@ import numpy as np
 
 from traitlets import Bool, observe
 from astropy import units as u
+from astropy.utils import deprecated
 from bqplot import LinearScale
 from bqplot.marks import Lines, Label, Scatter
 from glue.core import HubListener
@@ -16,7 +17,8 @@ from jdaviz.core.unit_conversion_utils import (all_flux_unit_conversion_equivs,
                                                flux_conversion_general)
 
 
-__all__ = ['OffscreenLinesMarks', 'BaseSpectrumVerticalLine', 'SpectralLine',
+__all__ = ['OffscreenLinesMarks', 'BaseSpectrumVerticalLine', 'SpectralLines',
+           'SpectralLineHighlight', 'SpectralLine',
            'SliceIndicatorMarks', 'ShadowMixin', 'ShadowLine', 'ShadowLabelFixedY',
            'PluginMark', 'LinesAutoUnit', 'PluginLine', 'PluginScatter',
            'LineAnalysisContinuum', 'LineAnalysisContinuumCenter',
@@ -64,11 +66,9 @@ class OffscreenLinesMarks(HubListener):
     def _update_counts(self, *args):
         oob_left, oob_right = 0, 0
         for m in self.viewer.figure.marks:
-            if isinstance(m, SpectralLine):
-                if m.x[0] < self.viewer.state.x_min:
-                    oob_left += 1
-                elif m.x[0] > self.viewer.state.x_max:
-                    oob_right += 1
+            if isinstance(m, SpectralLines):
+                oob_left += int(np.sum(m.obs_values < self.viewer.state.x_min))
+                oob_right += int(np.sum(m.obs_values > self.viewer.state.x_max))
         self.left.text = [f'\u25c0 {oob_left}' if oob_left > 0 else '']
         self.right.text = [f'{oob_right} \u25b6' if oob_right > 0 else '']
 
@@ -292,10 +292,16 @@ class BaseSpectrumVerticalLine(Lines, PluginMark, HubListener):
         scales = viewer.scales
 
         # Lines.__init__ will set self.x
-        super().__init__(x=[x, x], y=[0, 1],
+        x, y = self._vertical_xy(x)
+        super().__init__(x=x, y=y,
                          scales={'x': scales['x'], 'y': LinearScale(min=0, max=1)},
                          **kwargs)
 
+    @staticmethod
+    def _vertical_xy(x):
+        # x/y arrays spanning the full height of the viewer at x
+        return [x, x], [0, 1]
+
     def _update_reference_data(self, reference_data):
         # don't update x units before initialization or in rampviz
         if reference_data is None or 'Rampviz' in self.viewer.__class__.__name__:
@@ -317,48 +323,71 @@ class BaseSpectrumVerticalLine(Lines, PluginMark, HubListener):
         self.xunit = new_unit
 
 
-class SpectralLine(BaseSpectrumVerticalLine):
+class SpectralLines(BaseSpectrumVerticalLine):
     """
-    Subclass on bqplot Lines, mostly so that we can erase spectral lines
-    by eliminating any SpectralLines objects from a figures marks list. Also
-    lets us do wavelength redshifting here on mark creation.
+    Subclass on bqplot Lines drawing all plotted lines of a single line list
+    as one mark.  Each line is a row of the 2D ``x`` and ``y`` arrays, so
+    redshifting or converting units of the whole list is a single array
+    update instead of one update per line.
     """
-    def __init__(self, viewer, rest_value, redshift=0, name=None, **kwargs):
-        self._rest_value = rest_value
-        self._identify = False
-        self.name = name
-
-        # table_index is same as name_rest elsewhere
-        self.table_index = kwargs.pop("table_index", None)
-
-        # setting redshift will set self.x and enable the obs_value property,
-        # but to do that we need x_unit set first (would normally be assigned
-        # in the super init)
+    def __init__(self, viewer, rest_values, redshift=0, names=None, names_rest=None,
+                 listname=None, colors=None, **kwargs):
+        self._rest_values = np.asarray(rest_values, dtype=float)
+        self.names = list(names) if names is not None else [None] * len(self._rest_values)
+        self.names_rest = list(names_rest) if names_rest is not None else list(self.names)
+        self.listname = listname
+        self._identified = None
+
+        if colors is None:
+            colors = ['#4B0082']
+        if len(colors) != len(self._rest_values):
+            colors = list(colors[:1]) * len(self._rest_values)
+
+        # x must be available for the highlight mark before Lines.__init__ runs
         self.xunit = u.Unit(viewer.state.x_display_unit)
-        self.redshift = redshift
+        self._redshift = redshift
+        obs_values = self._obs_values_from_rest(self._rest_values, redshift)
+
+        self.highlight = SpectralLineHighlight(viewer)
 
         viewer.session.hub.subscribe(self, LineIdentifyMessage,
                                      handler=self._process_identify_change)
 
-        super().__init__(viewer=viewer, x=self.obs_value, stroke_width=1,
-                         fill='none', close_path=False, **kwargs)
+        super().__init__(viewer=viewer, x=obs_values, stroke_width=1,
+                         fill='none', close_path=False, colors=list(colors), **kwargs)
+
+    @staticmethod
+    def _vertical_xy(x):
+        x = np.asarray(x, dtype=float)
+        return np.column_stack([x, x]), np.tile([0., 1.], (len(x), 1))
 
     @property
-    def name_rest(self):
-        return self.table_index
+    def marks(self):
+        return [self, self.highlight]
 
     @property
-    def rest_value(self):
-        return self._rest_value
+    def rest_values(self):
+        return self._rest_values
 
     @property
-    def obs_value(self):
-        return self.x[0]
+    def obs_values(self):
+        # bqplot squeezes the arrays when a single line is plotted
+        return np.asarray(self.x).reshape(-1, 2)[:, 0]
 
-    def set_x_unit(self, unit=None):
-        prev_unit = self.xunit
-        super().set_x_unit(unit=unit)
-        self._rest_value = (self._rest_value * prev_unit).to_value(unit, u.spectral())
+    @property
+    def identify(self):
+        return self._identified is not None
+
+    def _obs_values_from_rest(self, rest_values, redshift):
+        if str(self.xunit.physical_type) == 'length':
+            return rest_values*(1+redshift)
+        elif str(self.xunit.physical_type) == 'frequency':
+            return rest_values/(1+redshift)
+        # catch all for anything else (wavenumber, energy, etc)
+        rest_angstrom = (rest_values*self.xunit).to_value(u.Angstrom,
+                                                          equivalencies=u.spectral())
+        return (rest_angstrom*(1+redshift)*u.Angstrom).to_value(self.xunit,
+                                                                equivalencies=u.spectral())
 
     @property
     def redshift(self):
@@ -367,33 +396,73 @@ class SpectralLine(BaseSpectrumVerticalLine):
     @redshift.setter
     def redshift(self, redshift):
         self._redshift = redshift
-        if str(self.xunit.physical_type) == 'length':
-            obs_value = self._rest_value*(1+redshift)
-        elif str(self.xunit.physical_type) == 'frequency':
-            obs_value = self._rest_value/(1+redshift)
-        else:
-            # catch all for anything else (wavenumber, energy, etc)
-            rest_angstrom = (self._rest_value*self.xunit).to_value(u.Angstrom,
-                                                                   equivalencies=u.spectral())
-            obs_angstrom = rest_angstrom*(1+redshift)
-            obs_value = (obs_angstrom*u.Angstrom).to_value(self.xunit,
-                                                           equivalencies=u.spectral())
-        self.x = [obs_value, obs_value]
+        self.x, self.y = self._vertical_xy(self._obs_values_from_rest(self._rest_values,
+                                                                      redshift))
 
-    @property
-    def identify(self):
-        return self._identify
+    def add_lines(self, rest_values, names, names_rest, colors):
+        """
+        Append lines (with rest values in the current x-units) to this mark.
+        """
+        self._rest_values = np.append(self._rest_values, rest_values)
+        self.names += list(names)
+        self.names_rest += list(names_rest)
+        colors = list(self.colors) + list(colors)
+        # update colors before x so that bqplot never sees more lines than colors
+        self.colors = colors
+        self.redshift = self._redshift
 
-    @identify.setter
-    def identify(self, identify):
-        if not isinstance(identify, bool):  # pragma: no cover
-            raise TypeError("identify must be of type bool")
+    def remove_lines(self, names_rest=None, names=None):
+        """
+        Remove the lines matching any entry of ``names_rest`` or ``names``.
+        Returns the number of remaining lines.
+        """
+        keep = np.ones(len(self._rest_values), dtype=bool)
+        if names_rest is not None:
+            keep &= ~np.isin(self.names_rest, names_rest)
+        if names is not None:
+            keep &= ~np.isin(self.names, names)
+        if not np.all(keep):
+            self._rest_values = self._rest_values[keep]
+            self.names = [n for n, k in zip(self.names, keep) if k]
+            self.names_rest = [n for n, k in zip(self.names_rest, keep) if k]
+            self.colors = [c for c, k in zip(self.colors, keep) if k]
+            self.redshift = self._redshift
+        return len(self._rest_values)
+
+    def set_colors(self, color, names_rest=None):
+        """
+        Set the color of all lines or only those in ``names_rest``.
+        """
+        if names_rest is None:
+            self.colors = [color] * len(self._rest_values)
+        else:
+            self.colors = [color if name_rest in names_rest else c
+                           for name_rest, c in zip(self.names_rest, self.colors)]
+        self._update_highlight()
 
-        self._identify = identify
-        self.stroke_width = 3 if identify else 1
+    def set_x_unit(self, unit=None):
+        prev_unit = self.xunit
+        super().set_x_unit(unit=unit)
+        self._rest_values = (self._rest_values * prev_unit).to_value(self.xunit,
+                                                                     u.spectral())
 
     def _process_identify_change(self, msg):
-        self.identify = msg.name_rest == self.table_index
+        self._identified = msg.name_rest if msg.name_rest in self.names_rest else None
+        self._update_highlight()
+
+    @observe('x')
+    def _update_highlight(self, *args):
+        if not hasattr(self, 'highlight'):
+            return
+        if self._identified not in self.names_rest:
+            self._identified = None
+            self.highlight.visible = False
+            return
+        ind = self.names_rest.index(self._identified)
+        obs_value = self.obs_values[ind]
+        self.highlight.x = [obs_value, obs_value]
+        self.highlight.colors = [self.colors[ind]]
+        self.highlight.visible = True
 
     def _update_unit(self, new_unit):
         if self.xunit is None:
@@ -402,11 +471,54 @@ class SpectralLine(BaseSpectrumVerticalLine):
         if new_unit == self.xunit:
             return
 
-        old_quant = self._rest_value*self.xunit
-        self._rest_value = old_quant.to_value(new_unit, equivalencies=u.spectral())
+        old_quant = self._rest_values*self.xunit
+        self._rest_values = old_quant.to_value(new_unit, equivalencies=u.spectral())
+        self.xunit = new_unit
         # re-compute self.x from current redshift (instead of converting that as well)
         self.redshift = self._redshift
-        self.xunit = new_unit
+
+
+class SpectralLineHighlight(Lines):
+    """
+    Thicker copy of the identified line of a `SpectralLines` mark, positioned
+    by its parent mark.
+    """
+    def __init__(self, viewer):
+        super().__init__(x=[0, 0], y=[0, 1],
+                         scales={'x': viewer.scales['x'], 'y': LinearScale(min=0, max=1)},
+                         stroke_width=3, fill='none', close_path=False, visible=False)
+
+
+@deprecated(since="5.1", alternative="SpectralLines")
+class SpectralLine(SpectralLines):
+    """
+    A single spectral line, drawn as a `SpectralLines` mark with one line.
+    """
+    def __init__(self, viewer, rest_value, redshift=0, name=None, **kwargs):
+        # table_index is same as name_rest elsewhere
+        table_index = kwargs.pop("table_index", None)
+        super().__init__(viewer, [rest_value], redshift=redshift, names=[name],
+                         names_rest=[table_index], **kwargs)
+
+    @property
+    def name(self):
+        return self.names[0]
+
+    @property
+    def table_index(self):
+        return self.names_rest[0]
+
+    @property
+    def name_rest(self):
+        return self.table_index
+
+    @property
+    def rest_value(self):
+        return self.rest_values[0]
+
+    @property
+    def obs_value(self):
+        return self.obs_values[0]
 
 
 class SliceIndicatorMarks(BaseSpectrumVerticalLine, HubListener):
@@ -0,0 +1,143 @@
+"""Opt-in execution profiling of plugin methods.
+
+Methods decorated with `~jdaviz.core.template_mixin.with_spinner` or
+`~jdaviz.core.template_mixin.skip_if_no_updates_since_last_active` are
+profiled once profiling is enabled, either for a single plugin (with
+``plg.profiling = True``) or for all plugins (with the ``profiling`` setting of
+the app).  The wall time, peak memory allocated by Python (traced with
+`tracemalloc`) and number of calls of each method are then available from
+``plg.profiling_results()``.
+"""
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from astropy import units as u
+from astropy.table import QTable
+
+__all__ = ['PluginProfiler', 'profile_call']
+
+# profiled calls in progress in each thread, outermost first
+_call_stack = threading.local()
+# profiled calls in progress in all threads: memory is traced for the whole
+# process, so the peaks of all of them are kept when the peak is reset
+_active_calls = []
+_call_stack_lock = threading.Lock()
+# whether tracing was started for the profiled calls (rather than already on)
+_started_tracing = False
+
+
+class PluginProfiler:
+    """
+    Wall time, peak memory and number of calls of the methods of a plugin.
+
+    Attributes
+    ----------
+    stats : dict
+        For each method name: ``calls``, ``total_time``, ``max_time``,
+        ``last_time`` (in seconds), ``peak_memory`` (the largest memory
+        allocated by a call, in bytes) and ``last_peak_memory``.
+    """
+    def __init__(self):
+        self.stats = {}
+
+    def record(self, method, wall_time, peak_memory):
+        stats = self.stats.setdefault(method, {'calls': 0, 'total_time': 0.,
+                                               'max_time': 0., 'last_time': 0.,
+                                               'peak_memory': 0, 'last_peak_memory': 0})
+        stats['calls'] += 1
+        stats['total_time'] += wall_time
+        stats['max_time'] = max(stats['max_time'], wall_time)
+        stats['last_time'] = wall_time
+        stats['peak_memory'] = max(stats['peak_memory'], peak_memory)
+        stats['last_peak_memory'] = peak_memory
+
+    def clear(self):
+        self.stats = {}
+
+    def to_table(self):
+        """
+        Profiling results as a table, with one row per method, sorted by
+        decreasing total time.
+
+        Returns
+        -------
+        table : `~astropy.table.QTable`
+        """
+        methods = sorted(self.stats, key=lambda method: -self.stats[method]['total_time'])
+        rows = [self.stats[method] for method in methods]
+        return QTable({'method': methods,
+                       'calls': [row['calls'] for row in rows],
+                       'total_time': [row['total_time'] for row in rows] * u.s,
+                       'mean_time': [row['total_time'] / row['calls'] for row in rows] * u.s,
+                       'max_time': [row['max_time'] for row in rows] * u.s,
+                       'peak_memory': [row['peak_memory'] for row in rows] * u.byte})
+
+
+def _get_profiler(obj):
+    # profiler of obj, if profiling is enabled for it or for the whole app
+    enabled = getattr(obj, 'profiling', False)
+    if not enabled:
+        app = getattr(obj, '_app', None)
+        enabled = app is not None and app.state.settings.get('profiling', False)
+    if not enabled:
+        return None
+    profiler = getattr(obj, '_profiler', None)
+    if profiler is None:
+        profiler = PluginProfiler()
+        obj._profiler = profiler
+    return profiler
+
+
+@contextmanager
+def profile_call(obj, method):
+    """
+    Profile the enclosed code as a call of ``method`` of ``obj``, if profiling
+    is enabled for ``obj``.
+
+    Memory is traced while (and only while) profiled calls are running.  The
+    peak memory of nested calls is measured separately, and counts towards the
+    peak memory of the calls that enclose them in the same thread.  Memory is
+    traced for the whole process, so the peak memory of a call also includes
+    the memory allocated by other threads in the meantime.
+
+    Yields
+    ------
+    profiler : `PluginProfiler` or `None`
+        The profiler of ``obj``, or `None` if profiling is disabled.
+    """
+    global _started_tracing
+    profiler = _get_profiler(obj)
+    if profiler is None:
+        yield None
+        return
+
+    if not hasattr(_call_stack, 'calls'):
+        _call_stack.calls = []
+    with _call_stack_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        for other in _active_calls:
+            other['peak'] = max(other['peak'], peak)
+        tracemalloc.reset_peak()
+        call = {'start': current, 'peak': current}
+        _active_calls.append(call)
+    _call_stack.calls.append(call)
+    start = time.perf_counter()
+    try:
+        yield profiler
+    finally:
+        wall_time = time.perf_counter() - start
+        _call_stack.calls.remove(call)
+        with _call_stack_lock:
+            peak = max(call['peak'], tracemalloc.get_traced_memory()[1])
+            _active_calls.remove(call)
+            for outer in _call_stack.calls:
+                outer['peak'] = max(outer['peak'], peak)
+            if not _active_calls and _started_tracing:
+                tracemalloc.stop()
+                _started_tracing = False
+        profiler.record(method, wall_time, peak - call['start'])
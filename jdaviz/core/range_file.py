@@ -0,0 +1,217 @@
+"""Read remote files with byte-range requests.
+
+`RangeRequestFile` is a seekable file object that only transfers the parts
+of a remote (HTTP(S) or S3) file that are read, so that opening a FITS file
+with `open_fits_by_range` only transfers the headers and the data of the
+extensions (or sections) that are accessed, rather than the whole file.
+"""
+import io
+import itertools
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import fsspec
+import requests
+from astropy.io import fits
+
+__all__ = ['RangeRequestFile', 'open_fits_by_range']
+
+_CONTENT_RANGE = re.compile(r'bytes\s+(\d+)-(\d+)/(\d+|\*)')
+
+
+class RangeRequestFile(io.RawIOBase):
+    """
+    Read-only, seekable file object for a remote file, backed by byte-range
+    requests.
+
+    Only the bytes that are read are transferred, in blocks of ``block_size``
+    bytes which are kept in a local (in-memory) least recently used cache, so
+    that, e.g., `astropy.io.fits.open` only transfers the headers and the data
+    that are accessed (including sections, see `astropy.io.fits.Section`).
+    Consecutive blocks that are not in the cache are fetched with a single
+    request.
+
+    Parameters
+    ----------
+    uri : str
+        ``http(s)://`` URL or ``s3://`` URI of the file.  HTTP servers must
+        support range requests.
+    block_size : int, optional
+        Size of the blocks, in bytes.
+    cache_size : int, optional
+        Maximum size of the block cache, in bytes.
+    timeout : float, optional
+        Timeout of HTTP requests, in seconds.
+    fsspec_filesystem : `fsspec.spec.AbstractFileSystem` or None, optional
+        Filesystem for S3 URIs.  Anonymous access is assumed if not provided.
+
+    Attributes
+    ----------
+    size : int
+        Size of the file, in bytes.
+    n_requests : int
+        Number of range requests made so far.
+    bytes_transferred : int
+        Number of bytes transferred so far.
+
+    Raises
+    ------
+    ValueError
+        The server does not support range requests.
+    """
+    mode = 'rb'
+
+    def __init__(self, uri, block_size=256 * 1024, cache_size=64 * 1024**2, timeout=None,
+                 fsspec_filesystem=None):
+        super().__init__()
+        self.name = uri
+        self.block_size = int(block_size)
+        self.cache_size = int(cache_size)
+        self.timeout = timeout
+        self.n_requests = 0
+        self.bytes_transferred = 0
+        self._blocks = OrderedDict()
+        self._pos = 0
+        self._lock = threading.Lock()
+
+        self._scheme = urlparse(uri).scheme.lower()
+        if self._scheme == 's3':
+            self._fs = fsspec_filesystem or fsspec.filesystem('s3', anon=True)
+            self.size = self._fs.size(uri)
+        elif self._scheme in ('http', 'https'):
+            # the size is given by the response to the first request, whose
+            # block is kept as it most likely holds the first header
+            self.size = None
+            self._store(0, self._fetch(0, self.block_size))
+        else:
+            raise ValueError(f"Range requests are not available for '{uri}'")
+
+    def _fetch(self, start, end):
+        """Transfer the bytes from ``start`` to ``end`` (excluded)."""
+        self.n_requests += 1
+        if self._scheme == 's3':
+            data = self._fs.cat_file(self.name, start=start, end=end)
+        else:
+            # streamed, so that the content is not transferred if the range is ignored
+            response = requests.get(self.name, headers={'Range': f'bytes={start}-{end - 1}'},
+                                    timeout=self.timeout, stream=True)
+            if not response.ok:
+                response.close()
+                response.raise_for_status()
+            match = _CONTENT_RANGE.match(response.headers.get('Content-Range', ''))
+            if response.status_code != 206 or match is None or match.group(3) == '*':
+                response.close()
+                raise ValueError(f"The server of '{self.name}' does not support range requests")
+            if self.size is None:
+                self.size = int(match.group(3))
+            data = response.content
+        self.bytes_transferred += len(data)
+        return data
+
+    def _store(self, index, block):
+        self._blocks[index] = block
+        self._blocks.move_to_end(index)
+        while len(self._blocks) * self.block_size > self.cache_size and len(self._blocks) > 1:
+            self._blocks.popitem(last=False)
+
+    def _read_range(self, start, end):
+        bs = self.block_size
+        first, last = start // bs, (end - 1) // bs
+        blocks = {}
+        for i in range(first, last + 1):
+            if i in self._blocks:
+                self._blocks.move_to_end(i)
+                blocks[i] = self._blocks[i]
+
+        # one request for each run of consecutive missing blocks
+        missing = [i for i in range(first, last + 1) if i not in blocks]
+        for _, run in itertools.groupby(enumerate(missing), lambda item: item[1] - item[0]):
+            run = [i for _, i in run]
+            data = self._fetch(run[0] * bs, min(self.size, (run[-1] + 1) * bs))
+            for j, i in enumerate(run):
+                blocks[i] = data[j * bs:(j + 1) * bs]
+                self._store(i, blocks[i])
+
+        data = b''.join(blocks[i] for i in range(first, last + 1))
+        return data[start - first * bs:end - first * bs]
+
+    def read(self, size=-1):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+        with self._lock:
+            start = self._pos
+            end = self.size if size is None or size < 0 else min(self.size, start + size)
+            if end <= start:
+                return b''
+            data = self._read_range(start, end)
+            self._pos = end
+            return data
+
+    def readall(self):
+        return self.read()
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if self.closed:
+            raise ValueError('I/O operation on closed file.')
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f'invalid whence ({whence})')
+        if pos < 0:
+            raise ValueError(f'negative seek position {pos}')
+        self._pos = pos
+        return pos
+
+    def tell(self):
+        return self._pos
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def close(self):
+        self._blocks.clear()
+        super().close()
+
+
+def open_fits_by_range(uri, block_size=256 * 1024, cache_size=64 * 1024**2, timeout=None,
+                       fsspec_filesystem=None):
+    """
+    Open a remote FITS file with byte-range requests (see `RangeRequestFile`).
+
+    The HDUs are loaded lazily, so that only the headers are transferred when
+    the file is opened (as the HDUs are accessed), and the data of an HDU are
+    only transferred once ``hdu.data`` or ``hdu.section`` is accessed.
+
+    Parameters
+    ----------
+    uri : str
+        ``http(s)://`` URL or ``s3://`` URI of the FITS file.
+    block_size, cache_size, timeout, fsspec_filesystem
+        See `RangeRequestFile`.
+
+    Returns
+    -------
+    hdulist : `~astropy.io.fits.HDUList`
+
+    Raises
+    ------
+    ValueError
+        The server does not support range requests.
+    """
+    file_obj = RangeRequestFile(uri, block_size=block_size, cache_size=cache_size,
+                                timeout=timeout, fsspec_filesystem=fsspec_filesystem)
+    return fits.open(file_obj, lazy_load_hdus=True)
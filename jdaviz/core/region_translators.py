@@ -20,7 +20,7 @@ from regions import (CirclePixelRegion, CircleSkyRegion,
                      RectangleAnnulusPixelRegion, RectangleAnnulusSkyRegion,
                      PixCoord, PolygonSkyRegion)
 
-__all__ = ['regions2roi', 'regions2aperture', 'aperture2regions']
+__all__ = ['regions2roi', 'regions2rois', 'regions2aperture', 'aperture2regions']
 
 
 def regions2roi(region_shape, wcs=None):
@@ -99,6 +99,74 @@ def regions2roi(region_shape, wcs=None):
     return roi
 
 
+def regions2rois(region_shapes, wcs=None):
+    """Convert many ``regions`` shapes to ``glue`` ROIs at once.
+
+    Same as calling `regions2roi` on each shape, except that circular sky
+    shapes (`regions.CircleSkyRegion` and `regions.CircleAnnulusSkyRegion`)
+    are grouped by shape and frame and converted to pixels with a single
+    WCS transformation per group.  This is only done for a FITS WCS without
+    distortions, otherwise (and for all other shapes) each shape is
+    converted individually.
+
+    Parameters
+    ----------
+    region_shapes : list of `regions.Region`
+        Supported ``regions`` shapes.
+
+    wcs : `~astropy.wcs.WCS` or `None`
+        A compatible WCS object, if required.
+        **This is only used for sky apertures.**
+
+    Returns
+    -------
+    rois : list of `glue.core.roi.Roi`
+        Equivalent ``glue`` ROIs, in the same order as ``region_shapes``.
+
+    Raises
+    ------
+    ValueError
+        WCS is required but not provided.
+
+    NotImplementedError
+        A given ``regions`` shape is not supported.
+
+    """
+    rois = [None] * len(region_shapes)
+
+    groups = {}
+    if wcs is not None and not getattr(wcs, 'has_distortion', True):
+        for i, region_shape in enumerate(region_shapes):
+            if isinstance(region_shape, (CircleSkyRegion, CircleAnnulusSkyRegion)):
+                key = (region_shape.__class__, region_shape.center.frame.name)
+                groups.setdefault(key, []).append(i)
+
+    for (cls, _), indices in groups.items():
+        centers = SkyCoord([region_shapes[i].center for i in indices])
+        x, y = wcs.world_to_pixel(centers)
+        # local pixel scale (arcsec per pixel) from 1-pixel offsets, as regions does
+        sky0 = wcs.pixel_to_world(x, y)
+        scale = np.sqrt(sky0.separation(wcs.pixel_to_world(x + 1, y)).arcsec
+                        * sky0.separation(wcs.pixel_to_world(x, y + 1)).arcsec)
+        if cls is CircleSkyRegion:
+            radius = u.Quantity([region_shapes[i].radius for i in indices]).to_value(u.arcsec)
+            for i, xc, yc, r in zip(indices, x, y, radius / scale):
+                rois[i] = CircularROI(xc=xc, yc=yc, radius=r)
+        else:
+            inner = u.Quantity([region_shapes[i].inner_radius
+                                for i in indices]).to_value(u.arcsec) / scale
+            outer = u.Quantity([region_shapes[i].outer_radius
+                                for i in indices]).to_value(u.arcsec) / scale
+            for i, xc, yc, r_in, r_out in zip(indices, x, y, inner, outer):
+                rois[i] = CircularAnnulusROI(xc=xc, yc=yc, inner_radius=r_in, outer_radius=r_out)
+
+    for i, region_shape in enumerate(region_shapes):
+        if rois[i] is None:
+            rois[i] = regions2roi(region_shape, wcs=wcs)
+
+    return rois
+
+
 def regions2aperture(region_shape):
     """Convert a given ``regions`` shape to ``photutils`` aperture.
 
@@ -45,6 +45,7 @@ from traitlets import Any, Bool, Dict, Float, HasTraits, Int, List, Unicode, obs
 from jdaviz.components.toolbar_nested import NestedJupyterToolbar
 from jdaviz.configs.cubeviz.plugins.viewers import (WithSliceIndicator,
                                                     WithSliceSelection)
+from jdaviz.core.cube_reduction import linear_continuum_fit
 from jdaviz.core.custom_traitlets import FloatHandleEmpty
 from jdaviz.core.events import (AddDataMessage, RemoveDataMessage, DataRenamedMessage,
                                 RestoreToolbarMessage, ViewerAddedMessage, ViewerRemovedMessage,
@@ -54,6 +55,7 @@ from jdaviz.core.events import (AddDataMessage, RemoveDataMessage, DataRenamedMe
                                 PluginTableAddedMessage, PluginTableModifiedMessage,
                                 PluginPlotAddedMessage, PluginPlotModifiedMessage,
                                 GlobalDisplayUnitChanged, SubsetRenameMessage)
+from jdaviz.core.profiling import PluginProfiler, profile_call
 from jdaviz.core.marks import (PluginMarkCollection,
                                LineAnalysisContinuumCenter,
                                LineAnalysisContinuumLeft,
@@ -638,7 +640,15 @@ class TemplateMixin(VuetifyTemplate, HubListener, ViewerPropertiesMixin, WithCac
 
         # set user-API methods
         if hasattr(self, 'user_api'):
-            def get_api_text(name, obj):
+            user_api = self.user_api
+
+            def get_api_text(name):
+                # properties are listed by name only, without evaluating them (some, such
+                # as an importer's output, would read or convert the full input data)
+                if isinstance(inspect.getattr_static(user_api._obj, name, None),
+                              (property, cached_property)):
+                    return name
+                obj = getattr(user_api, name, None)
                 if type(obj).__name__ == 'method':
                     if hasattr(obj, "__wrapped__"):
                         orig_sig = str(inspect.signature(obj.__wrapped__))
@@ -653,8 +663,7 @@ class TemplateMixin(VuetifyTemplate, HubListener, ViewerPropertiesMixin, WithCac
             with warnings.catch_warnings():
                 # Some API might be going through deprecation, so ignore the warning.
                 warnings.filterwarnings("ignore", category=DeprecationWarning)
-                self.api_methods = sorted([get_api_text(name, obj)
-                                           for name, obj in inspect.getmembers(self.user_api)])
+                self.api_methods = sorted([get_api_text(name) for name in dir(user_api)])
 
     @property
     def app(self):
@@ -718,7 +727,8 @@ def skip_if_no_updates_since_last_active(skip_if_not_active=True):
         def wrapper(self, msg={}):
             if msg is None:
                 # method was called manually, don't skip
-                return meth(self, msg)
+                with profile_call(self, meth.__name__):
+                    return meth(self, msg)
             if isinstance(msg, dict) and msg.get('name', None) == 'is_active':
                 if self.is_active and meth.__name__ in self._methods_skip_since_last_active:
                     # then we haven't received any other messages since the last time the plugin
@@ -740,7 +750,8 @@ def skip_if_no_updates_since_last_active(skip_if_not_active=True):
             # and so is NOT added to the skip list
             if meth.__name__ not in self._methods_skip_since_last_active:
                 self._methods_skip_since_last_active.append(meth.__name__)
-            ret_ = meth(self, msg)
+            with profile_call(self, meth.__name__):
+                ret_ = meth(self, msg)
             if ret_ is False:
                 self._methods_skip_since_last_active.remove(meth.__name__)
             return ret_
@@ -784,6 +795,10 @@ def with_spinner(spinner_traitlet='spinner', truthy=True):
     If ``truthy`` is a string that matches an attribute name on the instance,
     the attribute's value will be used instead. This allows subclasses to
     override the spinner text by defining a class attribute.
+
+    If profiling is enabled (see `~jdaviz.core.profiling`), the wall time and
+    peak memory of each call are recorded and logged at the debug level (shown
+    in the history of the Logger plugin once its verbosity is set to debug).
     """
     def decorator(meth):
         @wraps(meth)
@@ -795,9 +810,18 @@ def with_spinner(spinner_traitlet='spinner', truthy=True):
                 spinner_value = truthy
             setattr(self, spinner_traitlet, spinner_value)
             try:
-                ret_ = meth(self, *args, **kwargs)
+                with profile_call(self, meth.__name__) as profiler:
+                    ret_ = meth(self, *args, **kwargs)
             finally:
                 setattr(self, spinner_traitlet, False if spinner_value is True else '')
+            if profiler is not None:
+                stats = profiler.stats[meth.__name__]
+                name = getattr(self, '_plugin_name', None) or self.__class__.__name__
+                # only in the logger history, if its verbosity is set to debug
+                self.hub.broadcast(SnackbarMessage(
+                    f"{name}: {meth.__name__} took {stats['last_time']:.3f} s, "
+                    f"peak memory {stats['last_peak_memory'] / 1024**2:.1f} MiB",
+                    color='debug', sender=self))
             return ret_
         return wrapper
     return decorator
@@ -866,6 +890,7 @@ class PluginTemplateMixin(TemplateMixin):
     previews_temp_disabled = Bool(False).tag(sync=True)  # noqa use along-side @with_temp_disable() and <plugin-previews-temp-disabled v-model:previews_temp_disabled="previews_temp_disabled" :previews_last_time="previews_last_time" v-model:show_live_preview="show_live_preview"/>
     previews_last_time = Float(0).tag(sync=True)
     supports_auto_update = Bool(False).tag(sync=True)  # noqa whether this plugin supports auto-updating plugin results (requires __call__ method)
+    profiling = Bool(False)  # noqa whether to profile the methods decorated with @with_spinner() and @skip_if_no_updates_since_last_active(), see profiling_results()
 
     def __init__(self, app, tray_instance=False, **kwargs):
         self._plugin_name = kwargs.pop('plugin_name', None)
@@ -946,6 +971,26 @@ class PluginTemplateMixin(TemplateMixin):
         # can even be dependent on config, etc.
         return PluginUserApi(self, expose=[])
 
+    def profiling_results(self):
+        """
+        Wall time, peak memory and number of calls of the methods of the
+        plugin that were profiled (once ``profiling`` is enabled).
+
+        Returns
+        -------
+        table : `~astropy.table.QTable`
+            One row per method, sorted by decreasing total time, which can be
+            exported with ``table.write``.
+        """
+        profiler = getattr(self, '_profiler', None)
+        return (profiler or PluginProfiler()).to_table()
+
+    def clear_profiling(self):
+        """Clear the profiling results."""
+        profiler = getattr(self, '_profiler', None)
+        if profiler is not None:
+            profiler.clear()
+
     def _setup_relevant_if_truthy(self, traitlets):
         """
         Sets up and returns some things used in both ``relevant_if_any/all_truthy`` methods.
@@ -4186,7 +4231,8 @@ class SpectralContinuumMixin(VuetifyTemplate, HubListener):
                            mark_y.get(pos, []),
                            viewers=viewers)
 
-    def _get_continuum(self, dataset, spectral_subset, update_marks=False, per_pixel=False):
+    def _get_continuum(self, dataset, spectral_subset, update_marks=False, per_pixel=False,
+                       cube_dataset=None):
         if dataset.selected == '':
             self._update_continuum_marks()
             return None, None, None
@@ -4194,7 +4240,9 @@ class SpectralContinuumMixin(VuetifyTemplate, HubListener):
         if per_pixel:
             if self._app.config not in ('cubeviz', 'deconfigged'):
                 raise ValueError("per-pixel only supported for cubeviz/deconfigged")
-            full_spectrum = self._app._jdaviz_helper.get_data(self.dataset.selected,
+            if cube_dataset is None:
+                cube_dataset = self.dataset
+            full_spectrum = self._app._jdaviz_helper.get_data(cube_dataset.selected,
                                                               use_display_units=True)
         else:
             full_spectrum = dataset.get_selected_spectrum(use_display_units=True)
@@ -4311,20 +4359,14 @@ class SpectralContinuumMixin(VuetifyTemplate, HubListener):
             # full_spectrum.flux is a cube, so we want to act on all spaxels independently
             continuum_y = np.take(full_spectrum.flux, continuum_mask, axis=spectral_axis_index).value  # noqa
 
-            def fit_continuum(continuum_y_spaxel):
-                return np.polyfit(continuum_x-min_x, continuum_y_spaxel, deg=1)
-
-            # compute the linear fit for each spaxel independently, along the spectral axis
-            slopes_intercepts = np.apply_along_axis(fit_continuum, spectral_axis_index, continuum_y)
-            slopes = np.take(slopes_intercepts, 0, spectral_axis_index)
-            intercepts = np.take(slopes_intercepts, 1, spectral_axis_index)
+            # all spaxels share the same continuum points, so fit them all at once
+            slopes, intercepts = linear_continuum_fit(continuum_x-min_x, continuum_y,
+                                                      axis=spectral_axis_index)
 
-            # spectrum.spectral_axis is an array, but we need our continuum to have the same
-            # shape as the fluxes in the cube, so let's just duplicate to the correct shape
-            spectral_axis_cube = np.zeros(spectrum.flux.shape)
-            reshape_inds = [1, 1, 1]
+            # broadcast the spectral axis against the spatial dimensions of the cube
+            reshape_inds = [1] * spectrum.flux.ndim
             reshape_inds[spectral_axis_index] = -1
-            spectral_axis_cube[:, :, :] = spectrum.spectral_axis.value.reshape(reshape_inds)
+            spectral_axis_cube = spectrum.spectral_axis.value.reshape(reshape_inds)
             continuum = np.expand_dims(slopes, spectral_axis_index) * (spectral_axis_cube-min_x) + np.expand_dims(intercepts, spectral_axis_index)  # noqa
         else:
             continuum_y = full_spectrum.flux[continuum_mask].value
@@ -6907,7 +6949,7 @@ class Plot(PluginSubcomponent):
             data.update_components({comps[comp]: np.full_like(data[component], fill_value=np.nan)
                                     for comp in self._viewer_components})
             self._remove_data(label, broadcast=False)
-            self._add_data(label, broadcast=False, **kwargs)
+            self._add_data(label, broadcast=False, data_cls=type(data), **kwargs)
             self.update_style(label, **style_state)
         if reset_lims:
             self.viewer.state.reset_limits()
@@ -6943,9 +6985,9 @@ class Plot(PluginSubcomponent):
 
         self._plugin.session.hub.broadcast(PluginPlotModifiedMessage(sender=self))
 
-    def _add_data(self, label, broadcast=True, **kwargs):
+    def _add_data(self, label, broadcast=True, data_cls=Data, **kwargs):
         self._check_valid_components(**kwargs)
-        data = Data(label=label, **kwargs)
+        data = data_cls(label=label, **kwargs)
         dc = self._app.data_collection
         dc.append(data)
         dc_entry = dc[label]
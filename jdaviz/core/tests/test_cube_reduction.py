@@ -0,0 +1,170 @@
+import tracemalloc
+
+import astropy.units as u
+import numpy as np
+import pytest
+from astropy.nddata import StdDevUncertainty
+from numpy.testing import assert_allclose
+from specutils import Spectrum, SpectralRegion, analysis
+from specutils.manipulation import extract_region, spectral_slab
+
+from jdaviz.core.cube_reduction import (spectral_region_slice, tiled_collapse, tiled_moment,
+                                        linear_continuum_fit, line_statistics)
+
+
+def _cube(spectral_axis_index, mask=False, seed=42):
+    rng = np.random.default_rng(seed)
+    shape = (23, 17, 40) if spectral_axis_index == 2 else (40, 23, 17)
+    flux = rng.random(shape).astype(np.float32) * u.Jy
+    return Spectrum(flux=flux, spectral_axis=np.linspace(1, 2, 40) * u.um,
+                    mask=rng.random(shape) > 0.9 if mask else None,
+                    spectral_axis_index=spectral_axis_index)
+
+
+def test_spectral_region_slice():
+    spectral_axis = np.linspace(1, 2, 11) * u.um
+    assert spectral_region_slice(spectral_axis) == slice(None)
+    sel = spectral_region_slice(spectral_axis, SpectralRegion(1.2 * u.um, 1.5 * u.um))
+    assert isinstance(sel, slice)
+    assert_allclose(spectral_axis[sel].value, [1.2, 1.3, 1.4, 1.5])
+
+    sel = spectral_region_slice(spectral_axis, SpectralRegion([(1.1 * u.um, 1.2 * u.um),
+                                                               (1.7 * u.um, 1.8 * u.um)]))
+    assert_allclose(spectral_axis[sel].value, [1.1, 1.2, 1.7, 1.8])
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+@pytest.mark.parametrize('function', ('mean', 'median', 'min', 'max', 'sum'))
+@pytest.mark.parametrize('n_cpu', (1, 2))
+def test_tiled_collapse(spectral_axis_index, function, n_cpu):
+    cube = _cube(spectral_axis_index, mask=True)
+    lower, upper = 1.2 * u.um, 1.7 * u.um
+    expected = spectral_slab(cube, lower, upper).collapse(function, axis=spectral_axis_index)
+
+    sel = spectral_region_slice(cube.spectral_axis, SpectralRegion(lower, upper))
+    # small tiles to exercise the tiling
+    collapsed = tiled_collapse(cube, function, spectral_selection=sel,
+                               tile_bytes=800, n_cpu=n_cpu)
+    assert collapsed.unit == expected.unit
+    assert_allclose(collapsed.value, expected.value, rtol=1e-6)
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+@pytest.mark.parametrize('order', (0, 1, 2))
+def test_tiled_moment(spectral_axis_index, order):
+    cube = _cube(spectral_axis_index)
+    region = SpectralRegion(1.2 * u.um, 1.7 * u.um)
+    slab = extract_region(cube, region)
+    slab_sa = slab.spectral_axis.to('km/s', doppler_convention='relativistic',
+                                    doppler_rest=1.5 * u.um)
+    expected = analysis.moment(Spectrum(slab.flux, slab_sa,
+                                        spectral_axis_index=spectral_axis_index),
+                               order=order)
+
+    sel = spectral_region_slice(cube.spectral_axis, region)
+    moment = tiled_moment(cube, cube.spectral_axis[sel].to('km/s',
+                                                           doppler_convention='relativistic',
+                                                           doppler_rest=1.5 * u.um),
+                          order=order, spectral_selection=sel, tile_bytes=800, n_cpu=2)
+    assert moment.unit == expected.unit
+    assert_allclose(moment.value, expected.value, rtol=2e-5)
+
+    with pytest.raises(ValueError, match='Order must be a positive integer'):
+        tiled_moment(cube, cube.spectral_axis, order=-1)
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+def test_linear_continuum_fit(spectral_axis_index):
+    cube = _cube(spectral_axis_index)
+    x = np.linspace(0, 1, 40)
+    y = np.array(cube.flux.value, dtype=float)
+    # a non-finite spectrum only affects its own fit
+    y[(slice(None), 0, 0) if spectral_axis_index == 0 else (0, 0)] = np.nan
+
+    slopes, intercepts = linear_continuum_fit(x, y, axis=spectral_axis_index)
+    y = np.moveaxis(y, spectral_axis_index, -1)
+    assert slopes.shape == intercepts.shape == y.shape[:-1]
+    assert np.isnan(slopes[0, 0]) and np.isnan(intercepts[0, 0])
+    for index in [(0, 1), (5, 3), (16, 11)]:
+        assert_allclose([slopes[index], intercepts[index]], np.polyfit(x, y[index], deg=1))
+
+
+@pytest.mark.parametrize('spectral_axis_index', (0, 2))
+@pytest.mark.parametrize('with_uncertainty', (True, False))
+def test_line_statistics(spectral_axis_index, with_uncertainty):
+    rng = np.random.default_rng(0)
+    spectral_axis = np.linspace(1, 2, 40) * u.um
+    line = np.exp(-0.5 * ((spectral_axis.value - 1.5) / 0.05) ** 2)
+    amplitude = rng.uniform(1, 5, (6, 5, 1))
+    flux = 2 + amplitude * line + rng.normal(0, 0.05, (6, 5, 40))
+    continuum = np.broadcast_to(2 + 0.1 * (spectral_axis.value - 1), flux.shape).copy()
+    # non-positive continuum in one spaxel
+    continuum[1, 1, 3] = 0
+    uncertainty = StdDevUncertainty(np.full(flux.shape, 0.05)) if with_uncertainty else None
+    if spectral_axis_index == 0:
+        flux, continuum = flux.T, continuum.T
+        uncertainty = None if uncertainty is None else StdDevUncertainty(uncertainty.array.T)
+    cube = Spectrum(flux=flux * u.Jy, spectral_axis=spectral_axis, uncertainty=uncertainty,
+                    spectral_axis_index=spectral_axis_index)
+
+    statistics = line_statistics(cube, continuum)
+    assert np.isnan(statistics['Equivalent Width'][1, 1])
+    freq_statistics = line_statistics(cube, continuum,
+                                      line_flux_spectral_axis=spectral_axis.to(u.Hz, u.spectral()))
+
+    for index in [(0, 0), (3, 2), (5, 4)]:
+        cube_index = ((slice(None),) + index[::-1]) if spectral_axis_index == 0 else index
+        spectrum = Spectrum(flux=flux[cube_index] * u.Jy, spectral_axis=spectral_axis,
+                            uncertainty=None if uncertainty is None
+                            else StdDevUncertainty(uncertainty.array[cube_index]))
+        subtracted = spectrum - continuum[cube_index]
+        map_index = index[::-1] if spectral_axis_index == 0 else index
+        expected = {'Line Flux': analysis.line_flux(subtracted),
+                    'Equivalent Width': analysis.equivalent_width(spectrum
+                                                                  / continuum[cube_index]),
+                    'Gaussian Sigma Width': analysis.gaussian_sigma_width(subtracted),
+                    'Gaussian FWHM': analysis.gaussian_fwhm(subtracted),
+                    'Centroid': analysis.centroid(subtracted, region=None)}
+        for function, result in expected.items():
+            value = statistics[function][map_index]
+            assert value.unit == result.unit
+            assert_allclose(value.value, result.value, rtol=1e-10)
+            if with_uncertainty:
+                assert_allclose(statistics[function].uncertainty[map_index].value,
+                                result.uncertainty.to_value(result.unit), rtol=1e-8)
+            else:
+                assert statistics[function].uncertainty is None
+
+        freq_spectrum = Spectrum(flux=subtracted.flux,
+                                 spectral_axis=spectral_axis.to(u.Hz, u.spectral()))
+        assert_allclose(freq_statistics['Line Flux'][map_index].to_value(u.W / u.m**2),
+                        analysis.line_flux(freq_spectrum).to_value(u.W / u.m**2), rtol=1e-10)
+
+
+@pytest.mark.parametrize('reducer', ('collapse', 'moment'))
+def test_tiled_reduction_memory(reducer):
+    cube = Spectrum(flux=np.ones((100, 100, 500), dtype=np.float32) * u.Jy,
+                    spectral_axis=np.linspace(1, 2, 500) * u.um)
+    if reducer == 'collapse':
+        def full():
+            return cube.collapse('sum', axis=cube.spectral_axis_index)
+
+        def tiled():
+            return tiled_collapse(cube, 'sum', tile_bytes=2**20)
+    else:
+        def full():
+            return analysis.moment(cube, order=1)
+
+        def tiled():
+            return tiled_moment(cube, cube.spectral_axis, order=1, tile_bytes=2**20)
+
+    results, peak_mb = {}, {}
+    for label, func in (('full', full), ('tiled', tiled)):
+        tracemalloc.start()
+        results[label] = func()
+        peak_mb[label] = tracemalloc.get_traced_memory()[1] / 2**20
+        tracemalloc.stop()
+
+    assert_allclose(results['tiled'], results['full'], rtol=1e-6)
+    # the full-cube reductions copy the cube (~19 MB) at least once
+    assert peak_mb['tiled'] < peak_mb['full']
@@ -4,14 +4,17 @@ import warnings
 
 import numpy as np
 from astropy import units as u
+from astropy.io import fits
 from astropy.tests.helper import assert_quantity_allclose
 from astropy.nddata import CCDData, NDDataArray
 from glue.core import ComponentID
 from glue.core.roi import CircularROI
 from specutils import SpectralRegion, Spectrum
 
+from jdaviz import Imviz
 from jdaviz.core.helpers import _next_subset_num
 from jdaviz.core.loaders import ObjectResolver, ObjectParser
+from jdaviz.core.loaders.parsers.fits.fits import _PREPARSED_FITS
 
 
 class MockGroupItem:
@@ -470,3 +473,38 @@ def test_load_mixed_spectral_axis_units(deconfigged_helper, unitless_data, load_
     # check that there are 2 spectra in the data collection, the one loaded and
     # the one auto-extracted
     assert len(deconfigged_helper._app.data_collection) == 3  # 2 spectra + 1 extracted
+
+
+def _write_fits_images(tmp_path, n_files, shape=(10, 10)):
+    filenames = []
+    for i in range(n_files):
+        # every other file has the same name, in another directory
+        path = tmp_path / f'dir{i % 2}'
+        path.mkdir(exist_ok=True)
+        filename = str(path / f'image_{i // 2}.fits')
+        fits.PrimaryHDU(np.full(shape, i, dtype=float)).writeto(filename)
+        filenames.append(filename)
+    return filenames
+
+
+def test_load_many(imviz_helper, tmp_path):
+    filenames = _write_fits_images(tmp_path, 6)
+    inputs = filenames[:3] + [str(tmp_path / 'does_not_exist.fits')] + filenames[3:]
+
+    with pytest.warns(UserWarning, match='Could not load input 3'):
+        errors = imviz_helper.load_many(inputs, format='Image', n_cpu=3)
+    assert list(errors) == [3]
+    # every file opened by the threads was then used by its import
+    assert not _PREPARSED_FITS
+
+    # same labels and order as when loading one file after another
+    sequential = Imviz()
+    for filename in filenames:
+        sequential.load(filename, format='Image')
+    assert list(imviz_helper.datasets) == list(sequential.datasets)
+    for i, data in enumerate(imviz_helper._app.data_collection):
+        np.testing.assert_array_equal(data.get_component(data.main_components[0]).data, i)
+
+    # all the images are shown once the batch is done
+    viewer = imviz_helper.viewers.get('imviz-0')
+    assert sorted(viewer.data_menu.data_labels_loaded) == sorted(imviz_helper.datasets)
@@ -0,0 +1,142 @@
+import os
+
+import numpy as np
+import pytest
+from astropy.io import fits
+from glue.core import Data
+from glue_jupyter.bqplot.image.layer_artist import BqplotImageLayerArtist
+from numpy.testing import assert_allclose, assert_array_equal
+
+from jdaviz.core import image_pyramid
+from jdaviz.core.image_pyramid import (ImagePyramid, PyramidImageLayerArtist, _block_mean,
+                                       get_image_pyramid)
+
+
+def _image(shape, seed=0):
+    image = np.random.default_rng(seed).normal(size=shape).astype(np.float32)
+    image[3:9, 40:43] = np.nan
+    return image
+
+
+def test_pyramid_levels():
+    image = _image((100, 130))
+    data = Data(x=image, label='image')
+    pyramid = ImagePyramid(data, tile_size=16)
+    # down to a single pixel
+    assert pyramid.n_levels == 9
+    assert pyramid.level_shape(8) == (1, 1)
+    assert pyramid.level_shape(2) == (25, 33)
+
+    # tiles give the same levels as averaging the whole image
+    component = pyramid._component('x', image)
+    level = image
+    for k in range(1, pyramid.n_levels):
+        level = _block_mean(level)
+        height, width = level.shape
+        assert_array_equal(component.region(k, 0, height, 0, width), level)
+    assert_array_equal(component.region(2, 7, 20, 15, 18),
+                       _block_mean(_block_mean(image))[7:20, 15:18])
+    # non-finite values are ignored
+    assert_allclose(_block_mean(image)[1, 20], np.nanmean(image[2:4, 40:42]))
+    assert np.isnan(_block_mean(image)[2, 20])
+
+
+def test_fixed_resolution_buffer():
+    image = _image((512, 512))
+    data = Data(x=image, label='image')
+    pyramid = ImagePyramid(data, tile_size=64)
+
+    # full resolution
+    assert pyramid.fixed_resolution_buffer('x', image, [(0, 100, 101), (0, 150, 101)]) is None
+
+    # zoomed out, and partly outside of the image
+    bounds = [(-64.5, 575.5, 80), (0, 504, 64)]
+    assert pyramid.level_for_bounds(bounds) == 3
+    frb = pyramid.fixed_resolution_buffer('x', image, bounds)
+    assert frb.shape == (80, 64)
+    y = np.round(np.linspace(*bounds[0])).astype(int)
+    x = np.round(np.linspace(*bounds[1])).astype(int)
+    inside = (y >= 0) & (y < 512)
+    level = _block_mean(_block_mean(_block_mean(image)))
+    assert np.all(np.isnan(frb[~inside]))
+    assert_array_equal(frb[inside], level[np.ix_(y[inside] // 8, x // 8)])
+
+    # only the tiles in view were computed
+    bounds = [(0, 255, 32), (0, 255, 32)]
+    pyramid = ImagePyramid(data, tile_size=16)
+    pyramid.fixed_resolution_buffer('x', image, bounds)
+    assert {key[1:] for key in pyramid._components['x']._tiles if key[0] == 3} == \
+        {(ty, tx) for ty in range(2) for tx in range(2)}
+
+    # a new array for the component
+    image2 = image + 1
+    assert_allclose(pyramid.fixed_resolution_buffer('x', image2, bounds),
+                    pyramid.fixed_resolution_buffer('x', image, bounds) + 1, atol=1e-5)
+
+
+def test_pyramid_persistence(tmp_path, monkeypatch):
+    source = tmp_path / 'image.fits'
+    source.write_bytes(b'image')
+    image = _image((300, 200))
+    bounds = [(-0.5, 299.5, 20), (-0.5, 199.5, 20)]
+    directory = str(tmp_path / 'image.fits.pyramid')
+
+    pyramid = ImagePyramid(Data(x=image, label='image'), directory=directory,
+                           source=str(source), tile_size=32)
+    frb = pyramid.fixed_resolution_buffer('x', image, bounds)
+    assert {'pyramid.json', 'x_level3.npy', 'x_level3_tiles.npy'} <= set(os.listdir(directory))
+
+    # the levels are reused by another session...
+    def fail(array):
+        raise AssertionError('pyramid level computed again')
+
+    monkeypatch.setattr(image_pyramid, '_block_mean', fail)
+    pyramid = ImagePyramid(Data(x=image.copy(), label='image'), directory=directory,
+                           source=str(source), tile_size=32)
+    assert_array_equal(pyramid.fixed_resolution_buffer('x', image.copy(), bounds), frb)
+
+    # ... unless the file changed
+    os.utime(source, (0, 0))
+    pyramid = ImagePyramid(Data(x=image, label='image'), directory=directory,
+                           source=str(source), tile_size=32)
+    with pytest.raises(AssertionError, match='computed again'):
+        pyramid.fixed_resolution_buffer('x', image, bounds)
+    monkeypatch.undo()
+    assert_array_equal(pyramid.fixed_resolution_buffer('x', image, bounds), frb)
+
+
+def test_pyramid_import(imviz_helper, tmp_path):
+    image = _image((1024, 1024))
+    filename = str(tmp_path / 'mosaic.fits')
+    fits.HDUList([fits.PrimaryHDU(), fits.ImageHDU(image, name='SCI')]).writeto(filename)
+    imviz_helper.load(filename, format='Image', data_label='mosaic', image_pyramid=True,
+                      image_pyramid_persist=True)
+
+    data = imviz_helper._app.data_collection[0]
+    pyramid = get_image_pyramid(data)
+    assert pyramid.directory == f'{filename}.pyramid'
+    # nothing is computed before the image is displayed
+    assert not os.path.exists(pyramid.directory)
+    # plugins see the full-resolution image
+    assert_array_equal(data.get_component('SCI,1').data, image)
+
+    viewer = imviz_helper._app.get_viewer('imviz-0')
+    artist = [layer for layer in viewer.layers if layer.layer is data][0]
+    assert isinstance(artist, PyramidImageLayerArtist)
+
+    zoomed_out = [(0, 1008, 64), (0, 1008, 64)]
+    level = image
+    for _ in range(4):
+        level = _block_mean(level)
+    assert_array_equal(artist.get_image_data(bounds=zoomed_out), level)
+    assert os.path.exists(os.path.join(pyramid.directory, 'SCI_1_level4.npy'))
+
+    zoomed_in = [(100, 300, 200), (200, 500, 300)]
+    assert_array_equal(artist.get_image_data(bounds=zoomed_in),
+                       BqplotImageLayerArtist.get_image_data(artist, bounds=zoomed_in))
+
+    # the pyramid does not apply to another data
+    data.meta['_image_pyramid'] = ImagePyramid(Data(x=image, label='other'))
+    assert get_image_pyramid(data) is None
+    assert_array_equal(artist.get_image_data(bounds=zoomed_out),
+                       BqplotImageLayerArtist.get_image_data(artist, bounds=zoomed_out))
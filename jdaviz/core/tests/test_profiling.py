@@ -0,0 +1,85 @@
+import tracemalloc
+
+import numpy as np
+import pytest
+from astropy import units as u
+
+from jdaviz.core.profiling import profile_call
+from jdaviz.pytest_utilities.pytest_memlog import assert_profiling_budget, performance_budget
+
+
+class _Profiled:
+    profiling = True
+
+
+def test_profile_call():
+    obj = _Profiled()
+    with profile_call(obj, 'outer') as profiler:
+        outer = np.ones(10**6)
+        with profile_call(obj, 'inner'):
+            inner = np.ones(10**5)
+        outer_size, inner_size = outer.nbytes, inner.nbytes
+        del outer, inner
+    assert not tracemalloc.is_tracing()
+
+    stats = profiler.stats
+    assert stats['outer']['calls'] == stats['inner']['calls'] == 1
+    assert stats['outer']['total_time'] >= stats['inner']['total_time'] > 0
+    # the peak of the inner call counts towards the outer call
+    assert stats['outer']['peak_memory'] >= outer_size + inner_size
+    assert stats['inner']['peak_memory'] >= inner_size
+
+    # disabled
+    obj.profiling = False
+    with profile_call(obj, 'outer') as disabled:
+        pass
+    assert disabled is None
+    assert stats['outer']['calls'] == 1
+
+
+def test_plugin_profiling(cubeviz_helper, spectrum1d_cube):
+    cubeviz_helper.load_data(spectrum1d_cube, data_label='test')
+    plg = cubeviz_helper.plugins['Gaussian Smooth']
+    logger = cubeviz_helper.plugins['Logger']
+
+    plg._obj.spectral_smooth()
+    assert len(plg.profiling_results()) == 0
+    assert 'profiling' not in plg.to_dict()
+
+    plg.profiling = True
+    plg._obj.spectral_smooth()
+    # profiling results are only logged at the debug level
+    assert not any(entry['text'].startswith('Gaussian Smooth: spectral_smooth took')
+                   for entry in logger.history)
+    logger.history_verbosity = 'debug'
+    plg._obj.spectral_smooth()
+    results = plg.profiling_results()
+    assert list(results['method']) == ['spectral_smooth']
+    assert results['calls'][0] == 2
+    assert results['max_time'][0] > 0 * u.s
+    assert results['peak_memory'][0] > 0 * u.byte
+    assert logger.history[-1]['text'].startswith('Gaussian Smooth: spectral_smooth took')
+    assert_profiling_budget(plg, 'spectral_smooth', max_time=60, max_memory=1024**3)
+    with pytest.raises(pytest.fail.Exception, match='spectral_smooth took'):
+        assert_profiling_budget(plg, 'spectral_smooth', max_time=0)
+    with pytest.raises(pytest.fail.Exception, match='was not profiled'):
+        assert_profiling_budget(plg, 'spatial_smooth')
+
+    plg.clear_profiling()
+    assert len(plg.profiling_results()) == 0
+
+    # for all plugins
+    plg.profiling = False
+    cubeviz_helper._app.state.settings['profiling'] = True
+    cubeviz_helper.plugins['Moment Maps'].calculate_moment()
+    assert 'calculate_moment' in cubeviz_helper.plugins['Moment Maps'].profiling_results()['method']
+
+
+def test_performance_budget():
+    with performance_budget(max_time=60, max_memory=1024**3) as measured:
+        np.ones(10**5).sum()
+    assert measured['time'] > 0
+
+    with pytest.raises(pytest.fail.Exception, match='budget is 0 s'):
+        with performance_budget(max_time=0):
+            np.ones(10**5).sum()
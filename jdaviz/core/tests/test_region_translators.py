@@ -2,7 +2,7 @@ import pytest
 from astropy import units as u
 from astropy.coordinates import Angle, ICRS, SkyCoord
 from astropy.tests.helper import assert_quantity_allclose
-from glue.core.roi import CircularROI, EllipticalROI, RectangularROI
+from glue.core.roi import CircularROI, CircularAnnulusROI, EllipticalROI, RectangularROI
 from numpy.testing import assert_allclose
 from photutils.aperture import (CircularAperture, SkyCircularAperture,
                                 EllipticalAperture, SkyEllipticalAperture,
@@ -12,7 +12,7 @@ from photutils.aperture import (CircularAperture, SkyCircularAperture,
                                 RectangularAnnulus, SkyRectangularAnnulus)
 from regions import (CirclePixelRegion, CircleSkyRegion,
                      EllipsePixelRegion, EllipseSkyRegion,
-                     RectanglePixelRegion, CircleAnnulusPixelRegion,
+                     RectanglePixelRegion, CircleAnnulusPixelRegion, CircleAnnulusSkyRegion,
                      EllipseAnnulusPixelRegion, RectangleAnnulusPixelRegion,
                      PolygonPixelRegion, PolygonSkyRegion,
                      PixCoord)
@@ -20,7 +20,7 @@ from regions import (CirclePixelRegion, CircleSkyRegion,
 from jdaviz.core.region_translators import (
     _create_polygon_skyregion_from_coords, _create_circle_skyregion_from_coords,
     _create_ellipse_skyregion_from_coords, is_stcs_string, stcs_string2region,
-    regions2roi, regions2aperture, aperture2regions)
+    regions2roi, regions2rois, regions2aperture, aperture2regions)
 
 
 # TODO: Use proper method from upstream when that is available.
@@ -425,3 +425,30 @@ def test_stcs_string2region_correctness(stcs_string, expected):
 def test_stcs_string2region_exceptions(stcs_string, exception_message):
     with pytest.raises(ValueError, match=exception_message):
         stcs_string2region(stcs_string)
+
+
+def test_regions2rois_matches_regions2roi(image_2d_wcs):
+    pixel_regions = [CirclePixelRegion(center=PixCoord(x=10 + i, y=20 + 2 * i), radius=2 + i)
+                     for i in range(5)]
+    region_shapes = ([reg.to_sky(image_2d_wcs) for reg in pixel_regions]
+                     + [CircleAnnulusPixelRegion(center=PixCoord(x=30, y=30),
+                                                 inner_radius=2, outer_radius=5
+                                                 ).to_sky(image_2d_wcs),
+                        EllipsePixelRegion(center=PixCoord(x=5, y=6), width=4, height=2)]
+                     + pixel_regions[:2])
+
+    rois = regions2rois(region_shapes, wcs=image_2d_wcs)
+    assert len(rois) == len(region_shapes)
+    for roi, region_shape in zip(rois, region_shapes):
+        expected = regions2roi(region_shape, wcs=image_2d_wcs)
+        assert roi.__class__ == expected.__class__
+        assert_allclose((roi.xc, roi.yc), (expected.xc, expected.yc), atol=1e-6)
+        if isinstance(roi, CircularROI):
+            assert_allclose(roi.radius, expected.radius, rtol=1e-4)
+        elif isinstance(roi, CircularAnnulusROI):
+            assert_allclose((roi.inner_radius, roi.outer_radius),
+                            (expected.inner_radius, expected.outer_radius), rtol=1e-4)
+    assert isinstance(region_shapes[5], CircleAnnulusSkyRegion)
+
+    with pytest.raises(ValueError, match='WCS must be provided'):
+        regions2rois(region_shapes[:1])
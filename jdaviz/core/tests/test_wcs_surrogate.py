@@ -0,0 +1,120 @@
+import gwcs
+import numpy as np
+import pytest
+from astropy import units as u
+from astropy.coordinates import ICRS
+from astropy.modeling import fitting, models
+from astropy.nddata import NDData
+from gwcs import coordinate_frames as cf
+from numpy.testing import assert_allclose
+
+from jdaviz.core.wcs_surrogate import GWCSSurrogate, _try_gwcs_surrogate, get_interactive_wcs
+
+SHAPE = (300, 400)
+PIXEL_SCALE = 0.5 * u.arcsec
+
+
+def _fitted_inverse(forward, shape, degree=4):
+    """Polynomial fit of the inverse of a distortion, as in JWST distortion references."""
+    y, x = np.mgrid[-20:shape[0] + 20:10, -20:shape[1] + 20:10]
+    u_dist, v_dist = forward(x, y)
+    fitter = fitting.LinearLSQFitter()
+    return (models.Mapping((0, 1, 0, 1))
+            | (fitter(models.Polynomial2D(degree), u_dist, v_dist, x)
+               & fitter(models.Polynomial2D(degree), u_dist, v_dist, y)))
+
+
+def _distorted_gwcs(shape=SHAPE, bounding_box=True):
+    """TAN projection straddling RA=0 with a quadratic distortion and a bounding box."""
+    scale = PIXEL_SCALE.to_value(u.deg)
+    distortion = (models.Mapping((0, 1, 0, 1))
+                  | (models.Polynomial2D(2, c1_0=1, c2_0=2e-5, c1_1=-1e-5)
+                     & models.Polynomial2D(2, c0_1=1, c0_2=3e-5, c1_1=1e-5)))
+    distortion.inverse = _fitted_inverse(distortion, shape)
+    det2sky = (distortion
+               | models.Shift(-shape[1] / 2) & models.Shift(-shape[0] / 2)
+               | models.Scale(-scale) & models.Scale(scale)
+               | models.Pix2Sky_TAN()
+               | models.RotateNative2Celestial(0.0, -1.36555556, 180.0))
+    detector_frame = cf.Frame2D(name='detector', axes_names=('x', 'y'), unit=(u.pix, u.pix))
+    sky_frame = cf.CelestialFrame(reference_frame=ICRS(), name='icrs', unit=(u.deg, u.deg))
+    wcs = gwcs.WCS([(detector_frame, det2sky), (sky_frame, None)])
+    if bounding_box:
+        wcs.bounding_box = ((-0.5, shape[1] - 0.5), (-0.5, shape[0] - 0.5))
+    return wcs
+
+
+@pytest.fixture
+def distorted_gwcs():
+    return _distorted_gwcs()
+
+
+def test_surrogate_accuracy(distorted_gwcs):
+    surrogate = GWCSSurrogate(distorted_gwcs, SHAPE)
+    assert surrogate.max_error < 0.01
+
+    rng = np.random.default_rng(0)
+    x = rng.uniform(-0.5, SHAPE[1] - 0.5, 1000)
+    y = rng.uniform(-0.5, SHAPE[0] - 0.5, 1000)
+
+    # the image straddles RA=0, where the longitude wraps
+    ra, dec = distorted_gwcs.pixel_to_world_values(x, y)
+    assert ra.min() < 1 and ra.max() > 359
+    ra_fast, dec_fast = surrogate.pixel_to_world_values(x, y)
+    pixel_scale = PIXEL_SCALE.to_value(u.deg)
+    dra = (ra_fast - ra + 180) % 360 - 180
+    assert np.max(np.hypot(dra * np.cos(np.radians(dec)), dec_fast - dec)) < 0.01 * pixel_scale
+
+    x_back, y_back = surrogate.world_to_pixel_values(ra, dec)
+    assert np.max(np.hypot(x_back - x, y_back - y)) < 0.01
+
+    # scalars and the high-level API
+    sky = surrogate.pixel_to_world(10.2, 20.7)
+    assert sky.separation(distorted_gwcs.pixel_to_world(10.2, 20.7)).deg < 0.01 * pixel_scale
+    x_sky, y_sky = surrogate.world_to_pixel(sky)
+    assert np.ndim(x_sky) == 0
+    assert_allclose((x_sky, y_sky), (10.2, 20.7), atol=0.01)
+
+
+def test_surrogate_outside_grid(distorted_gwcs):
+    surrogate = GWCSSurrogate(distorted_gwcs, SHAPE)
+
+    # outside of the bounding box, the GWCS is used (and gives NaN)
+    ra, dec = surrogate.pixel_to_world_values([-10, 5], [5, SHAPE[0] + 10])
+    assert np.all(np.isnan(ra)) and np.all(np.isnan(dec))
+    assert np.all(np.isnan(surrogate.world_to_pixel_values(np.nan, 0)))
+
+    # no bounding box: the GWCS extrapolates
+    unbounded_gwcs = _distorted_gwcs(bounding_box=False)
+    surrogate = GWCSSurrogate(unbounded_gwcs, SHAPE)
+    world = surrogate.pixel_to_world_values(-10, -20)
+    assert_allclose(world, unbounded_gwcs.pixel_to_world_values(-10, -20))
+    assert_allclose(surrogate.world_to_pixel_values(*world), (-10, -20), atol=1e-6)
+
+
+def test_try_gwcs_surrogate(distorted_gwcs):
+    assert _try_gwcs_surrogate(None, SHAPE) is None
+
+    with pytest.warns(UserWarning, match='surrogate error'):
+        assert _try_gwcs_surrogate(distorted_gwcs, SHAPE, tolerance=1e-12) is None
+
+    distorted_gwcs.bounding_box = ((1000, 2000), (1000, 2000))
+    with pytest.warns(UserWarning, match='does not overlap the image'):
+        assert _try_gwcs_surrogate(distorted_gwcs, SHAPE) is None
+
+
+def test_surrogate_import(imviz_helper, distorted_gwcs):
+    ndd = NDData(np.ones(SHAPE), wcs=distorted_gwcs)
+    imviz_helper.load(ndd, format='Image', data_label='fast', gwcs_surrogate=True)
+    imviz_helper.load(ndd, format='Image', data_label='exact')
+
+    fast, exact = imviz_helper._app.data_collection
+    surrogate = get_interactive_wcs(fast)
+    assert isinstance(surrogate, GWCSSurrogate)
+    assert surrogate.wcs is fast.coords
+    assert surrogate.max_error < 0.01
+    assert get_interactive_wcs(exact) is exact.coords
+
+    # the surrogate no longer applies once the coordinates are replaced
+    fast.meta['_gwcs_surrogate'] = GWCSSurrogate(_distorted_gwcs(), SHAPE)
+    assert get_interactive_wcs(fast) is fast.coords
@@ -22,7 +22,7 @@ from bqplot.interacts import BrushSelector, BrushIntervalSelector
 from jdaviz.core.events import (LineIdentifyMessage, SpectralMarksChangedMessage,
                                 CatalogSelectClickEventMessage, FootprintSelectClickEventMessage,
                                 FootprintOverlayClickMessage, TableSelectRowClickMessage)
-from jdaviz.core.marks import SpectralLine, FootprintOverlay, RegionOverlay
+from jdaviz.core.marks import SpectralLines, FootprintOverlay, RegionOverlay
 from jdaviz.utils import get_top_layer_index, in_ra_comps, in_dec_comps
 
 __all__ = []
@@ -817,10 +817,12 @@ class SelectLine(CheckableTool, HubListener):
         self.line_names = msg.names_rest
 
     def on_mouse_event(self, data):
-        # yes this would be avoid a list-comprehension by putting in
+        # yes this would be avoid a concatenation by putting in
         # _on_plotted_lines_changed, but by leaving it here, we let
         # the marks worry about unit conversions
-        lines_x = np.array([mark.obs_value for mark in self.line_marks])
+        if not len(self.line_marks):
+            return
+        lines_x = np.concatenate([mark.obs_values for mark in self.line_marks])
         if not len(lines_x):
             return
         ind = np.argmin(abs(lines_x - data['domain']['x']))
@@ -829,7 +831,7 @@ class SelectLine(CheckableTool, HubListener):
         self.viewer.session.hub.broadcast(msg)
 
     def is_visible(self):
-        return len([m for m in self.viewer.figure.marks if isinstance(m, SpectralLine)]) > 0
+        return len([m for m in self.viewer.figure.marks if isinstance(m, SpectralLines)]) > 0
 
 
 @viewer_tool
@@ -344,6 +344,9 @@ class PluginUserApi(UserApiWrapper):
             default = ['show']
         if hasattr(plugin, 'loaders'):
             default += ['loaders']
+        if hasattr(plugin, 'profiling_results'):
+            default += ['profiling', 'profiling_results', 'clear_profiling']
+            excl_from_dict = list(excl_from_dict) + ['profiling']
         expose = list(set(list(expose) + default))
         if plugin.uses_active_status:
             expose += ['keep_active', 'as_active']
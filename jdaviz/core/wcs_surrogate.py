@@ -0,0 +1,277 @@
+"""Fast, interpolated stand-ins for expensive GWCS transformations.
+
+Evaluating a GWCS pipeline is much slower than a FITS WCS, which matters for
+anything that transforms coordinates on every mouse move (coordinates display,
+markers, alignment of the visible layer with the reference data).
+`GWCSSurrogate` samples the GWCS once on a grid over the image and evaluates
+the transformations by spline interpolation, with a maximum error measured
+against the GWCS when it is built.  The GWCS itself remains ``data.coords``;
+interactive code asks for `get_interactive_wcs` instead.
+"""
+import warnings
+
+import numpy as np
+from astropy.wcs.wcsapi import BaseLowLevelWCS, HighLevelWCSMixin
+from gwcs.wcs import WCS as GWCS
+from scipy.interpolate import RectBivariateSpline
+
+__all__ = ['GWCSSurrogate', 'get_interactive_wcs']
+
+_SURROGATE_META_KEY = '_gwcs_surrogate'
+
+
+class GWCSSurrogate(BaseLowLevelWCS, HighLevelWCSMixin):
+    """
+    Interpolated surrogate for a 2D celestial `gwcs.wcs.WCS`.
+
+    Pixel to world coordinates are given by bicubic splines through the GWCS
+    evaluated on a regular grid of pixel positions covering the image (and its
+    bounding box, if any).  World to pixel coordinates are found by Newton
+    iterations on the same splines.  Positions outside the grid, and world
+    coordinates that do not converge to a position inside the grid, are
+    transformed by the GWCS, so the surrogate never extrapolates.
+
+    Everything other than the transformations (world axis types, units,
+    classes, bounds, ...) is taken from the GWCS, so the surrogate can be used
+    wherever the APE 14 interface is expected.
+
+    Parameters
+    ----------
+    wcs : `gwcs.wcs.WCS`
+        GWCS with two pixel and two world axes.
+
+    shape : tuple of int
+        Shape of the image, in array (y, x) order.
+
+    grid_step : float
+        Spacing of the grid, in pixels.
+
+    Attributes
+    ----------
+    max_error : float
+        Largest error, in pixels, of the pixel to world and world to pixel
+        transformations at the centers of the grid cells (where the
+        interpolation is least accurate), compared to the GWCS.
+
+    Raises
+    ------
+    ValueError
+        The GWCS is not 2D or is not finite over the image.
+
+    """
+    def __init__(self, wcs, shape, grid_step=32):
+        if wcs.pixel_n_dim != 2 or wcs.world_n_dim != 2:
+            raise ValueError('GWCS surrogate is only available for 2D WCS, got '
+                             f'{wcs.pixel_n_dim} pixel and {wcs.world_n_dim} world axes')
+        self.wcs = wcs
+
+        # grid over the image, within the GWCS bounding box
+        (x0, x1), (y0, y1) = (-0.5, shape[1] - 0.5), (-0.5, shape[0] - 0.5)
+        bounds = wcs.pixel_bounds
+        if bounds is not None:
+            (bx0, bx1), (by0, by1) = bounds
+            x0, x1, y0, y1 = max(x0, bx0), min(x1, bx1), max(y0, by0), min(y1, by1)
+        if x0 >= x1 or y0 >= y1:
+            raise ValueError('GWCS bounding box does not overlap the image')
+        self._x_nodes = np.linspace(x0, x1, max(4, int(np.ceil((x1 - x0) / grid_step)) + 1))
+        self._y_nodes = np.linspace(y0, y1, max(4, int(np.ceil((y1 - y0) / grid_step)) + 1))
+        self._domain = (x0, x1, y0, y1)
+
+        x, y = np.meshgrid(self._x_nodes, self._y_nodes, indexing='ij')
+        world = [np.asarray(w, dtype=float) for w in wcs.pixel_to_world_values(x, y)]
+        if not all(np.all(np.isfinite(w)) for w in world):
+            raise ValueError('GWCS is not finite over the image')
+
+        # longitudes are interpolated relative to the center of the image, so that
+        # the splines do not see the wrap at 360 degrees
+        self._lon_center = [None, None]
+        for i, ptype in enumerate(wcs.world_axis_physical_types):
+            if (ptype or '').split('.')[-1] in ('ra', 'lon'):
+                self._lon_center[i] = world[i][len(self._x_nodes) // 2, len(self._y_nodes) // 2]
+        world = [self._relative(i, w) for i, w in enumerate(world)]
+        self._splines = [RectBivariateSpline(self._x_nodes, self._y_nodes, w) for w in world]
+
+        # affine approximation, as the starting point for world to pixel
+        design = np.column_stack([x.ravel(), y.ravel(), np.ones(x.size)])
+        coeffs = np.linalg.lstsq(design, np.column_stack([w.ravel() for w in world]),
+                                 rcond=None)[0]
+        self._affine_offset = coeffs[2]
+        self._affine_inv = np.linalg.inv(coeffs[:2].T)
+
+        self.max_error = self._measure_error()
+
+    def _relative(self, i, world):
+        if self._lon_center[i] is None:
+            return world
+        return (world - self._lon_center[i] + 180) % 360 - 180
+
+    def _absolute(self, i, world):
+        if self._lon_center[i] is None:
+            return world
+        return (world + self._lon_center[i]) % 360
+
+    def _inside(self, x, y):
+        x0, x1, y0, y1 = self._domain
+        return (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+    def _clip(self, x, y):
+        # FITPACK does not evaluate derivatives outside of the grid
+        x0, x1, y0, y1 = self._domain
+        return (np.clip(np.nan_to_num(x, nan=(x0 + x1) / 2), x0, x1),
+                np.clip(np.nan_to_num(y, nan=(y0 + y1) / 2), y0, y1))
+
+    def _jacobian(self, x, y):
+        return [[spline.ev(x, y, dx=1), spline.ev(x, y, dy=1)] for spline in self._splines]
+
+    def _measure_error(self):
+        x_mid = (self._x_nodes[1:] + self._x_nodes[:-1]) / 2
+        y_mid = (self._y_nodes[1:] + self._y_nodes[:-1]) / 2
+        x, y = (a.ravel() for a in np.meshgrid(x_mid, y_mid, indexing='ij'))
+        world = [np.asarray(w, dtype=float) for w in self.wcs.pixel_to_world_values(x, y)]
+
+        # pixel to world, converted to pixels with the local Jacobian
+        dw = [spline.ev(x, y) - self._relative(i, w)
+              for i, (spline, w) in enumerate(zip(self._splines, world))]
+        (j00, j01), (j10, j11) = self._jacobian(x, y)
+        det = j00 * j11 - j01 * j10
+        forward = np.hypot((j11 * dw[0] - j01 * dw[1]) / det, (j00 * dw[1] - j10 * dw[0]) / det)
+
+        # world to pixel, round trip from the exact world coordinates
+        x_back, y_back, converged = self._world_to_pixel(*world)
+        x_back[~converged] = np.nan
+        backward = np.hypot(x_back - x, y_back - y)
+
+        max_error = np.max(np.concatenate([forward, backward]))
+        return float(max_error) if np.isfinite(max_error) else np.inf
+
+    def _world_to_pixel(self, *world_arrays, n_iter=20, atol=1e-6):
+        """
+        Newton iterations from the affine approximation.  Returns the pixel
+        positions and whether each of them converged.
+        """
+        target = [self._relative(i, np.asarray(w, dtype=float))
+                  for i, w in enumerate(np.broadcast_arrays(*world_arrays))]
+        dw = np.stack([target[0] - self._affine_offset[0], target[1] - self._affine_offset[1]])
+        x, y = np.tensordot(self._affine_inv, dw, axes=1)
+        for _ in range(n_iter):
+            # positions that leave the grid stop there and are not converged
+            x, y = self._clip(x, y)
+            f0 = self._splines[0].ev(x, y) - target[0]
+            f1 = self._splines[1].ev(x, y) - target[1]
+            (j00, j01), (j10, j11) = self._jacobian(x, y)
+            det = j00 * j11 - j01 * j10
+            step_x = (j11 * f0 - j01 * f1) / det
+            step_y = (j00 * f1 - j10 * f0) / det
+            x, y = x - step_x, y - step_y
+            converged = (np.abs(step_x) < atol) & (np.abs(step_y) < atol)
+            if np.all(converged):
+                break
+        finite = np.isfinite(target[0]) & np.isfinite(target[1])
+        return np.where(finite, x, np.nan), np.where(finite, y, np.nan), converged
+
+    def pixel_to_world_values(self, *pixel_arrays):
+        x, y = (np.asarray(p, dtype=float) for p in np.broadcast_arrays(*pixel_arrays))
+        inside = self._inside(x, y)
+        world = [np.full(x.shape, np.nan) for _ in range(2)]
+        if np.any(inside):
+            for i, spline in enumerate(self._splines):
+                world[i][inside] = self._absolute(i, spline.ev(x[inside], y[inside]))
+        # outside of the grid (and of the bounding box), as the GWCS would
+        outside = ~inside & np.isfinite(x) & np.isfinite(y)
+        if np.any(outside):
+            exact = self.wcs.pixel_to_world_values(x[outside], y[outside])
+            for i in range(2):
+                world[i][outside] = exact[i]
+        return tuple(w[()] for w in world)
+
+    def world_to_pixel_values(self, *world_arrays):
+        world_arrays = [np.asarray(w, dtype=float) for w in np.broadcast_arrays(*world_arrays)]
+        x, y, converged = self._world_to_pixel(*world_arrays)
+        exact = ((~converged | ~self._inside(x, y))
+                 & np.isfinite(world_arrays[0]) & np.isfinite(world_arrays[1]))
+        if np.any(exact):
+            x_exact, y_exact = self.wcs.world_to_pixel_values(*(w[exact] for w in world_arrays))
+            x[exact], y[exact] = x_exact, y_exact
+        return x[()], y[()]
+
+    @property
+    def pixel_n_dim(self):
+        return 2
+
+    @property
+    def world_n_dim(self):
+        return 2
+
+    @property
+    def world_axis_physical_types(self):
+        return self.wcs.world_axis_physical_types
+
+    @property
+    def world_axis_units(self):
+        return self.wcs.world_axis_units
+
+    @property
+    def world_axis_names(self):
+        return self.wcs.world_axis_names
+
+    @property
+    def pixel_axis_names(self):
+        return self.wcs.pixel_axis_names
+
+    @property
+    def world_axis_object_components(self):
+        return self.wcs.world_axis_object_components
+
+    @property
+    def world_axis_object_classes(self):
+        return self.wcs.world_axis_object_classes
+
+    @property
+    def axis_correlation_matrix(self):
+        return self.wcs.axis_correlation_matrix
+
+    @property
+    def pixel_shape(self):
+        return self.wcs.pixel_shape
+
+    @property
+    def pixel_bounds(self):
+        return self.wcs.pixel_bounds
+
+    @property
+    def serialized_classes(self):
+        return False
+
+
+def _try_gwcs_surrogate(gw, shape, tolerance=0.01, grid_step=32):
+    """
+    Try to build a `GWCSSurrogate` for this GWCS, accurate to within
+    ``tolerance`` pixels.  If that is not possible, a warning is raised
+    and `None` is returned.
+    """
+    if not isinstance(gw, GWCS):
+        return None
+    try:
+        surrogate = GWCSSurrogate(gw, shape, grid_step=grid_step)
+    except Exception as err:
+        warnings.warn(f"A surrogate could not be built for the GWCS: {err}", UserWarning)
+        return None
+    if surrogate.max_error > tolerance:
+        warnings.warn(f"The GWCS surrogate error ({surrogate.max_error:.3g} pixels) exceeds "
+                      f"{tolerance} pixels, the GWCS will be used as is.", UserWarning)
+        return None
+    return surrogate
+
+
+def get_interactive_wcs(data):
+    """
+    WCS to use for interactive transformations of the coordinates of ``data``
+    (e.g., on every mouse move): the `GWCSSurrogate` built when the data were
+    imported, if any and if it still belongs to ``data.coords``, otherwise
+    ``data.coords``.
+    """
+    coords = getattr(data, 'coords', None)
+    surrogate = getattr(data, 'meta', {}).get(_SURROGATE_META_KEY)
+    if surrogate is not None and surrogate.wcs is coords:
+        return surrogate
+    return coords
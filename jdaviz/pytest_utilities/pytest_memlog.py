@@ -21,8 +21,17 @@ Run pytest with the --memlog option to enable memory logging:
     pytest --memlog 10                      # Show top 10 tests by USS+Swap diff
     pytest --memlog 10 --memlog-sort peak   # Sort by peak USS+Swap memory
     pytest --memlog 10 --memlog-max-worker  # Show worker with highest peak memory
+
+The same measurements can be used to assert performance budgets in tests,
+with `performance_budget` (for any code) or `assert_profiling_budget` (for the
+methods of a plugin, see `jdaviz.core.profiling`)::
+
+    with performance_budget(max_time=2, max_memory=200 * 1024**2):
+        plg.calculate_moment()
 """
 import re
+import time
+from contextlib import contextmanager
 
 import numpy as np
 import psutil
@@ -275,6 +284,63 @@ def _apply_memlog_sort(records, sort_method, top_n):
     return sorted_records[:top_n]
 
 
+@contextmanager
+def performance_budget(max_time=None, max_memory=None):
+    """
+    Fail the test if the enclosed code takes longer than ``max_time`` seconds
+    or increases the USS + Swap memory of the process by more than
+    ``max_memory`` bytes.
+
+    Yields
+    ------
+    measured : dict
+        Filled with the ``time`` (in seconds) and ``memory`` (in bytes) taken
+        by the enclosed code once it completes.
+    """
+    measured = {}
+    before = _get_memory_bytes()
+    start = time.perf_counter()
+    yield measured
+    measured['time'] = time.perf_counter() - start
+    after = _get_memory_bytes()
+    measured['memory'] = (int(after['uss']) + int(after['swap'])
+                          - int(before['uss']) - int(before['swap']))
+
+    if max_time is not None and measured['time'] > max_time:
+        pytest.fail(f'took {measured["time"]:.3f} s, budget is {max_time} s')
+    if max_memory is not None and measured['memory'] > max_memory:
+        pytest.fail(f'allocated {_format_bytes(measured["memory"]).strip()}, '
+                    f'budget is {_format_bytes(max_memory).strip()}')
+
+
+def assert_profiling_budget(plugin, method, max_time=None, max_memory=None):
+    """
+    Fail the test if the profiled calls of a plugin method (see
+    `jdaviz.core.profiling`) took longer than ``max_time`` seconds, or had a
+    peak memory larger than ``max_memory`` bytes.
+
+    Parameters
+    ----------
+    plugin : plugin or plugin user API
+        Plugin with profiling enabled.
+    method : str
+        Name of the method.
+    max_time : float, optional
+        Budget for the longest call, in seconds.
+    max_memory : int, optional
+        Budget for the peak memory of a call, in bytes.
+    """
+    results = plugin.profiling_results()
+    if method not in results['method']:
+        pytest.fail(f'{method} was not profiled')
+    row = results[list(results['method']).index(method)]
+    if max_time is not None and row['max_time'].value > max_time:
+        pytest.fail(f'{method} took {row["max_time"].value:.3f} s, budget is {max_time} s')
+    if max_memory is not None and row['peak_memory'].value > max_memory:
+        pytest.fail(f'{method} allocated {_format_bytes(row["peak_memory"].value).strip()}, '
+                    f'budget is {_format_bytes(max_memory).strip()}')
+
+
 # ============================================================================
 # Pytest hooks
 # ============================================================================
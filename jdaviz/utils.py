@@ -38,7 +38,10 @@ from glue.config import settings
 from glue.config import colormaps as glue_colormaps
 from glue.core import BaseData
 from glue.core.exceptions import IncompatibleAttribute
-from glue.core.subset import SubsetState, RangeSubsetState, RoiSubsetState
+from glue.core.contracts import contract
+from glue.core.decorators import memoize
+from glue.core.roi import CircularROI, CircularAnnulusROI, EllipticalROI, RectangularROI
+from glue.core.subset import SubsetState, RangeSubsetState, RoiSubsetState, OrState
 from glue_astronomy.spectral_coordinates import SpectralCoordinates
 from ipyvue import watch
 
@@ -50,7 +53,7 @@ __all__ = ['SnackbarQueue', 'enable_hot_reloading', 'bqplot_clear_figure',
            'get_wcs_only_layer_labels', 'get_top_layer_index',
            'get_reference_image_data', 'standardize_roman_metadata',
            'wildcard_match', 'cmap_samples', 'glue_colormaps',
-           'att_to_componentid', 'create_data_hash',
+           'att_to_componentid', 'create_data_hash', 'create_hdu_hash',
            'in_ra_comps', 'in_dec_comps', 'SPECTRAL_AXIS_COMP_LABELS',
            'hst_obstype', 'suppress_widget_comms']
 
@@ -124,6 +127,11 @@ def in_dec_comps(comp):
             )
 
 
+def _snackbar_color(msg):
+    # debug messages (only shown on request, see the Logger plugin) look like info messages
+    return 'info' if msg.color == 'debug' else msg.color
+
+
 class SnackbarQueue:
     '''
     Class that performs the role of VSnackbarQueue, which is not
@@ -140,14 +148,14 @@ class SnackbarQueue:
         self.first = True
 
     def put(self, state, logger_plg, msg, history=True, popup=True):
-        if msg.color not in ['info', 'warning', 'error', 'success', None]:
-            raise ValueError(f"color ({msg.color}) must be on of: info, warning, error, success")
+        if msg.color not in ['debug', 'info', 'warning', 'error', 'success', None]:
+            raise ValueError(f"color ({msg.color}) must be on of: debug, info, warning, error, success")  # noqa
 
         if not msg.loading and history and logger_plg is not None:
             now = time.localtime()
             timestamp = f'{now.tm_hour}:{now.tm_min:02d}:{now.tm_sec:02d}'
             new_history = {'time': timestamp, 'text': msg.text,
-                           'color': msg.color, 'traceback': msg.traceback}
+                           'color': _snackbar_color(msg), 'traceback': msg.traceback}
             # for now, we'll hardcode the max length of the stored history
             if len(logger_plg.history) >= 50:
                 logger_plg.history = logger_plg.history[1:] + [new_history]
@@ -226,7 +234,7 @@ class SnackbarQueue:
     def _write_message(self, state, msg):
         state.snackbar['show'] = False
         state.snackbar['text'] = msg.text
-        state.snackbar['color'] = msg.color
+        state.snackbar['color'] = _snackbar_color(msg)
         # TODO: in vuetify >2.3, timeout should be set to -1 to keep open
         #  indefinitely
         state.snackbar['timeout'] = 0  # timeout controlled by thread
@@ -671,6 +679,149 @@ class MultiMaskSubsetState(SubsetState):
         return cls(masks=masks)
 
 
+class MultiRoiSubsetState(OrState):
+    """
+    The union of many ROIs defined on the same x and y attributes.
+
+    The ROIs are stored as a balanced tree of `~glue.core.subset.OrState` so that
+    the subset can be inspected and modified like any other combination of ROI
+    subsets.  The membership mask is only computed when first requested, and
+    then by testing each ROI only within its bounding box rather than combining
+    one full-size mask per ROI.
+
+    Use `MultiRoiSubsetState.from_states` to build one from a list of
+    `~glue.core.subset.RoiSubsetState`.
+    """
+
+    @classmethod
+    def from_states(cls, states):
+        """
+        Combine a non-empty list of `~glue.core.subset.RoiSubsetState` into a
+        single subset state.
+        """
+        def _balanced(states):
+            if len(states) == 1:
+                return states[0]
+            half = len(states) // 2
+            return OrState(_balanced(states[:half]), _balanced(states[half:]))
+
+        if len(states) == 1:
+            return cls(states[0])
+        half = len(states) // 2
+        return cls(_balanced(states[:half]), _balanced(states[half:]))
+
+    def roi_states(self):
+        """
+        List of the `~glue.core.subset.RoiSubsetState` combined in this state,
+        or `None` if the tree contains anything other than ROIs combined with
+        "or".
+        """
+        leaves = []
+        stack = [self]
+        while stack:
+            state = stack.pop()
+            if isinstance(state, OrState):
+                if state.state2 is not None:
+                    stack.append(state.state2)
+                stack.append(state.state1)
+            elif isinstance(state, RoiSubsetState) and state.pretransform is None:
+                leaves.append(state)
+            else:
+                return None
+        return leaves
+
+    @staticmethod
+    def _roi_bounds(rois):
+        """
+        (xmin, xmax, ymin, ymax) bounding boxes of ``rois``, computed per shape.
+        """
+        bounds = np.tile([-np.inf, np.inf, -np.inf, np.inf], (len(rois), 1))
+        by_shape = {}
+        for i, roi in enumerate(rois):
+            by_shape.setdefault(type(roi), []).append(i)
+
+        for shape, indices in by_shape.items():
+            group = [rois[i] for i in indices]
+            if shape in (CircularROI, CircularAnnulusROI, EllipticalROI):
+                xc = np.array([roi.xc for roi in group], dtype=float)
+                yc = np.array([roi.yc for roi in group], dtype=float)
+                if shape is CircularROI:
+                    r = np.array([roi.radius for roi in group], dtype=float)
+                elif shape is CircularAnnulusROI:
+                    r = np.array([roi.outer_radius for roi in group], dtype=float)
+                else:
+                    r = np.array([max(roi.radius_x, roi.radius_y) for roi in group],
+                                 dtype=float)
+                bounds[indices] = np.column_stack([xc - r, xc + r, yc - r, yc + r])
+            elif shape is RectangularROI:
+                corners = np.array([[roi.xmin, roi.xmax, roi.ymin, roi.ymax]
+                                    for roi in group], dtype=float)
+                xc = corners[:, :2].mean(axis=1)
+                yc = corners[:, 2:].mean(axis=1)
+                # half-diagonal covers any rotation of the rectangle
+                r = np.hypot(corners[:, 1] - corners[:, 0], corners[:, 3] - corners[:, 2]) / 2
+                bounds[indices] = np.column_stack([xc - r, xc + r, yc - r, yc + r])
+            elif hasattr(group[0], 'vx'):
+                for i, roi in zip(indices, group):
+                    if len(roi.vx):
+                        bounds[i] = [np.min(roi.vx), np.max(roi.vx),
+                                     np.min(roi.vy), np.max(roi.vy)]
+        return bounds
+
+    @memoize
+    @contract(data='isinstance(Data)', view='array_view')
+    def to_mask(self, data, view=None):
+        states = self.roi_states()
+        if not states or len({(state.xatt, state.yatt) for state in states}) > 1:
+            return super().to_mask(data, view)
+
+        xatt, yatt = states[0].xatt, states[0].yatt
+        x = data[xatt, view]
+        y = data[yatt, view]
+        res_shape = x.shape
+
+        rois = [state.roi for state in states if state.roi.defined()]
+        bounds = self._roi_bounds(rois)
+
+        pixel_ids = data.pixel_component_ids
+        if view is None and xatt in pixel_ids and yatt in pixel_ids:
+            # ROIs in pixel space: evaluate on a single 2D plane, where each
+            # ROI only needs to be tested within its bounding box, and
+            # broadcast to the other dimensions.
+            plane = tuple(slice(None) if i in (xatt.axis, yatt.axis) else slice(0, 1)
+                          for i in range(data.ndim))
+            x, y = x[plane], y[plane]
+            mask = np.zeros(x.shape, dtype=bool)
+            nx, ny = x.shape[xatt.axis], x.shape[yatt.axis]
+            for roi, (xmin, xmax, ymin, ymax) in zip(rois, bounds):
+                x0, x1 = np.clip([np.floor(xmin), np.ceil(xmax) + 1], 0, nx).astype(int)
+                y0, y1 = np.clip([np.floor(ymin), np.ceil(ymax) + 1], 0, ny).astype(int)
+                if x0 >= x1 or y0 >= y1:
+                    continue
+                window = [slice(None)] * data.ndim
+                window[xatt.axis] = slice(x0, x1)
+                window[yatt.axis] = slice(y0, y1)
+                window = tuple(window)
+                mask[window] |= roi.contains(x[window], y[window])
+            return np.broadcast_to(mask, res_shape).copy()
+
+        # general case: candidates within the x-range of each ROI are found
+        # from the points sorted once along x
+        x, y = np.ravel(x), np.ravel(y)
+        mask = np.zeros(x.shape, dtype=bool)
+        order = np.argsort(x, kind='stable')
+        x_sorted = x[order]
+        lo = np.searchsorted(x_sorted, bounds[:, 0], side='left')
+        hi = np.searchsorted(x_sorted, bounds[:, 1], side='right')
+        for roi, (_, _, ymin, ymax), i0, i1 in zip(rois, bounds, lo, hi):
+            if i0 >= i1:
+                continue
+            candidates = order[i0:i1]
+            candidates = candidates[(y[candidates] >= ymin) & (y[candidates] <= ymax)]
+            mask[candidates] |= roi.contains(x[candidates], y[candidates])
+        return mask.reshape(res_shape)
+
+
 def get_cloud_fits(possible_uri, ext=None, fsspec_filesystem=None):
     """
     Load one or more extensions from a remote FITS file by its S3 URI.
@@ -1159,7 +1310,8 @@ def att_to_componentid(att_helper, att):
     raise ValueError(f"Could not find component ID for attribute '{att}'")
 
 
-def parallelize_calculation(workers, collect_result_callback, n_cpu=mp.cpu_count() - 1):
+def parallelize_calculation(workers, collect_result_callback, n_cpu=mp.cpu_count() - 1,
+                            prefer=None):
     """
     Function to perform parallel processing with joblib.
     The function takes a list of callables (functions with no arguments
@@ -1175,8 +1327,12 @@ def parallelize_calculation(workers, collect_result_callback, n_cpu=mp.cpu_count
     n_cpu : int
         The number of CPU cores to use for parallel processing.
         Defaults to the total number of available CPU cores - 1.
+    prefer : {None, 'processes', 'threads'}
+        Soft hint for the joblib backend.  Workers that spend most of their time
+        in numpy (which releases the GIL) can use ``'threads'`` to avoid copying
+        their inputs into worker processes.
     """
-    results = Parallel(n_jobs=n_cpu)(delayed(worker)() for worker in workers)
+    results = Parallel(n_jobs=n_cpu, prefer=prefer)(delayed(worker)() for worker in workers)
     _ = [collect_result_callback(r) for r in results]
 
 
@@ -1302,6 +1458,38 @@ def create_data_hash(input_data):
     return hasher.hexdigest()
 
 
+def create_hdu_hash(hdu):
+    """
+    Create and return a deterministic hash for a FITS HDU without reading its data.
+    The hash is built from the header cards together with the shape and dtype
+    of the data as described by the header, so that memory-mapped or lazily
+    loaded HDUs do not need to be read from disk.  Used in place of
+    `create_data_hash` when the ``lazy_load`` data setting is enabled.
+
+    Parameters
+    ----------
+    hdu : `~astropy.io.fits.hdu.base.ExtensionHDU` or `~astropy.io.fits.PrimaryHDU`
+        The HDU to hash.
+
+    Returns
+    -------
+    str or None
+        A hexadecimal string representing the hash of the HDU header,
+        or `None` if the HDU has no data.
+    """
+    header = getattr(hdu, 'header', None)
+    if header is None or not header.get('NAXIS', 0):
+        return None
+
+    # shape as described by the header (reversed FITS axis order, as in numpy)
+    shape = tuple(header.get(f'NAXIS{i}') for i in range(header['NAXIS'], 0, -1))
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(f'shape:{shape};bitpix:{header.get("BITPIX")}'.encode())
+    hasher.update(b';header:')
+    hasher.update(header.tostring().encode())
+    return hasher.hexdigest()
+
+
 # Add new and inverse colormaps to Glue global state. Also see ColormapRegistry in
 # https://github.com/glue-viz/glue/blob/main/glue/config.py
 new_cms = (['Rainbow', cm.rainbow],